@@ -0,0 +1,338 @@
+"""
+Root conftest.
+
+pytest parses the command line before it imports tests/fcle/conftest.py (it is
+not in a `test*` directory next to the rootdir), so options declared there are
+rejected as unknown. The suite's command line options live here instead; the
+hooks and fixtures that read them stay in tests/fcle/conftest.py.
+
+Even this file is only loaded once pytest has picked the rootdir from the
+positional arguments, so pass path values with `=` (`--replay-cassette=run.jsonl`):
+a separate `run.jsonl` is taken for a test path, which moves the rootdir away
+from pytest.ini and the options are rejected after all.
+"""
+
+from settings import (
+    BACKOFF_FACTOR,
+    CASE_STRENGTH,
+    CLEANUP_WORKERS,
+    CONCURRENCY_MAX,
+    DURATION_HISTORY,
+    HTTP_VERSION,
+    LATENCY_ALPHA,
+    LATENCY_MIN_SAMPLES,
+    LATENCY_TOLERANCE,
+    LOAD_DURATION,
+    LOAD_RAMP,
+    LOAD_RPS,
+    LOAD_WORKERS,
+    MAX_RETRIES,
+    POOL_CONNECTIONS,
+    POOL_MAXSIZE,
+    SOAK_DURATION,
+    SOAK_PAUSE,
+    SOAK_USERS,
+    SOAK_WINDOW,
+    STUB_CAPACITY,
+    STUB_DELAY,
+    USER_POOL_SIZE,
+)
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup("transport", "shared HTTP transport")
+    group.addoption(
+        "--pool-connections",
+        type=int,
+        default=POOL_CONNECTIONS,
+        help="number of per-host keep-alive pools",
+    )
+    group.addoption(
+        "--pool-size",
+        type=int,
+        default=POOL_MAXSIZE,
+        help="keep-alive connections per host",
+    )
+    group.addoption(
+        "--max-retries",
+        type=int,
+        default=MAX_RETRIES,
+        help="retries for connection errors and retryable statuses",
+    )
+    group.addoption(
+        "--retry-backoff",
+        type=float,
+        default=BACKOFF_FACTOR,
+        help="exponential backoff factor between retries",
+    )
+    group.addoption(
+        "--max-concurrency",
+        type=int,
+        default=CONCURRENCY_MAX,
+        help="upper bound of the adaptive per-endpoint-group concurrency limit, "
+        "which backs off on 429/503 and rising latency; 0 disables the limiter, "
+        "--benchmark, load and soak runs always run without it",
+    )
+    group.addoption(
+        "--http-version",
+        choices=("1.1", "2", "compare"),
+        default=HTTP_VERSION,
+        help="protocol of the async transport: 2 multiplexes requests over one "
+        "connection where the server offers HTTP/2 (needs h2 and an https:// "
+        "BASE_URL, HTTP/2 is only negotiated over TLS), compare runs every async "
+        "test under 1.1 and 2 and compares their latency",
+    )
+    group.addoption(
+        "--report-connections",
+        action="store_true",
+        default=False,
+        help="report connection reuse counts at the end of the run",
+    )
+
+    group.addoption(
+        "--latency-report",
+        default=None,
+        help="write per-endpoint latency histograms of every request to this "
+        "file at session end (.csv for a flat table, JSON otherwise)",
+    )
+
+    group = parser.getgroup("latency", "latency regression gate")
+    group.addoption(
+        "--latency-baseline",
+        default=None,
+        help="fail the session on a significant p95 regression against this baseline",
+    )
+    group.addoption(
+        "--latency-save-baseline",
+        default=None,
+        help="store this run's per-endpoint latency as a baseline file",
+    )
+    group.addoption(
+        "--latency-tolerance",
+        type=float,
+        default=LATENCY_TOLERANCE,
+        help="allowed relative p95 growth, 0.2 = 20%%",
+    )
+    group.addoption(
+        "--latency-alpha",
+        type=float,
+        default=LATENCY_ALPHA,
+        help="significance level of the regression test",
+    )
+    group.addoption(
+        "--latency-min-samples",
+        type=int,
+        default=LATENCY_MIN_SAMPLES,
+        help="endpoints with fewer requests are not judged",
+    )
+
+    group = parser.getgroup("user pool", "pre-registered users for auth_headers")
+    group.addoption(
+        "--user-pool-size",
+        type=int,
+        default=USER_POOL_SIZE,
+        help="users registered up front and leased to tests, 0 registers one per test",
+    )
+    group.addoption(
+        "--token-store",
+        default=None,
+        help="JSON file that keeps pooled users and tokens across runs, "
+        "TOKEN_STORE by default; off with --local-api or a cassette",
+    )
+    group.addoption(
+        "--no-token-store",
+        action="store_true",
+        default=False,
+        help="register new pool users and log in again, whatever is stored",
+    )
+
+    group = parser.getgroup("parallel", "parallel run with endpoint-aware sharding")
+    group.addoption(
+        "--workers",
+        type=int,
+        default=0,
+        help="run tests in N worker processes, endpoint groups stay on one worker",
+    )
+    group.addoption(
+        "--shard-file",
+        default=None,
+        help="internal: node ids assigned to this worker",
+    )
+    group.addoption(
+        "--worker-report",
+        default=None,
+        help="internal: file the worker streams its test reports to",
+    )
+    group.addoption(
+        "--duration-history",
+        default=DURATION_HISTORY,
+        help="JSON file of per-test durations: every run updates it, --workers "
+        "runs pack the tests by it; empty to disable",
+    )
+
+    group = parser.getgroup("load", "replay test scenarios as a load profile")
+    group.addoption(
+        "--load-duration",
+        type=float,
+        default=LOAD_DURATION,
+        help="seconds of load instead of running the tests, 0 runs the tests",
+    )
+    group.addoption(
+        "--load-rps",
+        type=float,
+        default=LOAD_RPS,
+        help="target requests per second after the ramp",
+    )
+    group.addoption(
+        "--load-ramp",
+        type=float,
+        default=LOAD_RAMP,
+        help="seconds of linear ramp-up to the target rps",
+    )
+    group.addoption(
+        "--load-mix",
+        default=None,
+        help="scenario weights, e.g. login=3,teacher_educations=5,learning_materials=2",
+    )
+    group.addoption(
+        "--load-workers",
+        type=int,
+        default=LOAD_WORKERS,
+        help="sender threads, i.e. the maximum number of requests in flight",
+    )
+    group.addoption(
+        "--load-report",
+        default=None,
+        help="write per-endpoint load results to this JSON file",
+    )
+    group.addoption(
+        "--load-seed",
+        type=int,
+        default=None,
+        help="seed for scenario and case selection",
+    )
+
+    group = parser.getgroup("soak", "cycle user journeys for hours, see utils/soak.py")
+    group.addoption(
+        "--soak-duration",
+        type=float,
+        default=SOAK_DURATION,
+        help="seconds of soak instead of running the tests, 0 runs the tests",
+    )
+    group.addoption(
+        "--soak-users",
+        type=int,
+        default=SOAK_USERS,
+        help="journeys running at once",
+    )
+    group.addoption(
+        "--soak-pause",
+        type=float,
+        default=SOAK_PAUSE,
+        help="seconds a user waits between two journeys",
+    )
+    group.addoption(
+        "--soak-window",
+        type=float,
+        default=SOAK_WINDOW,
+        help="seconds aggregated into one line of the soak report",
+    )
+    group.addoption(
+        "--soak-report",
+        default=None,
+        help="JSONL file the windows are streamed to, fcle-soak.jsonl by default",
+    )
+    group.addoption(
+        "--soak-seed",
+        type=int,
+        default=None,
+        help="seed for the payload variants",
+    )
+
+    group = parser.getgroup("local api", "in-process stand-in API server")
+    group.addoption(
+        "--local-api",
+        action="store_true",
+        default=False,
+        help="answer all plain-HTTP requests from an in-process stub of the API",
+    )
+    group.addoption(
+        "--local-api-delay",
+        type=float,
+        default=STUB_DELAY,
+        help="fixed service time in seconds added to every stub response",
+    )
+    group.addoption(
+        "--local-api-capacity",
+        type=int,
+        default=STUB_CAPACITY,
+        help="requests the stub serves at once, it throttles the rest with "
+        "429 and Retry-After; 0 serves all",
+    )
+
+    group = parser.getgroup("cassette", "record and replay HTTP exchanges")
+    group.addoption(
+        "--record-cassette",
+        default=None,
+        help="write every request/response pair to this JSONL cassette (.gz to compress)",
+    )
+    group.addoption(
+        "--replay-cassette",
+        default=None,
+        help="answer all requests from this cassette instead of the network",
+    )
+    group.addoption(
+        "--cassette-seed",
+        type=int,
+        default=None,
+        help="seed of the payload generators while recording, random by default",
+    )
+
+    group = parser.getgroup("benchmark", "upload throughput benchmark")
+    group.addoption(
+        "--benchmark",
+        action="store_true",
+        default=False,
+        help="run the tests marked `benchmark`, they are deselected otherwise",
+    )
+    group.addoption(
+        "--benchmark-max-size",
+        type=float,
+        default=None,
+        help="skip benchmark uploads larger than this many MB",
+    )
+    group.addoption(
+        "--benchmark-report",
+        default=None,
+        help="write the benchmark results and rejection thresholds to this JSON file",
+    )
+    group.addoption(
+        "--pagination-report",
+        default=None,
+        help="write the pagination crawls and latency-over-offset curves to this JSON file",
+    )
+
+    group = parser.getgroup("cases", "combinatorial parameter matrices")
+    group.addoption(
+        "--case-strength",
+        type=int,
+        default=CASE_STRENGTH,
+        help="cover every combination of this many input types (2 = pairwise), "
+        "0 runs only the hand-picked rows",
+    )
+
+    group = parser.getgroup("cleanup", "background teardown of created resources")
+    group.addoption(
+        "--cleanup-workers",
+        type=int,
+        default=CLEANUP_WORKERS,
+        help="parallel DELETE requests for resources the tests created, "
+        "0 keeps them on the server",
+    )
+    group.addoption(
+        "--account-ledger",
+        default=None,
+        help="append the accounts the run registers to this JSONL file for "
+        "`python -m utils.sweeper`; ACCOUNT_LEDGER by default against a real "
+        "API, off with --local-api or a replayed cassette",
+    )
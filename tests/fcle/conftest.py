@@ -1,18 +1,400 @@
+import asyncio
+import functools
+import importlib.util
+import inspect
 from http import HTTPStatus
 
+import httpx
 import pytest
 import requests
 
-from settings import BASE_URL, ENDPOINTS, TIMEOUT
-from utils.fake_data_generators import (
-    generate_email,
-    generate_nickname,
-    generate_password,
+from settings import (
+    BACKOFF_FACTOR,
+    CASE_STRENGTH,
+    CLEANUP_WORKERS,
+    CONCURRENCY_MAX,
+    ENDPOINTS,
+    MAX_RETRIES,
+    POOL_CONNECTIONS,
+    POOL_MAXSIZE,
+    SOAK_REPORT,
+    TIMEOUT,
+    TOKEN_STORE,
+    USER_POOL_SIZE,
 )
+from utils.async_transport import (
+    AsyncHttpTransport,
+    get_stream_stats,
+    run_coroutine_test,
+)
+from utils.cassette import Cassette, CassettePlugin
+from utils.combinatorics import set_case_strength
+from utils.concurrency import AdaptiveLimiter
+from utils.durations import DurationHistory, history_path
+from utils.latency import get_recorder
+from utils.latency_gate import LatencyGate
+from utils.ledger import configure_ledger, ledger_path
+from utils.multipart import MultipartEncoder
+from utils.pagination_benchmark import PaginationBenchmark
+from utils.parallel import ParallelRunner, ShardWorker, worker_id
+from utils.resource_tracker import ResourceTracker
+from utils.schemas import get_schema_registry
+from utils.stub_server import StubServer
+from utils.token_store import configure_token_store, get_token_store, store_path
+from utils.transport import close_transport, configure_transport, get_transport
+from utils.upload_benchmark import UploadBenchmark
+from utils.user_pool import UserPool, register_user
+
+CALL_REPORT_KEY = pytest.StashKey()
+STUB_SERVER_KEY = pytest.StashKey()
+BENCHMARK_KEY = pytest.StashKey()
+PAGINATION_BENCHMARK_KEY = pytest.StashKey()
+CLEANUP_KEY = pytest.StashKey()
+LIMITER_OFF_KEY = pytest.StashKey()
+
+
+def pytest_configure(config):
+    # before the fixture modules build their matrices during collection
+    set_case_strength(config.getoption("case_strength", CASE_STRENGTH))
+
+    if config.getoption("local_api", False):
+        server = StubServer(
+            delay=config.getoption("local_api_delay"),
+            capacity=config.getoption("local_api_capacity"),
+        ).start()
+        server.install()
+        config.stash[STUB_SERVER_KEY] = server
+
+    record = config.getoption("record_cassette", None)
+    replay = config.getoption("replay_cassette", None)
+    cassette = None
+    if record and replay:
+        raise pytest.UsageError(
+            "--record-cassette and --replay-cassette exclude each other"
+        )
+    if replay:
+        try:
+            cassette = Cassette(replay, "replay", worker=worker_id())
+        except (OSError, ValueError) as e:
+            raise pytest.UsageError(f"cannot replay {replay}: {e}")
+    elif record:
+        cassette = Cassette(
+            record, "record", seed=config.getoption("cassette_seed"), worker=worker_id()
+        )
+    if cassette is not None:
+        config.option.cassette_seed = cassette.seed  # workers record with the same seed
+        config.pluginmanager.register(CassettePlugin(config, cassette), "fcle-cassette")
+
+    # a replayed cassette has no server to overload, and benchmark, load and soak
+    # runs load it on purpose: a limiter would cap the concurrency they measure
+    limiter = None
+    max_concurrency = config.getoption("max_concurrency", CONCURRENCY_MAX)
+    load_option = _load_option(config)
+    if load_option is not None:
+        config.stash[LIMITER_OFF_KEY] = load_option
+    elif max_concurrency > 0 and not replay:
+        limiter = AdaptiveLimiter(maximum=max_concurrency)
+        config.pluginmanager.register(limiter, "fcle-concurrency")
+
+    configure_transport(
+        pool_connections=config.getoption("pool_connections", POOL_CONNECTIONS),
+        pool_maxsize=config.getoption("pool_size", POOL_MAXSIZE),
+        max_retries=config.getoption("max_retries", MAX_RETRIES),
+        backoff_factor=config.getoption("retry_backoff", BACKOFF_FACTOR),
+        cassette=cassette,
+        limiter=limiter,
+    )
+
+    # HTTP/2 of the async transport: always, never or both per test (`http2` fixture)
+    http_version = config.getoption("http_version", "1.1")
+    if http_version != "1.1" and importlib.util.find_spec("h2") is None:
+        raise pytest.UsageError(
+            f"--http-version {http_version} needs the h2 package: pip install 'httpx[http2]'"
+        )
+
+    # a cassette serves exchanges in recorded order, so it gets inline deletions
+    tracker = ResourceTracker(
+        get_transport().request,
+        workers=config.getoption("cleanup_workers", CLEANUP_WORKERS),
+        background=cassette is None,
+    )
+    config.stash[CLEANUP_KEY] = tracker
+    config.pluginmanager.register(tracker, "fcle-cleanup")
+
+    # accounts on the local stand-in or from a cassette do not outlive the run
+    ledger = config.getoption("account_ledger", None)
+    if ledger is None and not (config.getoption("local_api", False) or replay):
+        ledger = ledger_path()
+    configure_ledger(ledger)
+
+    # the same goes for their tokens; a cassette must replay the signups
+    tokens = None
+    if not (config.getoption("local_api", False) or cassette is not None):
+        if not config.getoption("no_token_store", False):
+            tokens = store_path(config.getoption("token_store", None) or TOKEN_STORE)
+    configure_token_store(tokens)
+
+    baseline = config.getoption("latency_baseline", None)
+    save_baseline = config.getoption("latency_save_baseline", None)
+    if (baseline or save_baseline) and not config.getoption("shard_file", None):
+        try:
+            gate = LatencyGate(
+                get_recorder(),
+                baseline_path=baseline,
+                save_path=save_baseline,
+                tolerance=config.getoption("latency_tolerance"),
+                alpha=config.getoption("latency_alpha"),
+                min_samples=config.getoption("latency_min_samples"),
+            )
+        except (OSError, ValueError) as e:
+            raise pytest.UsageError(f"cannot load latency baseline {baseline}: {e}")
+        config.pluginmanager.register(gate, "fcle-latency-gate")
+
+    if config.getoption("load_duration", 0) > 0:
+        # load mode pulls in every scenario's parameter generators, only import it here
+        from utils.load_profile import LoadRunner, parse_mix
+
+        try:
+            mix = parse_mix(config.getoption("load_mix"))
+        except ValueError as e:
+            raise pytest.UsageError(str(e))
+        config.pluginmanager.register(
+            LoadRunner(
+                config,
+                rps=config.getoption("load_rps"),
+                ramp=config.getoption("load_ramp"),
+                duration=config.getoption("load_duration"),
+                mix=mix,
+                workers=config.getoption("load_workers"),
+                report_path=config.getoption("load_report"),
+                seed=config.getoption("load_seed"),
+            ),
+            "fcle-load",
+        )
+    elif config.getoption("soak_duration", 0) > 0:
+        # like load mode, soak mode imports the payload generators only when used
+        from utils.soak import SoakRunner
+
+        if config.getoption("workers", 0) > 1:
+            raise pytest.UsageError(
+                "--soak-duration runs its own users, drop --workers"
+            )
+        config.pluginmanager.register(
+            SoakRunner(
+                config,
+                duration=config.getoption("soak_duration"),
+                users=config.getoption("soak_users"),
+                pause=config.getoption("soak_pause"),
+                window=config.getoption("soak_window"),
+                report_path=ledger_path(config.getoption("soak_report") or SOAK_REPORT),
+                seed=config.getoption("soak_seed"),
+            ),
+            "fcle-soak",
+        )
+    elif config.getoption("shard_file", None):
+        config.pluginmanager.register(
+            ShardWorker(
+                config,
+                config.getoption("shard_file"),
+                config.getoption("worker_report"),
+            ),
+            "fcle-shard-worker",
+        )
+    else:
+        _configure_scheduling(config, replay)
+
+    if config.getoption("benchmark", False):
+        if config.getoption("workers", 0) > 1:
+            raise pytest.UsageError(
+                "--benchmark measures throughput, run it without --workers"
+            )
+        max_size = config.getoption("benchmark_max_size")
+        benchmark = UploadBenchmark(
+            report_path=config.getoption("benchmark_report"),
+            max_size=int(max_size * 1024 * 1024) if max_size else None,
+        )
+        config.stash[BENCHMARK_KEY] = benchmark
+        config.pluginmanager.register(benchmark, "fcle-benchmark")
+        pagination = PaginationBenchmark(
+            report_path=config.getoption("pagination_report")
+        )
+        config.stash[PAGINATION_BENCHMARK_KEY] = pagination
+        config.pluginmanager.register(pagination, "fcle-pagination-benchmark")
+
+
+def _load_option(config):
+    """Option that makes the run load the server on purpose, None for test runs."""
+    if config.getoption("benchmark", False):
+        return "--benchmark"
+    for option in ("load_duration", "soak_duration"):
+        if config.getoption(option, 0) > 0:
+            return "--" + option.replace("_", "-")
+    return None
+
+
+def _configure_scheduling(config, replay):
+    """Duration history of the serial run or the controller, which packs the workers."""
+    history = None
+    path = config.getoption("duration_history", None)
+    if path:
+        local_api = config.getoption("local_api", False)
+        # replayed exchanges take no server time, they would skew the history
+        history = DurationHistory(history_path(path, local_api), record=not replay)
+        config.pluginmanager.register(history, "fcle-durations")
+    if config.getoption("workers", 0) > 1:
+        config.pluginmanager.register(
+            ParallelRunner(
+                config,
+                config.getoption("workers"),
+                weight=history.weight if history is not None else None,
+            ),
+            "fcle-parallel",
+        )
+
+
+def pytest_generate_tests(metafunc):
+    # compare mode runs every async test once per protocol, so both see its endpoints
+    if (
+        metafunc.config.getoption("http_version", "1.1") == "compare"
+        and "http2" in metafunc.fixturenames
+    ):
+        metafunc.parametrize(
+            "http2", (False, True), ids=("http1.1", "http2"), indirect=True
+        )
+
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_collection_modifyitems(config, items):
+    # benchmark tests take minutes and only run on request
+    if config.getoption("benchmark", False):
+        return
+    deselected = [item for item in items if item.get_closest_marker("benchmark")]
+    if deselected:
+        config.hook.pytest_deselected(items=deselected)
+        items[:] = [item for item in items if not item.get_closest_marker("benchmark")]
+
+
+@pytest.hookimpl(wrapper=True)
+def pytest_runtest_protocol(item, nextitem):
+    # requests made while the test runs are attributed to its node id
+    recorder = get_recorder()
+    recorder.node = item.nodeid
+    try:
+        return (yield)
+    finally:
+        recorder.node = None
+
+
+@pytest.hookimpl(wrapper=True)
+def pytest_runtest_makereport(item, call):
+    report = yield
+    if report.when == "call":
+        item.stash[CALL_REPORT_KEY] = report
+    return report
+
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_pyfunc_call(pyfuncitem):
+    """Runs `async def` tests on a fresh event loop."""
+    if not inspect.iscoroutinefunction(pyfuncitem.obj):
+        return None
+
+    funcargs = pyfuncitem.funcargs
+    kwargs = {name: funcargs[name] for name in pyfuncitem._fixtureinfo.argnames}
+    transports = [v for v in funcargs.values() if isinstance(v, AsyncHttpTransport)]
+    asyncio.run(run_coroutine_test(pyfuncitem.obj, kwargs, transports))
+    return True
+
+
+def pytest_sessionfinish(session):
+    path = session.config.getoption("latency_report", None)
+    if path:
+        get_recorder().write(path)
+
+
+def pytest_terminal_summary(terminalreporter, config):
+    path = config.getoption("latency_report", None)
+    if path and not config.getoption("shard_file", None):
+        terminalreporter.write_line(
+            f"latency report: {len(get_recorder())} requests written to {path}"
+        )
+    load_option = config.stash.get(LIMITER_OFF_KEY, None)
+    if load_option is not None:
+        terminalreporter.write_line(
+            f"concurrency limiter off with {load_option}: "
+            "requests were sent at the concurrency the run asked for"
+        )
+
+    http_version = config.getoption("http_version", "1.1")
+    if not config.getoption("report_connections", False) and http_version == "1.1":
+        return
+
+    terminalreporter.section("connection reuse")
+    stats = get_transport().connection_stats()
+    streams = get_stream_stats()
+    if not stats and not streams.versions:
+        terminalreporter.write_line("no requests were sent")
+    for host, entry in stats.items():
+        terminalreporter.write_line(
+            f"{host}: {entry['requests']} requests over "
+            f"{entry['connections']} connections ({entry['reused']} reused)"
+        )
+    for version, entry in streams.summary().items():
+        terminalreporter.write_line(
+            f"async {version}: {entry['requests']} requests over "
+            f"{entry['connections']} connections, peak {entry['peak_in_flight']} "
+            f"in flight per transport"
+            + (
+                f", stream ids up to {entry['max_stream_id']}"
+                if entry["max_stream_id"]
+                else ""
+            )
+            + f", p50 {entry['p50_ms']:.1f} ms, p95 {entry['p95_ms']:.1f} ms"
+        )
+    compared = streams.compare()
+    if compared:
+        versions = sorted({v for entry in compared.values() for v in entry})
+        terminalreporter.write_line(
+            f"{'endpoint':<40}" + "".join(f"{v + ' p50/p95 ms':>24}" for v in versions)
+        )
+        for key, entry in compared.items():
+            terminalreporter.write_line(
+                f"{key:<40}"
+                + "".join(
+                    f"{f'{entry[v][1]:.1f}/{entry[v][2]:.1f} ({entry[v][0]})':>24}"
+                    for v in versions
+                )
+            )
+    elif http_version == "compare":
+        terminalreporter.write_line(
+            "no endpoint was answered over both HTTP/1.1 and HTTP/2 (HTTP/2 is "
+            "only negotiated over TLS: an https:// BASE_URL whose server offers it)"
+        )
+
+
+def pytest_unconfigure(config):
+    close_transport()
+    server = config.stash.get(STUB_SERVER_KEY, None)
+    if server is not None:
+        server.stop()
+
+
+@pytest.fixture(scope="session")
+def http_transport():
+    """
+    Session-scoped fixture with the shared, connection-pooled HTTP transport.
+
+    Every request fixture below sends through it, so keep-alive connections are
+    reused across tests instead of opening a new TCP/TLS connection per call.
+
+    Returns:
+        utils.transport.HttpTransport: The shared transport.
+    """
+    return get_transport()
 
 
 @pytest.fixture
-def post_request():
+def post_request(http_transport):
     """
     Fixture that provides a function to make HTTP POST requests.
 
@@ -33,8 +415,9 @@ def post_request():
 
     def _make_request(payload, endpoint, headers=None):
         try:
-            response = requests.post(
-                url=f"{BASE_URL}{endpoint}",
+            response = http_transport.request(
+                "POST",
+                endpoint,
                 json=payload,
                 headers=headers,
                 timeout=TIMEOUT,
@@ -47,7 +430,7 @@ def post_request():
 
 
 @pytest.fixture
-def get_request():
+def get_request(http_transport):
     """
     Fixture that provides a function to make HTTP GET requests.
 
@@ -70,8 +453,9 @@ def get_request():
 
     def _make_request(endpoint, params=None, headers=None):
         try:
-            response = requests.get(
-                url=f"{BASE_URL}{endpoint}",
+            response = http_transport.request(
+                "GET",
+                endpoint,
                 params=params,
                 headers=headers,
                 timeout=TIMEOUT,
@@ -84,7 +468,7 @@ def get_request():
 
 
 @pytest.fixture
-def put_request():
+def put_request(http_transport):
     """
     Fixture that provides a function to make HTTP PUT requests.
 
@@ -105,8 +489,9 @@ def put_request():
 
     def _make_request(payload, endpoint, headers=None):
         try:
-            response = requests.put(
-                url=f"{BASE_URL}{endpoint}",
+            response = http_transport.request(
+                "PUT",
+                endpoint,
                 json=payload,
                 headers=headers,
                 timeout=TIMEOUT,
@@ -119,7 +504,7 @@ def put_request():
 
 
 @pytest.fixture
-def delete_request():
+def delete_request(http_transport):
     """
     Fixture that provides a function to make HTTP DELETE requests.
 
@@ -142,8 +527,9 @@ def delete_request():
 
     def _make_request(payload, endpoint, headers=None):
         try:
-            response = requests.delete(
-                url=f"{BASE_URL}{endpoint}",
+            response = http_transport.request(
+                "DELETE",
+                endpoint,
                 json=payload,
                 headers=headers,
                 timeout=TIMEOUT,
@@ -155,15 +541,41 @@ def delete_request():
     return _make_request
 
 
+@pytest.fixture(scope="session")
+def user_pool(request, http_transport):
+    """
+    Session-scoped pool of pre-registered users leased by `auth_headers`.
+
+    The first lease registers `--user-pool-size` users in parallel; later tests
+    reuse them instead of running signup → set-password → login again. Clean
+    users of earlier runs are taken from the token store first and put back
+    at the end of the session (utils/token_store.py).
+
+    Returns:
+        utils.user_pool.UserPool | None: The pool, or None if it is disabled
+        with `--user-pool-size 0`.
+    """
+    size = request.config.getoption("user_pool_size", USER_POOL_SIZE)
+    if size <= 0:
+        return None
+
+    def _post(payload, endpoint):
+        return http_transport.request("POST", endpoint, json=payload)
+
+    pool = UserPool(size, _post, store=get_token_store())
+    yield pool
+    pool.close()
+
+
 @pytest.fixture
-def auth_headers(post_request):
+def auth_headers(request, post_request, user_pool):
     """
     Fixture: Provides Authorization headers for an authenticated user.
 
-    This fixture automates the signup → set-password → login flow to produce
-    a valid JWT token for subsequent authenticated requests in tests.
+    The user is leased from the session `user_pool`, so the signup → set-password
+    → login flow runs once per pooled user instead of once per test.
 
-    Steps:
+    Steps (for every newly registered user):
         1. **Signup**: Registers a new user with a generated email.
            - Endpoint: `POST /signup`
            - Expects status 200/201 and a 'token' in response.
@@ -174,8 +586,16 @@ def auth_headers(post_request):
            - Endpoint: `POST /login`
            - Expects status 200 and a response body containing a non-empty 'token'.
 
+    Markers:
+        - `fresh_user`: bypass the pool and register a brand-new user for the test.
+        - `mutates_user`: the test changes the user (profile, role, ...), so it is
+          quarantined instead of being returned to the pool. Failed tests are
+          quarantined as well.
+
     Args:
+        request (FixtureRequest): Used to read the markers and the test outcome.
         post_request (callable): Fixture that performs HTTP POST requests.
+        user_pool (UserPool | None): Session pool of registered users.
 
     Returns:
         tuple:
@@ -188,38 +608,20 @@ def auth_headers(post_request):
         - Login response must contain a valid JWT string.
     """
 
-    email = generate_email()
-    # signup
-    r1 = post_request({"email": email, "lang": "en"}, ENDPOINTS["signup"])
-    assert r1.status_code == HTTPStatus.OK, f"Signup failed: {r1.status_code} {r1.text}"
-    token_signup = r1.json()["token"]
-
-    # set-password
-    pwd = generate_password(valid=True)
-    nick = generate_nickname(valid=True)
-    r2 = post_request(
-        {
-            "token": token_signup,
-            "newPassword": pwd,
-            "nickname": nick,
-            "timezone": "UTC+4",
-        },
-        ENDPOINTS["set_password"],
-    )
-
-    assert (
-        r2.status_code == HTTPStatus.OK
-    ), f"Set password failed: {r2.status_code} {r2.text}"
-
-    # login
-    r3 = post_request(
-        {"email": email, "password": pwd, "timezone": "UTC+4"}, ENDPOINTS["login"]
-    )
+    if user_pool is None or request.node.get_closest_marker("fresh_user"):
+        user = register_user(post_request)
+        yield user.headers, user.email
+        return
 
-    assert r3.status_code == HTTPStatus.OK, f"Login failed: {r3.status_code} {r3.text}"
-    jwt = r3.json()["token"]
+    user = user_pool.lease()
+    yield user.headers, user.email
 
-    return {"Authorization": f"Bearer {jwt}"}, email
+    report = request.node.stash.get(CALL_REPORT_KEY, None)
+    failed = report is None or report.failed
+    if failed or request.node.get_closest_marker("mutates_user"):
+        user_pool.quarantine(user)
+    else:
+        user_pool.release(user)
 
 
 @pytest.fixture
@@ -263,11 +665,11 @@ def get_profile(get_request):
 
 
 @pytest.fixture
-def upload_file():
+def upload_file(http_transport):
     def _upload_file(data, files, headers, endpoint):
         try:
-            return requests.post(
-                url=f"{BASE_URL}{endpoint}", data=data, files=files, headers=headers
+            return http_transport.request(
+                "POST", endpoint, data=data, files=files, headers=headers
             )
         except requests.exceptions.RequestException as e:
             pytest.fail(f"request failed: {e}")
@@ -276,13 +678,272 @@ def upload_file():
 
 
 @pytest.fixture
-def upload_file_put():
+def upload_file_put(http_transport):
     def _upload_file(data, files, headers, endpoint, id_):
         try:
-            return requests.put(
-                url=f"{BASE_URL}{endpoint}/{id_}", data=data, files=files, headers=headers
+            return http_transport.request(
+                "PUT", f"{endpoint}/{id_}", data=data, files=files, headers=headers
+            )
+        except requests.exceptions.RequestException as e:
+            pytest.fail(f"request failed: {e}")
+
+    return _upload_file
+
+
+@pytest.fixture
+def upload_benchmark(request):
+    """
+    Fixture with the session's utils.upload_benchmark.UploadBenchmark.
+
+    Only available with `pytest --benchmark`; benchmark tests are deselected
+    otherwise.
+
+    Returns:
+        UploadBenchmark: Runs sweep points and collects them for the summary.
+    """
+    benchmark = request.config.stash.get(BENCHMARK_KEY, None)
+    if benchmark is None:
+        pytest.skip("upload benchmark runs with --benchmark")
+    return benchmark
+
+
+@pytest.fixture
+def pagination_benchmark(request):
+    """
+    Fixture with the session's utils.pagination_benchmark.PaginationBenchmark.
+
+    Only available with `pytest --benchmark`, like `upload_benchmark`.
+
+    Returns:
+        PaginationBenchmark: Crawls and probes paged endpoints for the summary.
+    """
+    benchmark = request.config.stash.get(PAGINATION_BENCHMARK_KEY, None)
+    if benchmark is None:
+        pytest.skip("pagination benchmark runs with --benchmark")
+    return benchmark
+
+
+@pytest.fixture
+def track_resource(request):
+    """
+    Fixture that records server resources the test creates for deletion.
+
+    The records are deleted when the test is torn down, concurrently in the
+    background (see utils/resource_tracker.py), accounts after their resources.
+
+    Returns:
+        function: `track(key, id_, headers=None)`, `key` is the ENDPOINTS key
+        of the resource (`"users"` with the email for an account); returns `id_`.
+    """
+    tracker = request.config.stash[CLEANUP_KEY]
+    batch = []
+    yield functools.partial(tracker.track, batch)
+    tracker.submit(batch)
+
+
+@pytest.fixture(scope="session")
+def response_schemas():
+    """
+    Fixture with the session's response schemas, see utils/schemas.py.
+
+    Returns:
+        SchemaRegistry: `errors(name, body)` lists what is wrong with a
+        response body, "<name>[]" checks a list response.
+    """
+    return get_schema_registry()
+
+
+@pytest.fixture
+def upload_stream(http_transport):
+    """
+    Fixture that provides a function to upload files as a streamed multipart body.
+
+    Same call shape as `upload_file`, but the body is produced by
+    `utils.multipart.MultipartEncoder` while it is sent, so files can be assets,
+    buffers, open files or synthetic files of hundreds of MB
+    (`utils.multipart.synthetic_file`) without building the body in memory.
+
+    The inner function `_upload` has the following parameters:
+        data (dict): Form fields.
+        files (dict): `{field: (filename, content[, content_type])}`.
+        headers (dict, optional): HTTP headers, Content-Type is set by the encoder.
+        endpoint (str): The endpoint to append to the BASE_URL for the request.
+        method (str, optional): "POST" (default) or "PUT".
+
+    Returns:
+        requests.Response: The response object.
+
+    Raises:
+        pytest.fail: If the request fails due to a requests.exceptions.RequestException.
+    """
+
+    def _upload(data, files, headers, endpoint, method="POST"):
+        encoder = MultipartEncoder(data, files)
+        headers = {**(headers or {}), "Content-Type": encoder.content_type}
+        try:
+            return http_transport.request(
+                method, endpoint, data=encoder, headers=headers
             )
         except requests.exceptions.RequestException as e:
             pytest.fail(f"request failed: {e}")
 
+    return _upload
+
+
+@pytest.fixture
+def http2(request):
+    """
+    Fixture telling whether the async transport offers HTTP/2.
+
+    True with `--http-version 2`; with `--http-version compare` the tests that
+    use it run twice, once with False and once with True.
+    """
+    if hasattr(request, "param"):
+        return request.param
+    return request.config.getoption("http_version", "1.1") == "2"
+
+
+@pytest.fixture
+def async_transport(http_transport, http2):
+    """
+    Fixture with an asyncio HTTP transport for high-concurrency tests.
+
+    Uses the same base URL and timeout as the shared sync transport, but not its
+    concurrency limiter: the async tests fire their requests at once to provoke
+    races, a limiter would send them a few at a time. Only usable from
+    `async def` tests, it is closed when the test's event loop ends. Offers
+    HTTP/2 as the `http2` fixture says; the server only takes it up over TLS,
+    so an http:// BASE_URL stays on HTTP/1.1.
+
+    Returns:
+        utils.async_transport.AsyncHttpTransport: The async transport.
+    """
+    return AsyncHttpTransport(
+        base_url=http_transport.base_url,
+        timeout=http_transport.timeout,
+        cassette=http_transport.cassette,
+        max_retries=http_transport.max_retries,
+        http2=http2,
+    )
+
+
+@pytest.fixture
+def async_post_request(async_transport):
+    """
+    Async counterpart of `post_request`.
+
+    Returns:
+        coroutine function: `await _make_request(payload, endpoint, headers=None)`
+        returning an `httpx.Response`.
+
+    Raises:
+        pytest.fail: If the request fails due to an httpx.HTTPError.
+    """
+
+    async def _make_request(payload, endpoint, headers=None):
+        try:
+            return await async_transport.request(
+                "POST", endpoint, json=payload, headers=headers, timeout=TIMEOUT
+            )
+        except httpx.HTTPError as e:
+            pytest.fail(f"Request failed: {e}")
+
+    return _make_request
+
+
+@pytest.fixture
+def async_get_request(async_transport):
+    """
+    Async counterpart of `get_request`.
+
+    Returns:
+        coroutine function: `await _make_request(endpoint, params=None, headers=None)`
+        returning an `httpx.Response`.
+
+    Raises:
+        pytest.fail: If the request fails due to an httpx.HTTPError.
+    """
+
+    async def _make_request(endpoint, params=None, headers=None):
+        try:
+            return await async_transport.request(
+                "GET", endpoint, params=params, headers=headers, timeout=TIMEOUT
+            )
+        except httpx.HTTPError as e:
+            pytest.fail(f"Request failed: {e}")
+
+    return _make_request
+
+
+@pytest.fixture
+def async_put_request(async_transport):
+    """
+    Async counterpart of `put_request`.
+
+    Returns:
+        coroutine function: `await _make_request(payload, endpoint, headers=None)`
+        returning an `httpx.Response`.
+
+    Raises:
+        pytest.fail: If the request fails due to an httpx.HTTPError.
+    """
+
+    async def _make_request(payload, endpoint, headers=None):
+        try:
+            return await async_transport.request(
+                "PUT", endpoint, json=payload, headers=headers, timeout=TIMEOUT
+            )
+        except httpx.HTTPError as e:
+            pytest.fail(f"request failed: {e}")
+
+    return _make_request
+
+
+@pytest.fixture
+def async_delete_request(async_transport):
+    """
+    Async counterpart of `delete_request`.
+
+    Returns:
+        coroutine function: `await _make_request(payload, endpoint, headers=None)`
+        returning an `httpx.Response`.
+
+    Raises:
+        pytest.fail: If the request fails due to an httpx.HTTPError.
+    """
+
+    async def _make_request(payload, endpoint, headers=None):
+        try:
+            return await async_transport.request(
+                "DELETE", endpoint, json=payload, headers=headers, timeout=TIMEOUT
+            )
+        except httpx.HTTPError as e:
+            pytest.fail(f"request failed: {e}")
+
+    return _make_request
+
+
+@pytest.fixture
+def async_upload_file(async_transport):
+    async def _upload_file(data, files, headers, endpoint):
+        try:
+            return await async_transport.request(
+                "POST", endpoint, data=data, files=files, headers=headers
+            )
+        except httpx.HTTPError as e:
+            pytest.fail(f"request failed: {e}")
+
+    return _upload_file
+
+
+@pytest.fixture
+def async_upload_file_put(async_transport):
+    async def _upload_file(data, files, headers, endpoint, id_):
+        try:
+            return await async_transport.request(
+                "PUT", f"{endpoint}/{id_}", data=data, files=files, headers=headers
+            )
+        except httpx.HTTPError as e:
+            pytest.fail(f"request failed: {e}")
+
     return _upload_file
@@ -47,7 +47,7 @@ def test_add_and_list_multiple_teachers(auth_headers, fav_teachers):
 
 
 @pytest.mark.favorite_teachers
-def test_get_structure_has_expected_fields(auth_headers, fav_teachers):
+def test_get_structure_has_expected_fields(auth_headers, fav_teachers, response_schemas):
     """
     Test that the FavoriteTeachers API response has the expected structure.
 
@@ -60,13 +60,14 @@ def test_get_structure_has_expected_fields(auth_headers, fav_teachers):
         auth_headers (tuple): Fixture providing (headers, email) for an authenticated user.
         fav_teachers (fixture): Factory fixture returning a Client wrapper for the
                                 FavoriteTeachers API.
+        response_schemas (fixture): Session registry of response schemas.
 
     Steps:
         1. Authenticate and create an API client via `fav_teachers`.
         2. Clear any existing favorites for a clean start.
         3. Add a single known teacher (ID_A).
         4. Retrieve the favorites list.
-        5. Inspect the first item in the list and check:
+        5. Validate every item in the list against the "fav-teachers" schema:
             - It contains `id`, `nickname`, and `language`.
             - The `language` field is a dictionary.
             - That dictionary contains `id`, `languageName`, and `languageOwnName`.
@@ -89,13 +90,8 @@ def test_get_structure_has_expected_fields(auth_headers, fav_teachers):
 
     items = api.list()
     assert isinstance(items, list) and len(items) >= 1
-    sample = items[0]
-
-    for key in ("id", "nickname", "language"):
-        assert key in sample, f"Item doesnt have field '{key}': {sample}"
-    assert isinstance(sample["language"], dict)
-    for key in ("id", "languageName", "languageOwnName"):
-        assert key in sample["language"], f"Language doesnt have field '{key}': {sample['language']}"
+    errors = response_schemas.errors("fav-teachers[]", items)
+    assert not errors, f"Items dont match the schema: {errors}"
 
 
 @pytest.mark.favorite_teachers
@@ -0,0 +1,64 @@
+from http import HTTPStatus
+
+import pytest
+
+from fixtures.teachers.fixture_favorite_teachers import async_fav_teachers
+
+ID_A = 1000155
+
+# Количество одновременных POST одного и того же teacherId
+CONCURRENCY = 50
+
+
+@pytest.mark.favorite_teachers
+async def test_concurrent_add_same_teacher_no_duplicates(
+    auth_headers, async_fav_teachers, async_transport
+):
+    """
+    Race test: many concurrent POSTs of the same teacherId must create one favorite.
+
+    Reproduces the production race behind duplicate favorites: the server
+    checks `favoriteTeacher.teacherId.isExists` and inserts in two steps, so
+    parallel requests may all pass the check.
+
+    Steps:
+        1. Clear the favorites list.
+        2. Fire `CONCURRENCY` POST requests for `ID_A` on one event loop.
+        3. Read the list back.
+
+    Assertions:
+        - All `CONCURRENCY` POSTs were in flight at once.
+        - Exactly one POST succeeds, the others return 422 `isExists`.
+        - `ID_A` appears in the list exactly once.
+    """
+    headers, _ = auth_headers
+    api = async_fav_teachers(headers)
+
+    await api.clear()
+    responses = await api.add_many_raw([ID_A] * CONCURRENCY)
+
+    statuses = [r.status_code for r in responses]
+    succeeded = [
+        s
+        for s in statuses
+        if s in (HTTPStatus.OK, HTTPStatus.CREATED, HTTPStatus.NO_CONTENT)
+    ]
+    rejected = [
+        r
+        for r in responses
+        if r.status_code == HTTPStatus.UNPROCESSABLE_ENTITY and "isExists" in r.text
+    ]
+
+    data = await api.list()
+    ids = [t["id"] for t in (data or [])]
+
+    await api.clear()
+
+    assert (
+        async_transport.peak_in_flight >= CONCURRENCY
+    ), f"Only {async_transport.peak_in_flight} of {CONCURRENCY} POSTs ran at once"
+    assert ids.count(ID_A) == 1, f"Expected {ID_A} once, got {ids}"
+    assert (
+        len(succeeded) == 1
+    ), f"Expected exactly one successful POST, got statuses {statuses}"
+    assert len(rejected) == CONCURRENCY - 1, f"Unexpected statuses: {statuses}"
@@ -6,37 +6,38 @@ from utils.fake_data_generators import (
     generate_nickname,
     generate_password,
 )
+from utils.lazy_params import lazy_params, materialize
 
 OK = 200
 SIGNUP = ENDPOINTS["signup"]
 SET_PASSWORD = ENDPOINTS["set_password"]
 FORGOT_PASSWORD = ENDPOINTS["forgot_password"]
 
-params = [
-    {
-        "signup": {"email": generate_email(), "lang": "en"},
-        "set_password": {
-            "newPassword": generate_password(),
-            "nickname": generate_nickname(),
-            "timezone": "",
-        },
-        "forgot_password": {"email": None},
-    },
-    {
-        "signup": {"email": generate_email(), "lang": "ru"},
+
+def forgot_password_case(lang, timezone):
+    """Test data of one forgot password case, generated when the test runs."""
+    return {
+        "signup": {"email": generate_email(), "lang": lang},
         "set_password": {
             "newPassword": generate_password(),
             "nickname": generate_nickname(),
-            "timezone": "UTC",
+            "timezone": timezone,
         },
         "forgot_password": {"email": None},
-    },
-]
+    }
 
-ids = ["valid_en", "valid_ru"]
+
+params = lazy_params(
+    forgot_password_case,
+    [
+        ("en", ""),
+        ("ru", "UTC"),
+    ],
+    ids="valid_{0}",
+)
 
 
-@pytest.fixture(params=params, ids=ids)
+@pytest.fixture(params=params)
 def forgot_password_data(request):
     """
     Fixture that provides parameterized test data for forgot password-related tests.
@@ -48,13 +49,14 @@ def forgot_password_data(request):
         dict: A dictionary containing test data for signup, set password, and forgot password
               endpoints, as defined in the `params` list.
 
-    The fixture uses the `params` list, which contains test cases with the following structure:
+    The fixture uses the `params` list, whose test cases are built by `forgot_password_case`
+    when the test runs, with the following structure:
         - signup (dict): Contains 'email' (generated by `generate_email`) and 'lang' (language code, e.g., 'en' or 'ru').
         - set_password (dict): Contains 'newPassword' (generated by `generate_password`),
                               'nickname' (generated by `generate_nickname`), and 'timezone' (e.g., empty or 'UTC').
         - forgot_password (dict): Contains 'email' (currently set to None).
 
-    The `ids` list provides descriptive identifiers for each test case ('valid_en', 'valid_ru')
+    The test ids ('valid_en', 'valid_ru') name the language of each test case
     for better test reporting.
     """
-    return request.param
+    return materialize(request.param)
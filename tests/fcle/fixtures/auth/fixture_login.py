@@ -11,13 +11,16 @@ import pytest
 
 from parametrs.parameters_login import parameter_generation
 from settings import CONFLICT, ENDPOINTS
+from utils.combinatorics import covering_params
+from utils.lazy_params import materialize
 
 LOGIN = ENDPOINTS["login"]
 OK = 200
 
+
 # -------------------------------------------------------------------
 # List of test parameters for login scenarios.
-# Each parameter is generated via parameter_generation:
+# Each parameter is generated via parameter_generation when the test runs:
 #   - email: valid / invalid / empty / xss / long
 #   - password: valid / invalid / empty / xss
 #   - timezone: valid / invalid / empty / xss
@@ -28,32 +31,51 @@ OK = 200
 #   - incorrect or missing password
 #   - incorrect or missing timezone
 #   - valid requests
+#
+# The hand-picked rows below are kept and completed to a covering array
+# (pairwise by default, see utils/combinatorics.py and --case-strength).
 # -------------------------------------------------------------------
-PARAMS = [
-    parameter_generation("invalid", "valid", "valid", CONFLICT),  # invalid email
-    parameter_generation("empty", "valid", "valid", CONFLICT),  # empty email
-    parameter_generation("xss", "valid", "valid", CONFLICT),  # email with XSS payload
-    parameter_generation("long", "valid", "valid", 410),  # excessively long email
-    parameter_generation("valid", "empty", "valid", CONFLICT),  # empty password
-    parameter_generation("valid", "invalid", "valid", 410),  # invalid password
-    parameter_generation("valid", "xss", "valid", 410),  # password with XSS payload
-    parameter_generation("valid", "valid", "invalid", 410),  # invalid timezone
-    parameter_generation("valid", "valid", "empty", 410),  # empty timezone
-    parameter_generation("valid", "valid", "xss", 410),  # timezone with XSS payload
-]
+def expected_login_status(case):
+    """
+    Expected status of a generated combination, in the order the API validates:
+    malformed email -> 409, missing password -> 409, anything else is an
+    unknown user or a wrong password -> 410 (the timezone is not checked).
+    """
+    if case["email"] in ("invalid", "empty", "xss"):
+        return CONFLICT
+    if case["password"] == "empty":
+        return CONFLICT
+    return 410
 
-# -------------------------------------------------------------------
-# IDs for pytest parameterization.
-# These IDs are human-readable and appear in test reports,
-# e.g.: email=valid,password=empty,timezone=valid,status=400
-# -------------------------------------------------------------------
-IDS = [
-    f"email={email},password={password},timezone={tz},status={status}"
-    for (email, password, tz, status) in PARAMS
-]
+
+PARAMS = covering_params(
+    parameter_generation,
+    {
+        "email": ["valid", "invalid", "empty", "xss", "long"],
+        "password": ["valid", "invalid", "empty", "xss"],
+        "timezone": ["valid", "invalid", "empty", "xss"],
+    },
+    expected_login_status,
+    # IDs name the input types, not the generated values, so they are stable
+    # across runs and parallel workers,
+    # e.g.: email=valid,password=empty,timezone=valid,status=409
+    ids="email={email},password={password},timezone={timezone},status={status}",
+    seeds=[
+        ("invalid", "valid", "valid", CONFLICT),  # invalid email
+        ("empty", "valid", "valid", CONFLICT),  # empty email
+        ("xss", "valid", "valid", CONFLICT),  # email with XSS payload
+        ("long", "valid", "valid", 410),  # excessively long email
+        ("valid", "empty", "valid", CONFLICT),  # empty password
+        ("valid", "invalid", "valid", 410),  # invalid password
+        ("valid", "xss", "valid", 410),  # password with XSS payload
+        ("valid", "valid", "invalid", 410),  # invalid timezone
+        ("valid", "valid", "empty", 410),  # empty timezone
+        ("valid", "valid", "xss", 410),  # timezone with XSS payload
+    ],
+)
 
 
-@pytest.fixture(params=PARAMS, ids=IDS)
+@pytest.fixture(params=PARAMS)
 def login_params(request):
     """
     Pytest fixture for login test parameterization.
@@ -72,4 +94,4 @@ def login_params(request):
         - timezone (str): Timezone value (valid/invalid/empty/xss).
         - expected_status (int): Expected HTTP response status code.
     """
-    return request.param
+    return materialize(request.param)
@@ -4,6 +4,7 @@ from parametrs.parameters_signup import parameter_generation as signup_params
 from parametrs.parametrs_set_password import parameter_generation as set_password_params
 from settings import ENDPOINTS
 from utils.fake_data_generators import generate_password
+from utils.lazy_params import lazy_param, materialize
 
 OK = 200
 SIGNUP = ENDPOINTS["signup"]
@@ -11,8 +12,10 @@ SET_PASSWORD = ENDPOINTS["set_password"]
 RESET_PASSWORD = ENDPOINTS["reset_password"]
 FORGOT_PASS = ENDPOINTS["forgot_password"]
 
-params = [
-    {
+
+def reset_password_case():
+    """Test data of the reset password case, generated when the test runs."""
+    return {
         "signup": signup_params("valid", "valid", OK),
         "set_pass": set_password_params("valid", "valid", "valid", OK, token=True),
         "forgot_pass": {"email": ""},
@@ -21,16 +24,18 @@ params = [
             "newPassword": generate_password(),
             "timezone": "UTC+7",
         },
-    },
-]
+    }
 
-ids = [
-    f"signup={signup},set_pass={set_pass},forgot_pass={forgot_pass},reset_pass={reset_pass}"
-    for signup, set_pass, forgot_pass, reset_pass in params
+
+params = [
+    lazy_param(
+        reset_password_case,
+        id="signup=signup,set_pass=set_pass,forgot_pass=forgot_pass,reset_pass=reset_pass",
+    ),
 ]
 
 
-@pytest.fixture(params=params, ids=ids)
+@pytest.fixture(params=params)
 def reset_password_params(request):
     """
     Fixture that provides parameterized test data for reset password-related tests.
@@ -42,19 +47,19 @@ def reset_password_params(request):
         tuple: A tuple containing the password, nickname, timezone, and expected status code
                for a reset password test case, as generated by `parameter_generation`.
 
-    The fixture uses the `params` list, which contains test cases generated by
-    `parameter_generation` from `parametrs_set_password`. Each test case includes:
+    The fixture uses the `params` list, whose test cases are generated by
+    `reset_password_case` when the test runs. Each test case includes:
         - password (str): The password parameter (e.g., valid, invalid, empty).
         - nickname (str): The nickname parameter (e.g., valid).
         - timezone (str): The timezone parameter (e.g., valid, invalid, empty).
         - status (int): The expected HTTP status code for the test case (e.g., 200, 400).
 
-    The `ids` list provides descriptive identifiers for each test case in the format:
-    'password={password},nickname={nickname},timezone={timezone},status={status}' for better test reporting.
+    The test id keeps the format the suite has always reported for this case:
+    'signup=signup,set_pass=set_pass,forgot_pass=forgot_pass,reset_pass=reset_pass'.
 
     Note:
         The fixture currently includes only one active test case (all valid parameters).
         Additional test cases are commented out but can be enabled to test various invalid
         or empty parameter combinations, each expecting a 400 status code.
     """
-    return request.param
+    return materialize(request.param)
@@ -2,34 +2,34 @@ import pytest
 
 from parametrs.parametrs_set_password import parameter_generation
 from settings import CONFLICT, ENDPOINTS
+from utils.lazy_params import lazy_params, materialize
 
 SIGNUP = ENDPOINTS["signup"]
 SET_PASSWORD = ENDPOINTS["set_password"]
 
-params = [
-    parameter_generation("valid", "valid", "valid", 200),
-    parameter_generation("valid", "valid", "empty", 200),
-    parameter_generation("valid", "empty", "valid", CONFLICT),
-    parameter_generation("invalid", "valid", "valid", CONFLICT),
-    parameter_generation("empty", "valid", "valid", CONFLICT),
-    parameter_generation("valid", "empty", "invalid", CONFLICT),
-    parameter_generation("valid", "empty", "empty", CONFLICT),
-    parameter_generation("invalid", "valid", "invalid", CONFLICT),
-    parameter_generation("invalid", "valid", "empty", CONFLICT),
-    parameter_generation("empty", "valid", "invalid", CONFLICT),
-    parameter_generation("empty", "valid", "empty", CONFLICT),
-    parameter_generation("invalid", "invalid", "valid", CONFLICT),
-    parameter_generation("invalid", "empty", "valid", CONFLICT),
-    parameter_generation("empty", "invalid", "valid", CONFLICT),
-]
-
-ids = [
-    f"password={password},nickname={nickname},timezone={timezone},status={status}"
-    for password, nickname, timezone, status in params
-]
-
-
-@pytest.fixture(params=params, ids=ids)
+params = lazy_params(
+    parameter_generation,
+    [
+        ("valid", "valid", "valid", 200),
+        ("valid", "valid", "empty", 200),
+        ("valid", "empty", "valid", CONFLICT),
+        ("invalid", "valid", "valid", CONFLICT),
+        ("empty", "valid", "valid", CONFLICT),
+        ("valid", "empty", "invalid", CONFLICT),
+        ("valid", "empty", "empty", CONFLICT),
+        ("invalid", "valid", "invalid", CONFLICT),
+        ("invalid", "valid", "empty", CONFLICT),
+        ("empty", "valid", "invalid", CONFLICT),
+        ("empty", "valid", "empty", CONFLICT),
+        ("invalid", "invalid", "valid", CONFLICT),
+        ("invalid", "empty", "valid", CONFLICT),
+        ("empty", "invalid", "valid", CONFLICT),
+    ],
+    ids="password={0},nickname={1},timezone={2},status={3}",
+)
+
+
+@pytest.fixture(params=params)
 def set_password_params(request):
     """
     Fixture that provides parameterized test data for set password-related tests.
@@ -41,14 +41,14 @@ def set_password_params(request):
         tuple: A tuple containing the password, nickname, timezone, and expected status code
                for a set password test case, as generated by `parameter_generation`.
 
-    The fixture uses the `params` list, which contains test cases generated by
-    `parameter_generation` from `parametrs_set_password`. Each test case includes:
+    The fixture uses the `params` list, whose test cases are generated by
+    `parameter_generation` from `parametrs_set_password` when the test runs. Each test case includes:
         - password (str): The password parameter (e.g., valid, invalid, empty).
         - nickname (str): The nickname parameter (e.g., valid, invalid, empty).
         - timezone (str): The timezone parameter (e.g., valid, invalid, empty).
         - status (int): The expected HTTP status code for the test case (e.g., 200, 400).
 
-    The `ids` list provides descriptive identifiers for each test case in the format:
+    The test ids name the requested input types, not the generated values, in the format:
     'password={password},nickname={nickname},timezone={timezone},status={status}' for better test reporting.
     """
-    return request.param
+    return materialize(request.param)
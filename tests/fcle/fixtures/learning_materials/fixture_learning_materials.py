@@ -11,18 +11,15 @@ from settings import ENDPOINTS, OK
 
 from .fixture_learning_materials_fetch_cases import (
     valid_fetch_payload,
-    invalid_fetch_payload,
-    response_keys_fetch
+    invalid_fetch_payload
 )
 from .fixture_learning_materials_recent_cases import (
     valid_recent_payload,
-    invalid_recent_payload,
-    response_keys_recent
+    invalid_recent_payload
 )
 from .fixture_learning_materials_cases import (
     valid_payload,
     invalid_payload,
-    response_keys,
     MaterialTypeData
 )
 
@@ -54,23 +51,17 @@ def payload():
 
 
 @pytest.fixture
-def validate_structure():
+def validate_structure(response_schemas):
     def _validate_structure(
             endpoint="", 
             data={}
             ):
         
-        required = ()
+        # fetch returns full materials, recent its own short form
+        schema = ("learning_materials_recent" if endpoint == "recent"
+                  else "learning_materials")
 
-        if endpoint == "fetch":
-            required = response_keys_fetch
-        elif endpoint == "recent":
-            required = response_keys_recent
-        elif endpoint == "":
-            required = response_keys
-
-        reciev_keys = data.keys()
-        lost_keys = required - reciev_keys
+        lost_keys = response_schemas.missing_keys(schema, data)
 
         return lost_keys
     return _validate_structure
@@ -113,8 +104,56 @@ class LearningMaterialsClient:
         return self.delete_(None, f"{self.base}/picture/{id_}", self.headers)
 
 
+class AsyncLearningMaterialsClient:
+    """Async counterpart of LearningMaterialsClient, methods must be awaited."""
+
+    def __init__(self, auth_headers, get_request, post_request, put_request, delete_request):
+        self.headers = auth_headers
+        self.get_ = get_request
+        self.post_ = post_request
+        self.put_ = put_request
+        self.delete_ = delete_request
+        self.base = ENDPOINTS["learning_materials"]
+
+    async def post_fetch(self, payload: dict):
+        return await self.post_(payload, f"{self.base}/fetch", self.headers)
+
+    async def post_recent(self, payload: dict):
+        return await self.post_(payload, f"{self.base}/recent", self.headers)
+
+    async def post(self, payload: dict):
+        return await self.post_(payload, self.base, self.headers)
+
+    async def get(self, params):
+        return await self.get_(self.base, params, self.headers)
+
+    async def get_by_id(self, id_):
+        return await self.get_(f"{self.base}/{id_}", headers=self.headers)
+
+    async def get_tags(self, params):
+        return await self.get_(f"{self.base}/tags", params, self.headers)
+
+    async def put(self, payload, id_):
+        return await self.put_(payload, f"{self.base}/{id_}", self.headers)
+
+    async def delete(self, id_):
+        return await self.delete_(None, f"{self.base}/{id_}", self.headers)
+
+    async def delete_picture(self, id_):
+        return await self.delete_(None, f"{self.base}/picture/{id_}", self.headers)
+
+
+@pytest.fixture
+def async_learning_materials(
+    auth_headers, async_get_request, async_post_request, async_put_request, async_delete_request
+):
+    return AsyncLearningMaterialsClient(
+        auth_headers[0], async_get_request, async_post_request, async_put_request, async_delete_request
+    )
+
+
 @pytest.fixture
-def add_material_and_get_id(learning_materials):
+def add_material_and_get_id(learning_materials, track_resource):
     def _add_material_and_get_id(
             case: str = "Random payload"
     ):  
@@ -131,10 +170,14 @@ def add_material_and_get_id(learning_materials):
 
         if response.status_code == OK:
             try:
-                return payload_data, response.json()["id"]
+                material_id = response.json()["id"]
             
             except KeyError as e:
                 pytest.fail(f"{e}. Response is missing 'id' key")
+
+            # deleted in the background after the test
+            track_resource("learning_materials", material_id, client.headers)
+            return payload_data, material_id
         
         else:
             pytest.fail(
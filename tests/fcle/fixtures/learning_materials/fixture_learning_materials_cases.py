@@ -1,22 +1,19 @@
 import pytest
 import random
-import base64
-import mimetypes
 from dataclasses import dataclass, field
 from typing import Optional, Dict, Any
 
+from utils.assets import get_asset
 
-def valid_payload(case):
+
+def valid_cases():
     """
-    Returns valid payload data for specified test case.
-    
-    Args:
-        case: Test case identifier string
-        
+    Returns the valid test cases by name (also replayed by load and soak mode).
+
     Returns:
-        Dictionary with valid payload data for material creation
+        Dictionary of case identifier -> payload data
     """
-    cases = {
+    return {
         "Random payload": MaterialTypeCases.random_payload,
         "materialType 1 with jpg": MaterialTypeCases.material_type1_jpg,
         "materialType 1 with png": MaterialTypeCases.material_type1_png,
@@ -24,7 +21,18 @@ def valid_payload(case):
         "materialType 3": MaterialTypeCases.material_type3,
     }
 
-    data = cases[case]
+
+def valid_payload(case):
+    """
+    Returns valid payload data for specified test case.
+    
+    Args:
+        case: Test case identifier string
+        
+    Returns:
+        Dictionary with valid payload data for material creation
+    """
+    data = valid_cases()[case]
 
     # Ensure material type 1 has picture data
     if data["materialType"] == 1 and data["picture"] == "":
@@ -60,16 +68,6 @@ def invalid_payload(case):
     return data
 
 
-# Expected keys in API response
-response_keys = (
-    "id", "userId", "title", "description", "targetLanguageId", 
-    "writtenLanguageId", "categoryId", "tags", "content", "publishDate", 
-    "updateDate", "picture", "parentId", "topParentId", "materialType", 
-    "commentsCount", "isCommentsAllowed", "allowAiComment", "thumbnail", 
-    "user", "childrens"
-)
-
-
 @dataclass
 class MaterialTypeData:
     """
@@ -119,8 +117,8 @@ def image_to_data_url(file_name):
     """
     Converts image file to base64 data URL.
     
-    Searches for file in multiple paths and returns fallback 
-    if file not found.
+    The encoding is computed once per file by the asset cache
+    (utils/assets.py); returns a fallback if the file is not found.
     
     Args:
         file_name: Name of the image file
@@ -128,26 +126,11 @@ def image_to_data_url(file_name):
     Returns:
         Base64 data URL string for the image
     """
-    base_paths = [
-        "tests/tests/fcle/utils/example_files/",
-        "tests/fcle/utils/example_files/"
-    ]
-
-    for base_path in base_paths:
-        try:
-            file_path = f"{base_path}{file_name}"
-            mime_type, _ = mimetypes.guess_type(file_path)
-
-            with open(file_path, "rb") as image_file:
-                base64_data = base64.b64encode(image_file.read()).decode('utf-8')
-                data_url = f"data:{mime_type};base64,{base64_data}"
-                return data_url
-            
-        except FileNotFoundError:
-            continue
-
-    # Return fallback blank image
-    return "data:image/png;base64,iVBORw0KGgoAAAANSUhEU\
+    try:
+        return get_asset(file_name).data_url
+    except FileNotFoundError:
+        # Return fallback blank image
+        return "data:image/png;base64,iVBORw0KGgoAAAANSUhEU\
             AAAAEAAAABCAYAAAAfFcSJAAAADUlEQVR42mNkYPhfD\
             wAChwGA60e6kgAAAABJRU5ErkJggg=="
 
@@ -5,31 +5,6 @@ import random
 Параметры для API /LearningMaterials/fetch
 """
 
-response_keys_fetch = (
-    "id",
-    "userId", 
-    "title",
-    "description",
-    "targetLanguageId",
-    "writtenLanguageId",
-    "categoryId",
-    "tags",
-    "content",
-    "publishDate",
-    "updateDate",
-    "picture",
-    "parentId",
-    "topParentId",
-    "materialType",
-    "commentsCount",
-    "isCommentsAllowed",
-    "allowAiComment",
-    "thumbnail",
-    "user",
-    "childrens"
-)
-
-
 def valid_fetch_payload(case):
     
     cases = {
@@ -4,15 +4,6 @@ import random
 Параметры для API /LearningMaterials/recent
 """
 
-response_keys_recent = (
-        "id",
-        "title",
-        "publishDate",
-        "thumbnail",
-        "url"
-    )
-
-
 def valid_recent_payload(case):
     
     cases = {
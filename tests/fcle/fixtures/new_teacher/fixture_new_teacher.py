@@ -2,13 +2,23 @@ import random
 from http import HTTPStatus
 from typing import Any, Callable, Tuple
 
+import httpx
 import pytest
 import requests
 
 from conftest import auth_headers, get_request, post_request, put_request
 from parametrs.parameters_new_teacher import ParametrsNewTeacher
 from parametrs.parameters_upload_file import ParametrUploadFile
-from settings import CONFLICT, ENDPOINTS
+from settings import (
+    CONFLICT,
+    ENDPOINTS,
+    UPLOAD_BENCH_CONCURRENCY,
+    UPLOAD_BENCH_SIZES,
+    UPLOAD_BENCH_TYPES,
+)
+from utils.combinatorics import covering_params
+from utils.lazy_params import lazy_param, lazy_params, materialize
+from utils.upload_benchmark import format_size
 
 OK = HTTPStatus.OK
 INTERNAL_SERVER_ERROR = HTTPStatus.INTERNAL_SERVER_ERROR
@@ -120,11 +130,15 @@ class NewTeacher:
 
 
 @pytest.fixture
-def new_teacher(auth_headers, post_request, put_request, get_request):
+def new_teacher(request, auth_headers, post_request, put_request, get_request):
     """
     Pytest fixture to create a NewTeacher instance for testing.
 
+    The user behind `auth_headers` becomes a teacher, so it is marked
+    `mutates_user` and is not returned to the user pool.
+
     Args:
+        request (FixtureRequest): Used to mark the test as `mutates_user`.
         auth_headers (Tuple[str, str]): A tuple containing the authentication token and email.
         post_request (Callable): Function to handle POST requests.
         put_request (Callable): Function to handle PUT requests.
@@ -134,6 +148,7 @@ def new_teacher(auth_headers, post_request, put_request, get_request):
         NewTeacher: An instance of the NewTeacher class initialized with the provided token, email,
                    and request functions.
     """
+    request.applymarker(pytest.mark.mutates_user)
 
     def _add_validation(params):
         return NewTeacher(
@@ -145,30 +160,135 @@ def new_teacher(auth_headers, post_request, put_request, get_request):
     return _add_validation
 
 
-# TODO: В будущем добавить больше негативных тестовых данных
+class AsyncNewTeacher(NewTeacher):
+    """
+    Async counterpart of NewTeacher: the request functions are the `async_*_request`
+    fixtures and every method must be awaited.
+    """
 
-teacher_params = [
-    ParametrsNewTeacher.parametr_generation(status=OK),
-    ParametrsNewTeacher.parametr_generation(valid_lang=False, status=CONFLICT),
-    ParametrsNewTeacher.parametr_generation(valid_type=False, status=CONFLICT),
-]
+    async def post_new_teacher(self) -> Tuple[Any, Any]:
+        try:
+            response = await self.post_request(
+                {
+                    "teacherType": self.teacher_type,
+                    "languageId": self.language_id,
+                },
+                self.endpoint,
+                self.token,
+            )
+            return response, self.status
+        except httpx.HTTPError as e:
+            pytest.fail(f"Request failed: {e}")
+
+    async def put_new_teacher(self) -> Tuple[Any, Any]:
+        try:
+            response = await self.put_request(
+                {
+                    "teachingStyle": self.style_area,
+                    "meAsTeacher": self.as_teacher,
+                },
+                self.endpoint,
+                self.token,
+            )
+            return response, self.status
+        except httpx.HTTPError as e:
+            pytest.fail(f"Request failed: {e}")
 
-upload_params = [
-    ParametrUploadFile.parameters_generation("id", OK),  # upload-id-document
-    ParametrUploadFile.parameters_generation(
-        "education", OK
-    ),  # upload-education-document
-    ParametrUploadFile.parameters_generation(
-        "additional", OK
-    ),  # upload-additional-document
+    async def get_new_teacher(self) -> Tuple[Any, Any]:
+        try:
+            response = await self.get_request(self.endpoint, headers=self.token)
+            return response, self.status
+        except httpx.HTTPError as e:
+            pytest.fail(f"Request failed {e}")
+
+
+@pytest.fixture
+def async_new_teacher(
+    request, auth_headers, async_post_request, async_put_request, async_get_request
+):
+    """
+    Async counterpart of the `new_teacher` fixture, returns AsyncNewTeacher instances.
+    """
+    request.applymarker(pytest.mark.mutates_user)
+
+    def _add_validation(params):
+        return AsyncNewTeacher(
+            auth_headers,
+            (async_post_request, async_put_request, async_get_request),
+            params,
+        )
+
+    return _add_validation
+
+
+def _benchmark_case(document, file_type, size, concurrency):
+    upload = ParametrUploadFile.parameters_generation(
+        document,
+        OK,
+        valid_referenceid=document == "education",  # id/additional take none
+        file_type=file_type,
+    )
+    return upload, size, concurrency
+
+
+def _teacher_case(valid_type, valid_lang, status):
+    return ParametrsNewTeacher.parametr_generation(
+        valid_type=valid_type, valid_lang=valid_lang, status=status
+    )
+
+
+# TODO: В будущем добавить больше негативных тестовых данных
+
+teacher_params = covering_params(
+    _teacher_case,
+    {"valid_type": [True, False], "valid_lang": [True, False]},
+    # an invalid teacherType or languageId is rejected
+    lambda case: OK if case["valid_type"] and case["valid_lang"] else CONFLICT,
+    ids="type={valid_type},lang={valid_lang},status={status}",
+    seeds=[
+        (True, True, OK),
+        (True, False, CONFLICT),
+        (False, True, CONFLICT),
+    ],
+)
+
+upload_params = lazy_params(
+    ParametrUploadFile.parameters_generation,
+    [
+        ("id", OK),  # upload-id-document
+        ("education", OK),  # upload-education-document
+        ("additional", OK),  # upload-additional-document
+    ],
+    ids="{0}",
+)
+
+# every upload endpoint x file type x file size x concurrency, see utils/upload_benchmark.py
+benchmark_upload_params = [
+    lazy_param(
+        _benchmark_case,
+        document,
+        file_type,
+        size,
+        concurrency,
+        id=f"{document}-{file_type}-{format_size(size).replace(' ', '')}-c{concurrency}",
+    )
+    for document in ("id", "education", "additional")
+    for file_type in UPLOAD_BENCH_TYPES
+    for size in UPLOAD_BENCH_SIZES
+    for concurrency in UPLOAD_BENCH_CONCURRENCY
 ]
 
 
 @pytest.fixture(params=teacher_params)
 def new_teacher_params(request):
-    return request.param
+    return materialize(request.param)
 
 
 @pytest.fixture(params=upload_params)
 def new_upload_params(request):
-    return request.param
+    return materialize(request.param)
+
+
+@pytest.fixture(params=benchmark_upload_params)
+def new_upload_benchmark_params(request):
+    return materialize(request.param)
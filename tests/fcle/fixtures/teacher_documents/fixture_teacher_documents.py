@@ -84,9 +84,51 @@ class TeacherDocuments:
     # TODO python вызывает фикстуру put_request вместо upload_file_put
 
 
+class AsyncTeacherDocuments:
+    """Async counterpart of TeacherDocuments, methods must be awaited."""
+
+    def __init__(self, headers, get_request, upload_file, delete_request, upload_file_put):
+        self.headers = headers
+        self._get = get_request
+        self._upload = upload_file
+        self._delete = delete_request
+        self._put = upload_file_put
+        self.base = ENDPOINTS["teacher_documents"]
+
+    async def get(self):
+        return await self._get(self.base, headers=self.headers)
+
+    async def get_by_id(self, doc_id: int):
+        return await self._get(f"{self.base}/{doc_id}", headers=self.headers)
+
+    async def upload(self, data: dict, file: dict, endpoint: str):
+        return await self._upload(
+            data=data,
+            files=file,
+            headers=self.headers,
+            endpoint=f"{self.base}/{endpoint}",
+        )
+
+    async def delete(self, doc_id: int):
+        return await self._delete(None, f"{self.base}/{doc_id}", headers=self.headers)
+
+    async def put(self, payload: dict, file: dict, endpoint: str, doc_id: int):
+        return await self._put(
+            endpoint=f"{self.base}/{endpoint}",
+            data=payload,
+            files=file,
+            headers=self.headers,
+            id_=doc_id,
+        )
+
+
 @pytest.fixture
-def create_auth_token(new_teacher):
-    """Фикстура для создания аутентификационного токена."""
+def create_auth_token(new_teacher, track_resource):
+    """
+    Фикстура для создания аутентификационного токена.
+
+    Аккаунт учителя удаляется в фоне после теста (см. track_resource).
+    """
     
     # Генерируем валидные параметры для создания учителя
     param = ParametrsNewTeacher.parametr_generation(status=HTTPStatus.OK)
@@ -98,7 +140,10 @@ def create_auth_token(new_teacher):
     post_response, _ = teacher_instance.post_new_teacher()
     
     # Извлекаем токен из ответа, если статус успешный
-    return teacher_instance.token if post_response.status_code == OK else None
+    if post_response.status_code != OK:
+        return None
+    track_resource("users", teacher_instance.email, teacher_instance.token)
+    return teacher_instance.token
 
 
 @pytest.fixture
@@ -109,9 +154,10 @@ def teacher_documents(create_auth_token, get_request, post_request, delete_reque
 
 
 @pytest.fixture
-def add_document(upload_file):
+def add_document(upload_file, track_resource):
     """
-    Фикстура для добавления валидных данных для TeacherDocuments
+    Фикстура для добавления валидных данных для TeacherDocuments.
+    Созданные документы удаляются в фоне после теста (см. track_resource).
 
     Аргументы:
         document_type: "id", "education", "additional". 
@@ -134,9 +180,32 @@ def add_document(upload_file):
                                     endpoint=f"{base}/{endpoint}"
                                 )
             
-            return response.json(), response.status_code, response.text
+            data = response.json()
+            if response.status_code == OK and isinstance(data, dict):
+                track_resource("teacher_documents", data.get("id"), header)
+
+            return data, response.status_code, response.text
         
         except Exception as e:
             pytest.fail(f"Ошибка: {e}")
     
-    return _add_document
\ No newline at end of file
+    return _add_document
+
+
+@pytest.fixture
+def async_teacher_documents(
+    create_auth_token,
+    async_get_request,
+    async_upload_file,
+    async_delete_request,
+    async_upload_file_put,
+):
+    """Фикстура для создания объекта AsyncTeacherDocuments с готовым токеном."""
+
+    return AsyncTeacherDocuments(
+        create_auth_token,
+        async_get_request,
+        async_upload_file,
+        async_delete_request,
+        async_upload_file_put,
+    )
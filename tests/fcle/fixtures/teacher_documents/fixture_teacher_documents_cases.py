@@ -1,6 +1,8 @@
 import pytest
 import random
 
+from utils.assets import get_asset
+
 
 def _valid_payload(document_type):
     """
@@ -105,41 +107,22 @@ def _endpoint(document_type):
 
 def _read_file(file_name):
     """
-    Read file from filesystem and prepare for upload.
+    Prepare a file for upload from the asset cache.
     
     Args:
-        file_name (str): Name of file to read
+        file_name (str): Name of file in utils/example_files
     
     Returns:
-        dict: File data formatted for multipart upload
+        dict: File data formatted for multipart upload, with a fresh
+              stream over the cached bytes (utils/assets.py)
     
     Raises:
-        pytest.fail: If file cannot be found in any location
+        pytest.fail: If the file does not exist
     """
-    
-    base_paths = [
-        "tests/tests/fcle/utils/example_files/",
-        "tests/fcle/utils/example_files/"
-    ]
-    
-    for base_path in base_paths:
-        try:
-            file_path = f"{base_path}{file_name}"
-            
-            file = {
-                "file": (
-                    file_name,
-                    open(file_path, "rb"),
-                    "application/octet-stream",
-                )
-            }
-
-            return file
-        
-        except FileNotFoundError:
-            continue
-    
-    return pytest.fail("Не удалось открыть файл")
+    try:
+        return {"file": get_asset(file_name).upload()}
+    except FileNotFoundError:
+        return pytest.fail("Не удалось открыть файл")
     
 
 def _invalid_file(case="empty"):
@@ -36,7 +36,7 @@ def _to_headers(hdrs):
 
 
 @pytest.fixture
-def teacher_education_by_id(auth_headers, get_request, post_request):
+def teacher_education_by_id(request, auth_headers, get_request, post_request):
     """
     Для case 'ok_existing' заранее создаём учителя и одну запись образования,
     берём её id и тестируем GET по нему.
@@ -53,6 +53,8 @@ def teacher_education_by_id(auth_headers, get_request, post_request):
 
         if case.label == "ok_existing" and case.requires_auth and case.label != "invalid_token":
             headers = _to_headers(hdrs)
+            # пользователь становится учителем, в пул его не возвращаем
+            request.applymarker(pytest.mark.mutates_user)
 
             # 1) Создаём учителя — минимально валидный payload
             payload_teacher = {
@@ -119,7 +119,7 @@ class TeacherEducationPutByIdClient:
         return self._put(self._case.payload or {}, endpoint, self._headers(with_auth=self._requires_auth))
 
 @pytest.fixture
-def teacher_education_put_by_id(auth_headers, put_request, get_request, post_request):
+def teacher_education_put_by_id(request, auth_headers, put_request, get_request, post_request):
     def _make(case):
         hdrs = {}
         if case.requires_auth:
@@ -127,6 +127,8 @@ def teacher_education_put_by_id(auth_headers, put_request, get_request, post_req
                 hdrs = {"Authorization": "Bearer invalid.token.value"}
             else:
                 hdrs = auth_headers
+                # put() делает пользователя учителем, в пул его не возвращаем
+                request.applymarker(pytest.mark.mutates_user)
 
         return TeacherEducationPutByIdClient(
             put_request=put_request,
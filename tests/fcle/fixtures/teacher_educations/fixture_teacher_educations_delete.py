@@ -22,6 +22,7 @@ def _ensure_teacher(post_request, headers: Dict[str, str]) -> None:
     """
     Гарантируем, что текущий пользователь имеет роль Teacher.
     Если уже есть или бэк вернул конфликт — не считаем ошибкой.
+    Роль меняет пользователя: тест с пулом должен быть помечен `mutates_user`.
     """
     if not headers or "authorization" not in {k.lower() for k in headers.keys()}:
         return
@@ -84,8 +85,12 @@ def _extract_id_from_response_json(data: Any) -> Optional[int]:
 def create_teacher_education(
     post_request,
     headers: Dict[str, str],
+    track_resource=None,
 ) -> Tuple[Optional[int], "requests.Response"]:
-    """Создаёт запись через API и возвращает (id, response). Если не удалось — id=None."""
+    """
+    Создаёт запись через API и возвращает (id, response). Если не удалось — id=None.
+    С фикстурой track_resource запись удаляется в фоне после теста.
+    """
     # гарантируем роль Teacher перед созданием
     _ensure_teacher(post_request, headers=headers)
 
@@ -96,6 +101,8 @@ def create_teacher_education(
         edu_id = _extract_id_from_response_json(resp.json())
     except Exception:
         pass
+    if track_resource is not None:
+        track_resource("teacher_educations", edu_id, headers)
     return edu_id, resp
 
 
@@ -150,7 +157,7 @@ def generate_delete_cases() -> list[DeleteCase]:
 # ---------- фикстура, готовящая client+case+id ----------
 @pytest.fixture
 def client_case_delete_teacher_educations(
-    request, delete_request, post_request, auth_headers
+    request, delete_request, post_request, auth_headers, track_resource
 ):
     """
     Возвращает (client, case, target_id):
@@ -171,13 +178,17 @@ def client_case_delete_teacher_educations(
     headers = make_accept_text_plain(headers)
 
     # если авторизация валидна — заранее обеспечим роль Teacher (чтобы не ловить teachers.id.notTeacher)
+    # пользователь становится учителем, в пул его не возвращаем
     if case.requires_auth and case.header_kind == "valid":
+        request.applymarker(pytest.mark.mutates_user)
         _ensure_teacher(post_request, headers=headers)
 
     # id
     target_id: Any = case.id_value
     if case.create_before:
-        created_id, post_resp = create_teacher_education(post_request, headers=headers)
+        created_id, post_resp = create_teacher_education(
+            post_request, headers=headers, track_resource=track_resource
+        )
         if not created_id:
             pytest.skip(
                 f"[{case.label}] Не удалось создать запись (POST нестабилен). "
@@ -4,6 +4,7 @@ from typing import Any, Dict, List, Optional, Tuple
 
 import pytest
 from settings import ENDPOINTS
+from utils.schemas import get_schema_registry
 
 TEACHER_EDU_ENDPOINT = ENDPOINTS["teacher_educations"]
 TEACHER_EDU_FORMAL_ENDPOINT = f"{TEACHER_EDU_ENDPOINT}/formal"
@@ -91,46 +92,8 @@ def client_case_formal(get_request, auth_headers, request):
 # ---------- Validation ----------
 def validate_formal_item(item: Any, idx: int = 0) -> List[str]:
     """
-    Мягкая валидация структуры formal-образований + вложенных documents[].
+    Мягкая валидация структуры formal-образований + вложенных documents[]
+    по схеме "teacher_educations_formal" (settings/schemas.py).
     """
-    errs: List[str] = []
-    if not isinstance(item, dict):
-        return [f"[{idx}] item must be object/dict, got {type(item)}"]
-
-    # верхний уровень (проверяем типы, если поля присутствуют)
-    for k, t in [
-        ("id", (int, str)),
-        ("teacherId", (int, str)),
-        ("institutionName", str),
-        ("degreeId", (int, str)),
-        ("fieldOfStudy", str),
-        ("startYear", (int, str, type(None))),
-        ("finishYear", (int, str, type(None))),
-        ("createdAt", str),
-        ("updatedAt", str),
-    ]:
-        if k in item and not isinstance(item[k], t):
-            errs.append(f"[{idx}] `{k}` type mismatch: {type(item[k])} vs {t}")
-
-    # documents[]
-    docs = item.get("documents", [])
-    if docs is not None:
-        if not isinstance(docs, list):
-            errs.append(f"[{idx}] `documents` must be list, got {type(docs)}")
-        else:
-            for j, d in enumerate(docs):
-                if not isinstance(d, dict):
-                    errs.append(f"[{idx}].documents[{j}] must be object, got {type(d)}")
-                    continue
-                for k, t in [
-                    ("id", (int, str)),
-                    ("teacherId", (int, str)),
-                    ("documentType", (int, str)),
-                    ("fileName", str),
-                    ("fileUrl", str),
-                    ("title", str),
-                    ("description", str),
-                ]:
-                    if k in d and not isinstance(d[k], t):
-                        errs.append(f"[{idx}].documents[{j}].{k} type mismatch: {type(d[k])} vs {t}")
-    return errs
+    errors = get_schema_registry().errors("teacher_educations_formal", item, limit=None)
+    return [f"[{idx}] {error}" for error in errors]
@@ -1,3 +1,4 @@
+import asyncio
 import pytest
 from http import HTTPStatus
 from settings import ENDPOINTS
@@ -75,3 +76,75 @@ def fav_teachers(get_request, post_request, delete_request):
         return Client(headers)
 
     return _factory
+
+
+@pytest.fixture
+def async_fav_teachers(async_get_request, async_post_request, async_delete_request):
+    """Async-версия fav_teachers: методы нужно await-ить, *_many шлют запросы конкурентно."""
+    base = ENDPOINTS['fav-teachers']  # "FavoriteTeachers"
+
+    class AsyncClient:
+        def __init__(self, headers):
+            self.headers = headers
+
+        # GET /api/FavoriteTeachers
+        async def list(self):
+            r = await async_get_request(base, headers=self.headers)
+            assert r.status_code == HTTPStatus.OK, f"GET {base}: {r.status_code}, {r.text}"
+            return r.json()
+
+        # --- Сырой POST без проверок: для гонок нужен каждый ответ как есть
+        async def post(self, teacher_id: int):
+            return await async_post_request({"teacherId": int(teacher_id)}, base, headers=self.headers)
+
+        # --- Строгий POST: допускает только 200/201/204
+        async def add(self, teacher_id: int):
+            r = await self.post(teacher_id)
+            assert r.status_code in (HTTPStatus.OK, HTTPStatus.CREATED, HTTPStatus.NO_CONTENT), \
+                f"POST {base}: {r.status_code}, {r.text}"
+            return r
+
+        # --- Мягкий POST: игнорирует 422 favoriteTeacher.teacherId.isExists
+        async def add_ignore_exists(self, teacher_id: int):
+            r = await self.post(teacher_id)
+            if r.status_code == HTTPStatus.UNPROCESSABLE_ENTITY and "isExists" in (r.text or ""):
+                return r
+            assert r.status_code in (HTTPStatus.OK, HTTPStatus.CREATED, HTTPStatus.NO_CONTENT), \
+                f"POST {base}: {r.status_code}, {r.text}"
+            return r
+
+        async def add_many(self, ids):
+            return await asyncio.gather(*(self.add(_id) for _id in ids))
+
+        async def add_many_raw(self, ids):
+            return await asyncio.gather(*(self.post(_id) for _id in ids))
+
+        # --- Строгий DELETE: допускает только 200/204
+        async def delete(self, teacher_id: int):
+            endpoint = f"{base}/{int(teacher_id)}"
+            r = await async_delete_request(None, endpoint, headers=self.headers)
+            assert r.status_code in (HTTPStatus.OK, HTTPStatus.NO_CONTENT), \
+                f"DELETE {endpoint}: {r.status_code}, {r.text}"
+            return r
+
+        # --- Мягкий DELETE: игнорирует 422 favoriteTeacher.teacherId.notFound
+        async def delete_ignore_missing(self, teacher_id: int):
+            endpoint = f"{base}/{int(teacher_id)}"
+            r = await async_delete_request(None, endpoint, headers=self.headers)
+            if r.status_code == HTTPStatus.UNPROCESSABLE_ENTITY and "notFound" in (r.text or ""):
+                return r
+            assert r.status_code in (HTTPStatus.OK, HTTPStatus.NO_CONTENT), \
+                f"DELETE {endpoint}: {r.status_code}, {r.text}"
+            return r
+
+        async def delete_many(self, ids):
+            return await asyncio.gather(*(self.delete(_id) for _id in ids))
+
+        async def clear(self):
+            current = await self.list() or []
+            await asyncio.gather(*(self.delete_ignore_missing(t["id"]) for t in current))
+
+    def _factory(headers):
+        return AsyncClient(headers)
+
+    return _factory
@@ -32,8 +32,12 @@ class TeachingExperiences:
 
 
 @pytest.fixture()
-def create_auth_token(new_teacher):
-    """Фикстура для создания аутентификационного токена."""
+def create_auth_token(new_teacher, track_resource):
+    """
+    Фикстура для создания аутентификационного токена.
+
+    Аккаунт учителя удаляется в фоне после теста (см. track_resource).
+    """
     
     def _factory():
         # Генерируем валидные параметры для создания учителя
@@ -46,7 +50,10 @@ def create_auth_token(new_teacher):
         post_response, post_expected_status = teacher_instance.post_new_teacher()
         
         # Извлекаем токен из ответа, если статус успешный
-        return teacher_instance.token if post_response.status_code == HTTPStatus.OK else None
+        if post_response.status_code != HTTPStatus.OK:
+            return None
+        track_resource("users", teacher_instance.email, teacher_instance.token)
+        return teacher_instance.token
     
     return _factory
 
@@ -2,45 +2,29 @@ import random
 
 from datetime import datetime
 from utils.fake_data_generators import generate_text
-from jsonschema import validate, ValidationError
-
-
-validation_schema = {
-    "type": "object",
-    "properties": {
-        "id": {"type": "number"},
-        "teacherId": {"type": "number"},
-        "organization": {"type": "string", "maxLength": 200},
-        "position": {"type": "string", "maxLength": 100},
-        "startYear": {"type": "number", "minimum": 1960},
-        "finishYear": {"type": ["number", "null"]}, 
-        "description": {"type": "string", "maxLength": 255},
-        "createdAt": {"type": "string", "format": "date-time"},
-        "updatedAt": {"type": "string", "format": "date-time"}
-    },
-    "required": ["id", "teacherId", "organization", "position", "startYear", "finishYear", "description", "createdAt", "updatedAt"],
-    "additionalProperties": False
-}
+from utils.schemas import get_schema_registry
 
 
 def _validate_response_jsonschema(server_response):
     """
-    Валидирует ответ сервера по заданной схеме.
+    Валидирует ответ сервера по схеме Teaching_Experiences (settings/schemas.py).
     Возвращает (is_valid, error_message)
     """
-    try:
-        validate(instance=server_response, schema=validation_schema)
-        
-        finish_year = server_response["finishYear"]
-        if finish_year:
-            start_year = server_response["startYear"]
-            if finish_year < start_year:
-                return False, f"Ошибка валидации: {ValidationError.message}"
-        
-        return True, "Валидация успешна."
-        
-    except ValidationError as e:
-        return False, f"Ошибка валидации: {e.message}"
+    errors = get_schema_registry().errors(
+        "Teaching_Experiences", server_response, limit=1
+    )
+    if errors:
+        return False, f"Ошибка валидации: {errors[0]}"
+
+    finish_year = server_response["finishYear"]
+    if finish_year:
+        start_year = server_response["startYear"]
+        if finish_year < start_year:
+            return False, (
+                f"Ошибка валидации: finishYear {finish_year} < startYear {start_year}"
+            )
+
+    return True, "Валидация успешна."
 
 
 def _valid_payload():
@@ -34,3 +34,35 @@ def user_languages(auth_headers, get_request, post_request, delete_request):
         )
         return UserLanguagesClient(h, get_request, post_request, delete_request)
     return _factory
+
+
+class AsyncUserLanguagesClient:
+    """Async-версия UserLanguagesClient, методы нужно await-ить."""
+
+    def __init__(self, headers, get_request, post_request, delete_request):
+        self.headers = headers
+        self.get = get_request
+        self.post = post_request
+        self.delete_ = delete_request
+        self.base = ENDPOINTS["user-languages"]
+
+    async def list(self):
+        r = await self.get(self.base, headers=self.headers)
+        return r.json() if r.is_success else []
+
+    async def get_lang(self, lang_id: int):
+        return await self.get(f"{self.base}/{lang_id}", headers=self.headers)
+
+    async def add(self, payload: dict):
+        return await self.post(payload, self.base, headers=self.headers)
+
+    async def delete(self, lang_id: int):
+        return await self.delete_(None, f"{self.base}/{lang_id}", headers=self.headers)
+
+
+@pytest.fixture
+def async_user_languages(auth_headers, async_get_request, async_post_request, async_delete_request):
+    def _factory(headers=None):
+        h = headers if isinstance(headers, dict) else auth_headers[0]
+        return AsyncUserLanguagesClient(h, async_get_request, async_post_request, async_delete_request)
+    return _factory
@@ -1,10 +1,11 @@
 from http import HTTPStatus
 
 import pytest
-import requests
 
 from settings import CONFLICT, ENDPOINTS
 from utils.fake_data_generators import generate_email, generate_nickname
+from utils.token_store import cached_token
+from utils.transport import get_transport
 
 USERS_TELEGRAM = ENDPOINTS["telegram"]
 
@@ -44,15 +45,33 @@ class TelegramUser:
         return response, self.expected_statuses
 
 
-@pytest.fixture(scope="session")
-def auth_headers_tg():
-    response = requests.post(f"{BASE_URL}/Auth/login", json=TEST_USER)
-    assert response.status_code == 200, f"Auth failed: {response.text}"
+class AsyncTelegramUser(TelegramUser):
+    """
+    Async-версия TelegramUser: post_request — фикстура async_post_request.
+    """
 
-    data = response.json()
-    token = data.get("token") or data.get("accessToken") or data.get("jwtToken")
-    assert token, f"No token found in login response: {data}"
+    async def create(self):
+        response = await self.post_request(
+            self.payload, self.endpoint, headers=self.headers
+        )
+        return response, self.expected_statuses
 
+
+@pytest.fixture(scope="session")
+def auth_headers_tg():
+    def _login():
+        response = get_transport().request(
+            "POST", f"{BASE_URL}/Auth/login", json=TEST_USER
+        )
+        assert response.status_code == 200, f"Auth failed: {response.text}"
+
+        data = response.json()
+        token = data.get("token") or data.get("accessToken") or data.get("jwtToken")
+        assert token, f"No token found in login response: {data}"
+        return token
+
+    # the token outlives the run, see utils/token_store.py
+    token = cached_token(TEST_USER["email"], TEST_USER["password"], _login)
     return {"Authorization": f"Bearer {token}"}
 
 
@@ -90,12 +109,29 @@ def telegram_cases():
 
 
 @pytest.fixture
-def telegram_user(auth_headers, post_request):
+def telegram_user(request, auth_headers, post_request):
     """
     Фабрика для создания TelegramUser
     """
+    # telegram-аккаунт привязывается к пользователю, в пул он не возвращается
+    request.applymarker(pytest.mark.mutates_user)
 
     def _make(payload, expected_statuses):
         return TelegramUser(auth_headers[0], post_request, payload, expected_statuses)
 
     return _make
+
+
+@pytest.fixture
+def async_telegram_user(request, auth_headers, async_post_request):
+    """
+    Фабрика для создания AsyncTelegramUser
+    """
+    request.applymarker(pytest.mark.mutates_user)
+
+    def _make(payload, expected_statuses):
+        return AsyncTelegramUser(
+            auth_headers[0], async_post_request, payload, expected_statuses
+        )
+
+    return _make
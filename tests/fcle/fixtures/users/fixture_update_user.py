@@ -58,7 +58,10 @@ class UpdateUser:
 
 
 @pytest.fixture
-def update_user(auth_headers):
+def update_user(request, auth_headers):
+    # profile fields are rewritten, do not hand this user to other tests
+    request.applymarker(pytest.mark.mutates_user)
+
     def _make(case):
         return UpdateUser(auth_headers, case)
     return _make
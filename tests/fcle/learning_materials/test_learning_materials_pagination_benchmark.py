@@ -0,0 +1,91 @@
+import pytest
+
+from fixtures.learning_materials.fixture_learning_materials import (
+    learning_materials,
+    payload,
+)
+from settings import OK, PAGINATION_BENCH_ITEMS, PAGINATION_BENCH_PAGE_SIZES
+
+
+@pytest.mark.benchmark
+@pytest.mark.fresh_user
+@pytest.mark.learning_materials
+class TestLearningMaterialsPaginationBenchmark:
+    """
+    Pagination throughput of POST api/LearningMaterials/fetch.
+
+    Runs only with `pytest --benchmark`. The crawl covers the materials of a
+    fresh user, the offset probe the whole catalogue (`byUserId` 0), where a
+    deep `pageNumber` costs the most; see utils/pagination_benchmark.py.
+    """
+
+    @pytest.fixture(autouse=True)
+    def setup(self, learning_materials):
+        """
+        AUTOUSED FIXTURE: Sets up test environment before each test method.
+
+        Args:
+            learning_materials: API client fixture for LearningMaterials endpoints
+        """
+        self.client = learning_materials
+
+    def fetch(self, transport, by_user_id):
+        def _fetch(offset, size):
+            return transport.request(
+                "POST",
+                f"{self.client.base}/fetch",
+                json={
+                    "byUserId": by_user_id,
+                    "pageSize": size,
+                    "pageNumber": offset // size + 1,
+                    "languages": [],
+                    "materialType": 0,
+                    "categoryId": 0,
+                    "tags": "",
+                },
+                headers=self.client.headers,
+            )
+
+        return _fetch
+
+    def test_pagination_throughput(
+        self, pagination_benchmark, http_transport, payload, get_profile, track_resource
+    ):
+        """
+        Creates PAGINATION_BENCH_ITEMS materials, crawls them at every page
+        size and probes one page at growing offsets of the catalogue.
+
+        Asserts:
+            Every page is answered with 200 and each crawl returns every
+            created material exactly once.
+        """
+        created = set()
+        for _ in range(PAGINATION_BENCH_ITEMS):
+            response = self.client.post(payload(endpoint="", case="materialType 2"))
+            assert (
+                response.status_code == OK
+            ), f"{response.status_code}: {response.text}"
+            created.add(response.json()["id"])
+            track_resource(
+                "learning_materials", response.json()["id"], self.client.headers
+            )
+
+        fetch = self.fetch(http_transport, get_profile(self.client.headers)["id"])
+        for page_size in PAGINATION_BENCH_PAGE_SIZES:
+            point = pagination_benchmark.crawl(
+                "LearningMaterials/fetch", fetch, page_size
+            )
+            assert (
+                point.complete
+            ), f"Expected 200 for every page, but got {dict(point.statuses)}"
+            assert not point.duplicates and point.ids >= created, (
+                f"page size {page_size}: {point.duplicates} duplicates, "
+                f"{len(created - point.ids)} of {len(created)} created materials missing"
+            )
+
+        probe = pagination_benchmark.probe(
+            "LearningMaterials/fetch", self.fetch(http_transport, 0)
+        )
+        assert set(probe.statuses) == {
+            OK
+        }, f"Expected 200, but got {dict(probe.statuses)}"
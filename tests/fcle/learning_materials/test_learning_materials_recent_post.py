@@ -83,11 +83,11 @@ class TestLearningMaterials:
             assert isinstance(data, list), \
                 f"Response data should be list, got {type(data)}"
 
-            # If list is not empty, validate first item against expected schema
+            # Validate every item of the list against expected schema
             if data != []:
                 lost_keys = validate_structure(
                                             endpoint="recent", 
-                                            data=data[0]
+                                            data=data
                                             )
                 
                 assert len(lost_keys) == 0, \
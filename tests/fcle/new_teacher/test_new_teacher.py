@@ -8,6 +8,7 @@ from fixtures.new_teacher.fixture_new_teacher import (
     new_upload_params,
 )
 from settings import ENDPOINTS
+from utils.assets import get_asset
 
 
 @pytest.mark.new_teacher
@@ -102,13 +103,7 @@ class TestNewTeacher:
             headers = TestNewTeacher.token
             if referenceid is not None:
                 data["referenceid"] = referenceid
-            file = {
-                "file": (
-                    f"{file_name}",
-                    open(f"tests/fcle/utils/example_files/{file_name}", "rb"),
-                    "application/octet-stream",
-                )
-            }
+            file = {"file": get_asset(file_name).upload()}
             response = upload_file(data, file, headers, endpoint)
             assert (
                 response.status_code == status_code
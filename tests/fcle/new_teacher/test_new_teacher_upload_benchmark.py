@@ -0,0 +1,73 @@
+import pytest
+
+from fixtures.new_teacher.fixture_new_teacher import (
+    OK,
+    new_teacher,
+    new_upload_benchmark_params,
+)
+from parametrs.parameters_new_teacher import ParametrsNewTeacher
+
+
+@pytest.mark.benchmark
+@pytest.mark.new_teacher
+class TestNewTeacherUploadBenchmark:
+    """
+    Upload throughput of the newteacher document endpoints.
+
+    Runs only with `pytest --benchmark`. Every case is one point of the sweep
+    endpoint x file type x file size x concurrency; the results (MB/s, latency,
+    rejection thresholds) are printed at the end of the session, see
+    utils/upload_benchmark.py.
+    """
+
+    token = None
+
+    @pytest.fixture(autouse=True)
+    def teacher(self, request):
+        # one teacher for the whole sweep, created by the first case
+        if TestNewTeacherUploadBenchmark.token is None:
+            teacher = request.getfixturevalue("new_teacher")(
+                ParametrsNewTeacher.parametr_generation(status=OK)
+            )
+            response, status = teacher.post_new_teacher()
+            assert (
+                response.status_code == status
+            ), f"Expected status code {status}, but got {response.status_code}: {response.text}"
+            TestNewTeacherUploadBenchmark.token = teacher.token
+
+    @staticmethod
+    def test_upload_throughput(
+        upload_benchmark, http_transport, new_upload_benchmark_params
+    ):
+        """
+        Uploads a synthetic file of the case's type and size from `concurrency` threads.
+
+        Asserts:
+            Every upload got an HTTP answer and was either accepted (2xx) or
+            rejected with a client error (4xx); server errors and dropped
+            connections mean the endpoint does not enforce its limit cleanly.
+        """
+        (title, description, referenceid, file_name, endpoint, _), size, concurrency = (
+            new_upload_benchmark_params
+        )
+        if upload_benchmark.max_size and size > upload_benchmark.max_size:
+            pytest.skip("larger than --benchmark-max-size")
+
+        point = upload_benchmark.run(
+            http_transport,
+            endpoint,
+            {"title": title, "description": description, "referenceid": referenceid},
+            TestNewTeacherUploadBenchmark.token,
+            file_name.rsplit(".", 1)[-1],
+            size,
+            concurrency,
+        )
+
+        unexpected = {
+            status: count
+            for status, count in point.statuses.items()
+            if status == "error" or status >= 500
+        }
+        assert (
+            not unexpected
+        ), f"Expected 2xx/4xx answers, but got {dict(point.statuses)}"
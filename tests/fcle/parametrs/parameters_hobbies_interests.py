@@ -10,6 +10,7 @@ import pytest
 import requests
 
 from settings import CONTENT_URL, ENDPOINTS
+from utils.transport import get_transport
 
 BASE_URL = f"{CONTENT_URL}{ENDPOINTS['general_categories']}"
 CATEGORY_TYPES = {"hobbies": 4, "interests": 5}  # Maps category names to type IDs
@@ -67,7 +68,7 @@ def hobbies_interests_request(category_type: str) -> requests.Response:
     query_params = {"typeId": CATEGORY_TYPES[category_type], "lang": "en"}
 
     try:
-        r = requests.get(url=BASE_URL, params=query_params)
+        r = get_transport().request("GET", BASE_URL, params=query_params)
 
     except requests.exceptions.RequestException as e:
         pytest.fail(f"Request failed: {e}")
@@ -19,6 +19,8 @@ class ParametrUploadFile:
             If False, generates an invalid reference ID (None). Defaults to True.
         valid_file_name (bool, optional): If True, generates a valid file name from ["blank.pdf", "blank.png", "blank.jpg"].
             If False, generates an invalid file name (empty string). Defaults to True.3
+        file_type (str, optional): "pdf", "png" or "jpg" to pick the file name "blank.<file_type>"
+            instead of a random one. Defaults to None.
 
     Returns:
         tuple: A tuple containing:
@@ -47,16 +49,18 @@ class ParametrUploadFile:
         valid_description=True,
         valid_referenceid=True,
         valid_file_name=True,
+        file_type=None,
     ):
 
         title = "valid title" if valid_title else "aaa" * 10
         description = "valid description" if valid_description else "aaa" * 10
         referenceid = 1 if valid_referenceid else None
-        file_name = (
-            random.choice(["blank.pdf", "blank.png", "blank.jpg"])
-            if valid_file_name
-            else ""
-        )
+        if not valid_file_name:
+            file_name = ""
+        elif file_type:
+            file_name = f"blank.{file_type}"
+        else:
+            file_name = random.choice(["blank.pdf", "blank.png", "blank.jpg"])
         upload_endpoints = {
             "id": ENDPOINTS["upload-id-document"],
             "education": ENDPOINTS["upload-education-document"],
@@ -1,2 +1,17 @@
+from .assets import *
+from .benchmark import *
+from .cases import *
+from .cleanup import *
+from .concurrency import *
+from .durations import *
 from .endpoint import *
 from .http_codes import *
+from .latency import *
+from .load import *
+from .schemas import *
+from .soak import *
+from .stub import *
+from .sweeper import *
+from .token_store import *
+from .transport import *
+from .user_pool import *
@@ -0,0 +1,3 @@
+# Example upload files cache, see utils/assets.py
+
+ASSET_MMAP_THRESHOLD = 8 * 1024 * 1024  # bytes, larger files are memory-mapped
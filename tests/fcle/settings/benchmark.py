@@ -0,0 +1,17 @@
+# Upload throughput benchmark (pytest --benchmark), see utils/upload_benchmark.py
+
+# file sizes in bytes: 1 KB, 64 KB, 1 MB, 10 MB, 100 MB
+UPLOAD_BENCH_SIZES = (1024, 64 * 1024, 1024 * 1024, 10 * 1024 * 1024, 100 * 1024 * 1024)
+UPLOAD_BENCH_TYPES = ("pdf", "png", "jpg")
+UPLOAD_BENCH_CONCURRENCY = (1, 4, 16)  # uploads in flight at the same time
+UPLOAD_BENCH_ROUNDS = 2  # uploads per thread and sweep point
+
+# Pagination benchmark (also pytest --benchmark), see utils/pagination_benchmark.py
+PAGINATION_BENCH_PAGE_SIZES = (10, 50, 100)  # a full crawl per page size
+PAGINATION_BENCH_ITEMS = 200  # records a benchmark creates before crawling
+PAGINATION_BENCH_MAX_ITEMS = 10_000  # a crawl stops after this many items
+# skip values probed with PAGINATION_BENCH_PROBE_SIZE items per page, multiples of it
+PAGINATION_BENCH_OFFSETS = (0, 100, 1_000, 10_000, 100_000)
+PAGINATION_BENCH_PROBE_SIZE = 20
+PAGINATION_BENCH_PROBE_ROUNDS = 5  # requests per probed offset
+PAGINATION_BENCH_SLOWDOWN = 2.0  # deepest/first offset p50 ratio that is flagged
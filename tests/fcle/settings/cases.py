@@ -0,0 +1,3 @@
+# Combinatorial parameter matrices, see utils/combinatorics.py
+
+CASE_STRENGTH = 2  # cover every pair of input types, 0 keeps only the hand-picked rows
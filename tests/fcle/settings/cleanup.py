@@ -0,0 +1,4 @@
+# Background teardown of created server resources, see utils/resource_tracker.py
+
+CLEANUP_WORKERS = 4  # parallel DELETE requests, 0 keeps every created resource
+CLEANUP_TIMEOUT = 120  # seconds the session end waits for pending deletions
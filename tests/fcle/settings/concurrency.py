@@ -0,0 +1,10 @@
+# Adaptive request concurrency of the shared transports, see utils/concurrency.py
+
+CONCURRENCY_INITIAL = 4  # requests in flight per endpoint group before any feedback
+CONCURRENCY_MIN = 1
+CONCURRENCY_MAX = 64  # per endpoint group, 0 disables the limiter (--max-concurrency)
+CONCURRENCY_BACKOFF = 0.5  # the limit is multiplied by this on overload
+# overload: latency of an endpoint above FACTOR x its fastest and SLACK seconds more
+CONCURRENCY_LATENCY_FACTOR = 3.0
+CONCURRENCY_LATENCY_SLACK = 0.25
+RETRY_AFTER_MAX = 60  # seconds, longer Retry-After values are capped
@@ -0,0 +1,4 @@
+# Per-test duration history used to schedule --workers runs, see utils/durations.py
+
+DURATION_HISTORY = "fcle-durations.json"  # relative to the directory with pytest.ini
+DURATION_SMOOTHING = 0.3  # weight of the latest run in the moving average of a test
@@ -0,0 +1,5 @@
+# Latency regression gate (--latency-baseline), see utils/latency_gate.py
+
+LATENCY_TOLERANCE = 0.2  # allowed relative p95 growth over the baseline
+LATENCY_ALPHA = 0.01  # significance level of the p95 exceedance test
+LATENCY_MIN_SAMPLES = 20  # endpoints with fewer requests in the run are not judged
@@ -0,0 +1,12 @@
+# Load-test mode (pytest --load-duration N), see utils/load_profile.py
+
+LOAD_RPS = 10  # target requests per second after the ramp
+LOAD_RAMP = 10  # seconds of linear ramp-up from 0 to LOAD_RPS
+LOAD_DURATION = 0  # seconds, 0 disables load mode and runs the tests as usual
+LOAD_WORKERS = 32  # threads sending requests, upper bound of in-flight requests
+# scenario name -> relative weight in the traffic mix
+LOAD_MIX = {
+    "login": 3,
+    "teacher_educations": 5,
+    "learning_materials": 2,
+}
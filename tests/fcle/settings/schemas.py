@@ -0,0 +1,155 @@
+# Response schemas per endpoint, compiled once per session by utils/schemas.py
+
+_LEARNING_MATERIAL_KEYS = [
+    "id",
+    "userId",
+    "title",
+    "description",
+    "targetLanguageId",
+    "writtenLanguageId",
+    "categoryId",
+    "tags",
+    "content",
+    "publishDate",
+    "updateDate",
+    "picture",
+    "parentId",
+    "topParentId",
+    "materialType",
+    "commentsCount",
+    "isCommentsAllowed",
+    "allowAiComment",
+    "thumbnail",
+    "user",
+    "childrens",
+]
+
+_LEARNING_MATERIAL = {"type": "object", "required": _LEARNING_MATERIAL_KEYS}
+
+_RECENT_LEARNING_MATERIAL = {
+    "type": "object",
+    "required": ["id", "title", "publishDate", "thumbnail", "url"],
+}
+
+_EDUCATION_DOCUMENT = {
+    "type": "object",
+    "required": [
+        "id",
+        "teacherId",
+        "documentType",
+        "fileName",
+        "fileUrl",
+        "title",
+        "description",
+    ],
+}
+
+# documents=null is a known backend bug, the tests xfail on it themselves
+_TEACHER_EDUCATION = {
+    "type": "object",
+    "properties": {
+        "id": {"type": "integer"},
+        "teacherId": {"type": "integer"},
+        "institutionName": {"type": ["string", "null"]},
+        "degreeId": {"type": ["integer", "null"]},
+        "fieldOfStudy": {"type": ["string", "null"]},
+        "startYear": {"type": ["integer", "null"]},
+        "finishYear": {"type": ["integer", "null"]},
+        "createdAt": {"type": "string"},
+        "updatedAt": {"type": "string"},
+        "documents": {"type": ["array", "null"], "items": _EDUCATION_DOCUMENT},
+    },
+    "required": [
+        "id",
+        "teacherId",
+        "institutionName",
+        "degreeId",
+        "fieldOfStudy",
+        "startYear",
+        "finishYear",
+        "createdAt",
+        "updatedAt",
+        "documents",
+    ],
+}
+
+_ID = {"type": ["integer", "string"]}
+
+# soft check of /TeacherEducations/formal: types of the fields that are present
+_FORMAL_EDUCATION = {
+    "type": "object",
+    "properties": {
+        "id": _ID,
+        "teacherId": _ID,
+        "institutionName": {"type": "string"},
+        "degreeId": _ID,
+        "fieldOfStudy": {"type": "string"},
+        "startYear": {"type": ["integer", "string", "null"]},
+        "finishYear": {"type": ["integer", "string", "null"]},
+        "createdAt": {"type": "string"},
+        "updatedAt": {"type": "string"},
+        "documents": {
+            "type": ["array", "null"],
+            "items": {
+                "type": "object",
+                "properties": {
+                    "id": _ID,
+                    "teacherId": _ID,
+                    "documentType": _ID,
+                    "fileName": {"type": "string"},
+                    "fileUrl": {"type": "string"},
+                    "title": {"type": "string"},
+                    "description": {"type": "string"},
+                },
+            },
+        },
+    },
+}
+
+_TEACHING_EXPERIENCE = {
+    "type": "object",
+    "properties": {
+        "id": {"type": "number"},
+        "teacherId": {"type": "number"},
+        "organization": {"type": "string", "maxLength": 200},
+        "position": {"type": "string", "maxLength": 100},
+        "startYear": {"type": "number", "minimum": 1960},
+        "finishYear": {"type": ["number", "null"]},
+        "description": {"type": "string", "maxLength": 255},
+        "createdAt": {"type": "string", "format": "date-time"},
+        "updatedAt": {"type": "string", "format": "date-time"},
+    },
+    "required": [
+        "id",
+        "teacherId",
+        "organization",
+        "position",
+        "startYear",
+        "finishYear",
+        "description",
+        "createdAt",
+        "updatedAt",
+    ],
+    "additionalProperties": False,
+}
+
+_FAVORITE_TEACHER = {
+    "type": "object",
+    "properties": {
+        "language": {
+            "type": "object",
+            "required": ["id", "languageName", "languageOwnName"],
+        },
+    },
+    "required": ["id", "nickname", "language"],
+}
+
+# endpoint -> JSON schema of one response object; "<endpoint>[]" is a list of them
+RESPONSE_SCHEMAS = {
+    "fav-teachers": _FAVORITE_TEACHER,
+    "learning_materials": _LEARNING_MATERIAL,
+    "learning_materials_recent": _RECENT_LEARNING_MATERIAL,
+    "teacher_educations": _TEACHER_EDUCATION,
+    "teacher_educations_formal": _FORMAL_EDUCATION,
+    "Teaching_Experiences": _TEACHING_EXPERIENCE,
+}
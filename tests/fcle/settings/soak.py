@@ -0,0 +1,14 @@
+# Soak mode (pytest --soak-duration N), see utils/soak.py
+
+SOAK_DURATION = 0  # seconds, 0 disables soak mode and runs the tests as usual
+SOAK_USERS = 4  # journeys running at once, each in its own thread
+SOAK_PAUSE = 1.0  # seconds a user waits between two journeys
+SOAK_WINDOW = 60  # seconds aggregated into one line of the soak report
+SOAK_REPORT = "fcle-soak.jsonl"  # relative to the directory with pytest.ini
+SOAK_FAVORITE_TEACHERS = (1000155, 1000144)  # teachers a journey adds to favorites
+# a step is flagged when its p50 or p95 grows by more than this share over the run
+SOAK_TREND_TOLERANCE = 0.25
+SOAK_TREND_SLACK = 20  # ms the rise must exceed too, fast steps jitter by more than 25%
+SOAK_TREND_MIN_REQUESTS = 10  # requests of a step a window needs to join its trend
+SOAK_TREND_MIN_WINDOWS = 5  # windows needed before trends are judged
+SOAK_TREND_WINDOWS = 720  # windows kept for the trend, older ones are dropped
@@ -0,0 +1,8 @@
+# In-process stand-in API (pytest --local-api), see utils/stub_server.py
+
+STUB_HOST = "127.0.0.1"
+STUB_PORT = 0  # 0 picks a free port
+STUB_DELAY = 0.0  # seconds of fixed service time added to every response
+STUB_CAPACITY = 0  # requests served at once, more are throttled with 429; 0 serves all
+STUB_RETRY_AFTER = 1  # seconds, Retry-After of a throttled request
+STUB_TOKEN_TTL = 3600  # seconds an access token issued by the stub stays valid
@@ -0,0 +1,5 @@
+# Ledger of registered test accounts and the LABEL sweeper, see utils/sweeper.py
+
+ACCOUNT_LEDGER = "fcle-accounts.jsonl"  # relative to the directory with pytest.ini
+SWEEP_WORKERS = 8  # accounts swept in parallel
+SWEEP_RPS = 20  # request rate limit of the whole sweep
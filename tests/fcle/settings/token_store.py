@@ -0,0 +1,5 @@
+# Tokens of pooled and fixed accounts kept across runs, see utils/token_store.py
+
+TOKEN_STORE = "fcle-tokens.json"  # relative to the directory with pytest.ini
+TOKEN_REFRESH_MARGIN = 300  # seconds before `exp` a token is renewed
+TOKEN_REFRESH_INTERVAL = 30  # seconds between the pool's background expiry checks
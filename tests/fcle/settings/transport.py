@@ -0,0 +1,13 @@
+# Shared HTTP transport tuning, can be overridden from the command line
+# (see pytest_addoption in conftest.py)
+
+POOL_CONNECTIONS = 4  # number of per-host pools kept alive (API + content server)
+POOL_MAXSIZE = 16  # keep-alive connections per host
+MAX_RETRIES = 2
+# protocol of the async transport: "1.1", "2" (HTTP/2 where the server offers it
+# over TLS, so only with an https:// BASE_URL; needs `pip install httpx[http2]`)
+# or "compare" (every async test runs under both)
+HTTP_VERSION = "1.1"
+BACKOFF_FACTOR = 0.3  # sleep = factor * 2 ** (retry - 1)
+RETRY_STATUSES = (502, 503, 504)
+UPLOAD_CHUNK_SIZE = 256 * 1024  # bytes per chunk of streamed multipart bodies
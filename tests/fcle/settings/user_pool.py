@@ -0,0 +1,6 @@
+# Pre-registered user pool, see utils/user_pool.py
+
+USER_POOL_SIZE = 4  # users registered up front per session, 0 disables the pool
+USER_POOL_WORKERS = 4  # parallel signup flows while filling the pool
+USER_TIMEZONE = "UTC+4"
+IDENTITY_BATCH_SIZE = 256  # identities generated per batch, see utils/identities.py
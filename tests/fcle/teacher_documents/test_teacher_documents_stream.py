@@ -0,0 +1,91 @@
+from http import HTTPStatus
+
+import pytest
+
+from fixtures.new_teacher.fixture_new_teacher import new_teacher
+from fixtures.teacher_documents.fixture_teacher_documents import (
+    CREATED,
+    OK,
+    UNAUTHORIZED,
+    create_auth_token,
+    teacher_documents,
+)
+from fixtures.teacher_documents.fixture_teacher_documents_cases import _data, _endpoint
+from utils.assets import get_asset
+from utils.multipart import MB, synthetic_file
+
+TOO_LARGE = HTTPStatus.REQUEST_ENTITY_TOO_LARGE
+
+
+@pytest.mark.parametrize("document_type", ("id", "education", "additional"))
+@pytest.mark.teacher_documents
+class TestTeacherDocumentsStream:
+    """
+    Test suite for streamed multipart uploads to api/TeacherDocuments.
+
+    Uses the `upload_stream` fixture, which sends the multipart body while
+    it is generated instead of building it in memory.
+    """
+
+    @pytest.fixture(autouse=True)
+    def setup(self, teacher_documents):
+        self.client = teacher_documents
+
+    def test_streamed_upload_like_buffered(self, upload_stream, document_type):
+        """
+        TEST: Streamed upload of an example file is accepted like `upload_file`.
+
+        Steps:
+        1. Stream blank.pdf with valid data for the document type
+        2. Assert 200/201 and that the response describes the uploaded file
+        """
+        asset = get_asset("blank.pdf")
+
+        response = upload_stream(
+            endpoint=f"{self.client.base}/{_endpoint(document_type)}",
+            data=_data(document_type),
+            files={"file": asset.upload()},
+            headers=self.client.headers,
+        )
+
+        assert response.status_code in (CREATED, OK), (
+            f"Expected 200/201, got {response.status_code}",
+            f"{response.text}",
+        )
+        assert response.json()["fileName"] == asset.name
+
+    def test_streamed_upload_unauthorized(self, upload_stream, document_type):
+        """
+        TEST: Streamed upload without a token is rejected with 401.
+        """
+        response = upload_stream(
+            endpoint=f"{self.client.base}/{_endpoint(document_type)}",
+            data=_data(document_type),
+            files={"file": get_asset("blank.png").upload()},
+            headers=None,
+        )
+
+        assert response.status_code == UNAUTHORIZED, (
+            f"Expected 401, got {response.status_code}",
+            f"{response.text}",
+        )
+
+    def test_streamed_large_upload(self, upload_stream, document_type):
+        """
+        TEST: Upload size limit.
+
+        A synthetic 8 MB PDF is generated while it is sent. The API either
+        stores it or rejects it as too large; any other answer (5xx, a
+        dropped connection) means the limit is not enforced cleanly.
+        """
+        response = upload_stream(
+            endpoint=f"{self.client.base}/{_endpoint(document_type)}",
+            data=_data(document_type),
+            files={"file": ("large.pdf", synthetic_file(8 * MB, "pdf"))},
+            headers=self.client.headers,
+        )
+
+        assert response.status_code in (CREATED, OK, TOO_LARGE), (
+            f"Expected 200/201/413, got {response.status_code}",
+            f"{response.text[:500]}",
+        )
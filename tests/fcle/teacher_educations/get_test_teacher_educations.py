@@ -8,7 +8,7 @@ from parametrs.parameters_teacher_educations import generate_cases
 
 @pytest.mark.teacher_educations
 @pytest.mark.parametrize("case", generate_cases("GET"), ids=lambda c: c.label)
-def test_teacher_educations(teacher_educations, case):
+def test_teacher_educations(teacher_educations, response_schemas, case):
     """
         Интеграционный тест для  GET_TeacherEducations.
 
@@ -52,25 +52,12 @@ def test_teacher_educations(teacher_educations, case):
 
         assert isinstance(data, list), f"Ожидался список, получили {type(data)}"
 
+        # Ключи и типы каждого элемента и его documents (settings/schemas.py)
+        errors = response_schemas.errors("teacher_educations[]", data)
+        assert not errors, "Ошибки схемы:\n" + "\n".join(errors)
+
         if data:
             edu = data[0]
-            expected_keys = {
-                "id", "teacherId", "institutionName", "degreeId", "fieldOfStudy",
-                "startYear", "finishYear", "createdAt", "updatedAt", "documents",
-            }
-            missing = expected_keys - set(edu.keys())
-            assert not missing, f"Нет ключей в элементе: {missing}"
-
-            # Базовые типы
-            assert isinstance(edu["id"], int)
-            assert isinstance(edu["teacherId"], int)
-            assert isinstance(edu["institutionName"], (str, type(None)))
-            assert isinstance(edu["degreeId"], (int, type(None)))
-            assert isinstance(edu["fieldOfStudy"], (str, type(None)))
-            assert isinstance(edu["startYear"], (int, type(None)))
-            assert isinstance(edu["finishYear"], (int, type(None)))
-            assert isinstance(edu["createdAt"], str)
-            assert isinstance(edu["updatedAt"], str)
             assert isinstance(edu["documents"], list)
 
             # Бизнес-правила (валидация)
@@ -80,13 +67,3 @@ def test_teacher_educations(teacher_educations, case):
             if edu["finishYear"] and edu["startYear"]:
                 assert edu["finishYear"] >= edu["startYear"], \
                     f"finishYear < startYear: {edu['finishYear']} < {edu['startYear']}"
-
-            # Документы
-            docs = edu.get("documents") or []
-            if docs:
-                d0 = docs[0]
-                expected_doc_keys = {
-                    "id", "teacherId", "documentType", "fileName", "fileUrl", "title", "description"
-                }
-                miss_doc = expected_doc_keys - set(d0.keys())
-                assert not miss_doc, f"Нет ключей в document: {miss_doc}"
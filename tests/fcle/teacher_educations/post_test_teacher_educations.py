@@ -7,7 +7,7 @@ from parametrs.parameters_teacher_educations import generate_cases
 
 
 @pytest.mark.teacher_educations_post
-def test_post_teacher_educations(teacher_educations_post):
+def test_post_teacher_educations(teacher_educations_post, response_schemas):
     """
     Интеграционный тест эндпоинта POST /TeacherEducations.
 
@@ -40,12 +40,8 @@ def test_post_teacher_educations(teacher_educations_post):
         except json.JSONDecodeError as e:
             pytest.fail(f"Ответ не JSON: {e}. Raw: {r.text[:300]}")
 
-        expected_keys = {
-            "id", "teacherId", "institutionName", "degreeId", "fieldOfStudy",
-            "startYear", "finishYear", "createdAt", "updatedAt", "documents",
-        }
-        missing = expected_keys - set(data.keys())
-        assert not missing, f"Нет ключей в ответе: {missing}"
+        errors = response_schemas.errors("teacher_educations", data)
+        assert not errors, "Ошибки схемы:\n" + "\n".join(errors)
 
         # Бизнес-правила
         if data["startYear"]:
@@ -7,7 +7,7 @@ from parametrs.parameters_teacher_educations_by_id import generate_cases_by_id
 
 @pytest.mark.teacher_educations
 @pytest.mark.parametrize("case", generate_cases_by_id(), ids=lambda c: c.label)
-def test_teacher_education_get_by_id(teacher_education_by_id, case):
+def test_teacher_education_get_by_id(teacher_education_by_id, response_schemas, case):
     """
     Интеграционный тест для GET /TeacherEducations/{id}.
     Проверяем авторизацию, существующие/несуществующие id и валидации.
@@ -26,24 +26,9 @@ def test_teacher_education_get_by_id(teacher_education_by_id, case):
         except json.JSONDecodeError as e:
             pytest.fail(f"{case.label}: Ответ не JSON: {e}. Raw: {r.text[:300]}")
 
-        # Базовая структура
-        expected_keys = {
-            "id", "teacherId", "institutionName", "degreeId", "fieldOfStudy",
-            "startYear", "finishYear", "createdAt", "updatedAt", "documents",
-        }
-        missing = expected_keys - set(data.keys())
-        assert not missing, f"{case.label}: нет ключей {missing}"
-
-        # Типы
-        assert isinstance(data["id"], int)
-        assert isinstance(data["teacherId"], int)
-        assert isinstance(data["institutionName"], (str, type(None)))
-        assert isinstance(data["degreeId"], (int, type(None)))
-        assert isinstance(data["fieldOfStudy"], (str, type(None)))
-        assert isinstance(data["startYear"], (int, type(None)))
-        assert isinstance(data["finishYear"], (int, type(None)))
-        assert isinstance(data["createdAt"], str)
-        assert isinstance(data["updatedAt"], str)
+        # Ключи и типы, включая documents (settings/schemas.py)
+        errors = response_schemas.errors("teacher_educations", data)
+        assert not errors, f"{case.label}: ошибки схемы {errors}"
 
         # 🔻 Временный xfail из-за бага бэка:
         # Бэк возвращает documents = null вместо пустого массива [].
@@ -61,12 +46,3 @@ def test_teacher_education_get_by_id(teacher_education_by_id, case):
         if data["startYear"] is not None and data["finishYear"] is not None:
             assert data["finishYear"] >= data["startYear"], \
                 f"{case.label}: finishYear < startYear"
-
-        # Документы (если есть)
-        if docs:
-            doc0 = docs[0]
-            expected_doc_keys = {
-                "id", "teacherId", "documentType", "fileName", "fileUrl", "title", "description"
-            }
-            miss_doc = expected_doc_keys - set(doc0.keys())
-            assert not miss_doc, f"{case.label}: нет ключей в document: {miss_doc}"
@@ -35,7 +35,8 @@ def test_delete_cases(client_case_delete_teacher_educations):
 
 
 @pytest.mark.teacher_educations
-def test_double_delete_returns_false_or_404_or_422(auth_headers, post_request, delete_request):
+@pytest.mark.mutates_user
+def test_double_delete_returns_false_or_404_or_422(auth_headers, post_request, delete_request, track_resource):
     """
     1-й DELETE: 200 ('true'/'false').
     2-й DELETE: 200('false') ИЛИ 404/410/422 (в зависимости от реализации).
@@ -43,7 +44,7 @@ def test_double_delete_returns_false_or_404_or_422(auth_headers, post_request, d
     headers, _ = auth_headers
     headers = make_accept_text_plain(headers)
 
-    edu_id, post_resp = create_teacher_education(post_request, headers=headers)
+    edu_id, post_resp = create_teacher_education(post_request, headers=headers, track_resource=track_resource)
     if not edu_id:
         pytest.xfail(
             f"BUG/ENV: POST нестабилен, запись не создана. "
@@ -70,7 +71,8 @@ def test_delete_without_accept_header(auth_headers, delete_request):
 
 
 @pytest.mark.teacher_educations
-def test_delete_with_json_accept(auth_headers, post_request, delete_request):
+@pytest.mark.mutates_user
+def test_delete_with_json_accept(auth_headers, post_request, delete_request, track_resource):
     """
     Accept: application/json — либо 406, либо обычные 200/404/410/422.
     При 200 тело всё равно 'true'/'false' (иногда JSON).
@@ -78,7 +80,7 @@ def test_delete_with_json_accept(auth_headers, post_request, delete_request):
     headers, _ = auth_headers
     headers = {**headers, "Accept": "application/json"}
 
-    edu_id, post_resp = create_teacher_education(post_request, headers=headers)
+    edu_id, post_resp = create_teacher_education(post_request, headers=headers, track_resource=track_resource)
     if not edu_id:
         pytest.xfail(f"BUG/ENV: POST не создал запись: {getattr(post_resp,'status_code','?')} {getattr(post_resp,'text','?')!r}")
 
@@ -99,7 +101,8 @@ def test_delete_without_id_returns_404_or_405(auth_headers, delete_request):
 
 
 @pytest.mark.teacher_educations
-def test_delete_removes_from_list_when_ok(auth_headers, post_request, delete_request, get_request):
+@pytest.mark.mutates_user
+def test_delete_removes_from_list_when_ok(auth_headers, post_request, delete_request, get_request, track_resource):
     """
     После успешного 200 удаление — подтверждаем исчезновение:
       1) Пытаемся GET по id -> ждём 404/410/422.
@@ -111,7 +114,7 @@ def test_delete_removes_from_list_when_ok(auth_headers, post_request, delete_req
     headers_json = {**headers, "Accept": "application/json"}     # для GET (JSON)
 
     # Создали
-    edu_id, post_resp = create_teacher_education(post_request, headers=headers_del)
+    edu_id, post_resp = create_teacher_education(post_request, headers=headers_del, track_resource=track_resource)
     if not edu_id:
         pytest.xfail(f"BUG/ENV: POST не создал запись: {getattr(post_resp,'status_code','?')} {getattr(post_resp,'text','?')!r}")
 
@@ -121,7 +124,7 @@ def test_delete_removes_from_list_when_ok(auth_headers, post_request, delete_req
         pytest.xfail(f"BUG/ENV: DELETE вернул не 200 ({r_del.status_code}), тело: {r_del.text!r}")
 
     # 1) Проверка по id
-    r_by_id = get_request({}, f"{TEACHER_EDU_ENDPOINT}/{edu_id}", headers=headers_json)
+    r_by_id = get_request(f"{TEACHER_EDU_ENDPOINT}/{edu_id}", headers=headers_json)
     if r_by_id.status_code in (404, 410, 422):
         pass  # ок, подтверждено
     elif r_by_id.status_code == 405:
@@ -130,7 +133,7 @@ def test_delete_removes_from_list_when_ok(auth_headers, post_request, delete_req
         assert False, f"После удаления GET по id должен вернуть 404/410/422, получили {r_by_id.status_code}: {r_by_id.text!r}"
 
     # 2) Доп.проверка списка
-    r_list = get_request({}, TEACHER_EDU_ENDPOINT, headers=headers_json)
+    r_list = get_request(TEACHER_EDU_ENDPOINT, headers=headers_json)
     if r_list.status_code in (404, 405):
         pytest.xfail(f"BUG: GET /TeacherEducations недоступен (status={r_list.status_code}) — метод выключен/не сконфигурирован.")
     assert r_list.status_code in (200, 204), f"GET список упал: {r_list.status_code} {r_list.text!r}"
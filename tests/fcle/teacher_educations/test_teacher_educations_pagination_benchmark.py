@@ -0,0 +1,64 @@
+import pytest
+
+from fixtures.teacher_educations.fixture_teacher_educations_delete import (
+    build_teacher_education_payload,
+    create_teacher_education,
+)
+from settings import ENDPOINTS, PAGINATION_BENCH_ITEMS, PAGINATION_BENCH_PAGE_SIZES
+
+TEACHER_EDU_ENDPOINT = ENDPOINTS["teacher_educations"]
+
+
+@pytest.mark.benchmark
+@pytest.mark.fresh_user
+@pytest.mark.teacher_educations
+def test_pagination_throughput(
+    pagination_benchmark, auth_headers, post_request, http_transport, track_resource
+):
+    """
+    Crawls a teacher's educations with `skip`/`take` at every page size and
+    probes the latency of one page at growing `skip`, see
+    utils/pagination_benchmark.py. Runs only with `pytest --benchmark`.
+
+    Asserts:
+        Every page is answered with 200 and each crawl returns every created
+        education exactly once: no record is skipped or repeated at a page
+        boundary.
+    """
+    headers, _ = auth_headers
+    # the first one also makes the fresh user a teacher
+    edu_id, response = create_teacher_education(
+        post_request, headers=headers, track_resource=track_resource
+    )
+    assert (
+        edu_id
+    ), f"Expected a created education, but got {response.status_code}: {response.text}"
+    created = {edu_id}
+    for _ in range(PAGINATION_BENCH_ITEMS - 1):
+        response = post_request(
+            build_teacher_education_payload(), TEACHER_EDU_ENDPOINT, headers=headers
+        )
+        assert response.status_code == 200, f"{response.status_code}: {response.text}"
+        created.add(response.json()["id"])
+        track_resource("teacher_educations", response.json()["id"], headers)
+
+    def fetch(offset, size):
+        return http_transport.request(
+            "GET",
+            TEACHER_EDU_ENDPOINT,
+            params={"skip": offset, "take": size},
+            headers=headers,
+        )
+
+    for page_size in PAGINATION_BENCH_PAGE_SIZES:
+        point = pagination_benchmark.crawl(TEACHER_EDU_ENDPOINT, fetch, page_size)
+        assert (
+            point.complete
+        ), f"Expected 200 for every page, but got {dict(point.statuses)}"
+        assert not point.duplicates and point.ids >= created, (
+            f"page size {page_size}: {point.duplicates} duplicates, "
+            f"{len(created - point.ids)} of {len(created)} created educations missing"
+        )
+
+    probe = pagination_benchmark.probe(TEACHER_EDU_ENDPOINT, fetch)
+    assert set(probe.statuses) == {200}, f"Expected 200, but got {dict(probe.statuses)}"
@@ -0,0 +1,64 @@
+import asyncio
+
+import pytest
+
+from fixtures.user_languages.fixture_user_languages import (  # noqa: F401
+    async_user_languages,
+)
+from fixtures.user_languages.fixture_user_languages_cases import _valid_payload
+
+SUCCESS_CODES = {200, 201}
+
+# Количество одновременных POST с одним и тем же languageId
+CONCURRENCY = 30
+
+
+@pytest.mark.userlanguages
+async def test_concurrent_post_same_language_single_record(
+    async_user_languages, async_transport
+):
+    """
+    Конкурентные POST с одним languageId = upsert, запись должна быть одна.
+
+      1) собираем занятые languageId
+      2) одновременно шлём CONCURRENCY одинаковых POST на свободный languageId
+      3) все CONCURRENCY POST были в полёте одновременно
+      4) все ответы успешные, id записи у всех один
+      5) в списке ровно одна запись с этим languageId
+    """
+    client = async_user_languages()
+    before = await client.list() or []
+    used = {x.get("languageId") for x in before if isinstance(x, dict)}
+
+    payload = _valid_payload(
+        used_language_ids=used,
+        is_target=False,
+        level="A1",
+        goal_id=1,
+        subgoal_id=1,
+    )
+
+    responses = await asyncio.gather(
+        *(client.add(dict(payload)) for _ in range(CONCURRENCY))
+    )
+    statuses = [r.status_code for r in responses]
+    record_ids = {r.json()["id"] for r in responses if r.status_code in SUCCESS_CODES}
+
+    after = await client.list() or []
+    same_lang = [
+        x
+        for x in after
+        if isinstance(x, dict) and x.get("languageId") == payload["languageId"]
+    ]
+
+    for rec in same_lang:
+        await client.delete(rec["id"])
+
+    assert (
+        async_transport.peak_in_flight >= CONCURRENCY
+    ), f"Only {async_transport.peak_in_flight} of {CONCURRENCY} POSTs ran at once"
+    assert set(statuses) <= SUCCESS_CODES, f"Unexpected statuses: {statuses}"
+    assert len(record_ids) == 1, f"Concurrent upsert returned several ids: {record_ids}"
+    assert (
+        len(same_lang) == 1
+    ), f"Duplicate records for languageId={payload['languageId']}: {same_lang}"
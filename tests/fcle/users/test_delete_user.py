@@ -9,6 +9,7 @@ DELETED = (404, 422, 410)
 
 
 @pytest.mark.delete_user
+@pytest.mark.fresh_user
 def test_delete_user(auth_headers, delete_request, get_request):
     """
     Test the /api/Users DELETE endpoint
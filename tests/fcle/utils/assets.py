@@ -0,0 +1,177 @@
+"""
+Process-wide cache of the example upload files (utils/example_files/*).
+
+Payload builders used to probe several relative paths, reopen the file and
+base64-encode it again for every case. `get_asset(name)` loads a file once per
+process and keeps its bytes and derived encodings:
+
+    asset = get_asset("blank.png")
+    asset.data_url          # "data:image/png;base64,..." (computed once)
+    asset.upload()          # ("blank.png", <fresh stream>, "application/octet-stream")
+
+Files of ASSET_MMAP_THRESHOLD bytes and more are memory-mapped instead of read,
+so a large synthetic file costs address space, not heap. Streams handed out by
+`Asset.stream()` read from the cached buffer and never touch the disk again.
+
+Paths are resolved relative to this package, so the cache works from any
+working directory.
+"""
+
+import base64
+import io
+import mimetypes
+import mmap
+import threading
+from functools import cached_property
+from pathlib import Path
+
+from settings import ASSET_MMAP_THRESHOLD
+
+ASSET_DIR = Path(__file__).resolve().parent / "example_files"
+
+
+class _BufferStream(io.RawIOBase):
+    """Read-only, seekable stream over a shared buffer (bytes or mmap)."""
+
+    def __init__(self, buffer):
+        self._view = memoryview(buffer)
+        self._position = 0
+
+    def readable(self):
+        return True
+
+    def seekable(self):
+        return True
+
+    def readinto(self, target):
+        chunk = self._view[self._position : self._position + len(target)]
+        target[: len(chunk)] = chunk
+        self._position += len(chunk)
+        return len(chunk)
+
+    def seek(self, offset, whence=io.SEEK_SET):
+        base = {
+            io.SEEK_SET: 0,
+            io.SEEK_CUR: self._position,
+            io.SEEK_END: len(self._view),
+        }
+        self._position = max(base[whence] + offset, 0)
+        return self._position
+
+    def tell(self):
+        return self._position
+
+    def close(self):
+        if not self.closed:
+            self._view.release()
+        super().close()
+
+
+class Asset:
+    """
+    One cached example file.
+
+    Attributes:
+        name (str): File name inside the asset directory.
+        path (Path): Absolute path of the file.
+        mime_type (str): MIME type guessed from the extension.
+        size (int): File size in bytes.
+    """
+
+    def __init__(self, path, mmap_threshold=ASSET_MMAP_THRESHOLD):
+        self.path = Path(path)
+        self.name = self.path.name
+        self.mime_type = (
+            mimetypes.guess_type(self.name)[0] or "application/octet-stream"
+        )
+        with open(self.path, "rb") as f:
+            self.size = size = f.seek(0, io.SEEK_END)
+            if size and size >= mmap_threshold:
+                self.buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            else:
+                f.seek(0)
+                self.buffer = f.read()
+
+    @property
+    def mapped(self) -> bool:
+        return isinstance(self.buffer, mmap.mmap)
+
+    @property
+    def data(self) -> bytes:
+        """The file content (a copy when the file is memory-mapped)."""
+        return self.buffer if isinstance(self.buffer, bytes) else self.buffer[:]
+
+    @cached_property
+    def base64(self) -> str:
+        return base64.b64encode(self.buffer).decode("ascii")
+
+    @cached_property
+    def data_url(self) -> str:
+        return f"data:{self.mime_type};base64,{self.base64}"
+
+    def stream(self):
+        """Returns a fresh binary stream positioned at the start of the file."""
+        if isinstance(self.buffer, bytes):
+            return io.BytesIO(self.buffer)  # shares the bytes, no copy until written
+        return io.BufferedReader(_BufferStream(self.buffer))
+
+    def upload(self, content_type="application/octet-stream") -> tuple:
+        """`(file name, fresh stream, content type)` for a `files=` entry of requests."""
+        return self.name, self.stream(), content_type
+
+
+class AssetCache:
+    """
+    Thread-safe name -> Asset cache.
+
+    Attributes:
+        directory (Path): Directory the asset names are resolved in.
+    """
+
+    def __init__(self, directory=ASSET_DIR, mmap_threshold=ASSET_MMAP_THRESHOLD):
+        self.directory = Path(directory)
+        self.mmap_threshold = mmap_threshold
+        self._assets = {}
+        self._lock = threading.Lock()
+
+    def get(self, name) -> Asset:
+        """
+        Returns the cached asset, loading it on first use.
+
+        Raises:
+            FileNotFoundError: If there is no such file in the asset directory.
+        """
+        asset = self._assets.get(name)
+        if asset is not None:
+            return asset
+        with self._lock:
+            asset = self._assets.get(name)
+            if asset is None:
+                path = self.directory / name
+                if not name or not path.is_file():
+                    raise FileNotFoundError(
+                        f"no example file {name!r} in {self.directory}"
+                    )
+                asset = self._assets[name] = Asset(path, self.mmap_threshold)
+        return asset
+
+    def preload(self):
+        """Loads every file of the asset directory."""
+        for path in sorted(self.directory.iterdir()):
+            if path.is_file():
+                self.get(path.name)
+
+    def __len__(self):
+        return len(self._assets)
+
+
+_cache = AssetCache()
+
+
+def get_asset(name) -> Asset:
+    """Returns an example file from the process-wide cache."""
+    return _cache.get(name)
+
+
+def get_asset_cache() -> AssetCache:
+    return _cache
@@ -0,0 +1,364 @@
+"""
+asyncio counterpart of utils/transport.py.
+
+`AsyncHttpTransport` wraps one `httpx.AsyncClient` so a single test can keep
+hundreds of requests in flight on one event loop, e.g. to reproduce races on
+`FavoriteTeachers` or `UserLanguages` without spawning threads.
+
+Coroutine tests (`async def test_...`) are run by the `pytest_pyfunc_call`
+hook in conftest.py through `run_coroutine_test`, which also closes the
+transport inside the same event loop.
+
+Requests are reported to utils/latency.py like the sync ones; connect and
+time-to-first-byte come from httpcore trace events (DNS is part of connect).
+
+With an `AdaptiveLimiter`, requests wait for a permit of their endpoint group
+without blocking the loop (see utils/concurrency.py). The `async_transport`
+fixture passes none: its race tests fire all their requests at once on
+purpose, and `peak_in_flight` shows they did.
+
+A record cassette gets every exchange through a response event hook; a replay
+cassette replaces the network with `ReplayTransport` (see utils/cassette.py).
+
+With `http2=True` (`--http-version 2`, needs the h2 package) the client offers
+HTTP/2 through TLS ALPN and multiplexes all requests of a transport as streams
+of one connection per host; servers without HTTP/2 and plain http:// URLs stay
+on HTTP/1.1. The `async_transport` fixture builds a transport per test, so
+that is one connection per test and host, not one per worker or session.
+`--http-version compare` runs every async test twice, under HTTP/1.1 and
+HTTP/2 (test ids `[http1.1]` and `[http2]`). Every request is also counted in
+`StreamStats` under the version the server actually answered with:
+connections opened, requests in flight and latency per endpoint, shown in the
+"connection reuse" summary.
+"""
+
+import asyncio
+import threading
+import time
+from http import HTTPStatus, cookiejar
+
+import httpx
+
+from settings import BASE_URL, MAX_RETRIES, POOL_MAXSIZE, TIMEOUT
+from utils.concurrency import retry_after_seconds
+from utils.histogram import LatencyHistogram
+from utils.latency import RequestTiming, endpoint_key, get_recorder
+from utils.transport import resendable
+
+
+class _VersionStats:
+    """Counters of one HTTP version."""
+
+    def __init__(self):
+        self.requests = 0
+        self.connections = 0
+        self.peak_in_flight = 0
+        self.max_stream_id = 0
+        self.latency = LatencyHistogram()
+        self.endpoints = {}  # endpoint key -> LatencyHistogram
+
+
+class StreamStats:
+    """Requests of the async transports per negotiated HTTP version."""
+
+    def __init__(self):
+        self.versions = {}
+        self._lock = threading.Lock()
+
+    def record(self, version, key, seconds, connected, in_flight, stream_id=None):
+        """
+        Counts one answered request.
+
+        Args:
+            version (str): `response.http_version`, e.g. "HTTP/2".
+            key (str): Endpoint key of the request.
+            seconds (float): Latency of the request.
+            connected (bool): The request opened a new connection.
+            in_flight (int): Requests of the same transport in flight, this one included.
+            stream_id (int, optional): HTTP/2 stream id of the request.
+        """
+        micros = int(seconds * 1_000_000)
+        with self._lock:
+            stats = self.versions.setdefault(version, _VersionStats())
+            stats.requests += 1
+            stats.connections += int(connected)
+            stats.peak_in_flight = max(stats.peak_in_flight, in_flight)
+            stats.max_stream_id = max(stats.max_stream_id, stream_id or 0)
+            stats.latency.record(micros)
+            stats.endpoints.setdefault(key, LatencyHistogram()).record(micros)
+
+    def summary(self) -> dict:
+        """{version: {"requests", "connections", "peak_in_flight", "max_stream_id", "p50_ms", "p95_ms"}}"""
+        with self._lock:
+            return {
+                version: {
+                    "requests": stats.requests,
+                    "connections": stats.connections,
+                    "peak_in_flight": stats.peak_in_flight,
+                    "max_stream_id": stats.max_stream_id,
+                    "p50_ms": stats.latency.percentile(50) / 1000,
+                    "p95_ms": stats.latency.percentile(95) / 1000,
+                }
+                for version, stats in sorted(self.versions.items())
+            }
+
+    def compare(self) -> dict:
+        """{endpoint key: {version: (requests, p50 ms, p95 ms)}} of keys every version saw."""
+        with self._lock:
+            if len(self.versions) < 2:
+                return {}
+            keys = set.intersection(
+                *(set(stats.endpoints) for stats in self.versions.values())
+            )
+            return {
+                key: {
+                    version: (
+                        stats.endpoints[key].count,
+                        stats.endpoints[key].percentile(50) / 1000,
+                        stats.endpoints[key].percentile(95) / 1000,
+                    )
+                    for version, stats in sorted(self.versions.items())
+                }
+                for key in sorted(keys)
+            }
+
+
+_stream_stats = StreamStats()
+
+
+def get_stream_stats() -> StreamStats:
+    return _stream_stats
+
+
+class ReplayTransport(httpx.AsyncBaseTransport):
+    """httpx transport that answers every request from a replay cassette."""
+
+    def __init__(self, cassette):
+        self.cassette = cassette
+
+    async def handle_async_request(self, request):
+        body = await request.aread()
+        entry, content = self.cassette.play(
+            request.method, str(request.url), body, request.headers
+        )
+        return httpx.Response(
+            entry["status"],
+            headers=entry["headers"],
+            content=content,
+            request=request,
+        )
+
+
+def _recording_hook(cassette):
+    async def _record(response):
+        body = await response.request.aread()
+        await response.aread()
+        cassette.record(
+            response.request.method,
+            str(response.request.url),
+            body,
+            response.request.headers,
+            response.status_code,
+            response.reason_phrase,
+            response.headers,
+            response.content,
+        )
+
+    return _record
+
+
+class AsyncHttpTransport:
+    """
+    Connection-pooled async HTTP client.
+
+    Attributes:
+        base_url (str): Prefix for relative endpoints.
+        max_connections (int): Upper bound of concurrent connections.
+        timeout (int | float): Default timeout for every request.
+        cassette (utils.cassette.Cassette | None): Cassette to record to or replay from.
+        limiter (utils.concurrency.AdaptiveLimiter | None): Concurrency limit of
+            the requests, usually the sync transport's; None sends them all at once.
+        max_retries (int): Resends of a throttled 429 after its `Retry-After`.
+        http2 (bool): Offer HTTP/2, requires the h2 package.
+        peak_in_flight (int): Most requests of this transport in flight at once.
+    """
+
+    def __init__(
+        self,
+        base_url=BASE_URL,
+        max_connections=POOL_MAXSIZE * 8,
+        timeout=TIMEOUT,
+        cassette=None,
+        limiter=None,
+        max_retries=MAX_RETRIES,
+        http2=False,
+    ):
+        self.base_url = base_url
+        self.max_connections = max_connections
+        self.timeout = timeout
+        self.cassette = cassette
+        self.limiter = limiter
+        self.max_retries = max_retries
+        self.http2 = http2
+        self._in_flight = 0
+        self.peak_in_flight = 0
+        self._client = None
+        self._loop = None
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """AsyncClient bound to the running event loop, created on first use."""
+        loop = asyncio.get_running_loop()
+        if self._client is None or self._loop is not loop:
+            options = {}
+            if self.cassette is not None and self.cassette.mode == "replay":
+                options["transport"] = ReplayTransport(self.cassette)
+            elif self.cassette is not None:
+                options["event_hooks"] = {"response": [_recording_hook(self.cassette)]}
+            self._client = httpx.AsyncClient(
+                http2=self.http2,
+                limits=httpx.Limits(
+                    max_connections=self.max_connections,
+                    max_keepalive_connections=self.max_connections,
+                ),
+                timeout=self.timeout,
+                # same as the sync transport: no cookies carried between requests
+                cookies=cookiejar.CookieJar(
+                    policy=cookiejar.DefaultCookiePolicy(allowed_domains=[])
+                ),
+                **options,
+            )
+            self._loop = loop
+        return self._client
+
+    def build_url(self, endpoint: str) -> str:
+        """Returns the full URL (if endpoint is relative)."""
+        if not isinstance(endpoint, str):
+            raise TypeError(
+                f"endpoint must be a str path or URL, got {type(endpoint).__name__}"
+            )
+        if endpoint.startswith("http"):
+            return endpoint
+        return f"{self.base_url.rstrip('/')}/{endpoint.lstrip('/')}"
+
+    async def request(self, method: str, endpoint: str, **kwargs) -> httpx.Response:
+        """
+        Sends a request over the pooled async client.
+
+        Args:
+            method (str): HTTP method.
+            endpoint (str): Relative endpoint (see settings.ENDPOINTS) or absolute URL.
+            **kwargs: Passed to `httpx.AsyncClient.request` (json, data, files,
+                params, headers, timeout, ...).
+
+        Returns:
+            httpx.Response: The response object.
+        """
+        kwargs.setdefault("timeout", self.timeout)
+        url = self.build_url(endpoint)
+        key = endpoint_key(url, self.base_url)
+        attempt = 0
+        while True:
+            response = await self._send(method, url, key, kwargs)
+            retry_after = retry_after_seconds(response.headers.get("Retry-After"))
+            if (
+                response.status_code != HTTPStatus.TOO_MANY_REQUESTS
+                or retry_after is None
+                or attempt >= self.max_retries
+                or not resendable(kwargs)
+            ):
+                return response
+            attempt += 1
+            # with a limiter, the limiter holds the group back itself
+            if self.limiter is None:
+                await asyncio.sleep(retry_after)
+
+    async def _send(self, method, url, key, kwargs):
+        permit = None
+        if self.limiter is not None:
+            permit = await self.limiter.acquire_async(key)
+        timing = RequestTiming()
+        marks = {}
+        self._in_flight += 1
+        in_flight = self._in_flight
+        self.peak_in_flight = max(self.peak_in_flight, in_flight)
+
+        async def trace(event, info):
+            marks[event] = time.perf_counter()
+            if event.endswith("send_request_headers.started"):
+                timing.sent = marks[event]
+            elif event.endswith("receive_response_headers.complete"):
+                timing.headers = marks[event]
+            elif event in (
+                "connection.connect_tcp.complete",
+                "connection.start_tls.complete",
+            ):
+                timing.add_connect(
+                    marks[event] - marks[event.replace("complete", "started")]
+                )
+
+        kwargs = {
+            **kwargs,
+            "extensions": {**(kwargs.get("extensions") or {}), "trace": trace},
+        }
+        started = time.perf_counter()
+        status = "error"
+        response = None
+        try:
+            response = await self.client.request(method, url, **kwargs)
+            status = response.status_code
+            return response
+        finally:
+            self._in_flight -= 1
+            if response is not None:
+                get_stream_stats().record(
+                    response.http_version,
+                    key,
+                    time.perf_counter() - started,
+                    "connection.connect_tcp.complete" in marks,
+                    in_flight,
+                    response.extensions.get("stream_id"),
+                )
+            if permit is not None:
+                self.limiter.release(
+                    permit,
+                    response.status_code if response is not None else None,
+                    retry_after_seconds(
+                        response.headers.get("Retry-After")
+                        if response is not None
+                        else None
+                    ),
+                )
+            get_recorder().record(
+                key,
+                method.upper(),
+                status,
+                time.perf_counter() - started,
+                ttfb=timing.ttfb,
+                connect=timing.connect,
+                request_bytes=(
+                    int(response.request.headers.get("Content-Length") or 0)
+                    if response is not None
+                    else 0
+                ),
+                response_bytes=len(response.content) if response is not None else 0,
+            )
+
+    async def gather(self, *coroutines):
+        """Runs request coroutines concurrently and returns their results in order."""
+        return await asyncio.gather(*coroutines)
+
+    async def aclose(self):
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+            self._loop = None
+
+
+async def run_coroutine_test(function, kwargs, transports=()):
+    """Awaits a coroutine test and closes the async transports it used."""
+    try:
+        await function(**kwargs)
+    finally:
+        for transport in transports:
+            await transport.aclose()
@@ -0,0 +1,521 @@
+"""
+Record-and-replay HTTP cassettes for the shared request layer.
+
+`pytest --record-cassette PATH` writes every request/response pair the sync and
+async transports exchange to a JSONL cassette (gzip-compressed when PATH ends
+with `.gz`). `pytest --replay-cassette PATH` answers the same requests from that
+file without opening a socket, so a run measures only client-side overhead
+(fixtures, generators, assertions) and failures can be rerun offline.
+
+Format:
+    The first line is a header (`{"cassette": 1, ...}`), every other line is one
+    exchange (a recording merged from parallel workers has one header and
+    section per worker): method, url, status, reason, response headers and body (text, or
+    base64 under `body_b64`), its precomputed match keys and the generated values
+    masked in the request. Hop-by-hop and date headers are dropped; request
+    bodies are stored only as digests inside the keys.
+
+Matching:
+    Generated values differ between runs, so request bodies and query strings
+    are normalized before matching: emails, JWTs and every field named like
+    `email`, `nickname`, `*password*` or `*token*` are masked, JSON is re-dumped
+    with sorted keys and multipart boundaries are replaced. Each exchange is
+    indexed under three keys, tried from the most specific one:
+
+    1. method, host, path, normalized query, caller and body
+    2. method, endpoint label (utils/latency.endpoint_key), caller kind and body
+    3. method, endpoint label and caller kind
+
+    The caller is anonymous, a session token (issued by a recorded response)
+    or any other Authorization value, see `Cassette.caller`.
+
+    Exchanges are served in recorded order, starting after the one served last,
+    so requests with random payloads that only match by endpoint still get the
+    answer recorded at the same point of the run. When all exchanges of a key
+    were used the last one is repeated. The generated values of a matched request
+    are paired with the recorded ones, and recorded values are replaced by the
+    current ones in every later response body. A request that matches nothing raises
+    `CassetteMiss` (a `requests.ConnectionError`, so the request fixtures fail
+    the test with the request in the message).
+
+Seeding:
+    Most payloads are drawn from `random` and Faker. The cassette stores a seed;
+    `CassettePlugin` seeds both generators with it before collection (the
+    parametrize values) and again before each test phase from the seed and the
+    node id, so a replay generates the payloads of the recording and its
+    requests match exactly, whatever ran before.
+"""
+
+import base64
+import bisect
+import gzip
+import hashlib
+import json
+import random
+import re
+import threading
+import time
+from datetime import timedelta
+from urllib.parse import parse_qsl, urlencode, urlsplit
+
+import pytest
+import requests
+from requests.adapters import BaseAdapter
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+from settings import BASE_URL
+from utils.latency import endpoint_key
+
+CASSETTE_VERSION = 1
+
+EMAIL = re.compile(r"[\w.+-]+@[\w-]+(?:\.[\w-]+)+")
+JWT = re.compile(r"eyJ[\w-]*\.[\w-]*\.[\w-]*")
+BOUNDARY = re.compile(r"boundary=\"?([^\";]+)")
+
+# response headers that describe the connection or the moment, not the answer
+SKIPPED_HEADERS = {
+    "connection",
+    "content-encoding",
+    "content-length",
+    "date",
+    "keep-alive",
+    "server",
+    "set-cookie",
+    "transfer-encoding",
+}
+
+
+class CassetteMiss(requests.exceptions.ConnectionError):
+    """Replayed request has no recorded exchange."""
+
+
+def _masked_field(name) -> bool:
+    name = name.lower()
+    return name in ("email", "nickname") or "password" in name or "token" in name
+
+
+def _mask_text(text: str, found) -> str:
+    def _replace(placeholder):
+        def _sub(match):
+            found.append(match.group(0))
+            return placeholder
+
+        return _sub
+
+    text = EMAIL.sub(_replace("<email>"), text)
+    return JWT.sub(_replace("<token>"), text)
+
+
+def _mask(value, found, name=""):
+    if isinstance(value, dict):
+        return {key: _mask(item, found, key) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_mask(item, found) for item in value]
+    if isinstance(value, str):
+        if value and _masked_field(name):
+            found.append(value)
+            return f"<{name.lower()}>"
+        return _mask_text(value, found)
+    return value
+
+
+def normalize_query(query: str, found=None) -> str:
+    """Sorted query string with generated values masked (and appended to `found`)."""
+    found = [] if found is None else found
+    pairs = [
+        (name, _mask(value, found, name))
+        for name, value in parse_qsl(query, keep_blank_values=True)
+    ]
+    return urlencode(sorted(pairs))
+
+
+def normalize_body(body, content_type=None, found=None) -> str:
+    """
+    Returns a run-independent form of a request body.
+
+    Args:
+        body (bytes | str | None): Request body as sent.
+        content_type (str, optional): Content-Type header of the request.
+        found (list, optional): Receives the masked values in body order.
+
+    Returns:
+        str: Masked JSON with sorted keys, masked form data or text, or
+        `<stream>` for bodies that are sent from an iterator.
+    """
+    found = [] if found is None else found
+    if body is None:
+        return ""
+    if not isinstance(body, (bytes, str)):
+        return "<stream>"
+    if isinstance(body, bytes):
+        body = body.decode("utf-8", "replace")
+    content_type = content_type or ""
+
+    if "json" in content_type:
+        try:
+            data = json.loads(body)
+        except ValueError:
+            pass
+        else:
+            return json.dumps(_mask(data, found), sort_keys=True, separators=(",", ":"))
+    elif "x-www-form-urlencoded" in content_type:
+        return normalize_query(body, found)
+    elif "multipart" in content_type:
+        boundary = BOUNDARY.search(content_type)
+        if boundary:
+            body = body.replace(boundary.group(1), "<boundary>")
+    return _mask_text(body, found)
+
+
+def _digest(text: str) -> str:
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=10).hexdigest()
+
+
+def fingerprint(
+    method, url, body=None, content_type=None, caller="anonymous", base_url=BASE_URL
+):
+    """
+    Match keys of a request, most specific first (see module docstring).
+
+    Args:
+        caller (str): "anonymous", "session" or "other:<digest>", see
+            `Cassette.caller`; the digest is matched only by the first key.
+
+    Returns:
+        tuple[list[str], list[str]]: The keys and the generated values that were
+        masked, in request order (query first, then body).
+    """
+    parts = urlsplit(url)
+    method = method.upper()
+    label = endpoint_key(url, base_url)
+    found = []
+    query = normalize_query(parts.query, found)
+    normalized = _digest(normalize_body(body, content_type, found))
+    kind = caller.split(":", 1)[0]
+    keys = [
+        f"{method} {parts.netloc}{parts.path}?{query} {caller} {normalized}",
+        f"{method} {label} {kind} {normalized}",
+        f"{method} {label} {kind}",
+    ]
+    return keys, found
+
+
+def _open(path, mode):
+    if str(path).endswith(".gz"):
+        return gzip.open(path, mode + "t", encoding="utf-8")
+    return open(path, mode, encoding="utf-8")
+
+
+class Cassette:
+    """
+    A cassette file opened for recording or for replay.
+
+    Attributes:
+        path (str): Cassette file.
+        mode (str): "record" or "replay".
+        base_url (str): API prefix used for the endpoint labels of the match keys.
+    """
+
+    def __init__(self, path, mode, base_url=BASE_URL, seed=None, worker=None):
+        if mode not in ("record", "replay"):
+            raise ValueError(f"unknown cassette mode: {mode!r}")
+        self.path = path
+        self.mode = mode
+        self.base_url = base_url
+        self.worker = worker
+        self.seed = seed if seed is not None else random.randrange(2**32)
+        self.recorded = 0
+        self.played = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._file = None
+        self._entries = []
+        self._index = {}
+        self._cursor = -1
+        self._used = set()
+        self._issued = set()
+        self._substitutions = {}
+        self._pattern = None
+        if mode == "replay":
+            self._load()
+
+    def _load(self):
+        # a merged recording has one section (header + exchanges) per worker;
+        # a worker replays its own section if there is one, otherwise all
+        sections = []
+        with _open(self.path, "r") as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                data = json.loads(line)
+                if "cassette" in data:
+                    if data["cassette"] != CASSETTE_VERSION:
+                        raise ValueError(
+                            f"{self.path} is not a version {CASSETTE_VERSION} cassette"
+                        )
+                    sections.append((data, []))
+                elif not sections:
+                    raise ValueError(f"{self.path} has no cassette header")
+                else:
+                    sections[-1][1].append(data)
+
+        own = [s for s in sections if s[0].get("worker") == self.worker]
+        for header, entries in own or sections:
+            self.seed = header.get("seed", self.seed)
+            for entry in entries:
+                self._add(entry)
+
+    def _add(self, entry):
+        number = len(self._entries)
+        self._entries.append(entry)
+        for key in entry["keys"]:
+            self._index.setdefault(key, []).append(number)
+        self._issued.update(JWT.findall(entry.get("body", "")))
+
+    def caller(self, authorization) -> str:
+        """
+        Classifies the caller of a request for the match keys.
+
+        Tokens issued by a recorded response (signup, login, ...) are handed out
+        in whatever order the user pool leases them, so they are all matched as
+        "session". Any other Authorization value (an invalid or foreign token)
+        is part of the test and matched by its digest.
+        """
+        if not authorization:
+            return "anonymous"
+        token = JWT.search(authorization)
+        if token and token.group(0) in self._issued:
+            return "session"
+        return f"other:{_digest(authorization)}"
+
+    def _fingerprint(self, method, url, body, request_headers):
+        return fingerprint(
+            method,
+            url,
+            body,
+            request_headers.get("Content-Type"),
+            self.caller(request_headers.get("Authorization")),
+            self.base_url,
+        )
+
+    def record(
+        self, method, url, body, request_headers, status, reason, headers, content
+    ):
+        """
+        Appends one exchange to the cassette.
+
+        Args:
+            method (str): Request method.
+            url (str): Absolute request URL.
+            body (bytes | str | None): Request body, used only for the match keys.
+            request_headers (Mapping): Request headers (Content-Type, Authorization).
+            status (int): Response status code.
+            reason (str): Response reason phrase.
+            headers (Mapping): Response headers.
+            content (bytes): Response body.
+        """
+        keys, values = self._fingerprint(method, url, body, request_headers)
+        entry = {
+            "method": method.upper(),
+            "url": url,
+            "status": status,
+            "reason": reason,
+            "headers": {
+                name: value
+                for name, value in headers.items()
+                if name.lower() not in SKIPPED_HEADERS
+            },
+            "keys": keys,
+            "values": values,
+        }
+        try:
+            entry["body"] = content.decode("utf-8")
+        except UnicodeDecodeError:
+            entry["body_b64"] = base64.b64encode(content).decode("ascii")
+        line = json.dumps(entry, ensure_ascii=False, separators=(",", ":")) + "\n"
+
+        with self._lock:
+            self._issued.update(JWT.findall(entry.get("body", "")))
+            if self._file is None:
+                self._file = _open(self.path, "w")
+                self._file.write(json.dumps(self._header()) + "\n")
+            self._file.write(line)
+            self.recorded += 1
+
+    def _header(self):
+        return {
+            "cassette": CASSETTE_VERSION,
+            "base_url": self.base_url,
+            "seed": self.seed,
+            "worker": self.worker,
+            "recorded": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        }
+
+    def play(self, method, url, body=None, request_headers=None) -> tuple:
+        """
+        Answers a request from the cassette.
+
+        Generated values of the request (emails, nicknames, ...) are paired with
+        the recorded ones, and recorded values seen so far are replaced by the
+        current ones in the returned body, so e.g. a profile shows the email
+        this run signed up with. Only whole JSON string values are replaced.
+
+        Returns:
+            tuple[dict, bytes]: The recorded exchange and its response body.
+
+        Raises:
+            CassetteMiss: If no exchange matches any of the request's keys.
+        """
+        keys, values = self._fingerprint(method, url, body, request_headers or {})
+        with self._lock:
+            entry = self._pick(keys)
+            if entry is None:
+                self.misses += 1
+                raise CassetteMiss(
+                    f"no recorded response for {method.upper()} {url} in {self.path}"
+                )
+            self.played += 1
+            for recorded, current in zip(entry.get("values", ()), values):
+                if recorded != current and json.dumps(recorded)[1:-1] == recorded:
+                    self._substitutions[recorded] = current
+                    self._pattern = None
+            return entry, self._content(entry)
+
+    def _pick(self, keys):
+        # an exact match takes the first unused exchange of its key; looser ones
+        # prefer the next unused exchange after the one served last: a serial
+        # replay walks the recording in order, so requests with random payloads
+        # still get the answer recorded at the same point of the run
+        attempts = [(keys[0], 0)] + [
+            (key, start) for start in (self._cursor + 1, 0) for key in keys[1:]
+        ]
+        for key, start in attempts:
+            numbers = self._index.get(key, ())
+            position = bisect.bisect_left(numbers, start)
+            while position < len(numbers) and numbers[position] in self._used:
+                position += 1
+            if position < len(numbers):
+                self._used.add(numbers[position])
+                self._cursor = numbers[position]
+                return self._entries[numbers[position]]
+        for key in keys:
+            if key in self._index:  # everything used, repeat the last answer
+                return self._entries[self._index[key][-1]]
+        return None
+
+    def _content(self, entry) -> bytes:
+        if "body_b64" in entry:
+            return base64.b64decode(entry["body_b64"])
+        body = entry["body"]
+        if self._substitutions:
+            if self._pattern is None:
+                # whole JSON strings only, a short value could be part of a token
+                self._pattern = re.compile(
+                    '"(%s)"'
+                    % "|".join(
+                        map(
+                            re.escape,
+                            sorted(self._substitutions, key=len, reverse=True),
+                        )
+                    )
+                )
+            body = self._pattern.sub(
+                lambda match: f'"{self._substitutions[match.group(1)]}"', body
+            )
+        return body.encode("utf-8")
+
+    def close(self):
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+
+def merge_cassettes(paths, target):
+    """Concatenates recorded cassettes (e.g. of parallel workers) into `target`."""
+    with _open(target, "w") as out:
+        for path in paths:
+            with _open(path, "r") as f:
+                for line in f:
+                    out.write(line)
+
+
+class ReplayAdapter(BaseAdapter):
+    """requests adapter that answers every request from a replay cassette."""
+
+    def __init__(self, cassette):
+        super().__init__()
+        self.cassette = cassette
+
+    def send(
+        self, request, stream=False, timeout=None, verify=True, cert=None, proxies=None
+    ):
+        entry, content = self.cassette.play(
+            request.method, request.url, request.body, request.headers
+        )
+        response = requests.Response()
+        response.status_code = entry["status"]
+        response.reason = entry["reason"]
+        response.headers = CaseInsensitiveDict(entry["headers"])
+        response._content = content
+        response._content_consumed = True
+        response.headers["Content-Length"] = str(len(response._content))
+        response.encoding = get_encoding_from_headers(response.headers)
+        response.url = request.url
+        response.request = request
+        response.connection = self
+        response.elapsed = timedelta(0)
+        return response
+
+    def close(self):
+        pass
+
+
+def seed_generators(*parts):
+    """Seeds `random` and Faker from the given parts."""
+    seed = ":".join(map(str, parts))
+    random.seed(seed)
+    from faker import Faker
+
+    Faker.seed(seed)
+
+
+class CassettePlugin:
+    """pytest plugin: seeds the payload generators and reports cassette use."""
+
+    def __init__(self, config, cassette):
+        self.config = config
+        self.cassette = cassette
+        seed_generators(cassette.seed)
+
+    @pytest.hookimpl(wrapper=True, tryfirst=True)
+    def pytest_runtest_setup(self, item):
+        seed_generators(self.cassette.seed, item.nodeid, "setup")
+        return (yield)
+
+    @pytest.hookimpl(wrapper=True, tryfirst=True)
+    def pytest_runtest_call(self, item):
+        seed_generators(self.cassette.seed, item.nodeid, "call")
+        return (yield)
+
+    def pytest_terminal_summary(self, terminalreporter):
+        if self.config.getoption("shard_file", None):
+            return
+        cassette = self.cassette
+        if cassette.mode == "replay":
+            terminalreporter.write_line(
+                f"cassette: {cassette.played} responses replayed from {cassette.path}, "
+                f"{cassette.misses} misses"
+            )
+        elif self.config.getoption("workers", 0) > 1:
+            terminalreporter.write_line(
+                f"cassette: worker recordings merged into {cassette.path}"
+            )
+        else:
+            terminalreporter.write_line(
+                f"cassette: {cassette.recorded} exchanges recorded to {cassette.path}"
+            )
+
+    def pytest_unconfigure(self, config):
+        self.cassette.close()
@@ -0,0 +1,185 @@
+"""
+Covering arrays for the parameter generators.
+
+The parameter matrices used to be hand-picked rows, e.g. login's ten
+email x password x timezone combinations. `covering_array` builds the
+smallest set of rows it can find such that every combination of values of any
+`strength` dimensions appears in at least one row:
+
+    covering_array(
+        {"email": ["valid", "invalid", "empty"], "password": ["valid", "empty"],
+         "timezone": ["valid", "invalid"]},
+        strength=2,
+    )
+
+strength 2 (pairwise) covers every pair of values and typically needs a handful
+of rows instead of the full product, strength 3 every triple, and so on;
+strength 0 returns only the `seeds`. Seeds are hand-picked rows that must stay
+in the matrix (known regressions), the generator adds rows until the coverage
+is complete, so raising or lowering CASE_STRENGTH (`--case-strength`) is the
+request budget knob of every endpoint built with `covering_params`.
+
+The construction is the greedy AETG heuristic: each new row starts from an
+uncovered combination, fills the remaining dimensions one by one with the value
+that covers the most uncovered combinations, and the best of `candidates`
+such rows is kept. It is seeded, so the matrix and thus the test ids are the
+same on every run and in every parallel worker.
+"""
+
+import random
+from itertools import combinations, product
+
+from settings import CASE_STRENGTH
+from utils.lazy_params import lazy_param
+
+_strength = CASE_STRENGTH
+
+
+def set_case_strength(strength):
+    """Default strength of `covering_params`, set from `--case-strength`."""
+    global _strength
+    _strength = strength
+
+
+def get_case_strength() -> int:
+    return _strength
+
+
+def _tuples(row, t):
+    """Combinations of `t` dimensions a row (tuple of value indexes) covers."""
+    return {
+        (columns, tuple(row[c] for c in columns))
+        for columns in combinations(range(len(row)), t)
+    }
+
+
+def covering_array(
+    dimensions, strength=2, seeds=(), constraint=None, candidates=30, seed=0
+) -> list:
+    """
+    Rows covering every combination of values of any `strength` dimensions.
+
+    Args:
+        dimensions (dict): `{name: [values]}`, values are compared by equality.
+        strength (int): Size of the combinations to cover, 0 returns the seeds.
+        seeds (iterable[dict]): Rows that are always part of the result, first.
+        constraint (callable, optional): `constraint(row) -> bool`; rows it
+            rejects are not generated, combinations that only occur in rejected
+            rows stay uncovered.
+        candidates (int): Rows tried for each row that is added.
+        seed (int): Seed of the heuristic.
+
+    Returns:
+        list[dict]: Rows as `{name: value}`, seeds first.
+
+    Raises:
+        ValueError: If a seed uses a value that is not in `dimensions`.
+    """
+    names = list(dimensions)
+    values = [list(dimensions[name]) for name in names]
+    rows = []
+    for row in seeds:
+        try:
+            rows.append(
+                tuple(values[i].index(row[name]) for i, name in enumerate(names))
+            )
+        except (KeyError, ValueError):
+            raise ValueError(f"seed row {row!r} is not in the dimensions")
+
+    t = min(strength, len(names))
+    if t > 0:
+        uncovered = {
+            (columns, indexes)
+            for columns in combinations(range(len(names)), t)
+            for indexes in product(*(range(len(values[c])) for c in columns))
+        }
+        for row in rows:
+            uncovered -= _tuples(row, t)
+        rng = random.Random(seed)
+        allowed = (
+            (lambda row: True)
+            if constraint is None
+            else (lambda row: constraint(_named(names, values, row)))
+        )
+        while uncovered:
+            best, best_gain = None, 0
+            start = sorted(uncovered)
+            for _ in range(candidates):
+                row = _candidate(rng.choice(start), values, uncovered, t, rng)
+                gain = len(_tuples(row, t) & uncovered)
+                if gain > best_gain and allowed(row):
+                    best, best_gain = row, gain
+            if best is None:
+                break  # what is left only occurs in rows the constraint rejects
+            rows.append(best)
+            uncovered -= _tuples(best, t)
+    return [_named(names, values, row) for row in rows]
+
+
+def _candidate(start, values, uncovered, t, rng):
+    columns, indexes = start
+    row = [None] * len(values)
+    for column, index in zip(columns, indexes):
+        row[column] = index
+    free = [c for c in range(len(values)) if row[c] is None]
+    rng.shuffle(free)
+    for column in free:
+        fixed = [c for c in range(len(values)) if row[c] is not None]
+        best_index, best_gain = 0, -1
+        order = list(range(len(values[column])))
+        rng.shuffle(order)
+        for index in order:
+            row[column] = index
+            gain = 0
+            for others in combinations(fixed, t - 1):
+                key = tuple(sorted((column, *others)))
+                if (key, tuple(row[c] for c in key)) in uncovered:
+                    gain += 1
+            if gain > best_gain:
+                best_index, best_gain = index, gain
+        row[column] = best_index
+    return tuple(row)
+
+
+def _named(names, values, row) -> dict:
+    return {name: values[i][index] for i, (name, index) in enumerate(zip(names, row))}
+
+
+def covering_params(
+    factory, dimensions, expected, ids, strength=None, seeds=(), constraint=None
+) -> list:
+    """
+    Lazily generated `pytest.param`s for the rows of a covering array.
+
+    Args:
+        factory (callable): Called as `factory(*row values, expected status)`
+            when the test runs (see utils/lazy_params.py).
+        dimensions (dict): `{argument name: [values]}` in `factory` argument order.
+        expected (callable): `expected(row) -> status` for generated rows.
+        ids (str): Format string for the ids, filled with the row values and
+            `status`, e.g. "email={email},status={status}".
+        strength (int, optional): CASE_STRENGTH / `--case-strength` by default.
+        seeds (iterable[tuple]): Hand-picked `(*values, status)` rows that stay
+            in the matrix with their own expected status.
+        constraint (callable, optional): See `covering_array`.
+    """
+    names = list(dimensions)
+    seed_rows, seed_status = [], {}
+    for *row_values, status in seeds:
+        row = dict(zip(names, row_values))
+        seed_rows.append(row)
+        seed_status[tuple(row_values)] = status
+    rows = covering_array(
+        dimensions,
+        strength=_strength if strength is None else strength,
+        seeds=seed_rows,
+        constraint=constraint,
+    )
+    params = []
+    for row in rows:
+        key = tuple(row[name] for name in names)
+        status = seed_status[key] if key in seed_status else expected(row)
+        params.append(
+            lazy_param(factory, *key, status, id=ids.format(status=status, **row))
+        )
+    return params
@@ -0,0 +1,300 @@
+"""
+Adaptive (AIMD) concurrency limit of the shared transports.
+
+A `--workers` or load-mode run sends as many requests as it has threads; when
+staging throttles, the run fails instead of slowing down. The transports
+therefore take a permit from an `AdaptiveLimiter` before every request. Permits
+are counted per endpoint group, the ENDPOINTS key without its sub-path
+(`teacher_educations` covers `teacher_educations/{id}`), so a throttled upload
+endpoint does not slow down logins.
+
+The limit of a group moves like TCP's congestion window:
+
+- additive increase: every healthy response of a group that used its whole
+  limit adds 1 / limit, i.e. about one request per round of responses;
+- multiplicative decrease (CONCURRENCY_BACKOFF) on overload: a 503, a 429 with
+  `Retry-After`, or a smoothed latency of the endpoint far above the fastest
+  one seen (CONCURRENCY_LATENCY_FACTOR and _SLACK) while several of its
+  requests were in flight. Requests already in flight when the limit dropped
+  do not drop it again;
+- `Retry-After` (seconds or an HTTP date) also holds back every new request of
+  the group until it has passed.
+
+A 429 without `Retry-After` is an answer of the API itself, not throttling:
+the backend returns it for a repeated signup and the tests assert it.
+Throttled 429s are sent again after the wait (up to `--max-retries`) when the
+body can be sent twice; 503 is retried by the transport's urllib3 retries.
+
+Every process has its own limiter, so `--workers N` allows N times the limit.
+The end-of-run summary lists the groups whose limit had to drop.
+"""
+
+import asyncio
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from http import HTTPStatus
+
+from settings import (
+    CONCURRENCY_BACKOFF,
+    CONCURRENCY_INITIAL,
+    CONCURRENCY_LATENCY_FACTOR,
+    CONCURRENCY_LATENCY_SLACK,
+    CONCURRENCY_MAX,
+    CONCURRENCY_MIN,
+    RETRY_AFTER_MAX,
+)
+
+LATENCY_SMOOTHING = 0.2  # weight of the latest response in an endpoint's latency
+
+
+def retry_after_seconds(value):
+    """
+    Seconds to wait according to a `Retry-After` header value.
+
+    Returns:
+        float | None: Delay capped at RETRY_AFTER_MAX, None if `value` is empty
+        or neither delay-seconds nor an HTTP date.
+    """
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        seconds = float(value)
+    except ValueError:
+        try:
+            date = parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return None
+        if date.tzinfo is None:
+            date = date.replace(tzinfo=timezone.utc)
+        seconds = (date - datetime.now(timezone.utc)).total_seconds()
+    return min(max(seconds, 0.0), RETRY_AFTER_MAX)
+
+
+def throttled(status, retry_after) -> bool:
+    """Whether a response asks the client to slow down."""
+    if status == HTTPStatus.SERVICE_UNAVAILABLE:
+        return True
+    return status == HTTPStatus.TOO_MANY_REQUESTS and retry_after is not None
+
+
+def endpoint_group(key) -> str:
+    """Endpoint group of an endpoint key, e.g. "teacher_educations/{id}" -> "teacher_educations"."""
+    return key.split("/", 1)[0]
+
+
+@dataclass
+class Permit:
+    """One request in flight, returned to `AdaptiveLimiter.release`."""
+
+    group: str
+    key: str
+    started: float
+    saturated: bool  # the request used the last free slot of the limit
+    concurrent: bool  # other requests of the group were in flight
+
+
+class _Window:
+    """Limit and in-flight count of one endpoint group."""
+
+    def __init__(self, limit):
+        self.limit = float(limit)
+        self.in_flight = 0
+        self.peak = 0
+        self.lowest = self.limit
+        self.resume_at = 0.0  # monotonic time before which nothing is sent
+        self.decreased_at = float("-inf")
+        self.decreases = 0
+        self.throttled = 0
+        self.waiters = deque()
+
+    def try_acquire(self, now):
+        """0 if a slot was taken, seconds to wait for Retry-After, or None if full."""
+        if now < self.resume_at:
+            return self.resume_at - now
+        if self.in_flight >= int(self.limit):
+            return None
+        self.in_flight += 1
+        self.peak = max(self.peak, self.in_flight)
+        return 0
+
+
+class AdaptiveLimiter:
+    """
+    Per-endpoint-group AIMD concurrency limit, shared by threads and event loops.
+
+    Args:
+        initial (int): Limit of a group before its first response.
+        minimum (int): Lowest limit a group backs off to.
+        maximum (int): Highest limit a group ramps up to.
+        backoff (float): Factor applied to the limit on overload.
+        latency_factor (float): Overload when an endpoint's smoothed latency
+            exceeds this multiple of its fastest response ...
+        latency_slack (float): ... and is this many seconds above it.
+    """
+
+    def __init__(
+        self,
+        initial=CONCURRENCY_INITIAL,
+        minimum=CONCURRENCY_MIN,
+        maximum=CONCURRENCY_MAX,
+        backoff=CONCURRENCY_BACKOFF,
+        latency_factor=CONCURRENCY_LATENCY_FACTOR,
+        latency_slack=CONCURRENCY_LATENCY_SLACK,
+    ):
+        self.minimum = max(1, minimum)
+        self.maximum = max(self.minimum, maximum)
+        self.initial = min(max(initial, self.minimum), self.maximum)
+        self.backoff = backoff
+        self.latency_factor = latency_factor
+        self.latency_slack = latency_slack
+        self._windows = {}
+        self._latency = {}  # endpoint key -> [fastest, smoothed] seconds
+        self._lock = threading.Lock()
+
+    def _window(self, group) -> _Window:
+        window = self._windows.get(group)
+        if window is None:
+            window = self._windows[group] = _Window(self.initial)
+        return window
+
+    def _try_acquire(self, key, waiter):
+        """Permit, or the seconds to wait (None: until a release) after registering `waiter`."""
+        group = endpoint_group(key)
+        with self._lock:
+            window = self._window(group)
+            now = time.monotonic()
+            delay = window.try_acquire(now)
+            if delay == 0:
+                permit = Permit(
+                    group,
+                    key,
+                    now,
+                    saturated=window.in_flight >= int(window.limit),
+                    concurrent=window.in_flight > 1,
+                )
+                return permit, None
+            if delay is None:
+                window.waiters.append(waiter)
+            return None, delay
+
+    def acquire(self, key) -> Permit:
+        """Blocks until a request to endpoint `key` may be sent."""
+        while True:
+            event = threading.Event()
+            permit, delay = self._try_acquire(key, event.set)
+            if permit is not None:
+                return permit
+            if delay is None:
+                event.wait()
+            else:
+                time.sleep(delay)
+
+    async def acquire_async(self, key) -> Permit:
+        """`acquire` for coroutines, waits without blocking the event loop."""
+        loop = asyncio.get_running_loop()
+        while True:
+            future = loop.create_future()
+
+            def wake(future=future):
+                try:
+                    loop.call_soon_threadsafe(_resolve, future)
+                except RuntimeError:
+                    pass  # the loop of a finished test is closed
+
+            permit, delay = self._try_acquire(key, wake)
+            if permit is not None:
+                return permit
+            if delay is None:
+                await future
+            else:
+                await asyncio.sleep(delay)
+
+    def release(self, permit, status=None, retry_after=None):
+        """
+        Returns a permit and adapts the group's limit to the response.
+
+        Args:
+            permit (Permit): From `acquire`.
+            status (int, optional): Response status, None if the request failed.
+            retry_after (float, optional): `retry_after_seconds` of the response.
+        """
+        now = time.monotonic()
+        latency = now - permit.started
+        with self._lock:
+            window = self._windows[permit.group]
+            window.in_flight -= 1
+            if throttled(status, retry_after):
+                window.throttled += 1
+                if retry_after:
+                    window.resume_at = max(window.resume_at, now + retry_after)
+                self._decrease(window, permit)
+            elif status is not None and status < HTTPStatus.INTERNAL_SERVER_ERROR:
+                # a lone request is slow on its own, not because of the limit
+                if self._slow(permit.key, latency) and permit.concurrent:
+                    self._decrease(window, permit)
+                elif permit.saturated and window.limit < self.maximum:
+                    window.limit = min(self.maximum, window.limit + 1 / window.limit)
+            waiters, window.waiters = window.waiters, deque()
+        for wake in waiters:
+            wake()
+
+    def _slow(self, key, latency) -> bool:
+        stats = self._latency.get(key)
+        if stats is None:
+            self._latency[key] = [latency, latency]
+            return False
+        stats[0] = min(stats[0], latency)
+        stats[1] += LATENCY_SMOOTHING * (latency - stats[1])
+        fastest, smoothed = stats
+        return (
+            smoothed > fastest * self.latency_factor
+            and smoothed - fastest > self.latency_slack
+        )
+
+    def _decrease(self, window, permit):
+        # one decrease per round: requests sent before the last drop saw the old limit
+        if permit.started <= window.decreased_at:
+            return
+        window.limit = max(self.minimum, window.limit * self.backoff)
+        window.lowest = min(window.lowest, window.limit)
+        window.decreased_at = time.monotonic()
+        window.decreases += 1
+
+    def stats(self) -> dict:
+        """{group: {"limit", "lowest", "peak", "decreases", "throttled"}}"""
+        with self._lock:
+            return {
+                group: {
+                    "limit": round(window.limit, 2),
+                    "lowest": round(window.lowest, 2),
+                    "peak": window.peak,
+                    "decreases": window.decreases,
+                    "throttled": window.throttled,
+                }
+                for group, window in sorted(self._windows.items())
+            }
+
+    def pytest_terminal_summary(self, terminalreporter):
+        backed_off = {
+            group: entry for group, entry in self.stats().items() if entry["decreases"]
+        }
+        if not backed_off:
+            return
+        terminalreporter.write_line(
+            "concurrency: "
+            + "; ".join(
+                f"{group} limit {entry['limit']:g} (lowest {entry['lowest']:g}, "
+                f"peak {entry['peak']} in flight, {entry['throttled']} throttled)"
+                for group, entry in backed_off.items()
+            )
+        )
+
+
+def _resolve(future):
+    if not future.done():
+        future.set_result(None)
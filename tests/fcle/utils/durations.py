@@ -0,0 +1,145 @@
+"""
+History of per-test durations, used to schedule parallel runs.
+
+`plan_shards` packs endpoint groups onto `--workers` processes by weight. With
+one unit per test, a worker that got the `new_teacher` onboarding, the
+`teacher_documents` uploads or the multi-step `favorite_teachers` flows
+finishes long after the others. Every run therefore records the wall time of
+each test (setup + call + teardown) into a JSON file:
+
+    {"version": 1, "tests": {"<node id>": 1.84, ...}}
+
+The value is a moving average over runs (DURATION_SMOOTHING), so one slow run
+does not reorder the next. The next `--workers` run weighs every test by its
+recorded time. Tests without a record get the mean of the same test function's
+other parameter sets (node ids with generated values change between runs),
+otherwise the median of all records.
+
+In a parallel run the controller replays the worker reports through its own
+hooks, so it records the tests of all workers and is the only process that
+writes the file. Runs replayed from a cassette and load mode record nothing;
+`--local-api` keeps a separate history, the stand-in answers in microseconds.
+"""
+
+import json
+import statistics
+from pathlib import Path
+
+from settings import DURATION_HISTORY, DURATION_SMOOTHING
+from utils.import_audit import root_dir
+
+VERSION = 1
+
+
+def history_path(path=DURATION_HISTORY, local_api=False) -> Path:
+    """`path`, relative paths taken from the directory with pytest.ini."""
+    path = Path(path)
+    if local_api:
+        path = path.with_name(f"{path.stem}.local{path.suffix}")
+    return path if path.is_absolute() else root_dir() / path
+
+
+def _function(nodeid) -> str:
+    return nodeid.split("[", 1)[0]
+
+
+class DurationHistory:
+    """
+    Recorded test durations and the pytest plugin that updates them.
+
+    Args:
+        path (Path): JSON history file, created by `save`.
+        smoothing (float): Weight of the latest run in a test's average.
+        record (bool): Collect the durations of this run; `save` writes them.
+    """
+
+    def __init__(self, path, smoothing=DURATION_SMOOTHING, record=True):
+        self.path = Path(path)
+        self.smoothing = smoothing
+        self.record = record
+        self.tests = {}  # node id -> average seconds
+        self.observed = {}  # node id -> seconds in this run
+        self._phases = {}  # node id -> (call phase seen, seconds so far)
+        self._fallback = None
+        self.load()
+
+    def load(self):
+        """Reads the history file; a missing or unreadable file is an empty history."""
+        try:
+            data = json.loads(self.path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return
+        if not isinstance(data, dict) or data.get("version") != VERSION:
+            return
+        self.tests = {
+            nodeid: float(seconds)
+            for nodeid, seconds in data.get("tests", {}).items()
+            if isinstance(seconds, (int, float)) and seconds >= 0
+        }
+        self._fallback = None
+
+    def _fallbacks(self):
+        if self._fallback is None:
+            functions = {}
+            for nodeid, seconds in self.tests.items():
+                functions.setdefault(_function(nodeid), []).append(seconds)
+            self._fallback = (
+                {name: statistics.fmean(values) for name, values in functions.items()},
+                statistics.median(self.tests.values()) if self.tests else 1.0,
+            )
+        return self._fallback
+
+    def weight(self, nodeid) -> float:
+        """Expected seconds of test `nodeid`, for `plan_shards`."""
+        seconds = self.tests.get(nodeid)
+        if seconds is not None:
+            return seconds
+        functions, median = self._fallbacks()
+        return functions.get(_function(nodeid), median)
+
+    def add(self, nodeid, seconds):
+        """Records one run of `nodeid` taking `seconds`."""
+        self.observed[nodeid] = seconds
+
+    def merged(self) -> dict:
+        """The history with this run's durations averaged in."""
+        tests = dict(self.tests)
+        for nodeid, seconds in self.observed.items():
+            previous = tests.get(nodeid)
+            tests[nodeid] = (
+                seconds
+                if previous is None
+                else self.smoothing * seconds + (1 - self.smoothing) * previous
+            )
+        return tests
+
+    def save(self):
+        """Writes the merged history, replacing the file atomically."""
+        if not self.observed:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_name(self.path.name + ".tmp")
+        tests = {nodeid: round(seconds, 4) for nodeid, seconds in self.merged().items()}
+        tmp.write_text(
+            json.dumps({"version": VERSION, "tests": tests}, indent=0, sort_keys=True),
+            encoding="utf-8",
+        )
+        tmp.replace(self.path)
+
+    def pytest_runtest_logreport(self, report):
+        if not self.record:
+            return
+        called, total = self._phases.get(report.nodeid, (False, 0.0))
+        called = called or report.when == "call"
+        total += report.duration
+        if report.when != "teardown":
+            self._phases[report.nodeid] = called, total
+            return
+        self._phases.pop(report.nodeid, None)
+        # a test skipped or broken in setup says nothing about its duration
+        if called:
+            self.add(report.nodeid, total)
+
+    def pytest_sessionfinish(self, session):
+        if self.record:
+            self.save()
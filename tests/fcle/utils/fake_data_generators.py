@@ -1,10 +1,17 @@
 import random
 import string
 
-from faker import Faker
 from settings import LABEL
+from utils.lazy_import import LazyObject
 
-faker = Faker()
+
+def _make_faker():
+    from faker import Faker
+
+    return Faker()
+
+
+faker = LazyObject(_make_faker)  # Faker() is built by the first generator that needs it
 PUNCTUATION = "~!@#$%^&*()_+|{}[]:;\"'<>,.?/-"
 
 
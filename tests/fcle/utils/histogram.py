@@ -0,0 +1,126 @@
+"""
+HDR-style log-linear latency histogram.
+
+Values are non-negative integers (the suite records microseconds). Values
+below `2 ** precision_bits` get a bucket each; above that every power-of-two
+range is split into `2 ** (precision_bits - 1)` equal sub-buckets, so the
+relative error of any reported value stays below `2 ** (1 - precision_bits)`
+(< 0.8% with the default 8 bits) while the number of buckets grows only
+logarithmically with the range.
+
+Counts are kept in a sparse dict, recording is a couple of integer operations
+and one dict update, and histograms from several processes merge by adding
+counts, which is what makes the per-worker reports of `--workers` mergeable.
+"""
+
+import math
+
+
+class LatencyHistogram:
+    """
+    Log-linear histogram of non-negative integer values.
+
+    Args:
+        precision_bits (int): Sub-bucket resolution, see module docstring.
+    """
+
+    def __init__(self, precision_bits=8):
+        self.precision_bits = precision_bits
+        self._linear = 1 << precision_bits
+        self._half = self._linear >> 1
+        self.counts = {}
+        self.count = 0
+        self.total = 0
+        self.min = None
+        self.max = None
+
+    def _index(self, value: int) -> int:
+        if value < self._linear:
+            return value
+        shift = value.bit_length() - self.precision_bits
+        return self._linear + (shift - 1) * self._half + (value >> shift) - self._half
+
+    def _bounds(self, index: int):
+        """Returns the [low, high) value range of a bucket."""
+        if index < self._linear:
+            return index, index + 1
+        shift, offset = divmod(index - self._linear, self._half)
+        shift += 1
+        top = offset + self._half
+        return top << shift, (top + 1) << shift
+
+    def record(self, value, count=1):
+        value = max(0, int(value))
+        index = self._index(value)
+        self.counts[index] = self.counts.get(index, 0) + count
+        self.count += count
+        self.total += value * count
+        if self.min is None or value < self.min:
+            self.min = value
+        if self.max is None or value > self.max:
+            self.max = value
+
+    def merge(self, other: "LatencyHistogram"):
+        """Adds the counts of another histogram with the same precision."""
+        if other.precision_bits != self.precision_bits:
+            raise ValueError("Cannot merge histograms with different precision")
+        for index, count in other.counts.items():
+            self.counts[index] = self.counts.get(index, 0) + count
+        self.count += other.count
+        self.total += other.total
+        if other.min is not None:
+            self.min = other.min if self.min is None else min(self.min, other.min)
+        if other.max is not None:
+            self.max = other.max if self.max is None else max(self.max, other.max)
+
+    def percentile(self, q):
+        """
+        Returns the value at percentile `q` (0..100).
+
+        The upper edge of the bucket holding the nearest-rank sample is
+        returned (capped at the recorded maximum), so reported percentiles
+        never understate latency.
+        """
+        if not self.count:
+            return None
+        rank = max(1, math.ceil(q / 100 * self.count))
+        seen = 0
+        for index in sorted(self.counts):
+            seen += self.counts[index]
+            if seen >= rank:
+                return min(self._bounds(index)[1] - 1, self.max)
+        return self.max
+
+    def count_above(self, value) -> int:
+        """Number of recorded values in buckets entirely above `value`."""
+        return sum(
+            count
+            for index, count in self.counts.items()
+            if self._bounds(index)[0] > value
+        )
+
+    @property
+    def mean(self):
+        return self.total / self.count if self.count else None
+
+    def to_dict(self) -> dict:
+        return {
+            "precision_bits": self.precision_bits,
+            "count": self.count,
+            "total": self.total,
+            "min": self.min,
+            "max": self.max,
+            "counts": {
+                str(index): count for index, count in sorted(self.counts.items())
+            },
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "LatencyHistogram":
+        histogram = cls(data.get("precision_bits", 8))
+        histogram.counts = {int(k): v for k, v in data.get("counts", {}).items()}
+        histogram.count = data.get("count", sum(histogram.counts.values()))
+        histogram.total = data.get("total", 0)
+        histogram.min = data.get("min")
+        histogram.max = data.get("max")
+        return histogram
@@ -1,10 +1,9 @@
-import requests
-from settings import BASE_URL
+from utils.transport import get_transport
 
 
 def build_url(endpoint: str) -> str:
     """Возвращает полный URL (если endpoint относительный)."""
-    return endpoint if endpoint.startswith("http") else f"{BASE_URL.rstrip('/')}/{endpoint.lstrip('/')}"
+    return get_transport().build_url(endpoint)
 
 
 def variants(url: str):
@@ -21,14 +20,14 @@ def normalize_headers(headers):
 
 
 def request_options(url: str, headers=None):
-    return requests.options(build_url(url), headers=headers, timeout=30)
+    return get_transport().request("OPTIONS", url, headers=headers, timeout=30)
 
 
 def request_put(url: str, payload=None, headers=None):
     h = {"Content-Type": "application/json", "Accept": "application/json"}
     if headers:
         h.update(headers)
-    return requests.put(build_url(url), json=payload, headers=h, timeout=30)
+    return get_transport().request("PUT", url, json=payload, headers=h, timeout=30)
 
 
 def request_post(url: str, payload=None, headers=None, override=None):
@@ -37,4 +36,4 @@ def request_post(url: str, payload=None, headers=None, override=None):
         h["X-HTTP-Method-Override"] = override  # обход шлюзов, рубящих PUT
     if headers:
         h.update(headers)
-    return requests.post(build_url(url), json=payload, headers=h, timeout=30)
+    return get_transport().request("POST", url, json=payload, headers=h, timeout=30)
@@ -0,0 +1,219 @@
+"""
+Batched, collision-free test identities (email, password, nickname).
+
+`generate_email` / `generate_nickname` draw every character with
+`random.choice` and rely on luck for uniqueness, which stops working for load
+runs that register hundreds of thousands of users, and `generate_password`
+retries until the character classes happen to be present. `IdentityGenerator`
+builds whole batches instead:
+
+    generator = IdentityGenerator(seed=42, worker=3)
+    users = generator.batch(10_000)        # 10 000 Identity objects, one call
+    generator.emails(500)                  # just the emails
+
+Uniqueness comes from construction, not chance. Every identity has an index,
+`(worker slot << 32) | counter`, and the index is mapped through a keyed
+Feistel permutation of the 40-bit space, so different indexes always give
+different tokens that still look random:
+
+    email       <LABEL><run tag><token>@<domain>   run tag: 4 chars from the seed
+    nickname    <token>                             8 chars of [a-z0-9]
+
+Emails and nicknames are unique within a seed, and emails, via the run tag,
+practically across runs. `--workers` processes therefore all take the seed the
+controller drew for the run (FCLE_RUN_SEED, utils/parallel.py): with seeds of
+their own, their nicknames would come from independent permutations and could
+collide. Passwords get one character of every required class placed at random
+positions, so no retries are needed. The same seed and worker give the same
+identities; outside workers the default seed is drawn from `random`, which the
+cassette plugin seeds, so recorded runs replay.
+"""
+
+import itertools
+import random
+import string
+import threading
+from dataclasses import dataclass
+from functools import lru_cache
+
+from settings import IDENTITY_BATCH_SIZE, LABEL
+from utils.fake_data_generators import PUNCTUATION
+from utils.parallel import run_seed, worker_id
+
+EMAIL_DOMAINS = ("gmail.com", "yahoo.com", "outlook.com", "yandex.ru")
+BASE36 = string.digits + string.ascii_lowercase
+
+_HALF_BITS = 20
+_HALF_MASK = (1 << _HALF_BITS) - 1
+_ROUNDS = 4
+MAX_COUNTER = 1 << 32  # identities per generator
+MAX_WORKER_SLOTS = 1 << 8  # slot 0 is the serial run / controller
+
+# a valid password has at least one character of every class
+PASSWORD_CLASSES = (
+    string.ascii_lowercase,
+    string.ascii_uppercase,
+    string.digits,
+    PUNCTUATION,
+)
+PASSWORD_ALPHABET = "".join(PASSWORD_CLASSES)
+
+
+@dataclass(frozen=True)
+class Identity:
+    email: str
+    password: str
+    nickname: str
+
+
+# all two-character base36 strings, the token is encoded two digits at a time
+_BASE36_PAIRS = [a + b for a in BASE36 for b in BASE36]
+
+
+def _token(value) -> str:
+    """`value` < 36 ** 8 as 8 base36 characters, 36 ** 8 > 2 ** 40 fits every token."""
+    high, low = divmod(value, 1296**2)
+    pairs = _BASE36_PAIRS
+    return (
+        pairs[high // 1296]
+        + pairs[high % 1296]
+        + pairs[low // 1296]
+        + pairs[low % 1296]
+    )
+
+
+@lru_cache(maxsize=None)
+def _positions(length) -> list:
+    """Distinct positions for the required characters of a password."""
+    return list(itertools.permutations(range(length), len(PASSWORD_CLASSES)))
+
+
+class _Permutation:
+    """Keyed bijection of [0, 2**40): a 4-round balanced Feistel network."""
+
+    def __init__(self, rng):
+        self.keys = [rng.getrandbits(_HALF_BITS) for _ in range(_ROUNDS)]
+
+    def __call__(self, value) -> int:
+        left, right = value >> _HALF_BITS, value & _HALF_MASK
+        for key in self.keys:
+            mixed = ((right * 0x9E3779B1) ^ key ^ (right >> 7)) & _HALF_MASK
+            left, right = right, left ^ mixed
+        return (left << _HALF_BITS) | right
+
+
+class IdentityGenerator:
+    """
+    Seedable generator of unique identities, partitioned by parallel worker.
+
+    Args:
+        seed (int, optional): Seed of tokens, domains and passwords; the run
+            seed in a `--workers` process, drawn from `random` otherwise.
+        worker (int, optional): Parallel worker index, the current worker by
+            default. Identities of different workers never collide.
+        label (str): Email prefix the DB sweeper searches for.
+        password_length (int): Length of generated passwords, at least 4.
+    """
+
+    def __init__(self, seed=None, worker=None, label=LABEL, password_length=12):
+        if password_length < 4:
+            raise ValueError("password_length must be at least 4")
+        if worker is None:
+            worker = worker_id()
+        slot = 0 if worker is None else worker + 1
+        if slot >= MAX_WORKER_SLOTS:
+            raise ValueError(f"worker index {worker} is out of range")
+        if seed is None:
+            seed = run_seed()
+        self.seed = random.getrandbits(64) if seed is None else seed
+        self.worker = worker
+        self.label = label
+        self.password_length = password_length
+        self._slot = slot
+        self._rng = random.Random(self.seed)
+        self._email_tokens = _Permutation(self._rng)
+        self._nickname_tokens = _Permutation(self._rng)
+        self._run_tag = _token(self.seed % 36**4)[4:]
+        self._counter = 0
+        self._buffer = []
+        self._lock = threading.Lock()
+
+    def _indexes(self, n) -> range:
+        with self._lock:
+            start = self._counter
+            if start + n > MAX_COUNTER:
+                raise OverflowError("identity counter exhausted, use another seed")
+            self._counter += n
+        base = self._slot << 32
+        return range(base + start, base + start + n)
+
+    def _emails(self, indexes) -> list:
+        with self._lock:
+            domains = self._rng.choices(EMAIL_DOMAINS, k=len(indexes))
+        prefix = f"{self.label}{self._run_tag}"
+        return [
+            f"{prefix}{_token(self._email_tokens(index))}@{domain}"
+            for index, domain in zip(indexes, domains)
+        ]
+
+    def _nicknames(self, indexes) -> list:
+        return [_token(self._nickname_tokens(index)) for index in indexes]
+
+    def emails(self, n) -> list:
+        """`n` unique emails."""
+        return self._emails(self._indexes(n))
+
+    def nicknames(self, n) -> list:
+        """`n` unique valid nicknames (lowercase letters and digits)."""
+        return self._nicknames(self._indexes(n))
+
+    def passwords(self, n) -> list:
+        """`n` valid passwords: lower and upper case letters, digits and punctuation."""
+        length = self.password_length
+        with self._lock:
+            rng = self._rng
+            # one draw for all characters, one per required class, one for the
+            # positions the required characters overwrite
+            chars = rng.choices(PASSWORD_ALPHABET, k=n * length)
+            required = [rng.choices(pool, k=n) for pool in PASSWORD_CLASSES]
+            positions = rng.choices(_positions(length), k=n)
+        passwords = []
+        for i, places in enumerate(positions):
+            password = chars[i * length : (i + 1) * length]
+            for pool, place in zip(required, places):
+                password[place] = pool[i]
+            passwords.append("".join(password))
+        return passwords
+
+    def batch(self, n) -> list:
+        """`n` unique identities."""
+        indexes = self._indexes(n)
+        return [
+            Identity(email, password, nickname)
+            for email, password, nickname in zip(
+                self._emails(indexes), self.passwords(n), self._nicknames(indexes)
+            )
+        ]
+
+    def identity(self) -> Identity:
+        """One identity, taken from batches of IDENTITY_BATCH_SIZE."""
+        with self._lock:
+            if self._buffer:
+                return self._buffer.pop()
+        identities = self.batch(IDENTITY_BATCH_SIZE)
+        with self._lock:
+            self._buffer.extend(reversed(identities[1:]))
+        return identities[0]
+
+
+_generator = None
+_generator_lock = threading.Lock()
+
+
+def get_identity_generator() -> IdentityGenerator:
+    """Process-wide generator for the current worker, created on first use."""
+    global _generator
+    with _generator_lock:
+        if _generator is None:
+            _generator = IdentityGenerator()
+        return _generator
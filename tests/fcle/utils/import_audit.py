@@ -0,0 +1,155 @@
+"""
+Import-cost audit of the suite's start-up.
+
+Runs pytest's collection in a child interpreter with `python -X importtime`
+and reports where start-up time goes: the slowest modules by cumulative and by
+self time, and self time summed per top-level package. Every parallel worker
+pays this cost again, so anything heavy that shows up here and is only needed
+by some tests belongs behind utils/lazy_import.py.
+
+Run it from tests/fcle; arguments after `--` are passed to pytest:
+
+    python -m utils.import_audit --top 20
+    python -m utils.import_audit --json imports.json -- --local-api
+"""
+
+import json
+import re
+import subprocess
+import sys
+from collections import defaultdict
+from dataclasses import dataclass
+from pathlib import Path
+
+# "import time:       self [us] |  cumulative | imported package"
+IMPORTTIME_LINE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|( *)(\S+)\s*$")
+
+# top-level packages of this repository, marked in the report
+PROJECT_PACKAGES = {"conftest", "fixtures", "parametrs", "settings", "utils"}
+
+
+@dataclass
+class ModuleImport:
+    name: str
+    self_us: int
+    cumulative_us: int
+    depth: int
+
+    @property
+    def package(self) -> str:
+        return self.name.split(".")[0]
+
+    @property
+    def project(self) -> bool:
+        return self.package in PROJECT_PACKAGES or any(
+            part.startswith("test_") for part in self.name.split(".")
+        )
+
+
+def parse_importtime(text) -> list:
+    """Parses `-X importtime` output into ModuleImport entries, in output order."""
+    imports = []
+    for line in text.splitlines():
+        match = IMPORTTIME_LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, name = match.groups()
+            imports.append(
+                ModuleImport(name, int(self_us), int(cumulative_us), len(indent) // 2)
+            )
+    return imports
+
+
+def root_dir() -> Path:
+    """Directory with pytest.ini, pytest is run from there."""
+    for parent in Path(__file__).resolve().parents:
+        if (parent / "pytest.ini").is_file():
+            return parent
+    return Path.cwd()
+
+
+def collect_imports(pytest_args=()) -> list:
+    """Imports of `pytest --collect-only` with the given arguments."""
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-m", "pytest", "--collect-only", "-q"]
+        + list(pytest_args),
+        cwd=root_dir(),
+        capture_output=True,
+        text=True,
+    )
+    return parse_importtime(completed.stderr)
+
+
+def summarize(imports, top=15) -> dict:
+    packages = defaultdict(int)
+    for entry in imports:
+        packages[entry.package] += entry.self_us
+    by_cumulative = sorted(imports, key=lambda e: e.cumulative_us, reverse=True)
+    by_self = sorted(imports, key=lambda e: e.self_us, reverse=True)
+    return {
+        "modules": len(imports),
+        "total_us": sum(entry.self_us for entry in imports),
+        "project_us": sum(entry.self_us for entry in imports if entry.project),
+        "by_cumulative": [_row(entry) for entry in by_cumulative[:top]],
+        "by_self": [_row(entry) for entry in by_self[:top]],
+        "packages": dict(sorted(packages.items(), key=lambda kv: kv[1], reverse=True)),
+    }
+
+
+def _row(entry) -> dict:
+    return {
+        "module": entry.name,
+        "self_us": entry.self_us,
+        "cumulative_us": entry.cumulative_us,
+        "project": entry.project,
+    }
+
+
+def format_report(summary, top=15) -> str:
+    lines = [
+        f"{summary['modules']} modules imported in {summary['total_us'] / 1000:.1f} ms "
+        f"({summary['project_us'] / 1000:.1f} ms in this repository)",
+    ]
+    for title, key in (
+        ("slowest by cumulative time", "by_cumulative"),
+        ("slowest by self time", "by_self"),
+    ):
+        lines.append("")
+        lines.append(f"{title}:")
+        lines.append(f"  {'cumulative ms':>13}{'self ms':>10}  module")
+        for row in summary[key]:
+            mark = "  *" if row["project"] else ""
+            lines.append(
+                f"  {row['cumulative_us'] / 1000:>13.1f}{row['self_us'] / 1000:>10.1f}"
+                f"  {row['module']}{mark}"
+            )
+    lines.append("")
+    lines.append("self time per top-level package:")
+    for package, self_us in list(summary["packages"].items())[:top]:
+        mark = "  *" if package in PROJECT_PACKAGES else ""
+        lines.append(f"  {self_us / 1000:>13.1f}  {package}{mark}")
+    lines.append("")
+    lines.append("* module of this repository")
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--top", type=int, default=15, help="rows per table")
+    parser.add_argument("--json", default=None, help="also write the report here")
+    parser.add_argument("pytest_args", nargs="*", help="arguments for pytest, after --")
+    args = parser.parse_args(argv)
+
+    imports = collect_imports(args.pytest_args)
+    if not imports:
+        sys.exit("pytest produced no -X importtime output")
+    summary = summarize(imports, args.top)
+    print(format_report(summary, args.top))
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(summary, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
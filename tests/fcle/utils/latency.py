@@ -0,0 +1,276 @@
+"""
+Per-request latency collection for the shared transports.
+
+`HttpTransport.request` and `AsyncHttpTransport.request` report every call to
+the session-wide `LatencyRecorder` with:
+
+    endpoint  ENDPOINTS key of the path (see `endpoint_key`)
+    method, status, request/response body sizes
+    dns, connect, ttfb, total timings (dns/connect only for new connections)
+    node id of the running test
+
+Timings go into `LatencyHistogram`s keyed by (endpoint, method, status), so the
+memory cost does not grow with the number of requests. With `--latency-report`
+the summary is written at session end as JSON (with the histogram buckets,
+suitable for build-over-build comparison) or CSV (one row per key).
+"""
+
+import csv
+import json
+import re
+import threading
+import time
+from dataclasses import dataclass
+from functools import lru_cache
+from urllib.parse import urlsplit
+
+from settings import BASE_URL, ENDPOINTS
+from utils.histogram import LatencyHistogram
+
+PERCENTILES = (50, 90, 95, 99)
+TIMINGS = ("total", "ttfb", "connect", "dns")
+
+# path segments that identify an entity rather than a route
+_ID_SEGMENT = re.compile(r"^(\d+|[0-9a-fA-F]{8}-[0-9a-fA-F-]{27})$")
+
+
+@lru_cache(maxsize=None)
+def _routes():
+    """ENDPOINTS values (normalized) -> key, first key wins for duplicates."""
+    routes = {}
+    for key, value in ENDPOINTS.items():
+        routes.setdefault(value.strip("/").lower(), key)
+    return routes
+
+
+@lru_cache(maxsize=4096)
+def endpoint_key(url: str, base_url: str = BASE_URL) -> str:
+    """
+    Maps a request URL to a low-cardinality endpoint label.
+
+    Args:
+        url (str): Absolute request URL.
+        base_url (str): API prefix stripped before matching.
+
+    Returns:
+        str: The ENDPOINTS key for an exact route, `key/{id}` or `key/rest`
+        for sub-paths of a known route (numeric/uuid segments become `{id}`),
+        or the normalized path if no ENDPOINTS value matches.
+    """
+    path = urlsplit(url).path
+    prefix = urlsplit(base_url).path
+    if prefix.strip("/") and path.startswith(prefix.rstrip("/")):
+        path = path[len(prefix.rstrip("/")) :]
+
+    segments = [
+        "{id}" if _ID_SEGMENT.match(segment) else segment.lower()
+        for segment in path.strip("/").split("/")
+        if segment
+    ]
+    routes = _routes()
+    for cut in range(len(segments), 0, -1):
+        key = routes.get("/".join(segments[:cut]))
+        if key is not None:
+            return "/".join([key, *segments[cut:]])
+    return "/".join(segments) or "/"
+
+
+@dataclass
+class RequestTiming:
+    """Timestamps filled in by the timed urllib3 connections for one request."""
+
+    dns: float = None
+    connect: float = None
+    sent: float = None
+    headers: float = None
+
+    def add_dns(self, seconds):
+        self.dns = (self.dns or 0.0) + seconds
+
+    def add_connect(self, seconds):
+        self.connect = (self.connect or 0.0) + seconds
+
+    @property
+    def ttfb(self):
+        if self.sent is None or self.headers is None:
+            return None
+        return self.headers - self.sent
+
+
+_local = threading.local()
+
+
+def current_timing():
+    """RequestTiming of the request running on this thread, if any."""
+    return getattr(_local, "timing", None)
+
+
+def start_timing() -> RequestTiming:
+    _local.timing = RequestTiming()
+    return _local.timing
+
+
+def stop_timing():
+    _local.timing = None
+
+
+def body_size(body) -> int:
+    """Size of a request/response body without consuming it."""
+    if body is None:
+        return 0
+    if isinstance(body, (bytes, bytearray, str)):
+        return len(body)
+    try:
+        return len(body)
+    except TypeError:
+        return 0
+
+
+class _Entry:
+    __slots__ = ("histograms", "requests", "request_bytes", "response_bytes")
+
+    def __init__(self):
+        self.histograms = {name: LatencyHistogram() for name in TIMINGS}
+        self.requests = 0
+        self.request_bytes = 0
+        self.response_bytes = 0
+
+    def merge(self, other):
+        for name in TIMINGS:
+            self.histograms[name].merge(other.histograms[name])
+        self.requests += other.requests
+        self.request_bytes += other.request_bytes
+        self.response_bytes += other.response_bytes
+
+
+class LatencyRecorder:
+    """
+    Thread-safe aggregate of request timings.
+
+    Attributes:
+        node (str | None): Node id of the running test, set by conftest hooks.
+    """
+
+    def __init__(self):
+        self.node = None
+        self.entries = {}
+        self.nodes = {}
+        self._lock = threading.Lock()
+
+    def record(
+        self,
+        endpoint,
+        method,
+        status,
+        total,
+        ttfb=None,
+        connect=None,
+        dns=None,
+        request_bytes=0,
+        response_bytes=0,
+    ):
+        """Records one request, timings in seconds."""
+        node = self.node
+        with self._lock:
+            entry = self.entries.get((endpoint, method, status))
+            if entry is None:
+                entry = self.entries[(endpoint, method, status)] = _Entry()
+            entry.requests += 1
+            entry.request_bytes += request_bytes
+            entry.response_bytes += response_bytes
+            for name, seconds in (
+                ("total", total),
+                ("ttfb", ttfb),
+                ("connect", connect),
+                ("dns", dns),
+            ):
+                if seconds is not None:
+                    entry.histograms[name].record(seconds * 1_000_000)
+            if node is not None:
+                stats = self.nodes.setdefault(node, [0, 0.0])
+                stats[0] += 1
+                stats[1] += total
+
+    def __len__(self):
+        return sum(entry.requests for entry in self.entries.values())
+
+    def merge_dump(self, data: dict):
+        """Adds a `dump()` from another process (e.g. a `--workers` worker)."""
+        with self._lock:
+            for row in data.get("endpoints", []):
+                other = _Entry()
+                other.requests = row["requests"]
+                other.request_bytes = row["request_bytes"]
+                other.response_bytes = row["response_bytes"]
+                other.histograms = {
+                    name: LatencyHistogram.from_dict(row["histograms"][name])
+                    for name in TIMINGS
+                }
+                key = (row["endpoint"], row["method"], row["status"])
+                self.entries.setdefault(key, _Entry()).merge(other)
+            for node, (requests, seconds) in data.get("nodes", {}).items():
+                stats = self.nodes.setdefault(node, [0, 0.0])
+                stats[0] += requests
+                stats[1] += seconds
+
+    def rows(self, histograms=False) -> list:
+        """Summary rows, timings in milliseconds."""
+        with self._lock:
+            items = sorted(self.entries.items(), key=lambda kv: tuple(map(str, kv[0])))
+            rows = []
+            for (endpoint, method, status), entry in items:
+                row = {
+                    "endpoint": endpoint,
+                    "method": method,
+                    "status": status,
+                    "requests": entry.requests,
+                    "request_bytes": entry.request_bytes,
+                    "response_bytes": entry.response_bytes,
+                }
+                for name in TIMINGS:
+                    histogram = entry.histograms[name]
+                    row[f"{name}_count"] = histogram.count
+                    row[f"{name}_mean_ms"] = _ms(histogram.mean)
+                    row[f"{name}_max_ms"] = _ms(histogram.max)
+                    for q in PERCENTILES:
+                        row[f"{name}_p{q}_ms"] = _ms(histogram.percentile(q))
+                if histograms:
+                    row["histograms"] = {
+                        name: entry.histograms[name].to_dict() for name in TIMINGS
+                    }
+                rows.append(row)
+            return rows
+
+    def dump(self) -> dict:
+        with self._lock:
+            nodes = {node: list(stats) for node, stats in self.nodes.items()}
+        return {
+            "generated": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "base_url": BASE_URL,
+            "endpoints": self.rows(histograms=True),
+            "nodes": nodes,
+        }
+
+    def write(self, path):
+        """Writes the summary, CSV if `path` ends with .csv, JSON otherwise."""
+        if str(path).lower().endswith(".csv"):
+            rows = self.rows()
+            with open(path, "w", newline="", encoding="utf-8") as f:
+                if rows:
+                    writer = csv.DictWriter(f, fieldnames=list(rows[0]))
+                    writer.writeheader()
+                    writer.writerows(rows)
+            return
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.dump(), f, indent=2)
+
+
+def _ms(microseconds):
+    return round(microseconds / 1000, 3) if microseconds is not None else None
+
+
+_recorder = LatencyRecorder()
+
+
+def get_recorder() -> LatencyRecorder:
+    return _recorder
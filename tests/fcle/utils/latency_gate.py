@@ -0,0 +1,225 @@
+"""
+Latency regression gate against a stored baseline.
+
+`--latency-save-baseline PATH` stores the total-time histograms of the run per
+(endpoint, method). `--latency-baseline PATH` compares the current run with
+that file and fails the session when an endpoint's p95 regressed. A baseline
+that cannot be read is a usage error before any test runs, so a wrong path
+in CI does not turn the gate off.
+
+Only responses that reached the server with a status below 500 are compared:
+transport errors and 5xx answer fast or time out and would skew both sides.
+
+Significance:
+    With a baseline p95 of B and a tolerance t, the threshold is B * (1 + t).
+    If the endpoint did not regress, a request exceeds the threshold with a
+    probability of at most 5%, so the number of exceeding requests k out of n
+    is bounded by Binomial(n, 0.05). The endpoint is reported as a regression
+    when P(K >= k) is below `alpha`. A handful of slow requests on an endpoint
+    called a few times therefore does not fail the build, while a consistent
+    shift does, even if the raw current p95 is noisy.
+"""
+
+import json
+import math
+import time
+from dataclasses import dataclass
+
+import pytest
+
+from settings import (
+    LATENCY_ALPHA,
+    LATENCY_MIN_SAMPLES,
+    LATENCY_TOLERANCE,
+)
+from utils.histogram import LatencyHistogram
+
+# share of requests allowed above the baseline p95 when nothing regressed
+P95_EXCEEDANCE = 0.05
+
+
+def binomial_sf(k, n, p) -> float:
+    """P(K >= k) for K ~ Binomial(n, p)."""
+    if k <= 0:
+        return 1.0
+    if k > n:
+        return 0.0
+    log_p, log_q = math.log(p), math.log1p(-p)
+    terms = [
+        math.lgamma(n + 1)
+        - math.lgamma(i + 1)
+        - math.lgamma(n - i + 1)
+        + i * log_p
+        + (n - i) * log_q
+        for i in range(k, n + 1)
+    ]
+    top = max(terms)
+    return min(1.0, math.exp(top) * sum(math.exp(t - top) for t in terms))
+
+
+def endpoint_histograms(recorder) -> dict:
+    """Total-time histograms per "endpoint METHOD" over statuses below 500."""
+    histograms = {}
+    with recorder._lock:
+        for (endpoint, method, status), entry in recorder.entries.items():
+            if not isinstance(status, int) or status >= 500:
+                continue
+            key = f"{endpoint} {method}"
+            histograms.setdefault(key, LatencyHistogram()).merge(
+                entry.histograms["total"]
+            )
+    return histograms
+
+
+def save_baseline(recorder, path):
+    histograms = endpoint_histograms(recorder)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(
+            {
+                "generated": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+                "endpoints": {
+                    key: {
+                        "p95_ms": round(histogram.percentile(95) / 1000, 3),
+                        "histogram": histogram.to_dict(),
+                    }
+                    for key, histogram in sorted(histograms.items())
+                },
+            },
+            f,
+            indent=2,
+        )
+
+
+def load_baseline(path) -> dict:
+    """
+    Returns {"endpoint METHOD": LatencyHistogram} from a saved baseline.
+
+    Raises:
+        OSError: The file cannot be read.
+        ValueError: The file is not a saved baseline.
+    """
+    with open(path, encoding="utf-8") as f:
+        data = json.load(f)
+    try:
+        return {
+            key: LatencyHistogram.from_dict(entry["histogram"])
+            for key, entry in data["endpoints"].items()
+        }
+    except (AttributeError, KeyError, TypeError) as e:
+        raise ValueError(f"not a latency baseline: {e!r}") from e
+
+
+@dataclass
+class Comparison:
+    endpoint: str
+    samples: int
+    baseline_p95: float  # milliseconds
+    current_p95: float  # milliseconds
+    threshold: float  # milliseconds
+    exceeding: int
+    p_value: float
+    regressed: bool
+
+
+def compare(
+    baseline,
+    current,
+    tolerance=LATENCY_TOLERANCE,
+    alpha=LATENCY_ALPHA,
+    min_samples=LATENCY_MIN_SAMPLES,
+):
+    """
+    Compares current histograms with the baseline, see module docstring.
+
+    Args:
+        baseline (dict): {"endpoint METHOD": LatencyHistogram} of the baseline.
+        current (dict): Same for the current run.
+        tolerance (float): Allowed relative p95 growth, 0.2 = 20%.
+        alpha (float): Significance level of the exceedance test.
+        min_samples (int): Endpoints with fewer current requests are skipped.
+
+    Returns:
+        list[Comparison]: One entry per endpoint present in both runs.
+    """
+    comparisons = []
+    for key in sorted(baseline.keys() & current.keys()):
+        histogram = current[key]
+        if histogram.count < min_samples or not baseline[key].count:
+            continue
+        baseline_p95 = baseline[key].percentile(95)
+        threshold = baseline_p95 * (1 + tolerance)
+        exceeding = histogram.count_above(threshold)
+        p_value = binomial_sf(exceeding, histogram.count, P95_EXCEEDANCE)
+        comparisons.append(
+            Comparison(
+                endpoint=key,
+                samples=histogram.count,
+                baseline_p95=baseline_p95 / 1000,
+                current_p95=histogram.percentile(95) / 1000,
+                threshold=threshold / 1000,
+                exceeding=exceeding,
+                p_value=p_value,
+                regressed=p_value < alpha,
+            )
+        )
+    return comparisons
+
+
+class LatencyGate:
+    """
+    pytest plugin: saves and/or checks the latency baseline at session end.
+
+    The baseline is loaded right away, `load_baseline` errors propagate.
+    """
+
+    def __init__(
+        self,
+        recorder,
+        baseline_path=None,
+        save_path=None,
+        tolerance=LATENCY_TOLERANCE,
+        alpha=LATENCY_ALPHA,
+        min_samples=LATENCY_MIN_SAMPLES,
+    ):
+        self.recorder = recorder
+        self.baseline_path = baseline_path
+        self.save_path = save_path
+        self.tolerance = tolerance
+        self.alpha = alpha
+        self.min_samples = min_samples
+        self.comparisons = []
+        self.baseline = load_baseline(baseline_path) if baseline_path else None
+
+    @pytest.hookimpl(trylast=True)
+    def pytest_sessionfinish(self, session):
+        if self.baseline is not None:
+            self.comparisons = compare(
+                self.baseline,
+                endpoint_histograms(self.recorder),
+                self.tolerance,
+                self.alpha,
+                self.min_samples,
+            )
+            if any(c.regressed for c in self.comparisons):
+                session.exitstatus = pytest.ExitCode.TESTS_FAILED
+        if self.save_path:
+            save_baseline(self.recorder, self.save_path)
+
+    def pytest_terminal_summary(self, terminalreporter):
+        if not self.baseline_path:
+            return
+        terminalreporter.section("latency baseline")
+        terminalreporter.write_line(
+            f"tolerance {self.tolerance:.0%}, alpha {self.alpha}, "
+            f"min samples {self.min_samples}, baseline {self.baseline_path}"
+        )
+        for c in self.comparisons:
+            verdict = "REGRESSION" if c.regressed else "ok"
+            terminalreporter.write_line(
+                f"{verdict:<10} {c.endpoint:<40} p95 {c.baseline_p95:.1f} -> "
+                f"{c.current_p95:.1f} ms, {c.exceeding}/{c.samples} above "
+                f"{c.threshold:.1f} ms, p={c.p_value:.2g}",
+                red=c.regressed,
+            )
+        if not self.comparisons:
+            terminalreporter.write_line("no endpoint had enough samples in both runs")
@@ -0,0 +1,73 @@
+"""
+Deferred imports for heavy dependencies.
+
+Every test module reaches utils/ and the fixture modules at collection time, so a
+module-level `Faker()` or `import jsonschema` is paid by every run and every
+parallel worker, also when no test that needs it is selected. These helpers
+load on first use instead:
+
+    jsonschema = lazy_module("jsonschema")      # imported on first attribute access
+    faker = LazyObject(_make_faker)             # Faker() built on first attribute access
+
+`python -m utils.import_audit` shows what start-up still imports.
+"""
+
+import importlib
+import importlib.util
+import sys
+import threading
+
+
+def lazy_module(name):
+    """
+    Returns module `name`, executed on its first attribute access.
+
+    An already imported module is returned as is. A missing module raises
+    ModuleNotFoundError here, not at first use.
+    """
+    module = sys.modules.get(name)
+    if module is not None:
+        return module
+    spec = importlib.util.find_spec(name)
+    if spec is None:
+        raise ModuleNotFoundError(f"No module named {name!r}", name=name)
+    loader = importlib.util.LazyLoader(spec.loader)
+    spec.loader = loader
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    loader.exec_module(module)
+    return module
+
+
+class LazyObject:
+    """
+    Proxy for an object that is built by `factory()` on first attribute access.
+
+    The object is built once, also when several threads reach it at the same time.
+    """
+
+    __slots__ = ("_factory", "_object", "_lock")
+
+    def __init__(self, factory):
+        self._factory = factory
+        self._object = None
+        self._lock = threading.Lock()
+
+    def _get(self):
+        if self._object is None:
+            with self._lock:
+                if self._object is None:
+                    self._object = self._factory()
+        return self._object
+
+    @property
+    def loaded(self) -> bool:
+        return self._object is not None
+
+    def __getattr__(self, name):
+        return getattr(self._get(), name)
+
+    def __repr__(self):
+        if self._object is None:
+            return f"<LazyObject {getattr(self._factory, '__name__', self._factory)}>"
+        return repr(self._object)
@@ -0,0 +1,99 @@
+"""
+Parameter sets that are generated when a test runs, not when it is collected.
+
+Fixture modules used to build their parameter matrix at import time, e.g.
+
+    params = [parameter_generation("valid", "empty", OK), ...]
+
+which runs the email/password/Faker generators for every row while pytest
+collects, also for rows that `-k`, markers or a parallel shard deselect. The ids
+were made from the generated values, so they changed from run to run and
+differed between parallel workers.
+
+`lazy_params` keeps only the factory and its arguments; the id is built from the
+arguments, so it is stable:
+
+    params = lazy_params(
+        parameter_generation,
+        [("valid", "empty", OK), ...],
+        ids="email={0},lang={1},status={2}",
+    )
+
+    @pytest.fixture(params=params)
+    def signup_params(request):
+        return materialize(request.param)
+
+`materialize` calls the factory during fixture setup, after the cassette plugin
+seeded the generators for the test, so recorded runs stay reproducible.
+"""
+
+import pytest
+
+
+class LazyParam:
+    """
+    One parameter set: `factory(*args, **kwargs)`, called by `materialize`.
+
+    Attributes:
+        id (str): Test id of the parameter set.
+    """
+
+    __slots__ = ("factory", "args", "kwargs", "id")
+
+    def __init__(self, factory, args=(), kwargs=None, id=None):
+        self.factory = factory
+        self.args = tuple(args)
+        self.kwargs = kwargs or {}
+        self.id = id
+
+    def materialize(self):
+        return self.factory(*self.args, **self.kwargs)
+
+    def __repr__(self):
+        return (
+            f"LazyParam({self.id or getattr(self.factory, '__name__', self.factory)})"
+        )
+
+
+def lazy_param(factory, *args, id=None, marks=(), **kwargs):
+    """
+    Returns a `pytest.param` for a single lazily generated parameter set.
+
+    Args:
+        factory (callable): Builds the values, called once per test.
+        *args, **kwargs: Arguments of `factory`.
+        id (str, optional): Test id, `factory` arguments joined by "-" by default.
+        marks: Marks of the parameter set, as for `pytest.param`.
+    """
+    if id is None:
+        id = "-".join(str(arg) for arg in (*args, *kwargs.values()))
+    return pytest.param(LazyParam(factory, args, kwargs, id), id=id, marks=marks)
+
+
+def lazy_params(factory, cases, ids=None, **kwargs):
+    """
+    Returns `pytest.param`s for `factory(*case, **kwargs)` of every case.
+
+    Args:
+        factory (callable): Builds the values of one parameter set.
+        cases (iterable[tuple]): Positional arguments of `factory`, one tuple per set.
+        ids (str | callable, optional): A format string applied to the case
+            (`"email={0},status={1}"`) or a function `case -> id`.
+        **kwargs: Keyword arguments passed to every `factory` call.
+    """
+    params = []
+    for case in cases:
+        case = tuple(case)
+        if ids is None:
+            id = None
+        elif callable(ids):
+            id = ids(case)
+        else:
+            id = ids.format(*case)
+        params.append(lazy_param(factory, *case, id=id, **kwargs))
+    return params
+
+
+def materialize(param):
+    """Values of a parameter set: generated for a LazyParam, `param` itself otherwise."""
+    return param.materialize() if isinstance(param, LazyParam) else param
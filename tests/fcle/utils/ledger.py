@@ -0,0 +1,67 @@
+"""
+Ledger of the accounts the suite registers.
+
+Every generated email starts with `LABEL` so test users can be told apart in
+the DB, but the API cannot search users, and deleting one needs its password.
+`register_user` therefore appends every account it registers to a JSONL ledger,
+one line per account:
+
+    {"email": "labelfordb...@gmail.com", "password": "...", "created": 1760000000.0}
+
+`python -m utils.sweeper` reads it back and deletes the accounts. Parallel
+workers append to the same file; every entry is one short write to a file
+opened in append mode, so lines do not interleave.
+"""
+
+import json
+import threading
+import time
+from pathlib import Path
+
+from settings import ACCOUNT_LEDGER, LABEL
+from utils.import_audit import root_dir
+
+_path = None
+_lock = threading.Lock()
+
+
+def ledger_path(path=ACCOUNT_LEDGER) -> Path:
+    """`path`, relative paths taken from the directory with pytest.ini."""
+    path = Path(path)
+    return path if path.is_absolute() else root_dir() / path
+
+
+def configure_ledger(path):
+    """Starts recording registered accounts to `path`, None stops."""
+    global _path
+    _path = None if path is None else Path(path)
+
+
+def record_account(email, password):
+    """Appends an account to the configured ledger, if any."""
+    if _path is None:
+        return
+    line = json.dumps({"email": email, "password": password, "created": time.time()})
+    with _lock, open(_path, "a", encoding="utf-8") as f:
+        f.write(line + "\n")
+
+
+def read_ledger(path, label=LABEL) -> list:
+    """
+    Accounts of the ledger at `path` whose email starts with `label`.
+
+    Returns:
+        list[dict]: One entry per email, the last one recorded, in ledger order.
+    """
+    accounts = {}
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            try:
+                entry = json.loads(line)
+            except json.JSONDecodeError:
+                continue  # a line cut short by a killed run
+            email = entry.get("email", "")
+            if email.startswith(label) and entry.get("password"):
+                accounts.pop(email, None)
+                accounts[email] = entry
+    return list(accounts.values())
@@ -0,0 +1,391 @@
+"""
+Load-test mode built from the suite's own parameter generators.
+
+`pytest --load-duration 60 --load-rps 20 --load-ramp 15` skips the tests and
+replays their scenarios as an open-loop traffic profile instead:
+
+    login               fixtures.auth.fixture_login.PARAMS
+    teacher_educations  parametrs.parameters_teacher_educations.generate_cases("GET")
+    learning_materials  fixtures.learning_materials.fixture_learning_materials_cases.valid_cases
+
+Arrivals follow a linear ramp from 0 to the target RPS, then stay flat until
+the duration ends. Requests are sent on schedule whether or not earlier ones
+have finished, and latency is measured from the scheduled send time, so a
+stalled server shows up in the percentiles instead of silently lowering the
+request rate.
+
+A request is an error when it raises or its status does not match the
+scenario's expected status. Results are reported per `settings.ENDPOINTS` key.
+
+The authorized scenarios share one registered user. Its token is renewed in
+the background and read at every arrival, so a run longer than the JWT
+lifetime keeps its auth. When the run ends the user is swept with everything
+it created, e.g. the posted learning materials (utils/sweeper.py); a user the
+sweep misses stays in the ledger for `python -m utils.sweeper`.
+"""
+
+import json
+import math
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Callable, Iterable
+
+import pytest
+
+from fixtures.auth.fixture_login import PARAMS as LOGIN_PARAMS
+from fixtures.learning_materials.fixture_learning_materials_cases import (
+    valid_cases,
+    valid_payload,
+)
+from parametrs.parameters_teacher_educations import generate_cases
+from settings import (
+    ENDPOINTS,
+    LOAD_MIX,
+    LOAD_RAMP,
+    LOAD_RPS,
+    LOAD_WORKERS,
+)
+from utils.lazy_params import materialize
+from utils.sweeper import Sweeper
+from utils.transport import get_transport
+from utils.user_pool import UserPool
+
+
+@dataclass
+class LoadRequest:
+    """One request of a scenario and the statuses that count as success."""
+
+    method: str
+    endpoint: str
+    expected: Iterable[int]
+    kwargs: dict = field(default_factory=dict)
+
+
+@dataclass
+class Scenario:
+    """
+    Weighted traffic source.
+
+    Attributes:
+        name (str): Scenario name used in LOAD_MIX / --load-mix.
+        endpoint_key (str): Key in settings.ENDPOINTS the results are reported under.
+        make (callable): `make(rng, auth) -> LoadRequest`, `auth` is a dict of headers.
+    """
+
+    name: str
+    endpoint_key: str
+    make: Callable
+
+
+# Names of the valid LearningMaterials payloads, as in the POST tests
+LEARNING_MATERIAL_CASES = tuple(valid_cases())
+
+
+def _login(rng, auth):
+    # a row of the login tests' covering array, generated like in the fixture
+    param = rng.choice(LOGIN_PARAMS)
+    email, password, timezone, status = materialize(param.values[0])
+    return LoadRequest(
+        "POST",
+        ENDPOINTS["login"],
+        (status,),
+        {"json": {"email": email, "password": password, "timezone": timezone}},
+    )
+
+
+def _teacher_educations(rng, auth):
+    case = rng.choice(generate_cases("GET"))
+    headers = {"Accept": "application/json"}
+    if case.requires_auth:
+        if case.label == "invalid_token":
+            headers["Authorization"] = "Bearer invalid.token.value"
+        else:
+            headers |= auth
+    expected = (
+        (case.expected_status,)
+        if isinstance(case.expected_status, int)
+        else tuple(case.expected_status)
+    )
+    return LoadRequest(
+        "GET",
+        ENDPOINTS["teacher_educations"],
+        expected,
+        {"params": case.params, "headers": headers},
+    )
+
+
+def _learning_materials(rng, auth):
+    payload = valid_payload(rng.choice(LEARNING_MATERIAL_CASES))
+    return LoadRequest(
+        "POST",
+        ENDPOINTS["learning_materials"],
+        (200, 201),
+        {"json": payload, "headers": auth},
+    )
+
+
+SCENARIOS = {
+    "login": Scenario("login", "login", _login),
+    "teacher_educations": Scenario(
+        "teacher_educations", "teacher_educations", _teacher_educations
+    ),
+    "learning_materials": Scenario(
+        "learning_materials", "learning_materials", _learning_materials
+    ),
+}
+
+
+def parse_mix(value) -> dict:
+    """
+    Parses `name=weight,name=weight` into a mix dict.
+
+    Raises:
+        ValueError: On unknown scenario names or non-positive weights.
+    """
+    if not value:
+        return dict(LOAD_MIX)
+    mix = {}
+    for part in value.split(","):
+        name, _, weight = part.partition("=")
+        name = name.strip()
+        if name not in SCENARIOS:
+            raise ValueError(f"Unknown load scenario: {name}")
+        mix[name] = float(weight) if weight else 1.0
+        if mix[name] <= 0:
+            raise ValueError(f"Weight of {name} must be positive")
+    return mix
+
+
+def arrival_times(rps, ramp, duration):
+    """
+    Yields scheduled send times (seconds from start) for a linear ramp to `rps`.
+
+    During the ramp the rate grows as rps * t / ramp, so the k-th arrival is at
+    sqrt(2 * ramp * k / rps); afterwards arrivals are 1 / rps apart.
+    """
+    if rps <= 0:
+        return
+    ramp = max(0.0, min(ramp, duration))
+    ramp_requests = rps * ramp / 2
+    k = 0
+    while True:
+        k += 1
+        if k <= ramp_requests:
+            t = math.sqrt(2 * ramp * k / rps)
+        else:
+            t = ramp + (k - ramp_requests) / rps
+        if t >= duration:
+            return
+        yield t
+
+
+def percentile(values, q):
+    """Nearest-rank percentile of a sorted list, `q` in 0..100."""
+    if not values:
+        return None
+    rank = max(1, math.ceil(q / 100 * len(values)))
+    return values[rank - 1]
+
+
+class EndpointStats:
+    def __init__(self):
+        self.latencies = []
+        self.errors = 0
+        self.statuses = {}
+
+    def add(self, latency, status, ok):
+        self.latencies.append(latency)
+        self.statuses[status] = self.statuses.get(status, 0) + 1
+        self.errors += int(not ok)
+
+    def summary(self, elapsed) -> dict:
+        latencies = sorted(self.latencies)
+        count = len(latencies)
+        return {
+            "requests": count,
+            "errors": self.errors,
+            "error_rate": self.errors / count if count else 0.0,
+            "rps": count / elapsed if elapsed else 0.0,
+            "p50_ms": _ms(percentile(latencies, 50)),
+            "p95_ms": _ms(percentile(latencies, 95)),
+            "p99_ms": _ms(percentile(latencies, 99)),
+            "statuses": {str(k): v for k, v in sorted(self.statuses.items(), key=str)},
+        }
+
+
+def _ms(seconds):
+    return round(seconds * 1000, 1) if seconds is not None else None
+
+
+class LoadRunner:
+    """
+    pytest plugin that replaces the test run with a load profile.
+
+    Args:
+        config (pytest.Config): Session config.
+        rps (float): Target requests per second.
+        ramp (float): Seconds of linear ramp-up.
+        duration (float): Total seconds of traffic, including the ramp.
+        mix (dict): Scenario name -> weight.
+        workers (int): Sender threads.
+        report_path (str, optional): JSON file for the per-endpoint results.
+        seed (int, optional): Seed for scenario and case selection.
+    """
+
+    def __init__(
+        self,
+        config,
+        rps=LOAD_RPS,
+        ramp=LOAD_RAMP,
+        duration=0,
+        mix=None,
+        workers=LOAD_WORKERS,
+        report_path=None,
+        seed=None,
+    ):
+        self.config = config
+        self.rps = rps
+        self.ramp = ramp
+        self.duration = duration
+        self.mix = mix or dict(LOAD_MIX)
+        self.workers = workers
+        self.report_path = report_path
+        self.rng = random.Random(seed)
+        self.stats = {}
+        self.elapsed = 0.0
+        self.setup_error = None
+        self.sweep_outcome = None
+        self._lock = threading.Lock()
+        self._pool = None
+        self._user = None
+
+    @pytest.hookimpl(trylast=True)
+    def pytest_collection_modifyitems(self, config, items):
+        # the scenarios come from the generators, no test is run
+        if items:
+            config.hook.pytest_deselected(items=list(items))
+            items[:] = []
+
+    @pytest.hookimpl(tryfirst=True)
+    def pytest_runtestloop(self, session):
+        self._login_user()
+        try:
+            self.run()
+        finally:
+            self._sweep_user()
+        return True
+
+    def _login_user(self):
+        """Registers the user of the scenarios that need auth."""
+        if not any(name != "login" for name in self.mix):
+            return
+        transport = get_transport()
+        self._pool = UserPool(
+            1,
+            lambda payload, endpoint: transport.request("POST", endpoint, json=payload),
+        )
+        try:
+            self._user = self._pool.lease()
+        except Exception as e:  # run anyway, authorized scenarios report errors
+            self.setup_error = e
+
+    def _auth(self) -> dict:
+        """Current headers of the user, the refresh thread renews its token."""
+        return self._user.headers if self._user is not None else {}
+
+    def _sweep_user(self):
+        """Stops the token refresh and deletes the user with what it created."""
+        if self._pool is not None:
+            self._pool.close()
+        if self._user is None:
+            return
+        account = {"email": self._user.email, "password": self._user.password}
+        try:
+            self.sweep_outcome = Sweeper(get_transport(), rps=0).sweep_account(account)
+        except Exception as e:  # left in the ledger for `python -m utils.sweeper`
+            self.sweep_outcome = f"failed: {e}"
+
+    def run(self):
+        transport = get_transport()
+        scenarios = [SCENARIOS[name] for name in self.mix]
+        weights = [self.mix[name] for name in self.mix]
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            for due in arrival_times(self.rps, self.ramp, self.duration):
+                delay = start + due - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+                scenario = self.rng.choices(scenarios, weights)[0]
+                load_request = scenario.make(self.rng, self._auth())
+                executor.submit(
+                    self._send, transport, scenario, load_request, start + due
+                )
+        self.elapsed = time.perf_counter() - start
+
+    def _send(self, transport, scenario, load_request, scheduled):
+        try:
+            response = transport.request(
+                load_request.method, load_request.endpoint, **load_request.kwargs
+            )
+            status = response.status_code
+            ok = status in load_request.expected
+        except Exception as e:  # a broken request is a data point, not a crash
+            status, ok = type(e).__name__, False
+        latency = time.perf_counter() - scheduled
+
+        with self._lock:
+            self.stats.setdefault(scenario.endpoint_key, EndpointStats()).add(
+                latency, status, ok
+            )
+
+    def results(self) -> dict:
+        return {
+            key: stats.summary(self.elapsed)
+            for key, stats in sorted(self.stats.items())
+        }
+
+    def pytest_sessionfinish(self, session):
+        if self.report_path:
+            with open(self.report_path, "w", encoding="utf-8") as f:
+                json.dump(
+                    {
+                        "rps": self.rps,
+                        "ramp": self.ramp,
+                        "duration": self.duration,
+                        "mix": self.mix,
+                        "elapsed": round(self.elapsed, 3),
+                        "endpoints": self.results(),
+                    },
+                    f,
+                    indent=2,
+                )
+
+    def pytest_terminal_summary(self, terminalreporter):
+        terminalreporter.section("load profile")
+        terminalreporter.write_line(
+            f"target {self.rps} rps, ramp {self.ramp}s, duration {self.duration}s, "
+            f"mix {self.mix}, elapsed {self.elapsed:.1f}s"
+        )
+        if self.setup_error is not None:
+            terminalreporter.write_line(
+                f"user registration failed, requests were sent without auth: "
+                f"{self.setup_error!r}"
+            )
+        if self.sweep_outcome is not None:
+            terminalreporter.write_line(
+                f"load user {self._user.email} and its records: {self.sweep_outcome}"
+            )
+        terminalreporter.write_line(
+            f"{'endpoint':<22}{'requests':>9}{'rps':>8}{'errors':>8}{'err %':>8}"
+            f"{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}"
+        )
+        for key, row in self.results().items():
+            terminalreporter.write_line(
+                f"{key:<22}{row['requests']:>9}{row['rps']:>8.1f}{row['errors']:>8}"
+                f"{row['error_rate'] * 100:>7.1f}%"
+                f"{row['p50_ms']:>9}{row['p95_ms']:>9}{row['p99_ms']:>9}"
+            )
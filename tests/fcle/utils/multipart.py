@@ -0,0 +1,250 @@
+"""
+Streaming multipart/form-data encoder for document and file uploads.
+
+`requests` builds the whole multipart body in memory when it gets `files=`.
+`MultipartEncoder` produces the same wire format lazily: it is passed as
+`data=` together with its `content_type`, knows its length up front (so the
+request carries a Content-Length instead of being chunked) and yields the body
+in chunks:
+
+    encoder = MultipartEncoder({"title": "t"}, {"file": ("big.pdf", synthetic_file(200 * MB))})
+    transport.request("POST", endpoint, data=encoder,
+                      headers={"Content-Type": encoder.content_type})
+
+File sources:
+    bytes, bytearray, memoryview, mmap, utils.assets.Asset
+        sent as memoryview slices of the buffer, nothing is copied
+    binary file objects
+        read chunk by chunk from their current position
+    SyntheticFile / GeneratedFile
+        produced on the fly with a declared size, e.g. hundreds of MB of
+        padding after a valid PDF/PNG/JPEG header, with flat client memory
+
+The encoder can be iterated again (retries re-send the body), file objects are
+rewound to where they started.
+"""
+
+import io
+import mmap
+import os
+import uuid
+
+from urllib3.fields import format_multipart_header_param
+
+from settings import UPLOAD_CHUNK_SIZE
+from utils.assets import Asset
+
+KB = 1024
+MB = 1024 * KB
+
+# minimal headers that make a synthetic file look like its type
+FILE_SIGNATURES = {
+    "pdf": b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n",
+    "png": b"\x89PNG\r\n\x1a\n",
+    "jpg": b"\xff\xd8\xff\xe0\x00\x10JFIF\x00",
+}
+
+
+class SyntheticFile:
+    """
+    File content of a declared size, generated while it is sent.
+
+    The body is `header` followed by repetitions of one `pattern` block, so
+    memory use does not depend on `size`.
+
+    Attributes:
+        size (int): Total size in bytes, including the header.
+        header (bytes): Leading bytes, e.g. a file signature.
+        pattern (bytes): Block repeated after the header.
+    """
+
+    def __init__(self, size, header=b"", pattern=b"\0" * (64 * KB)):
+        if size < len(header):
+            raise ValueError(
+                f"size {size} is smaller than the {len(header)} byte header"
+            )
+        if not pattern:
+            raise ValueError("pattern must not be empty")
+        self.size = size
+        self.header = header
+        self.pattern = pattern
+
+    def __len__(self):
+        return self.size
+
+    def chunks(self, chunk_size=UPLOAD_CHUNK_SIZE):
+        if self.header:
+            yield memoryview(self.header)
+        remaining = self.size - len(self.header)
+        # one block of whole patterns close to chunk_size, sliced for the tail
+        repeat = max(chunk_size // len(self.pattern), 1)
+        block = memoryview(self.pattern * repeat)
+        while remaining > 0:
+            chunk = block[: min(remaining, len(block))]
+            remaining -= len(chunk)
+            yield chunk
+
+
+class GeneratedFile:
+    """
+    File content produced by a generator with a declared size.
+
+    Attributes:
+        size (int): Number of bytes the generator produces.
+        factory (callable): Returns a fresh iterable of bytes-like chunks;
+            called once per send, so a retried request gets the same content.
+    """
+
+    def __init__(self, size, factory):
+        self.size = size
+        self.factory = factory
+
+    def __len__(self):
+        return self.size
+
+    def chunks(self, chunk_size=UPLOAD_CHUNK_SIZE):
+        sent = 0
+        for chunk in self.factory():
+            sent += memoryview(chunk).nbytes
+            if sent > self.size:
+                raise ValueError(
+                    f"generator produced more than the declared {self.size} bytes"
+                )
+            yield chunk
+        if sent != self.size:
+            raise ValueError(f"generator produced {sent} bytes, declared {self.size}")
+
+
+def synthetic_file(size, file_type="pdf") -> SyntheticFile:
+    """Synthetic file of `size` bytes that starts with the signature of `file_type`."""
+    return SyntheticFile(size, header=FILE_SIGNATURES.get(file_type, b""))
+
+
+class _BufferSource:
+    def __init__(self, buffer):
+        self.view = memoryview(buffer).cast("B")
+
+    def __len__(self):
+        return self.view.nbytes
+
+    def chunks(self, chunk_size=UPLOAD_CHUNK_SIZE):
+        for start in range(0, len(self.view), chunk_size):
+            yield self.view[start : start + chunk_size]
+
+
+class _FileSource:
+    def __init__(self, file):
+        self.file = file
+        self.start = file.tell()
+        try:
+            end = os.fstat(file.fileno()).st_size
+        except (AttributeError, OSError, io.UnsupportedOperation):
+            end = file.seek(0, io.SEEK_END)
+            file.seek(self.start)
+        self.size = end - self.start
+
+    def __len__(self):
+        return self.size
+
+    def chunks(self, chunk_size=UPLOAD_CHUNK_SIZE):
+        self.file.seek(self.start)
+        remaining = self.size
+        while remaining > 0:
+            chunk = self.file.read(min(chunk_size, remaining))
+            if not chunk:
+                raise ValueError(f"{self.file!r} ended {remaining} bytes early")
+            remaining -= len(chunk)
+            yield chunk
+
+
+def _source(content):
+    if isinstance(content, (SyntheticFile, GeneratedFile)):
+        return content
+    if isinstance(content, Asset):
+        return _BufferSource(content.buffer)
+    if isinstance(content, str):
+        return _BufferSource(content.encode("utf-8"))
+    if isinstance(content, (bytes, bytearray, memoryview, mmap.mmap)):
+        return _BufferSource(content)
+    if hasattr(content, "read") and hasattr(content, "seek"):
+        return _FileSource(content)
+    raise TypeError(f"unsupported file content: {type(content).__name__}")
+
+
+class MultipartEncoder:
+    """
+    Lazily encoded multipart/form-data body.
+
+    Args:
+        fields (dict | list[tuple] | None): Form fields, `{name: value}`; lists
+            of values and None are handled like requests' `data=`.
+        files (dict | list[tuple] | None): `{name: (filename, content[, content_type])}`
+            like requests' `files=`, `content` is any supported source (see the
+            module docstring). The content type defaults to application/octet-stream.
+        boundary (str, optional): Multipart boundary, random by default.
+        chunk_size (int): Maximum size of the body chunks.
+
+    Attributes:
+        content_type (str): Value for the request's Content-Type header.
+    """
+
+    def __init__(
+        self, fields=None, files=None, boundary=None, chunk_size=UPLOAD_CHUNK_SIZE
+    ):
+        self.boundary = boundary or uuid.uuid4().hex
+        self.chunk_size = chunk_size
+        self.content_type = f"multipart/form-data; boundary={self.boundary}"
+        self._parts = []
+
+        for name, value in _items(fields):
+            values = value if isinstance(value, (list, tuple)) else [value]
+            for item in values:
+                if item is None:
+                    continue
+                if not isinstance(item, (bytes, bytearray)):
+                    item = str(item).encode("utf-8")
+                self._parts.append((self._headers(name), _BufferSource(bytes(item))))
+
+        for name, spec in _items(files):
+            if not isinstance(spec, (list, tuple)):
+                spec = (getattr(spec, "name", name), spec)
+            filename, content = spec[0], spec[1]
+            content_type = (
+                spec[2] if len(spec) > 2 and spec[2] else "application/octet-stream"
+            )
+            headers = self._headers(name, os.path.basename(str(filename)), content_type)
+            self._parts.append((headers, _source(content)))
+        self._closing = f"--{self.boundary}--\r\n".encode("ascii")
+
+    def _headers(self, name, filename=None, content_type=None) -> bytes:
+        disposition = f"form-data; {format_multipart_header_param('name', name)}"
+        if filename is not None:
+            disposition += f"; {format_multipart_header_param('filename', filename)}"
+        lines = [f"--{self.boundary}", f"Content-Disposition: {disposition}"]
+        if content_type:
+            lines.append(f"Content-Type: {content_type}")
+        return ("\r\n".join(lines) + "\r\n\r\n").encode("utf-8")
+
+    def __len__(self):
+        return sum(
+            len(headers) + len(source) + 2 for headers, source in self._parts
+        ) + len(self._closing)
+
+    def __iter__(self):
+        for headers, source in self._parts:
+            yield headers
+            for chunk in source.chunks(self.chunk_size):
+                if len(chunk):
+                    yield chunk
+            yield b"\r\n"
+        yield self._closing
+
+    def read_all(self) -> bytes:
+        """The whole body in memory, for small bodies and debugging only."""
+        return b"".join(bytes(chunk) for chunk in self)
+
+
+def _items(mapping):
+    if not mapping:
+        return []
+    return list(mapping.items()) if hasattr(mapping, "items") else list(mapping)
@@ -0,0 +1,312 @@
+"""
+Pagination throughput benchmark for the paged list endpoints.
+
+Benchmark tests (marker `benchmark`, run only with `pytest --benchmark`) pass
+a `fetch(offset, size)` callable that requests one page of their endpoint, so
+`skip`/`take` (TeacherEducations) and `pageNumber`/`pageSize`
+(LearningMaterials/fetch) look the same here. `fetch` sends through the
+`http_transport` fixture: the request fixtures turn a dropped request into
+`pytest.fail`, which would end the crawl instead of counting as an error.
+Two measurements per endpoint:
+
+    crawl   `crawl()` pages through the whole dataset at one page size, from
+            offset 0 until a short page (or PAGINATION_BENCH_MAX_ITEMS), and
+            records ms per page, items/s of the crawl and duplicate ids.
+    probe   `probe()` requests one PAGINATION_BENCH_PROBE_SIZE page at each of
+            PAGINATION_BENCH_OFFSETS, PAGINATION_BENCH_PROBE_ROUNDS times, and
+            records the p50 per offset. An OFFSET scan reads and throws away
+            all skipped rows, so its latency grows with the offset; an indexed
+            keyset lookup stays flat. Offsets past the end still cost the scan.
+
+The probe's slowdown is p50 at the deepest offset / p50 at the first one;
+above PAGINATION_BENCH_SLOWDOWN the endpoint is flagged. The slope of p50 over
+the offset (least squares, ms per 10 000 skipped rows) is reported with it.
+
+The summary is printed at the end of the session and written as JSON with
+`--pagination-report PATH`: the crawls with their per-page curve and the
+latency-over-offset curve of every probe, ready to attach to a backend ticket.
+"""
+
+import json
+import threading
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from http import HTTPStatus
+
+import requests
+
+from settings import (
+    PAGINATION_BENCH_MAX_ITEMS,
+    PAGINATION_BENCH_OFFSETS,
+    PAGINATION_BENCH_PROBE_ROUNDS,
+    PAGINATION_BENCH_PROBE_SIZE,
+    PAGINATION_BENCH_SLOWDOWN,
+)
+from utils.histogram import LatencyHistogram
+
+
+def _ms(micros):
+    return round(micros / 1000, 1) if micros is not None else None
+
+
+def _items(response) -> list:
+    """Items of a page, [] for anything but a 200 with a JSON list."""
+    if response.status_code != HTTPStatus.OK:
+        return []
+    try:
+        data = response.json()
+    except ValueError:
+        return []
+    return data if isinstance(data, list) else []
+
+
+def _fetch(fetch, offset, size):
+    """Sends one page request, returns (status, items, seconds)."""
+    started = time.perf_counter()
+    try:
+        response = fetch(offset, size)
+        status, items = response.status_code, _items(response)
+    except requests.RequestException:  # a dropped request is a data point
+        status, items = "error", []
+    return status, items, time.perf_counter() - started
+
+
+@dataclass
+class CrawlPoint:
+    """One full crawl of an endpoint at one page size."""
+
+    endpoint: str
+    page_size: int
+    pages: int = 0
+    items: int = 0
+    duplicates: int = 0
+    capped: bool = False  # stopped at max_items, the dataset is larger
+    wall: float = 0.0
+    statuses: Counter = field(default_factory=Counter)
+    latency: LatencyHistogram = field(default_factory=LatencyHistogram)
+    curve: list = field(default_factory=list)  # [offset, ms] per page
+    ids: set = field(default_factory=set, repr=False)
+
+    @property
+    def complete(self) -> bool:
+        """Every page was answered with 200."""
+        return set(self.statuses) == {HTTPStatus.OK}
+
+    @property
+    def items_per_second(self) -> float:
+        return self.items / self.wall if self.wall else 0.0
+
+    def to_dict(self) -> dict:
+        return {
+            "endpoint": self.endpoint,
+            "page_size": self.page_size,
+            "pages": self.pages,
+            "items": self.items,
+            "duplicates": self.duplicates,
+            "capped": self.capped,
+            "statuses": {str(k): v for k, v in sorted(self.statuses.items(), key=str)},
+            "wall_s": round(self.wall, 3),
+            "items_per_s": round(self.items_per_second, 1),
+            "p50_ms": _ms(self.latency.percentile(50)),
+            "p95_ms": _ms(self.latency.percentile(95)),
+            "max_ms": _ms(self.latency.max),
+            "curve": self.curve,
+        }
+
+
+@dataclass
+class OffsetProbe:
+    """Latency of one page at increasing offsets of an endpoint."""
+
+    endpoint: str
+    page_size: int
+    latency: dict = field(default_factory=dict)  # offset -> LatencyHistogram
+    returned: dict = field(default_factory=dict)  # offset -> items of the last page
+    statuses: Counter = field(default_factory=Counter)
+
+    def p50(self, offset):
+        return self.latency[offset].percentile(50)
+
+    @property
+    def slowdown(self):
+        """p50 at the deepest offset / p50 at the first, None without both."""
+        offsets = sorted(self.latency)
+        if len(offsets) < 2 or not self.p50(offsets[0]):
+            return None
+        return self.p50(offsets[-1]) / self.p50(offsets[0])
+
+    @property
+    def slope(self):
+        """Least-squares growth of p50 in ms per 10 000 skipped rows."""
+        points = [(offset, self.p50(offset) / 1000) for offset in self.latency]
+        if len(points) < 2:
+            return None
+        mean_x = sum(x for x, _ in points) / len(points)
+        mean_y = sum(y for _, y in points) / len(points)
+        spread = sum((x - mean_x) ** 2 for x, _ in points)
+        if not spread:
+            return None
+        return sum((x - mean_x) * (y - mean_y) for x, y in points) / spread * 10_000
+
+    def degraded(self, threshold=PAGINATION_BENCH_SLOWDOWN) -> bool:
+        return self.slowdown is not None and self.slowdown > threshold
+
+    def to_dict(self) -> dict:
+        slowdown, slope = self.slowdown, self.slope
+        return {
+            "endpoint": self.endpoint,
+            "page_size": self.page_size,
+            "statuses": {str(k): v for k, v in sorted(self.statuses.items(), key=str)},
+            "curve": [
+                {
+                    "offset": offset,
+                    "items": self.returned[offset],
+                    "p50_ms": _ms(self.p50(offset)),
+                    "p95_ms": _ms(self.latency[offset].percentile(95)),
+                }
+                for offset in sorted(self.latency)
+            ],
+            "slowdown": round(slowdown, 2) if slowdown is not None else None,
+            "ms_per_10k_skipped": round(slope, 2) if slope is not None else None,
+            "degraded": self.degraded(),
+        }
+
+
+class PaginationBenchmark:
+    """pytest plugin: crawls and probes paged endpoints for the benchmark tests."""
+
+    def __init__(
+        self,
+        report_path=None,
+        max_items=PAGINATION_BENCH_MAX_ITEMS,
+        rounds=PAGINATION_BENCH_PROBE_ROUNDS,
+    ):
+        self.report_path = report_path
+        self.max_items = max_items
+        self.rounds = rounds
+        self.crawls = []
+        self.probes = []
+        self._lock = threading.Lock()
+
+    def crawl(self, endpoint, fetch, page_size) -> CrawlPoint:
+        """
+        Pages through the dataset of `fetch` from offset 0.
+
+        Args:
+            endpoint (str): Name of the endpoint in the summary.
+            fetch (callable): `fetch(offset, size)` returning the page response.
+            page_size (int): Items per page.
+
+        Returns:
+            CrawlPoint: The measured crawl, also kept for the summary.
+        """
+        point = CrawlPoint(endpoint, page_size)
+        started = time.perf_counter()
+        offset = 0
+        while True:
+            status, items, seconds = _fetch(fetch, offset, page_size)
+            point.pages += 1
+            point.statuses[status] += 1
+            point.latency.record(int(seconds * 1_000_000))
+            point.curve.append([offset, round(seconds * 1000, 1)])
+            for item in items:
+                id_ = item.get("id") if isinstance(item, dict) else None
+                if id_ in point.ids:
+                    point.duplicates += 1
+                elif id_ is not None:
+                    point.ids.add(id_)
+            point.items += len(items)
+            offset += page_size
+            if status != HTTPStatus.OK or len(items) < page_size:
+                break
+            if point.items >= self.max_items:
+                point.capped = True
+                break
+        point.wall = time.perf_counter() - started
+
+        with self._lock:
+            self.crawls.append(point)
+        return point
+
+    def probe(
+        self,
+        endpoint,
+        fetch,
+        offsets=PAGINATION_BENCH_OFFSETS,
+        page_size=PAGINATION_BENCH_PROBE_SIZE,
+    ) -> OffsetProbe:
+        """
+        Requests one page at each offset, `rounds` times, deepest offsets last.
+
+        Args:
+            endpoint (str): Name of the endpoint in the summary.
+            fetch (callable): `fetch(offset, size)` returning the page response.
+            offsets (Iterable[int]): Offsets to probe, multiples of `page_size`
+                for page-number endpoints.
+            page_size (int): Items per page.
+
+        Returns:
+            OffsetProbe: The measured curve, also kept for the summary.
+        """
+        probe = OffsetProbe(endpoint, page_size)
+        for offset in sorted(offsets):
+            histogram = probe.latency[offset] = LatencyHistogram()
+            for _ in range(self.rounds):
+                status, items, seconds = _fetch(fetch, offset, page_size)
+                probe.statuses[status] += 1
+                histogram.record(int(seconds * 1_000_000))
+                probe.returned[offset] = len(items)
+
+        with self._lock:
+            self.probes.append(probe)
+        return probe
+
+    def pytest_sessionfinish(self, session):
+        if not self.report_path:
+            return
+        with open(self.report_path, "w", encoding="utf-8") as f:
+            json.dump(
+                {
+                    "crawls": [point.to_dict() for point in self.crawls],
+                    "offsets": [probe.to_dict() for probe in self.probes],
+                },
+                f,
+                indent=2,
+            )
+
+    def pytest_terminal_summary(self, terminalreporter):
+        if not self.crawls and not self.probes:
+            return
+        terminalreporter.section("pagination benchmark")
+        if self.crawls:
+            terminalreporter.write_line(
+                f"{'endpoint':<30}{'size':>6}{'pages':>7}{'items':>8}{'items/s':>10}"
+                f"{'p50 ms':>9}{'p95 ms':>9}{'dups':>6}  statuses"
+            )
+        for point in sorted(self.crawls, key=lambda p: (p.endpoint, p.page_size)):
+            row = point.to_dict()
+            terminalreporter.write_line(
+                f"{point.endpoint:<30}{point.page_size:>6}{point.pages:>7}"
+                f"{str(point.items) + ('+' if point.capped else ''):>8}"
+                f"{row['items_per_s']:>10.1f}{row['p50_ms']:>9.1f}{row['p95_ms']:>9.1f}"
+                f"{point.duplicates:>6}  {row['statuses']}"
+            )
+        for probe in self.probes:
+            row = probe.to_dict()
+            curve = ", ".join(
+                f"{entry['offset']}: {entry['p50_ms']} ms" for entry in row["curve"]
+            )
+            verdict = ""
+            if row["slowdown"] is not None:
+                verdict = (
+                    f" -> x{row['slowdown']:g}, {row['ms_per_10k_skipped']:g} ms "
+                    "per 10k skipped"
+                    + (", DEGRADES WITH SKIP" if row["degraded"] else "")
+                )
+            terminalreporter.write_line(
+                f"{probe.endpoint} p50 by skip ({probe.page_size} per page): "
+                f"{curve}{verdict}"
+            )
+        if self.report_path:
+            terminalreporter.write_line(f"pagination report: {self.report_path}")
@@ -0,0 +1,411 @@
+"""
+Built-in parallel runner with endpoint-aware sharding.
+
+`pytest --workers N` turns the current process into a controller:
+
+1. The controller collects the suite as usual and groups tests by their
+   endpoint marker (`favorite_teachers`, `teacher_documents`, ..., see
+   SHARD_GROUPS); sub-markers such as `teach_doc_post_invalid` join the group
+   of their endpoint, and pytest's own markers (xfail, skipif, ...) are no
+   groups. Tests without an endpoint marker are grouped by module. A group is
+   never split, so tests that share server-side state run serially on one
+   worker.
+2. Groups are packed onto N workers (longest group first, onto the least
+   loaded worker, then moved or swapped off the longest worker while that
+   shortens the run). A group weighs the seconds its tests took in earlier
+   runs (utils/durations.py), 1 per test without a history.
+3. Every worker is a `python -m pytest` subprocess started with the original
+   command line, a shard file and its own report file. The shard file lists
+   collection indices rather than node ids: several parametrized tests put
+   generated values (emails, passwords) into their ids, which differ between
+   processes, while the collection order does not. Workers have their own
+   transport and user pool, and all of them get the same identity seed
+   (FCLE_RUN_SEED), so their worker slots split one identity space.
+4. Workers stream serialized test reports; the controller replays them through
+   its own hooks, so the terminal summary, exit code and `--junitxml` report
+   are merged as if the run was serial. Per-worker timing is printed at the end.
+5. Every worker also dumps its request latency histograms; the controller merges
+   them, so `--latency-report` covers the requests of all workers.
+6. With `--record-cassette`, every worker records its own cassette and the
+   controller concatenates them into the requested file.
+"""
+
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+
+import pytest
+
+from utils.cassette import merge_cassettes
+from utils.latency import get_recorder
+
+# Environment variables set for worker processes: the worker index and the
+# identity seed the controller drew for the run (utils/identities.py)
+WORKER_ID_ENV = "FCLE_WORKER_ID"
+RUN_SEED_ENV = "FCLE_RUN_SEED"
+
+# Shard group of each endpoint marker of pytest.ini; sub-markers map to the group
+# of their endpoint. Any other marker (xfail, skipif, fresh_user, benchmark, ...)
+# says how a test runs, not which server-side state it shares.
+SHARD_GROUPS = {
+    "signup": "signup",
+    "set_password": "set_password",
+    "forgot_password": "forgot_password",
+    "reset_password": "reset_password",
+    "change_password": "change_password",
+    "login": "login",
+    "get_profile": "get_profile",
+    "hobbies": "hobbies",
+    "interests": "interests",
+    "new_teacher": "new_teacher",
+    "teaching_experiences": "teaching_experiences",
+    "teacher_documents": "teacher_documents",
+    "teach_doc_post_invalid": "teacher_documents",
+    "teacher_educations": "teacher_educations",
+    "update_user": "update_user",
+    "delete_user": "delete_user",
+    "favorite_teachers": "favorite_teachers",
+    "telegram_get": "telegram",
+    "telegram_post": "telegram",
+    "userlanguages": "userlanguages",
+    "learning_materials": "learning_materials",
+    "buy_package": "buy_package",
+    "deposit": "deposit",
+    "terminate_package": "terminate_package",
+}
+
+
+def worker_id():
+    """Returns the index of the current worker, or None in the controller/serial run."""
+    value = os.environ.get(WORKER_ID_ENV)
+    return int(value) if value is not None else None
+
+
+def run_seed():
+    """Returns the identity seed of the run in a worker, or None in the controller/serial run."""
+    value = os.environ.get(RUN_SEED_ENV)
+    return int(value) if value is not None else None
+
+
+def group_markers(config) -> dict:
+    """{marker: shard group} of the SHARD_GROUPS markers registered in pytest.ini."""
+    registered = {
+        line.split(":", 1)[0].split("(", 1)[0].strip()
+        for line in config.getini("markers")
+    }
+    return {name: group for name, group in SHARD_GROUPS.items() if name in registered}
+
+
+def group_key(item, markers) -> str:
+    """
+    Returns the shard group of a test item.
+
+    Args:
+        item (pytest.Item): Collected test.
+        markers (dict): {endpoint marker: shard group}, see `group_markers`.
+
+    Returns:
+        str: The shard group of the test's endpoint markers (the first by name
+        if they disagree, so the order of the decorators does not matter), or
+        its module path without one.
+    """
+    groups = {markers[m.name] for m in item.iter_markers() if m.name in markers}
+    if groups:
+        return min(groups)
+    return item.nodeid.split("::", 1)[0]
+
+
+def plan_shards(items, workers, markers, weight=None):
+    """
+    Packs test groups onto workers to minimise the longest worker's load.
+
+    Groups go longest first onto the least loaded worker (LPT). Then single
+    groups are moved or swapped off the most loaded worker while that shortens
+    it without making another worker longer than it was.
+
+    Args:
+        items (list[pytest.Item]): Collected tests in collection order.
+        workers (int): Number of worker processes.
+        markers (dict): {endpoint marker: shard group}, see `group_markers`.
+        weight (callable, optional): `weight(nodeid) -> float`, e.g. the seconds
+            DurationHistory expects; defaults to 1 per test.
+
+    Returns:
+        list[Shard]: One shard per worker that received tests.
+    """
+    weight = weight or (lambda nodeid: 1.0)
+
+    groups = {}
+    for index, item in enumerate(items):
+        groups.setdefault(group_key(item, markers), []).append((index, item.nodeid))
+    loads = {
+        name: sum(weight(nodeid) for _, nodeid in entries)
+        for name, entries in groups.items()
+    }
+
+    shards = [Shard(index) for index in range(workers)]
+    for name in sorted(groups, key=lambda name: -loads[name]):
+        shard = min(shards, key=lambda s: s.load)
+        shard.groups.append(name)
+        shard.load += loads[name]
+    _rebalance(shards, loads)
+
+    for shard in shards:
+        for name in shard.groups:
+            shard.indices.extend(index for index, _ in groups[name])
+            shard.nodeids.extend(nodeid for _, nodeid in groups[name])
+    return [shard for shard in shards if shard.nodeids]
+
+
+def _rebalance(shards, loads, rounds=100):
+    """Moves or swaps groups off the most loaded shard while its load drops."""
+    for _ in range(rounds):
+        top = max(shards, key=lambda s: s.load)
+        best = None  # (new top load, top group, other shard, other group)
+        for other in shards:
+            if other is top:
+                continue
+            for name in top.groups:
+                # None: move `name` to `other`, else swap it with `swap`
+                for swap in [None, *other.groups]:
+                    delta = loads[name] - (loads[swap] if swap else 0.0)
+                    if delta <= 0:
+                        continue
+                    peak = max(top.load - delta, other.load + delta)
+                    if peak < top.load - 1e-9 and (best is None or peak < best[0]):
+                        best = (peak, name, other, swap)
+        if best is None:
+            return
+        _, name, other, swap = best
+        top.groups.remove(name)
+        other.groups.append(name)
+        delta = loads[name]
+        if swap is not None:
+            other.groups.remove(swap)
+            top.groups.append(swap)
+            delta -= loads[swap]
+        top.load -= delta
+        other.load += delta
+
+
+@dataclass
+class Shard:
+    index: int
+    groups: list = field(default_factory=list)
+    indices: list = field(default_factory=list)
+    nodeids: list = field(default_factory=list)
+    load: float = 0.0
+
+
+@dataclass
+class WorkerProcess:
+    shard: Shard
+    process: subprocess.Popen
+    report_path: Path
+    log_path: Path
+    started: float
+    finished: float = None
+    offset: int = 0
+    tests: int = 0
+    failed: int = 0
+    test_time: float = 0.0
+
+    @property
+    def wall_time(self):
+        return (self.finished or time.perf_counter()) - self.started
+
+
+class ShardWorker:
+    """Worker side: runs only the shard's tests and streams reports to a file."""
+
+    def __init__(self, config, shard_file, report_file):
+        self.config = config
+        self.shard = json.loads(Path(shard_file).read_text(encoding="utf-8"))
+        self.report_file = open(report_file, "a", encoding="utf-8")
+
+    @pytest.hookimpl(trylast=True)
+    def pytest_collection_modifyitems(self, config, items):
+        if len(items) == self.shard["total"]:
+            wanted = set(self.shard["indices"])
+            keep = [index in wanted for index in range(len(items))]
+        else:
+            # collection differs from the controller, fall back to node ids
+            wanted = set(self.shard["nodeids"])
+            keep = [item.nodeid in wanted for item in items]
+
+        selected = [item for item, flag in zip(items, keep) if flag]
+        deselected = [item for item, flag in zip(items, keep) if not flag]
+        if deselected:
+            config.hook.pytest_deselected(items=deselected)
+        items[:] = selected
+
+    def pytest_runtest_logreport(self, report):
+        data = self.config.hook.pytest_report_to_serializable(
+            config=self.config, report=report
+        )
+        self.report_file.write(json.dumps(data) + "\n")
+        self.report_file.flush()
+
+    def pytest_unconfigure(self, config):
+        self.report_file.close()
+
+
+class ParallelRunner:
+    """Controller side: shards the collected tests and drives the workers."""
+
+    poll_interval = 0.2
+
+    def __init__(self, config, workers, weight=None):
+        self.config = config
+        self.workers = workers
+        self.weight = weight
+        self.running = []
+        self.workdir = None
+        cassette_seed = config.getoption("cassette_seed", None)
+        if cassette_seed is not None:  # a replay must draw the recorded identities
+            self.seed = random.Random(f"{cassette_seed}:identities").getrandbits(64)
+        else:
+            self.seed = random.getrandbits(64)
+
+    @pytest.hookimpl(tryfirst=True)
+    def pytest_runtestloop(self, session):
+        if session.config.option.collectonly:
+            return None
+        if (
+            session.testsfailed
+            and not session.config.option.continue_on_collection_errors
+        ):
+            return None  # let the default loop report the collection errors
+
+        shards = plan_shards(
+            session.items, self.workers, group_markers(self.config), self.weight
+        )
+        self.workdir = Path(tempfile.mkdtemp(prefix="fcle-workers-"))
+        self.running = [self._spawn(shard, len(session.items)) for shard in shards]
+
+        while any(worker.finished is None for worker in self.running):
+            for worker in self.running:
+                self._drain(worker)
+                if worker.finished is None and worker.process.poll() is not None:
+                    self._drain(worker)
+                    worker.finished = time.perf_counter()
+            time.sleep(self.poll_interval)
+
+        for worker in self.running:
+            latency_path = self._latency_path(worker.shard)
+            if latency_path.exists():
+                get_recorder().merge_dump(
+                    json.loads(latency_path.read_text(encoding="utf-8"))
+                )
+            if worker.process.returncode not in (
+                pytest.ExitCode.OK,
+                pytest.ExitCode.TESTS_FAILED,
+                pytest.ExitCode.NO_TESTS_COLLECTED,
+            ):
+                session.testsfailed += 1
+
+        cassette = self.config.getoption("record_cassette", None)
+        if cassette:
+            merge_cassettes(
+                [
+                    path
+                    for path in (self._cassette_path(w.shard) for w in self.running)
+                    if path.exists()
+                ],
+                cassette,
+            )
+        return True
+
+    def _spawn(self, shard, total):
+        shard_path = self.workdir / f"worker-{shard.index}.shard"
+        report_path = self.workdir / f"worker-{shard.index}.jsonl"
+        log_path = self.workdir / f"worker-{shard.index}.log"
+        shard_path.write_text(
+            json.dumps(
+                {"total": total, "indices": shard.indices, "nodeids": shard.nodeids}
+            ),
+            encoding="utf-8",
+        )
+        report_path.touch()
+
+        args = [
+            sys.executable,
+            "-m",
+            "pytest",
+            *self.config.invocation_params.args,
+            "--workers=0",
+            f"--shard-file={shard_path}",
+            f"--worker-report={report_path}",
+            f"--junitxml={self.workdir / f'worker-{shard.index}.xml'}",
+            f"--latency-report={self._latency_path(shard)}",
+        ]
+        if self.config.getoption("record_cassette", None):
+            args.append(f"--record-cassette={self._cassette_path(shard)}")
+            args.append(f"--cassette-seed={self.config.getoption('cassette_seed')}")
+        env = dict(
+            os.environ,
+            **{WORKER_ID_ENV: str(shard.index), RUN_SEED_ENV: str(self.seed)},
+        )
+        with open(log_path, "w", encoding="utf-8") as log:
+            process = subprocess.Popen(
+                args,
+                cwd=self.config.invocation_params.dir,
+                env=env,
+                stdout=log,
+                stderr=subprocess.STDOUT,
+            )
+        return WorkerProcess(shard, process, report_path, log_path, time.perf_counter())
+
+    def _latency_path(self, shard):
+        return self.workdir / f"worker-{shard.index}.latency.json"
+
+    def _cassette_path(self, shard):
+        suffix = (
+            ".gz" if self.config.getoption("record_cassette").endswith(".gz") else ""
+        )
+        return self.workdir / f"worker-{shard.index}.cassette.jsonl{suffix}"
+
+    def _drain(self, worker):
+        """Replays the complete report lines a worker wrote since the last poll."""
+        with open(worker.report_path, "rb") as f:
+            f.seek(worker.offset)
+            chunk = f.read()
+        complete = chunk[: chunk.rfind(b"\n") + 1]
+        worker.offset += len(complete)
+
+        for line in complete.decode("utf-8").splitlines():
+            report = self.config.hook.pytest_report_from_serializable(
+                config=self.config, data=json.loads(line)
+            )
+            if report.when == "call" or (report.when == "setup" and not report.passed):
+                worker.tests += 1
+            worker.failed += int(report.failed)
+            worker.test_time += report.duration
+            self.config.hook.pytest_runtest_logreport(report=report)
+
+    def pytest_terminal_summary(self, terminalreporter):
+        if not self.running:
+            return
+
+        terminalreporter.section("parallel workers")
+        for worker in self.running:
+            terminalreporter.write_line(
+                f"worker {worker.shard.index}: {worker.tests} tests, "
+                f"{worker.failed} failed reports, wall {worker.wall_time:.2f}s"
+                + (f" (planned {worker.shard.load:.2f}s)" if self.weight else "")
+                + ", "
+                f"test time {worker.test_time:.2f}s, exit {worker.process.returncode}, "
+                f"groups: {', '.join(worker.shard.groups)}"
+            )
+        walls = [worker.wall_time for worker in self.running]
+        terminalreporter.write_line(
+            f"makespan {max(walls):.2f}s, "
+            f"serial estimate {sum(w.test_time for w in self.running):.2f}s, "
+            f"worker logs: {self.workdir}"
+        )
@@ -0,0 +1,216 @@
+"""
+Background teardown of the server resources tests create.
+
+Fixtures create learning materials, teacher documents, educations and whole
+teacher accounts and mostly leave them behind, so the staging DB grows with
+every run; the few inline cleanups delete one entity after another inside the
+test. Fixtures now record what they create through the `track_resource`
+fixture instead:
+
+    track_resource("learning_materials", material_id, headers)
+    track_resource("users", email, headers)     # the account itself
+
+Records are keyed by ENDPOINTS key. When the test is torn down its records are
+handed to a thread pool of `--cleanup-workers` threads and deleted there
+concurrently, so the next test starts right away. Accounts ("users") are
+deleted after the other resources of the same test, whose deletion needs the
+account's token. The session end waits for pending deletions (CLEANUP_TIMEOUT)
+and the summary reports what was deleted.
+
+A deletion answered with 404/410/422, or 401 because the owning account is
+already gone, counts as already gone: tests that delete their resource
+themselves can still track it. Failed deletions are reported, they never fail
+a test. With a cassette the deletions run inline at teardown, in a fixed
+order, so recordings replay.
+"""
+
+import threading
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from http import HTTPStatus
+
+from settings import CLEANUP_TIMEOUT, ENDPOINTS, TIMEOUT
+
+# deleted last: deleting an account invalidates the token its resources need
+ACCOUNT_KEYS = ("users",)
+
+GONE_STATUSES = (
+    HTTPStatus.UNAUTHORIZED,
+    HTTPStatus.NOT_FOUND,
+    HTTPStatus.GONE,
+    HTTPStatus.UNPROCESSABLE_ENTITY,
+)
+
+
+@dataclass(frozen=True)
+class Resource:
+    key: str
+    id: object
+    headers: tuple  # sorted header items, hashable
+
+    def request(self) -> tuple:
+        """(endpoint, JSON body) of the DELETE that removes the resource."""
+        if self.key == "users":
+            return ENDPOINTS["users"], {"email": self.id}
+        return f"{ENDPOINTS[self.key]}/{self.id}", None
+
+
+class ResourceTracker:
+    """
+    Records created resources per test and deletes them in the background.
+
+    Args:
+        send (callable): `send(method, endpoint, json=, headers=, timeout=)`
+            returning a response, e.g. HttpTransport.request.
+        workers (int): Parallel deletions; 0 keeps every resource.
+        background (bool): Delete in the thread pool; False deletes inline when
+            the test's records are submitted.
+        timeout (float): Seconds `close` waits for pending deletions.
+    """
+
+    def __init__(self, send, workers, background=True, timeout=CLEANUP_TIMEOUT):
+        self.send = send
+        self.workers = workers
+        self.background = background
+        self.timeout = timeout
+        self.results = Counter()  # (key, "deleted" | "gone" | "failed") -> count
+        self.errors = []
+        self._executor = None
+        self._pending = 0
+        self._idle = threading.Condition()
+
+    @property
+    def enabled(self) -> bool:
+        return self.workers > 0
+
+    def track(self, batch, key, id_, headers=None):
+        """
+        Records resource `id_` of ENDPOINTS[`key`], deletable with `headers`.
+
+        `batch` is the list of one test's records, passed to `submit` when the
+        test ends. Returns `id_`.
+        """
+        if key not in ENDPOINTS:
+            raise KeyError(f"{key!r} is not an ENDPOINTS key")
+        if self.enabled and id_ is not None:
+            resource = Resource(key, id_, tuple(sorted((headers or {}).items())))
+            if resource not in batch:
+                batch.append(resource)
+        return id_
+
+    def submit(self, batch):
+        """Deletes the resources of a finished test, accounts last."""
+        if not batch:
+            return
+        resources = [r for r in batch if r.key not in ACCOUNT_KEYS]
+        accounts = [r for r in batch if r.key in ACCOUNT_KEYS]
+        if not self.background:
+            for resource in reversed(resources):
+                self._delete(resource)
+            for resource in accounts:
+                self._delete(resource)
+            return
+
+        with self._idle:
+            self._pending += len(batch)
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.workers, thread_name_prefix="fcle-cleanup"
+                )
+        if not resources:
+            self._start(accounts)
+            return
+
+        left = [len(resources)]
+        lock = threading.Lock()
+
+        def _resource_done(_):
+            with lock:
+                left[0] -= 1
+                last = left[0] == 0
+            if last:
+                self._start(accounts)
+
+        for resource in resources:
+            self._executor.submit(self._run, resource).add_done_callback(_resource_done)
+
+    def _start(self, resources):
+        for resource in resources:
+            self._executor.submit(self._run, resource)
+
+    def _run(self, resource):
+        try:
+            self._delete(resource)
+        finally:
+            with self._idle:
+                self._pending -= 1
+                if self._pending == 0:
+                    self._idle.notify_all()
+
+    def _delete(self, resource):
+        endpoint, body = resource.request()
+        try:
+            response = self.send(
+                "DELETE",
+                endpoint,
+                json=body,
+                headers=dict(resource.headers),
+                timeout=TIMEOUT,
+            )
+        except Exception as e:  # a failed cleanup must not break the run
+            self._result(resource, "failed", f"{endpoint}: {e}")
+            return
+        if response.status_code < 300:
+            self._result(resource, "deleted")
+        elif response.status_code in GONE_STATUSES:
+            self._result(resource, "gone")
+        else:
+            self._result(resource, "failed", f"{endpoint}: {response.status_code}")
+
+    def _result(self, resource, outcome, error=None):
+        with self._idle:
+            self.results[resource.key, outcome] += 1
+            if error is not None:
+                self.errors.append(error)
+
+    def close(self) -> bool:
+        """Waits for pending deletions; False if some were still running."""
+        with self._idle:
+            done = self._idle.wait_for(lambda: self._pending == 0, self.timeout)
+        if self._executor is not None:
+            self._executor.shutdown(wait=done, cancel_futures=True)
+            self._executor = None
+        return done
+
+    def totals(self) -> Counter:
+        totals = Counter()
+        for (_, outcome), count in self.results.items():
+            totals[outcome] += count
+        return totals
+
+    def pytest_sessionfinish(self, session):
+        if not self.close():
+            self.errors.append(
+                f"{self._pending} deletions still pending after {self.timeout}s"
+            )
+
+    def pytest_terminal_summary(self, terminalreporter):
+        totals = self.totals()
+        if not totals and not self.errors:
+            return
+        deleted = Counter(
+            {
+                key: n
+                for (key, outcome), n in self.results.items()
+                if outcome == "deleted"
+            }
+        )
+        per_key = ", ".join(f"{key} {n}" for key, n in sorted(deleted.items()))
+        terminalreporter.write_line(
+            f"cleanup: {totals['deleted']} resources deleted"
+            + (f" ({per_key})" if per_key else "")
+            + f", {totals['gone']} already gone, {totals['failed']} failed"
+        )
+        for error in self.errors[:5]:
+            terminalreporter.write_line(f"  {error}")
@@ -0,0 +1,316 @@
+"""
+Registry of response schemas, compiled once per session.
+
+Response checks used to be spread over the suite: `jsonschema.validate` on
+every teaching experience, which checks the schema and builds a validator on
+each call, and hand-written key tuples and isinstance loops elsewhere. The
+schemas now live in settings/schemas.py, keyed by endpoint, and are checked
+through one registry:
+
+    schemas = get_schema_registry()
+    assert not schemas.errors("teacher_educations[]", r.json())
+    schemas.missing_keys("learning_materials", item)
+
+"<endpoint>[]" is the list of the endpoint's objects. Every schema is compiled
+on first use and reused by every later check of the session (per parallel
+worker):
+
+- a jsonschema validator, the schema checked once, which reports the errors;
+- a plain Python predicate for the keywords the responses use (type,
+  properties, required, additionalProperties, items, min/max, minLength /
+  maxLength). Valid responses, the common case, only run the predicate, so a
+  list of thousands of items costs a few dict lookups per item and does not
+  import jsonschema at all. The predicate may be stricter than jsonschema,
+  never looser: a response it rejects is validated again by jsonschema, which
+  has the final word. Schemas with other keywords always go to jsonschema.
+
+`format` is an annotation, as for `jsonschema.validate`.
+"""
+
+import threading
+from itertools import islice
+
+from settings import RESPONSE_SCHEMAS
+from utils.lazy_import import lazy_module
+
+jsonschema = lazy_module("jsonschema")  # loaded by the first invalid response
+
+LIST_SUFFIX = "[]"
+
+# keywords without effect on validation
+_ANNOTATIONS = {
+    "$schema",
+    "$id",
+    "$comment",
+    "title",
+    "description",
+    "default",
+    "examples",
+    "format",
+}
+
+# keywords the predicate compiler handles
+_SUPPORTED = {
+    "type",
+    "properties",
+    "required",
+    "additionalProperties",
+    "items",
+    "minItems",
+    "maxItems",
+    "minimum",
+    "maximum",
+    "minLength",
+    "maxLength",
+}
+
+
+class _Unsupported(Exception):
+    """The schema uses a keyword the predicate compiler does not know."""
+
+
+# Python types of the JSON types; bool is not a number for jsonschema, and
+# floats with an integral value are integers
+_KINDS = {
+    "string": (str,),
+    "integer": (int,),
+    "number": (int, float),
+    "boolean": (bool,),
+    "null": (type(None),),
+    "object": (dict,),
+    "array": (list,),
+}
+
+
+def _all(checks):
+    if len(checks) == 1:
+        return checks[0]
+    checks = tuple(checks)
+
+    def check(value):
+        for part in checks:
+            if not part(value):
+                return False
+        return True
+
+    return check
+
+
+def _compile(schema):
+    """Predicate equivalent to or stricter than validating against `schema`."""
+    if schema is True:
+        return lambda value: True
+    if schema is False:
+        return lambda value: False
+    if not isinstance(schema, dict):
+        raise _Unsupported(schema)
+    keywords = set(schema) - _ANNOTATIONS
+    if keywords - _SUPPORTED:
+        raise _Unsupported(keywords - _SUPPORTED)
+    checks = []
+    if "type" in keywords:
+        checks.append(_compile_type(schema["type"]))
+    if keywords & {"properties", "required", "additionalProperties"}:
+        checks.append(_compile_object(schema))
+    if keywords & {"items", "minItems", "maxItems"}:
+        checks.append(_compile_array(schema))
+    if keywords & {"minimum", "maximum"}:
+        checks.append(_compile_bounds(schema, (int, float), "minimum", "maximum"))
+    if keywords & {"minLength", "maxLength"}:
+        checks.append(_compile_bounds(schema, (str,), "minLength", "maxLength", len))
+    return _all(checks) if checks else (lambda value: True)
+
+
+def _compile_type(names):
+    if isinstance(names, str):
+        names = [names]
+    try:
+        kinds = frozenset(kind for name in names for kind in _KINDS[name])
+    except KeyError as e:
+        raise _Unsupported(e.args[0])
+    if "integer" in names and "number" not in names:
+        return lambda value: type(value) in kinds or (
+            type(value) is float and value.is_integer()
+        )
+    return lambda value: type(value) in kinds
+
+
+def _compile_object(schema):
+    properties = tuple(
+        (name, _compile(subschema))
+        for name, subschema in schema.get("properties", {}).items()
+    )
+    required = frozenset(schema.get("required", ()))
+    additional = schema.get("additionalProperties", True)
+    if isinstance(additional, dict):
+        raise _Unsupported("additionalProperties")
+    allowed = None if additional else frozenset(schema.get("properties", {}))
+
+    def check(value):
+        if type(value) is not dict:
+            return True
+        keys = value.keys()
+        if not required <= keys:
+            return False
+        if allowed is not None and not keys <= allowed:
+            return False
+        for name, check_property in properties:
+            if name in value and not check_property(value[name]):
+                return False
+        return True
+
+    return check
+
+
+def _compile_array(schema):
+    items = schema.get("items", True)
+    if not isinstance(items, (dict, bool)):
+        raise _Unsupported("items")  # tuple validation
+    check_item = _compile(items)
+    low, high = schema.get("minItems", 0), schema.get("maxItems")
+
+    def check(value):
+        if type(value) is not list:
+            return True
+        if len(value) < low or (high is not None and len(value) > high):
+            return False
+        for item in value:
+            if not check_item(item):
+                return False
+        return True
+
+    return check
+
+
+def _compile_bounds(schema, kinds, low_keyword, high_keyword, measure=None):
+    low, high = schema.get(low_keyword), schema.get(high_keyword)
+
+    def check(value):
+        if type(value) not in kinds:
+            return True
+        size = value if measure is None else measure(value)
+        if low is not None and size < low:
+            return False
+        return high is None or size <= high
+
+    return check
+
+
+def _error_path(error) -> str:
+    return "$" + "".join(
+        f"[{part}]" if isinstance(part, int) else f".{part}"
+        for part in error.absolute_path
+    )
+
+
+class SchemaRegistry:
+    """
+    Response schemas by name, each compiled once.
+
+    Args:
+        schemas (dict, optional): `{name: JSON schema of one object}`,
+            RESPONSE_SCHEMAS by default.
+    """
+
+    def __init__(self, schemas=None):
+        self._schemas = dict(RESPONSE_SCHEMAS if schemas is None else schemas)
+        self._validators = {}
+        self._predicates = {}
+        self._lock = threading.Lock()
+
+    def register(self, name, schema):
+        """Adds or replaces the schema `name`."""
+        with self._lock:
+            self._schemas[name] = schema
+            for cache in (self._validators, self._predicates):
+                cache.pop(name, None)
+                cache.pop(name + LIST_SUFFIX, None)
+
+    def schema(self, name) -> dict:
+        """Schema `name`; "<name>[]" is an array of `name` objects."""
+        base = name[: -len(LIST_SUFFIX)] if name.endswith(LIST_SUFFIX) else name
+        try:
+            schema = self._schemas[base]
+        except KeyError:
+            raise KeyError(f"no response schema registered for {base!r}") from None
+        return {"type": "array", "items": schema} if base != name else schema
+
+    def validator(self, name):
+        """jsonschema validator of `name`, the schema is checked on first use."""
+        validator = self._validators.get(name)
+        if validator is None:
+            schema = self.schema(name)
+            cls = jsonschema.validators.validator_for(schema)
+            cls.check_schema(schema)
+            validator = cls(schema)
+            with self._lock:
+                validator = self._validators.setdefault(name, validator)
+        return validator
+
+    def predicate(self, name):
+        """Fast check of `name`, None if the schema needs jsonschema."""
+        try:
+            return self._predicates[name]
+        except KeyError:
+            pass
+        try:
+            predicate = _compile(self.schema(name))
+        except _Unsupported:
+            predicate = None
+        with self._lock:
+            return self._predicates.setdefault(name, predicate)
+
+    def is_valid(self, name, instance) -> bool:
+        predicate = self.predicate(name)
+        if predicate is not None and predicate(instance):
+            return True
+        return self.validator(name).is_valid(instance)
+
+    def errors(self, name, instance, limit=10) -> list:
+        """
+        Validation errors of `instance` against schema `name`.
+
+        Args:
+            name (str): Schema name, "<name>[]" for a list response.
+            instance: Decoded response body.
+            limit (int, optional): Maximum number of errors, None for all.
+
+        Returns:
+            list[str]: "<path>: <message>" per error, e.g.
+                "$[3].teacherId: None is not of type 'integer'"; empty if valid.
+        """
+        predicate = self.predicate(name)
+        if predicate is not None and predicate(instance):
+            return []
+        errors = self.validator(name).iter_errors(instance)
+        return [
+            f"{_error_path(error)}: {error.message}" for error in islice(errors, limit)
+        ]
+
+    def missing_keys(self, name, instance) -> set:
+        """
+        Required top-level keys of schema `name` that `instance` lacks.
+
+        For a list, the keys missing in any of its items.
+        """
+        required = frozenset(self.schema(name).get("required", ()))
+        if not isinstance(instance, list):
+            return set(required - instance.keys())
+        missing = set()
+        for item in instance:
+            if not required <= item.keys():
+                missing |= required - item.keys()
+        return missing
+
+
+_registry = None
+_registry_lock = threading.Lock()
+
+
+def get_schema_registry() -> SchemaRegistry:
+    """Process-wide registry, its schemas compiled once per session."""
+    global _registry
+    with _registry_lock:
+        if _registry is None:
+            _registry = SchemaRegistry()
+        return _registry
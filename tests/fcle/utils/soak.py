@@ -0,0 +1,561 @@
+"""
+Soak mode: realistic user journeys for hours, with streamed metrics.
+
+`pytest --soak-duration 14400 --soak-users 8` skips the tests and keeps
+`--soak-users` threads cycling through the onboarding journey of a teacher:
+
+    signup -> set_password -> login -> new_teacher -> upload_id_document
+    -> teacher_educations -> upload_education_document -> Teaching_Experiences
+    -> learning_materials -> fav-teachers -> sweep
+
+Each journey registers a fresh `LABEL` account and `sweep` deletes it with
+everything it created (utils/sweeper.py). The server's data does not grow over
+the run, and a journey that fails halfway is still swept. Accounts are also
+written to the ledger, so an interrupted run can be swept afterwards. Payloads
+come from the suite's own generators.
+
+Client memory stays flat however long the run is. Samples are not kept:
+every step records into a histogram of the current window (`--soak-window`
+seconds), and when the window closes its per-step aggregates are appended as
+one JSON line to `--soak-report`:
+
+    {"window": 7, "start": "2026-10-16T09:07:00Z", "journeys": 41,
+     "journey_errors": 0, "client_rss_mb": 61.2,
+     "steps": {"login": {"requests": 41, "errors": 0, "p50_ms": 38.1,
+                         "p95_ms": 52.4, "p99_ms": 60.2, "max_ms": 61.0}, ...},
+     "trends": ["login: p95 +31% (+16.2 ms) over 7 windows"]}
+
+Only the p50/p95 of each closed window are kept, to judge trends (at most
+SOAK_TREND_WINDOWS of them). A step is flagged when the least-squares line
+through its p95 windows (p95 creeping up) or its p50 windows (a slowdown of
+every request, as with a leak) rises by more than SOAK_TREND_TOLERANCE and by
+more than SOAK_TREND_SLACK ms over the run. The median of the last quarter of
+windows must confirm the rise over the first quarter, so a single slow window
+does not raise a flag, and a window joins a step's trend only with at least
+SOAK_TREND_MIN_REQUESTS requests of it, so a percentile of two requests does not
+either.
+"""
+
+import json
+import random
+import statistics
+import threading
+import time
+from collections import deque
+from datetime import datetime, timezone
+from http import HTTPStatus
+from pathlib import Path
+
+import pytest
+
+from fixtures.learning_materials.fixture_learning_materials_cases import valid_payload
+from fixtures.teacher_documents.fixture_teacher_documents_cases import (
+    _valid_payload as document_payload,
+)
+from fixtures.teacher_educations.fixture_teacher_educations_delete import (
+    build_teacher_education_payload,
+)
+from fixtures.teaching_experiences.fixture_teaching_experiences_cases import (
+    _valid_payload as experience_payload,
+)
+from parametrs.parameters_new_teacher import ParametrsNewTeacher
+from settings import (
+    ENDPOINTS,
+    SOAK_FAVORITE_TEACHERS,
+    SOAK_PAUSE,
+    SOAK_TREND_MIN_REQUESTS,
+    SOAK_TREND_MIN_WINDOWS,
+    SOAK_TREND_SLACK,
+    SOAK_TREND_TOLERANCE,
+    SOAK_TREND_WINDOWS,
+    SOAK_USERS,
+    SOAK_WINDOW,
+    USER_TIMEZONE,
+)
+from utils.histogram import LatencyHistogram
+from utils.identities import get_identity_generator
+from utils.ledger import record_account
+from utils.load_profile import LEARNING_MATERIAL_CASES
+from utils.sweeper import Sweeper
+from utils.transport import get_transport
+
+STEPS = (
+    "signup",
+    "set_password",
+    "login",
+    "new_teacher",
+    "upload_id_document",
+    "teacher_educations",
+    "upload_education_document",
+    "Teaching_Experiences",
+    "learning_materials",
+    "fav-teachers",
+    "sweep",
+)
+
+OK = (HTTPStatus.OK, HTTPStatus.CREATED)
+
+
+class StepFailed(Exception):
+    """A journey step got an unexpected answer, the rest of the journey is skipped."""
+
+
+def _ms(micros):
+    return round(micros / 1000, 1) if micros is not None else None
+
+
+def _client_rss_mb():
+    """Resident memory of this process, None where /proc is not available."""
+    try:
+        with open("/proc/self/statm", encoding="ascii") as f:
+            pages = int(f.read().split()[1])
+    except (OSError, ValueError, IndexError):
+        return None
+    import resource
+
+    return round(pages * resource.getpagesize() / 2**20, 1)
+
+
+def _growth(values):
+    """
+    Rise of `values` over their index by least squares, or None.
+
+    The rise counts only if the median of the last quarter of `values` is above
+    the median of the first quarter, then it is (relative, absolute): (fit at
+    end - fit at start) / fit at start, and fit at end - fit at start.
+    """
+    n = len(values)
+    quarter = max(1, n // 4)
+    if statistics.median(values[-quarter:]) <= statistics.median(values[:quarter]):
+        return None
+    mean_x, mean_y = (n - 1) / 2, statistics.fmean(values)
+    slope = sum((x - mean_x) * (y - mean_y) for x, y in enumerate(values)) / sum(
+        (x - mean_x) ** 2 for x in range(n)
+    )
+    start = mean_y - slope * mean_x
+    if start <= 0:
+        return None
+    rise = slope * (n - 1)
+    return rise / start, rise
+
+
+class _Step:
+    """Aggregates of one step, for a window or the whole run."""
+
+    def __init__(self):
+        self.histogram = LatencyHistogram()
+        self.errors = 0
+
+    def add(self, micros, ok):
+        self.histogram.record(micros)
+        self.errors += int(not ok)
+
+    def summary(self) -> dict:
+        histogram = self.histogram
+        return {
+            "requests": histogram.count,
+            "errors": self.errors,
+            "p50_ms": _ms(histogram.percentile(50)),
+            "p95_ms": _ms(histogram.percentile(95)),
+            "p99_ms": _ms(histogram.percentile(99)),
+            "max_ms": _ms(histogram.max),
+        }
+
+
+class SoakMetrics:
+    """
+    Per-window step aggregates, streamed to a JSONL file, and their trends.
+
+    Args:
+        path (Path, optional): Report the windows are appended to.
+        window (float): Seconds per window.
+        tolerance (float): Relative p50/p95 rise over the run that is flagged.
+        slack (float): Milliseconds the rise must exceed as well.
+        min_windows (int): Windows needed before trends are judged.
+        min_requests (int): Requests of a step a window needs to join its trend.
+        keep (int): Windows kept for the trends.
+    """
+
+    def __init__(
+        self,
+        path=None,
+        window=SOAK_WINDOW,
+        tolerance=SOAK_TREND_TOLERANCE,
+        slack=SOAK_TREND_SLACK,
+        min_windows=SOAK_TREND_MIN_WINDOWS,
+        min_requests=SOAK_TREND_MIN_REQUESTS,
+        keep=SOAK_TREND_WINDOWS,
+    ):
+        self.path = Path(path) if path else None
+        self.window = window
+        self.tolerance = tolerance
+        self.slack = slack
+        self.min_windows = min_windows
+        self.min_requests = min_requests
+        self.keep = keep
+        self.index = 0
+        self.total = {}  # step -> _Step of the whole run
+        self.journeys = 0
+        self.journey_errors = 0
+        self.series = {}  # step -> deque of (p50, p95) per window, microseconds
+        self.flags = []
+        self._lock = threading.Lock()
+        self._reset(time.time())
+        if self.path is not None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self.path.write_text("", encoding="utf-8")
+
+    def _reset(self, now):
+        self.started = now
+        self.steps = {}
+        self.window_journeys = 0
+        self.window_errors = 0
+
+    def add(self, step, seconds, ok):
+        micros = seconds * 1_000_000
+        with self._lock:
+            self.steps.setdefault(step, _Step()).add(micros, ok)
+            self.total.setdefault(step, _Step()).add(micros, ok)
+
+    def journey(self, ok):
+        with self._lock:
+            self.window_journeys += 1
+            self.window_errors += int(not ok)
+            self.journeys += 1
+            self.journey_errors += int(not ok)
+
+    def roll(self, now=None, force=False):
+        """Closes the window if its time is up (or `force`), returns its line or None."""
+        now = time.time() if now is None else now
+        with self._lock:
+            if not force and now - self.started < self.window:
+                return None
+            steps, journeys, errors = (
+                self.steps,
+                self.window_journeys,
+                self.window_errors,
+            )
+            started = self.started
+            self._reset(now)
+            self.index += 1
+            index = self.index
+        line = {
+            "window": index,
+            "start": datetime.fromtimestamp(started, timezone.utc).strftime(
+                "%Y-%m-%dT%H:%M:%SZ"
+            ),
+            "seconds": round(now - started, 1),
+            "journeys": journeys,
+            "journey_errors": errors,
+            "client_rss_mb": _client_rss_mb(),
+            "steps": {name: steps[name].summary() for name in STEPS if name in steps},
+        }
+        for name, step in steps.items():
+            if step.histogram.count < self.min_requests:
+                continue
+            series = self.series.setdefault(name, deque(maxlen=self.keep))
+            series.append(
+                (step.histogram.percentile(50), step.histogram.percentile(95))
+            )
+        self.flags = self.trends()
+        line["trends"] = self.flags
+        if self.path is not None:
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(line) + "\n")
+        return line
+
+    def trends(self) -> list:
+        """Steps whose p95 or p50 rose by more than tolerance and slack over the windows."""
+        flags = []
+        for name in STEPS:
+            series = self.series.get(name)
+            if series is None or len(series) < self.min_windows:
+                continue
+            for label, column in (("p95", 1), ("p50", 0)):
+                growth = _growth([entry[column] for entry in series])
+                if growth is None:
+                    continue
+                relative, rise = growth
+                if relative > self.tolerance and rise / 1000 > self.slack:
+                    flags.append(
+                        f"{name}: {label} +{relative:.0%} (+{rise / 1000:.1f} ms) "
+                        f"over {len(series)} windows"
+                    )
+        return flags
+
+
+class Journey:
+    """
+    One pass through the soak journey with a fresh account.
+
+    Args:
+        transport (utils.transport.HttpTransport): Sends the requests.
+        metrics (SoakMetrics): Gets the time and outcome of every step.
+        rng (random.Random): Picks payload variants.
+    """
+
+    def __init__(self, transport, metrics, rng):
+        self.transport = transport
+        self.metrics = metrics
+        self.rng = rng
+        self.headers = None
+
+    def _step(self, name, method, endpoint, expected=OK, **kwargs):
+        started = time.perf_counter()
+        response = None
+        try:
+            response = self.transport.request(method, endpoint, **kwargs)
+            ok = response.status_code in expected
+        except Exception:  # a broken request is a data point, not a crash
+            ok = False
+        self.metrics.add(name, time.perf_counter() - started, ok)
+        if not ok:
+            status = response.status_code if response is not None else "error"
+            raise StepFailed(f"{name}: {status}")
+        return response
+
+    def run(self) -> bool:
+        """Runs the journey, returns whether every step succeeded."""
+        identity = get_identity_generator().identity()
+        registered = False
+        try:
+            registered = self._onboard(identity)
+            self._teach()
+            return True
+        except StepFailed:
+            return False
+        finally:
+            if registered:
+                self._sweep(identity)
+
+    def _onboard(self, identity) -> bool:
+        r = self._step(
+            "signup",
+            "POST",
+            ENDPOINTS["signup"],
+            json={"email": identity.email, "lang": "en"},
+        )
+        self._step(
+            "set_password",
+            "POST",
+            ENDPOINTS["set_password"],
+            json={
+                "token": r.json()["token"],
+                "newPassword": identity.password,
+                "nickname": identity.nickname,
+                "timezone": USER_TIMEZONE,
+            },
+        )
+        record_account(identity.email, identity.password)
+        try:
+            r = self._step(
+                "login",
+                "POST",
+                ENDPOINTS["login"],
+                json={
+                    "email": identity.email,
+                    "password": identity.password,
+                    "timezone": USER_TIMEZONE,
+                },
+            )
+        except StepFailed:
+            return True  # registered, sweep it
+        self.headers = {"Authorization": f"Bearer {r.json()['token']}"}
+        return True
+
+    def _teach(self):
+        if self.headers is None:
+            raise StepFailed("login")
+        headers = self.headers
+        teacher_type, language_id, *_ = ParametrsNewTeacher.parametr_generation(
+            status=HTTPStatus.OK
+        )
+        self._step(
+            "new_teacher",
+            "POST",
+            ENDPOINTS["new_teacher"],
+            json={"teacherType": teacher_type, "languageId": language_id},
+            headers=headers,
+        )
+        self._upload("upload_id_document", "id")
+        r = self._step(
+            "teacher_educations",
+            "POST",
+            ENDPOINTS["teacher_educations"],
+            json=build_teacher_education_payload(),
+            headers=headers,
+        )
+        self._upload("upload_education_document", "education", r.json().get("id"))
+        self._step(
+            "Teaching_Experiences",
+            "POST",
+            ENDPOINTS["Teaching_Experiences"],
+            json=experience_payload(),
+            headers=headers,
+        )
+        self._step(
+            "learning_materials",
+            "POST",
+            ENDPOINTS["learning_materials"],
+            json=valid_payload(self.rng.choice(LEARNING_MATERIAL_CASES)),
+            headers=headers,
+        )
+        for teacher_id in SOAK_FAVORITE_TEACHERS:
+            self._step(
+                "fav-teachers",
+                "POST",
+                ENDPOINTS["fav-teachers"],
+                json={"teacherId": teacher_id},
+                headers=headers,
+            )
+
+    def _upload(self, name, document_type, reference=None):
+        data, endpoint, files = document_payload(document_type)
+        if reference is not None:
+            data["referenceid"] = reference
+        self._step(
+            name,
+            "POST",
+            f"{ENDPOINTS['teacher_documents']}/{endpoint}",
+            data=data,
+            files=files,
+            headers=self.headers,
+        )
+
+    def _sweep(self, identity):
+        started = time.perf_counter()
+        account = {"email": identity.email, "password": identity.password}
+        try:
+            ok = Sweeper(self.transport, rps=0).sweep_account(account) == "deleted"
+        except Exception:  # left in the ledger for `python -m utils.sweeper`
+            ok = False
+        self.metrics.add("sweep", time.perf_counter() - started, ok)
+
+
+class SoakRunner:
+    """
+    pytest plugin that replaces the test run with a soak run.
+
+    Args:
+        config (pytest.Config): Session config.
+        duration (float): Seconds of soak.
+        users (int): Journeys running at once.
+        pause (float): Seconds between two journeys of a user.
+        window (float): Seconds per report window.
+        report_path (str, optional): JSONL file the windows are streamed to.
+        seed (int, optional): Seed of the payload variants.
+    """
+
+    def __init__(
+        self,
+        config,
+        duration,
+        users=SOAK_USERS,
+        pause=SOAK_PAUSE,
+        window=SOAK_WINDOW,
+        report_path=None,
+        seed=None,
+    ):
+        self.config = config
+        self.duration = duration
+        self.users = max(1, users)
+        self.pause = pause
+        self.metrics = SoakMetrics(report_path, window)
+        self.report_path = report_path
+        self.seed = seed
+        self.elapsed = 0.0
+        self._stop = threading.Event()
+
+    @pytest.hookimpl(trylast=True)
+    def pytest_collection_modifyitems(self, config, items):
+        # the journeys come from the generators, no test is run
+        if items:
+            config.hook.pytest_deselected(items=list(items))
+            items[:] = []
+
+    @pytest.hookimpl(tryfirst=True)
+    def pytest_runtestloop(self, session):
+        self.run()
+        return True
+
+    def run(self):
+        transport = get_transport()
+        seeds = random.Random(self.seed)
+        threads = [
+            threading.Thread(
+                target=self._user,
+                args=(transport, random.Random(seeds.random())),
+                name=f"fcle-soak-{index}",
+                daemon=True,
+            )
+            for index in range(self.users)
+        ]
+        start = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        deadline = start + self.duration
+        while time.perf_counter() < deadline:
+            time.sleep(min(1.0, max(0.0, deadline - time.perf_counter())))
+            self._report(self.metrics.roll())
+        self._stop.set()
+        for thread in threads:
+            thread.join()
+        self.elapsed = time.perf_counter() - start
+        self._report(self.metrics.roll(force=True))
+
+    def _user(self, transport, rng):
+        while not self._stop.is_set():
+            ok = Journey(transport, self.metrics, rng).run()
+            self.metrics.journey(ok)
+            self._stop.wait(self.pause)
+
+    def _report(self, line):
+        reporter = self.config.pluginmanager.get_plugin("terminalreporter")
+        if line is None or reporter is None:
+            return
+        slowest = max(
+            line["steps"].items(),
+            key=lambda item: item[1]["p95_ms"] or 0,
+            default=(None, None),
+        )
+        reporter.write_line(
+            f"soak window {line['window']}: {line['journeys']} journeys, "
+            f"{line['journey_errors']} failed"
+            + (
+                f", slowest {slowest[0]} p95 {slowest[1]['p95_ms']} ms"
+                if slowest[0]
+                else ""
+            )
+            + (
+                f", client {line['client_rss_mb']} MB"
+                if line["client_rss_mb"] is not None
+                else ""
+            )
+        )
+        for flag in line["trends"]:
+            reporter.write_line(f"  trend: {flag}")
+
+    def pytest_terminal_summary(self, terminalreporter):
+        metrics = self.metrics
+        terminalreporter.section("soak")
+        terminalreporter.write_line(
+            f"{self.users} users, {self.elapsed:.0f}s, {metrics.index} windows, "
+            f"{metrics.journeys} journeys, {metrics.journey_errors} failed"
+            + (f", windows streamed to {self.report_path}" if self.report_path else "")
+        )
+        terminalreporter.write_line(
+            f"{'step':<27}{'requests':>9}{'errors':>8}{'p50 ms':>9}{'p95 ms':>9}"
+            f"{'p99 ms':>9}{'max ms':>9}"
+        )
+        for name in STEPS:
+            if name not in metrics.total:
+                continue
+            row = metrics.total[name].summary()
+            terminalreporter.write_line(
+                f"{name:<27}{row['requests']:>9}{row['errors']:>8}{row['p50_ms']:>9}"
+                f"{row['p95_ms']:>9}{row['p99_ms']:>9}{row['max_ms']:>9}"
+            )
+        if metrics.flags:
+            terminalreporter.write_line("degradation trends:")
+            for flag in metrics.flags:
+                terminalreporter.write_line(f"  {flag}")
@@ -0,0 +1,1555 @@
+"""
+In-process stand-in for the API under test.
+
+`pytest --local-api` starts a `StubServer` on a free localhost port before the
+first test and points `HTTP_PROXY` of the test process at it, so every
+plain-HTTP request of the session (the shared transports, the async client and
+the few fixtures that call `requests` directly) is answered locally. Nothing in
+the tests changes: URLs keep the `BASE_URL` / `CONTENT_URL` hosts, the stub
+picks the API by the requested host, and latency reports and baselines use
+the same endpoint keys as runs against the real server.
+
+The stub keeps just enough in-memory state for the flows the suite exercises:
+accounts and their tokens, profiles, favorite teachers, user languages,
+teacher profiles with educations, experiences and documents, learning
+materials and contact tickets. Status codes and bodies follow what the tests
+expect from the real server: 409 with `{"error": {"code", "message"}}` for
+validation errors, problem+json for 401. Ids come from counters and every
+response can be given a fixed service time (`--local-api-delay`), so runs
+against the stub are repeatable enough to benchmark the suite itself. With a
+capacity (`--local-api-capacity`) the stub throttles the requests beyond it
+with 429 and `Retry-After`, like a throttling gateway.
+
+It can also be started on its own (from tests/fcle), e.g. as a target for the
+load mode:
+
+    python -m utils.stub_server --port 8080
+"""
+
+import base64
+import hashlib
+import hmac
+import itertools
+import json
+import os
+import re
+import secrets
+import string
+import threading
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from email.parser import BytesParser
+from email.policy import HTTP
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+from settings import (
+    BASE_URL,
+    CONTENT_URL,
+    STUB_CAPACITY,
+    STUB_DELAY,
+    STUB_HOST,
+    STUB_PORT,
+    STUB_RETRY_AFTER,
+    STUB_TOKEN_TTL,
+)
+
+PROXY_ENV = ("HTTP_PROXY", "http_proxy", "NO_PROXY", "no_proxy")
+
+EMAIL = re.compile(r"^[A-Za-z0-9._+-]+@[A-Za-z0-9-]+(\.[A-Za-z0-9-]+)+$")
+EMAIL_LOCAL_MAX = 64  # longer local parts overflow the real server's column (500)
+NICKNAME = re.compile(r"^[a-z0-9_]{3,50}$")
+TIMEZONE = re.compile(r"^UTC([+-]\d{1,2})?$")
+TELEGRAM = re.compile(r"^(@|https?://t\.me/)?[A-Za-z0-9_]+$")
+LANGUAGES = {"en", "ru", "de", "fr", "es", "it", "pt", "uk", "pl", "tr", "zh", "ja"}
+LEVELS = {"Native", "A1", "A2", "B1", "B2", "C1", "C2", ""}
+INT32_MAX = 2**31 - 1
+
+# general categories of the content server: typeId -> ids
+CATEGORIES = {4: range(1, 25), 5: range(101, 125)}
+# degreeId -> formal degree (listed by /formal) or course (listed by /courses)
+FORMAL_DEGREES = range(1, 7)
+COURSE_DEGREES = range(7, 11)
+DOCUMENT_TYPES = {"id": "id", "education": "education", "additional": "additional"}
+
+
+class ApiError(Exception):
+    """Error response, rendered as {"error": {"code", "message"}}."""
+
+    def __init__(self, status, code, message=""):
+        super().__init__(message or code)
+        self.status = int(status)
+        self.code = code
+        self.message = message or code
+
+
+class Unauthorized(ApiError):
+    """401, rendered as problem+json like the real server's auth middleware."""
+
+    def __init__(self, message="Unauthorized"):
+        super().__init__(HTTPStatus.UNAUTHORIZED, "auth.token.invalid", message)
+
+
+def _validation(code, message):
+    return ApiError(HTTPStatus.CONFLICT, code, f"validation failed: {message}")
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%S.%fZ")
+
+
+def _b64(data: bytes) -> str:
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode("ascii")
+
+
+def _unb64(text: str) -> bytes:
+    return base64.urlsafe_b64decode(text + "=" * (-len(text) % 4))
+
+
+def _valid_password(password) -> bool:
+    return (
+        isinstance(password, str)
+        and len(password) >= 8
+        and any(c.islower() for c in password)
+        and any(c.isupper() for c in password)
+        and any(c.isdigit() for c in password)
+        and any(c in string.punctuation for c in password)
+    )
+
+
+def _valid_timezone(value) -> bool:
+    if value == "":
+        return True
+    match = isinstance(value, str) and TIMEZONE.match(value)
+    return bool(match) and -12 <= int(match.group(1) or 0) <= 14
+
+
+def _text(payload, key, max_length, entity, required=True, min_length=1):
+    """Returns a validated string field of `payload` (None if optional and absent)."""
+    value = payload.get(key)
+    if value is None and not required:
+        return None
+    if not isinstance(value, str) or not min_length <= len(value) <= max_length:
+        raise _validation(
+            f"{entity}.{key}.invalid",
+            f"{key} must be a string of {min_length}..{max_length} characters",
+        )
+    return value
+
+
+def _int(value, name, entity, minimum=1, maximum=INT32_MAX):
+    if (
+        isinstance(value, bool)
+        or not isinstance(value, int)
+        or not minimum <= value <= maximum
+    ):
+        raise _validation(
+            f"{entity}.{name}.invalid", f"{name} must be {minimum}..{maximum}"
+        )
+    return value
+
+
+def _query_int(query, name, default=None, minimum=None):
+    """Reads an integer query parameter, 400 for non-numbers and out-of-range values."""
+    values = query.get(name)
+    if not values:
+        return default
+    if len(values) > 1 or not re.fullmatch(r"-?\d+", values[0]):
+        raise ApiError(
+            HTTPStatus.BAD_REQUEST,
+            f"query.{name}.invalid",
+            f"{name} must be an integer",
+        )
+    value = int(values[0])
+    if not -INT32_MAX - 1 <= value <= INT32_MAX or (
+        minimum is not None and value < minimum
+    ):
+        raise ApiError(
+            HTTPStatus.BAD_REQUEST, f"query.{name}.invalid", f"{name} is out of range"
+        )
+    return value
+
+
+def _path_id(value) -> int:
+    """Entity id from the path, 400 for ids that cannot exist."""
+    if (
+        not re.fullmatch(r"-?\d+", value)
+        or not -INT32_MAX - 1 <= int(value) <= INT32_MAX
+    ):
+        raise ApiError(
+            HTTPStatus.BAD_REQUEST, "request.id.invalid", f"Invalid id {value!r}"
+        )
+    return int(value)
+
+
+@dataclass
+class Request:
+    method: str
+    path: str
+    query: dict
+    headers: object
+    body: bytes
+    params: tuple = ()
+
+    def json(self):
+        if not self.body:
+            return {}
+        try:
+            return json.loads(self.body)
+        except ValueError:
+            raise ApiError(
+                HTTPStatus.BAD_REQUEST, "request.body.invalid", "Body is not JSON"
+            )
+
+    def form(self):
+        """Returns ({field: str}, {field: (filename, bytes)}) of a multipart/urlencoded body."""
+        content_type = self.headers.get("Content-Type", "")
+        if content_type.startswith("application/x-www-form-urlencoded"):
+            fields = parse_qs(self.body.decode("utf-8"), keep_blank_values=True)
+            return {k: v[-1] for k, v in fields.items()}, {}
+        if not content_type.startswith("multipart/form-data"):
+            return {}, {}
+        message = BytesParser(policy=HTTP).parsebytes(
+            f"Content-Type: {content_type}\r\n\r\n".encode("latin-1") + self.body
+        )
+        fields, files = {}, {}
+        for part in message.iter_parts():
+            name = part.get_param("name", header="content-disposition")
+            filename = part.get_filename()
+            data = part.get_payload(decode=True) or b""
+            if filename is not None:
+                files[name] = (filename, data)
+            else:
+                fields[name] = data.decode("utf-8")
+        return fields, files
+
+
+@dataclass
+class Response:
+    status: int
+    body: object = None
+    content_type: str = "application/json; charset=utf-8"
+    headers: dict = field(default_factory=dict)
+
+    def encode(self) -> bytes:
+        if self.body is None:
+            return b""
+        if isinstance(self.body, bytes):
+            return self.body
+        if isinstance(self.body, str) and not self.content_type.startswith(
+            "application/"
+        ):
+            return self.body.encode("utf-8")
+        return json.dumps(self.body, ensure_ascii=False).encode("utf-8")
+
+
+def _text_response(text, status=HTTPStatus.OK):
+    return Response(status, text, "text/plain; charset=utf-8")
+
+
+def _throttled():
+    return Response(
+        HTTPStatus.TOO_MANY_REQUESTS,
+        {"error": {"code": "server.throttled", "message": "Too many requests"}},
+        headers={"Retry-After": str(STUB_RETRY_AFTER)},
+    )
+
+
+@dataclass
+class Account:
+    id: int
+    email: str
+    lang: str
+    password: str = None
+    nickname: str = None
+    timezone: str = ""
+    profile: dict = field(default_factory=dict)
+    hobbies: list = field(default_factory=list)
+    interests: list = field(default_factory=list)
+    join_date: str = field(default_factory=_now)
+    last_login: str = None
+    telegram: dict = None
+    teacher: dict = None
+    favorites: dict = field(default_factory=dict)  # teacherId -> added at
+    languages: dict = field(default_factory=dict)  # record id -> record
+    educations: dict = field(default_factory=dict)
+    experiences: dict = field(default_factory=dict)
+    documents: dict = field(default_factory=dict)
+
+
+class StubApi:
+    """
+    State and request handlers of the stand-in API.
+
+    `handle` is thread-safe: handlers run under one lock, which also makes
+    check-then-insert flows (favorites, language upserts) atomic.
+
+    Args:
+        secret (bytes, optional): HMAC key of the issued tokens, random by default.
+        token_ttl (int): Lifetime of access tokens in seconds.
+    """
+
+    # (method, path pattern, handler name, API), patterns are matched case-insensitively
+    ROUTES = (
+        ("POST", r"auth/signup", "signup", "api"),
+        ("POST", r"auth/set-password", "set_password", "api"),
+        ("POST", r"auth/login", "login", "api"),
+        ("POST", r"auth/forgot-password", "forgot_password", "api"),
+        ("POST", r"auth/reset-password", "reset_password", "api"),
+        ("POST", r"auth/change-password", "change_password", "api"),
+        ("GET", r"users/get-profile", "get_profile", "api"),
+        ("PUT", r"users", "update_user", "api"),
+        ("POST", r"users", "update_user_override", "api"),
+        ("DELETE", r"users", "delete_user", "api"),
+        ("POST", r"users/hobbies", "set_hobbies", "api"),
+        ("POST", r"users/interests", "set_interests", "api"),
+        ("POST", r"users/telegram", "link_telegram", "api"),
+        ("GET", r"users/telegram", "list_telegram", "api"),
+        ("GET", r"users/telegram/([^/]+)", "get_telegram", "api"),
+        ("GET", r"favoriteteachers", "list_favorites", "api"),
+        ("POST", r"favoriteteachers", "add_favorite", "api"),
+        ("DELETE", r"favoriteteachers/([^/]+)", "delete_favorite", "api"),
+        ("GET", r"userlanguages", "list_languages", "api"),
+        ("POST", r"userlanguages", "upsert_language", "api"),
+        ("GET", r"userlanguages/([^/]+)", "get_language", "api"),
+        ("DELETE", r"userlanguages/([^/]+)", "delete_language", "api"),
+        ("GET", r"newteacher", "get_teacher", "api"),
+        ("POST", r"newteacher", "create_teacher", "api"),
+        ("PUT", r"newteacher", "update_teacher", "api"),
+        (
+            "POST",
+            r"newteacher/upload-(id|education|additional)-document",
+            "upload_document",
+            "api",
+        ),
+        ("GET", r"teachereducations", "list_educations", "api"),
+        ("POST", r"teachereducations", "create_education", "api"),
+        ("GET", r"teachereducations/formal", "list_formal", "api"),
+        ("GET", r"teachereducations/courses", "list_courses", "api"),
+        ("GET", r"teachereducations/([^/]+)", "get_education", "api"),
+        ("PUT", r"teachereducations/([^/]+)", "update_education", "api"),
+        ("DELETE", r"teachereducations/([^/]+)", "delete_education", "api"),
+        ("GET", r"teachingexperiences", "list_experiences", "api"),
+        ("POST", r"teachingexperiences", "create_experience", "api"),
+        ("GET", r"teachingexperiences/([^/]+)", "get_experience", "api"),
+        ("PUT", r"teachingexperiences/([^/]+)", "update_experience", "api"),
+        ("DELETE", r"teachingexperiences/([^/]+)", "delete_experience", "api"),
+        ("GET", r"teacherdocuments", "list_documents", "api"),
+        (
+            "POST",
+            r"teacherdocuments/upload-(id|education|additional)-document",
+            "upload_document",
+            "api",
+        ),
+        (
+            "PUT",
+            r"teacherdocuments/(id|education|additional)-document/([^/]+)",
+            "replace_document",
+            "api",
+        ),
+        ("GET", r"teacherdocuments/([^/]+)", "get_document", "api"),
+        ("DELETE", r"teacherdocuments/([^/]+)", "delete_document", "api"),
+        ("GET", r"learningmaterials", "list_materials", "api"),
+        ("POST", r"learningmaterials", "create_material", "api"),
+        ("POST", r"learningmaterials/fetch", "fetch_materials", "api"),
+        ("POST", r"learningmaterials/recent", "recent_materials", "api"),
+        ("GET", r"learningmaterials/tags", "material_tags", "api"),
+        (
+            "DELETE",
+            r"learningmaterials/picture/([^/]+)",
+            "delete_material_picture",
+            "api",
+        ),
+        ("GET", r"learningmaterials/([^/]+)", "get_material", "api"),
+        ("PUT", r"learningmaterials/([^/]+)", "update_material", "api"),
+        ("DELETE", r"learningmaterials/([^/]+)", "delete_material", "api"),
+        ("POST", r"contacttickets", "create_ticket", "api"),
+        ("GET", r"generalcategories", "general_categories", "content"),
+    )
+
+    def __init__(self, secret=None, token_ttl=STUB_TOKEN_TTL):
+        self.secret = secret or secrets.token_bytes(32)
+        self.token_ttl = token_ttl
+        self.accounts = {}  # id -> Account
+        self.by_email = {}  # lower-cased email -> Account
+        self.signup_tokens = {}  # token -> (email, lang)
+        self.reset_tokens = {}  # token -> account id
+        self.materials = {}
+        self.tickets = {}
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+        self._routes = [
+            (method, re.compile(pattern + r"/?", re.IGNORECASE), name, api)
+            for method, pattern, name, api in self.ROUTES
+        ]
+        self._api_host = urlsplit(BASE_URL).hostname
+        self._content_host = urlsplit(CONTENT_URL).hostname
+        self._prefixes = {
+            "api": urlsplit(BASE_URL).path.strip("/"),
+            "content": urlsplit(CONTENT_URL).path.strip("/"),
+        }
+
+    # --- dispatch ------------------------------------------------------------
+
+    def handle(self, method, target, headers, body=b"") -> Response:
+        """
+        Answers one request.
+
+        Args:
+            method (str): HTTP method.
+            target (str): Request target, absolute (proxy form) or origin form.
+            headers: Request headers (mapping with `.get`).
+            body (bytes): Request body.
+
+        Returns:
+            Response: Status, body and extra headers.
+        """
+        url = urlsplit(target)
+        host = (url.hostname or headers.get("Host", "").split(":")[0]).lower()
+        api = "content" if host == self._content_host else "api"
+        path = url.path.strip("/")
+        prefix = self._prefixes[api]
+        if prefix and path.lower().startswith(prefix.lower()):
+            path = path[len(prefix) :].strip("/")
+        query = parse_qs(url.query, keep_blank_values=True)
+
+        allowed = []
+        for route_method, pattern, name, route_api in self._routes:
+            if route_api != api:
+                continue
+            match = pattern.fullmatch(path)
+            if match is None:
+                continue
+            allowed.append(route_method)
+            if route_method == method:
+                request = Request(method, path, query, headers, body, match.groups())
+                try:
+                    with self._lock:
+                        return getattr(self, f"_{name}")(request)
+                except Unauthorized as e:
+                    return Response(
+                        e.status,
+                        {
+                            "type": "https://tools.ietf.org/html/rfc9110#section-15.5.2",
+                            "title": e.message,
+                            "status": e.status,
+                        },
+                        "application/problem+json; charset=utf-8",
+                    )
+                except ApiError as e:
+                    return Response(
+                        e.status, {"error": {"code": e.code, "message": e.message}}
+                    )
+
+        if allowed:
+            allow = ", ".join(sorted(set(allowed) | {"OPTIONS"}))
+            if method == "OPTIONS":
+                return Response(HTTPStatus.NO_CONTENT, headers={"Allow": allow})
+            return Response(
+                HTTPStatus.METHOD_NOT_ALLOWED,
+                {"error": {"code": "request.method.notAllowed", "message": method}},
+                headers={"Allow": allow},
+            )
+        return Response(
+            HTTPStatus.NOT_FOUND,
+            {"error": {"code": "request.route.notFound", "message": f"/{path}"}},
+        )
+
+    def _next_id(self) -> int:
+        return next(self._ids)
+
+    # --- tokens --------------------------------------------------------------
+
+    def issue_token(self, account) -> str:
+        """HS256 JWT with the account id in `sub` and an `exp` claim."""
+        now = int(time.time())
+        header = _b64(json.dumps({"alg": "HS256", "typ": "JWT"}).encode())
+        claims = _b64(
+            json.dumps(
+                {
+                    "sub": str(account.id),
+                    "email": account.email,
+                    "iat": now,
+                    "exp": now + self.token_ttl,
+                    "jti": self._next_id(),
+                }
+            ).encode()
+        )
+        signature = hmac.new(self.secret, f"{header}.{claims}".encode(), hashlib.sha256)
+        return f"{header}.{claims}.{_b64(signature.digest())}"
+
+    def _token_claims(self, token):
+        try:
+            header, claims, signature = token.split(".")
+            expected = hmac.new(
+                self.secret, f"{header}.{claims}".encode(), hashlib.sha256
+            )
+            if not hmac.compare_digest(_unb64(signature), expected.digest()):
+                return None
+            data = json.loads(_unb64(claims))
+        except (ValueError, TypeError):
+            return None
+        if data.get("exp", 0) < time.time():
+            return None
+        return data
+
+    def _optional_account(self, request):
+        authorization = request.headers.get("Authorization") or ""
+        if not authorization:
+            return None
+        scheme, _, token = authorization.partition(" ")
+        claims = (
+            self._token_claims(token.strip()) if scheme.lower() == "bearer" else None
+        )
+        if claims is None:
+            raise Unauthorized("Invalid or expired token")
+        account = self.accounts.get(int(claims["sub"]))
+        if account is None:
+            raise ApiError(HTTPStatus.NOT_FOUND, "user.User.notFound", "User not found")
+        return account
+
+    def _account(self, request) -> Account:
+        account = self._optional_account(request)
+        if account is None:
+            raise Unauthorized()
+        return account
+
+    # --- auth ----------------------------------------------------------------
+
+    def register(self, email, password, nickname, timezone_="", lang="en") -> Account:
+        """Creates an active account directly, e.g. fixed accounts of the suite."""
+        account = Account(self._next_id(), email, lang, password, nickname, timezone_)
+        self.accounts[account.id] = account
+        self.by_email[email.lower()] = account
+        return account
+
+    def _signup(self, request):
+        payload = request.json()
+        email, lang = payload.get("email"), payload.get("lang")
+        if not isinstance(email, str) or not EMAIL.match(email):
+            raise _validation("user.email.invalid", "email is not a valid address")
+        if len(email.split("@")[0]) > EMAIL_LOCAL_MAX:
+            raise ApiError(
+                HTTPStatus.INTERNAL_SERVER_ERROR, "server.error", "Internal error"
+            )
+        if lang not in (None, "") and lang not in LANGUAGES:
+            raise _validation("user.lang.invalid", "lang is not a supported language")
+        if email.lower() in self.by_email or any(
+            pending == email.lower() for pending, _ in self.signup_tokens.values()
+        ):
+            raise ApiError(
+                HTTPStatus.TOO_MANY_REQUESTS,
+                "user.email.isExists",
+                "Signup already requested",
+            )
+        token = secrets.token_urlsafe(24)
+        self.signup_tokens[token] = (email.lower(), lang)
+        return Response(HTTPStatus.OK, {"email": email, "lang": lang, "token": token})
+
+    def _set_password(self, request):
+        payload = request.json()
+        token = payload.get("token")
+        password, nickname = payload.get("newPassword"), payload.get("nickname")
+        tz = payload.get("timezone", "")
+        if not token:
+            raise _validation("user.token.invalid", "token is required")
+        if not _valid_password(password):
+            raise _validation("user.password.invalid", "password is too weak")
+        if not isinstance(nickname, str) or not NICKNAME.match(nickname):
+            raise _validation(
+                "user.nickname.invalid", "nickname must be [a-z0-9_]{3,50}"
+            )
+        if not _valid_timezone(tz):
+            raise _validation(
+                "user.timezone.invalid", "timezone must be UTC-12..UTC+14"
+            )
+        email, lang = self.signup_tokens.pop(token, (None, None))
+        if email is None:
+            raise ApiError(
+                HTTPStatus.GONE, "user.token.expired", "Signup token is not valid"
+            )
+        account = self.register(email, password, nickname, tz, lang or "en")
+        return Response(HTTPStatus.OK, {"email": account.email, "nickname": nickname})
+
+    def _login(self, request):
+        payload = request.json()
+        email, password = payload.get("email"), payload.get("password")
+        if not isinstance(email, str) or not EMAIL.match(email):
+            raise _validation("user.email.invalid", "email is not a valid address")
+        if not password:
+            raise _validation("user.password.invalid", "password is required")
+        account = self.by_email.get(email.lower())
+        if account is None or account.password != password:
+            raise ApiError(
+                HTTPStatus.GONE,
+                "user.loginMethod.invalid",
+                "Email or password is invalid",
+            )
+        account.last_login = _now()
+        return Response(HTTPStatus.OK, {"token": self.issue_token(account)})
+
+    def _forgot_password(self, request):
+        email = request.json().get("email")
+        account = self.by_email.get(email.lower()) if isinstance(email, str) else None
+        if account is None:
+            raise ApiError(HTTPStatus.NOT_FOUND, "user.User.notFound", "User not found")
+        token = secrets.token_urlsafe(24)
+        self.reset_tokens[token] = account.id
+        return _text_response(token)
+
+    def _reset_password(self, request):
+        payload = request.json()
+        if not _valid_password(payload.get("newPassword")):
+            raise _validation("user.password.invalid", "password is too weak")
+        if not _valid_timezone(payload.get("timezone", "")):
+            raise _validation(
+                "user.timezone.invalid", "timezone must be UTC-12..UTC+14"
+            )
+        account_id = self.reset_tokens.pop(payload.get("token") or "", None)
+        if account_id not in self.accounts:
+            raise ApiError(
+                HTTPStatus.GONE, "user.token.expired", "Reset token is not valid"
+            )
+        self.accounts[account_id].password = payload["newPassword"]
+        return _text_response("true")
+
+    def _change_password(self, request):
+        account = self._account(request)
+        payload = request.json()
+        if payload.get("oldPassword") != account.password:
+            raise ApiError(
+                HTTPStatus.UNPROCESSABLE_ENTITY,
+                "user.oldPassword.invalid",
+                "Wrong password",
+            )
+        if not _valid_password(payload.get("newPassword")):
+            raise _validation("user.password.invalid", "password is too weak")
+        account.password = payload["newPassword"]
+        return _text_response("true")
+
+    # --- users ---------------------------------------------------------------
+
+    def _profile(self, account):
+        return {
+            "id": account.id,
+            "email": account.email,
+            "nickname": account.nickname,
+            "firstName": account.profile.get("firstName"),
+            "lastName": account.profile.get("lastName"),
+            "bio": account.profile.get("bio"),
+            "country": account.profile.get("country"),
+            "city": account.profile.get("city"),
+            "telegramAccount": account.profile.get("telegramAccount"),
+            "timezone": account.timezone,
+            "lang": account.lang,
+            "joinDate": account.join_date,
+            "lastLogin": account.last_login,
+            "hobbies": list(account.hobbies),
+            "interests": list(account.interests),
+            "userLanguages": list(account.languages.values()),
+        }
+
+    def _get_profile(self, request):
+        return Response(HTTPStatus.OK, self._profile(self._account(request)))
+
+    def _update_user(self, request):
+        account = self._account(request)
+        payload = request.json()
+        limits = {
+            "nickname": 50,
+            "firstName": 50,
+            "lastName": 50,
+            "bio": 500,
+            "country": 50,
+            "city": 100,
+            "timezone": 20,
+        }
+        for key, limit in limits.items():
+            value = payload.get(key)
+            if value is not None and not isinstance(value, str):
+                raise ApiError(
+                    HTTPStatus.UNPROCESSABLE_ENTITY,
+                    f"user.{key}.invalid",
+                    f"{key} must be a string",
+                )
+            if isinstance(value, str) and len(value) > limit:
+                raise ApiError(
+                    HTTPStatus.UNPROCESSABLE_ENTITY,
+                    f"user.{key}.tooLong",
+                    f"{key} must be at most {limit} characters",
+                )
+        if payload.get("timezone") is not None and not _valid_timezone(
+            payload["timezone"]
+        ):
+            raise _validation(
+                "user.timezone.invalid", "timezone must be UTC-12..UTC+14"
+            )
+        telegram = payload.get("telegramAccount")
+        if telegram and (not isinstance(telegram, str) or not TELEGRAM.match(telegram)):
+            raise ApiError(
+                HTTPStatus.BAD_REQUEST,
+                "user.telegramAccount.invalid",
+                "TelegramAccount must be empty, @username, username or https://t.me/username",
+            )
+        for key in limits:
+            if key in ("nickname", "timezone"):
+                if payload.get(key):
+                    setattr(account, key, payload[key])
+            elif key in payload:
+                account.profile[key] = payload[key]
+        if "telegramAccount" in payload:
+            account.profile["telegramAccount"] = telegram
+        return Response(HTTPStatus.OK, self._profile(account))
+
+    def _update_user_override(self, request):
+        if request.headers.get("X-HTTP-Method-Override", "").upper() != "PUT":
+            raise ApiError(
+                HTTPStatus.METHOD_NOT_ALLOWED, "request.method.notAllowed", "POST"
+            )
+        return self._update_user(request)
+
+    def _delete_user(self, request):
+        account = self._account(request)
+        email = request.json().get("email")
+        if not isinstance(email, str) or email.lower() != account.email.lower():
+            raise ApiError(
+                HTTPStatus.FORBIDDEN, "user.email.mismatch", "Not your account"
+            )
+        del self.accounts[account.id]
+        del self.by_email[account.email.lower()]
+        return _text_response("true")
+
+    def _set_categories(self, request, key, type_id):
+        account = self._account(request)
+        ids = request.json().get(key)
+        if not isinstance(ids, list) or any(
+            isinstance(i, bool) or i not in CATEGORIES[type_id] for i in ids
+        ):
+            raise _validation(
+                f"user.{key}.invalid", f"{key} must be known category ids"
+            )
+        setattr(account, key, list(dict.fromkeys(ids)))
+        return Response(HTTPStatus.OK, getattr(account, key))
+
+    def _set_hobbies(self, request):
+        return self._set_categories(request, "hobbies", 4)
+
+    def _set_interests(self, request):
+        return self._set_categories(request, "interests", 5)
+
+    def _link_telegram(self, request):
+        account = self._account(request)
+        payload = request.json()
+        if not isinstance(payload.get("username"), str):
+            raise _validation("telegram.username.invalid", "username is required")
+        account.telegram = {
+            "id": account.id,
+            "telegramId": payload.get("telegramId"),
+            "username": payload["username"],
+        }
+        if payload.get("telegramAccount"):
+            account.profile["telegramAccount"] = payload["telegramAccount"]
+        profile = self._profile(account)
+        profile["telegramAccount"] = profile["telegramAccount"] or ""
+        return Response(HTTPStatus.OK, profile)
+
+    def _list_telegram(self, request):
+        self._account(request)
+        linked = [a.telegram for a in self.accounts.values() if a.telegram]
+        return Response(HTTPStatus.OK, linked)
+
+    def _get_telegram(self, request):
+        self._account(request)
+        account = self.accounts.get(_path_id(request.params[0]))
+        if account is None or account.telegram is None:
+            raise ApiError(HTTPStatus.NOT_FOUND, "telegram.User.notFound", "Not found")
+        return Response(HTTPStatus.OK, account.telegram)
+
+    # --- favorite teachers ---------------------------------------------------
+
+    def _teacher_card(self, teacher_id):
+        return {
+            "id": teacher_id,
+            "nickname": f"teacher{teacher_id}",
+            "language": {
+                "id": 1,
+                "languageName": "English",
+                "languageOwnName": "English",
+            },
+        }
+
+    def _list_favorites(self, request):
+        account = self._account(request)
+        return Response(
+            HTTPStatus.OK, [self._teacher_card(i) for i in account.favorites]
+        )
+
+    def _add_favorite(self, request):
+        account = self._account(request)
+        teacher_id = _int(
+            request.json().get("teacherId"), "teacherId", "favoriteTeacher"
+        )
+        if teacher_id in account.favorites:
+            raise ApiError(
+                HTTPStatus.UNPROCESSABLE_ENTITY,
+                "favoriteTeacher.teacherId.isExists",
+                "Teacher is already in favorites",
+            )
+        account.favorites[teacher_id] = _now()
+        return Response(HTTPStatus.OK, self._teacher_card(teacher_id))
+
+    def _delete_favorite(self, request):
+        account = self._account(request)
+        teacher_id = _path_id(request.params[0])
+        if account.favorites.pop(teacher_id, None) is None:
+            raise ApiError(
+                HTTPStatus.UNPROCESSABLE_ENTITY,
+                "favoriteTeacher.teacherId.notFound",
+                "Teacher is not in favorites",
+            )
+        return _text_response("true")
+
+    # --- user languages ------------------------------------------------------
+
+    def _list_languages(self, request):
+        return Response(HTTPStatus.OK, list(self._account(request).languages.values()))
+
+    def _upsert_language(self, request):
+        account = self._account(request)
+        payload = request.json()
+        language_id = _int(payload.get("languageId"), "languageId", "userLanguage")
+        is_target = payload.get("isTarget", False)
+        if not isinstance(is_target, bool):
+            raise _validation(
+                "userLanguage.isTarget.invalid", "isTarget must be a boolean"
+            )
+        level = payload.get("level", "")
+        if level is not None and level not in LEVELS:
+            raise _validation(
+                "userLanguage.level.invalid", "level must be Native or A1..C2"
+            )
+        goal_id, subgoal_id = payload.get("goalId"), payload.get("subgoalId")
+        if goal_id is not None:
+            _int(goal_id, "goalId", "userLanguage", minimum=0 if not is_target else 1)
+        if subgoal_id is not None:
+            _int(subgoal_id, "subgoalId", "userLanguage")
+        record = next(
+            (r for r in account.languages.values() if r["languageId"] == language_id),
+            None,
+        )
+        if record is None:
+            record = {"id": self._next_id(), "userId": account.id}
+            account.languages[record["id"]] = record
+        record.update(
+            languageId=language_id,
+            isTarget=is_target,
+            level=level,
+            goalId=goal_id,
+            subgoalId=subgoal_id,
+        )
+        return Response(HTTPStatus.OK, record)
+
+    def _language(self, request):
+        record = self._account(request).languages.get(_path_id(request.params[0]))
+        if record is None:
+            raise ApiError(
+                HTTPStatus.NOT_FOUND,
+                "userLanguage.UserLanguage.notFound",
+                "Language not found",
+            )
+        return record
+
+    def _get_language(self, request):
+        return Response(HTTPStatus.OK, self._language(request))
+
+    def _delete_language(self, request):
+        record = self._language(request)
+        del self._account(request).languages[record["id"]]
+        return _text_response("true")
+
+    # --- teacher profile -----------------------------------------------------
+
+    def _create_teacher(self, request):
+        account = self._account(request)
+        payload = request.json()
+        teacher_type = _int(
+            payload.get("teacherType"), "teacherType", "teacher", maximum=59
+        )
+        language_id = _int(
+            payload.get("languageId"), "languageId", "teacher", maximum=108
+        )
+        account.teacher = {
+            "id": account.id,
+            "userId": account.id,
+            "teacherType": teacher_type,
+            "languageId": language_id,
+            "about": payload.get("about"),
+            "teachingStyle": (account.teacher or {}).get("teachingStyle"),
+            "meAsTeacher": (account.teacher or {}).get("meAsTeacher"),
+        }
+        return Response(HTTPStatus.OK, account.teacher)
+
+    def _teacher(self, request):
+        account = self._account(request)
+        if account.teacher is None:
+            raise ApiError(
+                HTTPStatus.NOT_FOUND, "teacher.Teacher.notFound", "Not a teacher"
+            )
+        return account
+
+    def _get_teacher(self, request):
+        return Response(HTTPStatus.OK, self._teacher(request).teacher)
+
+    def _update_teacher(self, request):
+        account = self._teacher(request)
+        payload = request.json()
+        for key in ("teachingStyle", "meAsTeacher"):
+            if key in payload:
+                account.teacher[key] = _text(
+                    payload, key, 2000, "teacher", min_length=0
+                )
+        return Response(HTTPStatus.OK, account.teacher)
+
+    # --- teacher educations --------------------------------------------------
+
+    def _education_payload(self, payload, partial=False):
+        year = datetime.now().year
+        values = {
+            "institutionName": _text(
+                payload, "institutionName", 200, "teacherEducation"
+            ),
+            "fieldOfStudy": _text(payload, "fieldOfStudy", 100, "teacherEducation"),
+            "degreeId": payload.get("degreeId"),
+            "startYear": payload.get("startYear"),
+            "finishYear": payload.get("finishYear"),
+        }
+        if values["degreeId"] is not None or not partial:
+            _int(
+                values["degreeId"],
+                "degreeId",
+                "teacherEducation",
+                maximum=COURSE_DEGREES[-1],
+            )
+        if values["startYear"] is not None or not partial:
+            _int(values["startYear"], "startYear", "teacherEducation", 1900, year)
+        if values["finishYear"] is not None:
+            _int(
+                values["finishYear"],
+                "finishYear",
+                "teacherEducation",
+                values["startYear"] or 1900,
+                year + 10,
+            )
+        return values
+
+    def _education_view(self, account, education):
+        documents = [
+            d
+            for d in account.documents.values()
+            if d["documentType"] == "education"
+            and d.get("referenceId") == education["id"]
+        ]
+        return {**education, "documents": documents}
+
+    def _list_educations(self, request):
+        account = self._account(request)
+        teacher_id = _query_int(request.query, "teacherId")
+        skip = _query_int(request.query, "skip", 0, minimum=0)
+        take = _query_int(request.query, "take", minimum=0)
+        items = [
+            self._education_view(account, e)
+            for e in account.educations.values()
+            if teacher_id in (None, e["teacherId"])
+        ]
+        items = items[skip:] if take is None else items[skip : skip + take]
+        return Response(HTTPStatus.OK, items)
+
+    def _list_by_degree(self, request, degrees):
+        account = self._account(request)
+        return Response(
+            HTTPStatus.OK,
+            [
+                self._education_view(account, e)
+                for e in account.educations.values()
+                if e["degreeId"] in degrees
+            ],
+        )
+
+    def _list_formal(self, request):
+        return self._list_by_degree(request, FORMAL_DEGREES)
+
+    def _list_courses(self, request):
+        return self._list_by_degree(request, COURSE_DEGREES)
+
+    def _create_education(self, request):
+        account = self._account(request)
+        values = self._education_payload(request.json())
+        now = _now()
+        education = {
+            "id": self._next_id(),
+            "teacherId": account.id,
+            **values,
+            "createdAt": now,
+            "updatedAt": now,
+        }
+        account.educations[education["id"]] = education
+        return Response(HTTPStatus.OK, self._education_view(account, education))
+
+    def _education(self, request):
+        account = self._account(request)
+        education = account.educations.get(_path_id(request.params[0]))
+        if education is None:
+            raise ApiError(
+                HTTPStatus.NOT_FOUND,
+                "teacherEducation.TeacherEducation.notFound",
+                "Teacher education not found",
+            )
+        return account, education
+
+    def _get_education(self, request):
+        return Response(HTTPStatus.OK, self._education_view(*self._education(request)))
+
+    def _update_education(self, request):
+        account, education = self._education(request)
+        education.update(
+            self._education_payload(request.json(), partial=True), updatedAt=_now()
+        )
+        return Response(HTTPStatus.OK, self._education_view(account, education))
+
+    def _delete_education(self, request):
+        account = self._account(request)
+        deleted = account.educations.pop(_path_id(request.params[0]), None) is not None
+        return _text_response("true" if deleted else "false")
+
+    # --- teaching experiences ------------------------------------------------
+
+    def _experience_payload(self, payload):
+        year = datetime.now().year
+        values = {
+            "organization": _text(
+                payload, "organization", 200, "teachingExperience", min_length=3
+            ),
+            "position": _text(
+                payload, "position", 100, "teachingExperience", min_length=3
+            ),
+            "startYear": _int(
+                payload.get("startYear"), "startYear", "teachingExperience", 1960, year
+            ),
+            "finishYear": payload.get("finishYear"),
+            "description": _text(
+                payload,
+                "description",
+                255,
+                "teachingExperience",
+                required=False,
+                min_length=0,
+            )
+            or "",
+        }
+        if values["finishYear"] is not None:
+            _int(
+                values["finishYear"],
+                "finishYear",
+                "teachingExperience",
+                values["startYear"],
+                year,
+            )
+        return values
+
+    def _list_experiences(self, request):
+        return Response(
+            HTTPStatus.OK, list(self._account(request).experiences.values())
+        )
+
+    def _create_experience(self, request):
+        account = self._account(request)
+        now = _now()
+        experience = {
+            "id": self._next_id(),
+            "teacherId": account.id,
+            **self._experience_payload(request.json()),
+            "createdAt": now,
+            "updatedAt": now,
+        }
+        account.experiences[experience["id"]] = experience
+        return Response(HTTPStatus.OK, experience)
+
+    def _experience(self, request):
+        account = self._account(request)
+        experience = account.experiences.get(_path_id(request.params[0]))
+        if experience is None:
+            raise ApiError(
+                HTTPStatus.NOT_FOUND,
+                "teachingExperience.TeachingExperience.notFound",
+                "Teaching experience not found",
+            )
+        return account, experience
+
+    def _get_experience(self, request):
+        return Response(HTTPStatus.OK, self._experience(request)[1])
+
+    def _update_experience(self, request):
+        _, experience = self._experience(request)
+        experience.update(self._experience_payload(request.json()), updatedAt=_now())
+        return Response(HTTPStatus.OK, experience)
+
+    def _delete_experience(self, request):
+        account, experience = self._experience(request)
+        del account.experiences[experience["id"]]
+        return _text_response("true")
+
+    # --- teacher documents ---------------------------------------------------
+
+    def _document_form(self, request, document_type):
+        fields, files = request.form()
+        upload = files.get("file")
+        if upload is None or not upload[1]:
+            raise ApiError(
+                HTTPStatus.BAD_REQUEST,
+                "teacherDocument.file.required",
+                "file is required",
+            )
+        for key in ("title", "description"):
+            if len(fields.get(key, "")) > 100:
+                raise ApiError(
+                    HTTPStatus.BAD_REQUEST,
+                    f"teacherDocument.{key}.tooLong",
+                    f"{key} must be at most 100 characters",
+                )
+        reference = fields.get("referenceid") or fields.get("referenceId")
+        if (document_type == "education") != bool(reference):
+            raise ApiError(
+                HTTPStatus.BAD_REQUEST,
+                "teacherDocument.referenceId.invalid",
+                "referenceId is required for education documents only",
+            )
+        return {
+            "documentType": DOCUMENT_TYPES[document_type],
+            "fileName": upload[0],
+            "fileSize": len(upload[1]),
+            "title": fields.get("title", ""),
+            "description": fields.get("description", ""),
+            "referenceId": (
+                int(reference) if reference and reference.isdigit() else None
+            ),
+        }
+
+    def _upload_document(self, request):
+        account = self._account(request)
+        values = self._document_form(request, request.params[0])
+        document_id = self._next_id()
+        document = {
+            "id": document_id,
+            "teacherId": account.id,
+            **values,
+            "fileUrl": f"/files/teacher-documents/{document_id}/{values['fileName']}",
+        }
+        account.documents[document_id] = document
+        return Response(HTTPStatus.OK, document)
+
+    def _document(self, request, index=0):
+        account = self._account(request)
+        document = account.documents.get(_path_id(request.params[index]))
+        if document is None:
+            raise ApiError(
+                HTTPStatus.NOT_FOUND,
+                "teacherDocument.TeacherDocument.notFound",
+                "Teacher document not found",
+            )
+        return account, document
+
+    def _list_documents(self, request):
+        return Response(HTTPStatus.OK, list(self._account(request).documents.values()))
+
+    def _get_document(self, request):
+        return Response(HTTPStatus.OK, self._document(request)[1])
+
+    def _replace_document(self, request):
+        _, document = self._document(request, index=1)
+        document.update(self._document_form(request, request.params[0]))
+        document["fileUrl"] = (
+            f"/files/teacher-documents/{document['id']}/{document['fileName']}"
+        )
+        return Response(HTTPStatus.OK, document)
+
+    def _delete_document(self, request):
+        account, document = self._document(request)
+        del account.documents[document["id"]]
+        return _text_response("true")
+
+    # --- learning materials --------------------------------------------------
+
+    def _material_view(self, material):
+        account = self.accounts.get(material["userId"])
+        return {
+            **material,
+            "user": (
+                {"id": account.id, "nickname": account.nickname} if account else None
+            ),
+            "childrens": [
+                m["id"]
+                for m in self.materials.values()
+                if m["parentId"] == material["id"]
+            ],
+        }
+
+    def _create_material(self, request):
+        account = self._account(request)
+        payload = request.json()
+        now = _now()
+        material = {
+            "id": self._next_id(),
+            "userId": account.id,
+            "commentsCount": 0,
+            "publishDate": now,
+            "updateDate": now,
+            **self._material_payload(payload),
+        }
+        self.materials[material["id"]] = material
+        return Response(HTTPStatus.OK, self._material_view(material))
+
+    def _material_payload(self, payload):
+        values = {
+            "title": _text(payload, "title", 200, "learningMaterial"),
+            "description": payload.get("description") or "",
+            "content": payload.get("content") or "",
+            "tags": payload.get("tags") or "",
+            "picture": payload.get("picture") or "",
+            "parentId": payload.get("parentId"),
+            "topParentId": payload.get("topParentId"),
+            "isCommentsAllowed": bool(payload.get("isCommentsAllowed", True)),
+            "allowAiComment": bool(payload.get("allowAiComment", False)),
+        }
+        for key in ("targetLanguageId", "writtenLanguageId", "categoryId"):
+            values[key] = _int(payload.get(key, 0), key, "learningMaterial", minimum=0)
+        values["materialType"] = _int(
+            payload.get("materialType"), "materialType", "learningMaterial", 1, 3
+        )
+        if not isinstance(values["tags"], str) or len(values["tags"]) > 500:
+            raise _validation(
+                "learningMaterial.tags.invalid", "tags must be at most 500 characters"
+            )
+        values["thumbnail"] = values["picture"][:64] if values["picture"] else None
+        return values
+
+    def _material(self, request, own=True):
+        material = self.materials.get(_path_id(request.params[0]))
+        if material is None:
+            raise ApiError(
+                HTTPStatus.NOT_FOUND,
+                "learningMaterial.LearningMaterial.notFound",
+                "Learning material not found",
+            )
+        if own and material["userId"] != self._account(request).id:
+            raise ApiError(
+                HTTPStatus.FORBIDDEN, "learningMaterial.user.forbidden", "Not yours"
+            )
+        return material
+
+    def _get_material(self, request):
+        return Response(
+            HTTPStatus.OK, self._material_view(self._material(request, own=False))
+        )
+
+    def _update_material(self, request):
+        material = self._material(request)
+        material.update(self._material_payload(request.json()), updateDate=_now())
+        return Response(HTTPStatus.OK, self._material_view(material))
+
+    def _delete_material(self, request):
+        del self.materials[self._material(request)["id"]]
+        return _text_response("true")
+
+    def _delete_material_picture(self, request):
+        material = self._material(request)
+        material.update(picture="", thumbnail=None, updateDate=_now())
+        return _text_response("true")
+
+    def _query_materials(
+        self, by_user, material_type, category, tags, page_size, page_number
+    ):
+        items = [
+            m
+            for m in self.materials.values()
+            if by_user in (0, m["userId"])
+            and material_type in (0, m["materialType"])
+            and category in (0, m["categoryId"])
+            and (not tags or any(t in m["tags"].split(",") for t in tags.split(",")))
+        ]
+        start = (page_number - 1) * page_size
+        return [self._material_view(m) for m in items[start : start + page_size]]
+
+    def _list_materials(self, request):
+        self._optional_account(request)
+        query = request.query
+        tags = query.get("tags", [""])
+        if len(tags) > 1 or len(tags[0]) > 500:
+            raise ApiError(
+                HTTPStatus.BAD_REQUEST,
+                "query.tags.invalid",
+                "tags must be at most 500 characters",
+            )
+        return Response(
+            HTTPStatus.OK,
+            self._query_materials(
+                _query_int(query, "byUserId", 0, minimum=0),
+                _query_int(query, "materialType", 0, minimum=0),
+                _query_int(query, "categoryId", 0, minimum=0),
+                tags[0],
+                _query_int(query, "pageSize", 10, minimum=1),
+                _query_int(query, "pageNumber", 1, minimum=1),
+            ),
+        )
+
+    def _fetch_materials(self, request):
+        self._account(request)
+        payload = request.json()
+        tags = payload.get("tags") or ""
+        if not isinstance(tags, str) or len(tags) > 500:
+            raise _validation(
+                "learningMaterial.tags.invalid", "tags must be at most 500 characters"
+            )
+        return Response(
+            HTTPStatus.OK,
+            self._query_materials(
+                _int(
+                    payload.get("byUserId") or 0,
+                    "byUserId",
+                    "learningMaterial",
+                    minimum=0,
+                ),
+                _int(
+                    payload.get("materialType") or 0,
+                    "materialType",
+                    "learningMaterial",
+                    0,
+                    3,
+                ),
+                _int(
+                    payload.get("categoryId") or 0,
+                    "categoryId",
+                    "learningMaterial",
+                    minimum=0,
+                ),
+                tags,
+                _int(payload.get("pageSize"), "pageSize", "learningMaterial", 1, 1000),
+                _int(payload.get("pageNumber"), "pageNumber", "learningMaterial"),
+            ),
+        )
+
+    def _recent_materials(self, request):
+        self._account(request)
+        payload = request.json()
+        top = _int(payload.get("top"), "top", "learningMaterial", 1, 100)
+        material_type = _int(
+            payload.get("materialType") or 0, "materialType", "learningMaterial", 0, 3
+        )
+        items = [
+            m
+            for m in reversed(list(self.materials.values()))
+            if material_type in (0, m["materialType"])
+        ][:top]
+        return Response(
+            HTTPStatus.OK,
+            [
+                {
+                    "id": m["id"],
+                    "title": m["title"],
+                    "publishDate": m["publishDate"],
+                    "thumbnail": m["thumbnail"],
+                    "url": f"/learning-materials/{m['id']}",
+                }
+                for m in items
+            ],
+        )
+
+    def _material_tags(self, request):
+        self._account(request)
+        material_type = _query_int(request.query, "materialType", 0, minimum=0)
+        limit = _query_int(request.query, "limit", 10, minimum=1)
+        tags = {}
+        for m in self.materials.values():
+            if material_type in (0, m["materialType"]):
+                for tag in filter(None, m["tags"].split(",")):
+                    tags[tag] = tags.get(tag, 0) + 1
+        return Response(HTTPStatus.OK, sorted(tags, key=tags.get, reverse=True)[:limit])
+
+    # --- contact tickets / content -------------------------------------------
+
+    def _create_ticket(self, request):
+        account = self._optional_account(request)
+        payload = request.json()
+        email = payload.get("email")
+        if not isinstance(email, str) or not EMAIL.match(email):
+            raise _validation(
+                "contactTicket.email.invalid", "email is not a valid address"
+            )
+        ticket = {
+            "id": self._next_id(),
+            "email": email,
+            "subject": _text(payload, "subject", 200, "contactTicket"),
+            "message": _text(payload, "message", 4000, "contactTicket"),
+            "userId": payload.get("userId") or (account.id if account else None),
+            "createdAt": _now(),
+        }
+        self.tickets[ticket["id"]] = ticket
+        return Response(HTTPStatus.OK, ticket)
+
+    def _general_categories(self, request):
+        type_id = _query_int(request.query, "typeId")
+        return Response(
+            HTTPStatus.OK,
+            [
+                {"id": i, "typeId": type_id, "name": f"category {i}"}
+                for i in CATEGORIES.get(type_id, ())
+            ],
+        )
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def _dispatch(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        body = self.rfile.read(length) if length else b""
+        if not self.server.admit():
+            self._respond(_throttled())
+            return
+        try:
+            if self.server.delay:
+                time.sleep(self.server.delay)
+            response = self.server.api.handle(
+                self.command, self.path, self.headers, body
+            )
+        finally:
+            self.server.leave()
+        self._respond(response)
+
+    def _respond(self, response):
+        payload = response.encode()
+        self.send_response(response.status)
+        if payload:
+            self.send_header("Content-Type", response.content_type)
+        for name, value in response.headers.items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        if self.command != "HEAD":
+            self.wfile.write(payload)
+
+    do_GET = do_POST = do_PUT = do_PATCH = do_DELETE = do_OPTIONS = do_HEAD = _dispatch
+
+    def log_message(self, format, *args):
+        pass
+
+
+class StubServer(ThreadingHTTPServer):
+    """
+    Threaded HTTP/1.1 server around a `StubApi`.
+
+    Accepts both origin-form requests (`GET /api/Users/get-profile`) and
+    proxy-form ones (`GET http://example.com/api/Users/get-profile`), which is
+    how requests routed through `HTTP_PROXY` arrive.
+
+    Args:
+        host (str): Interface to bind.
+        port (int): Port, 0 picks a free one.
+        delay (float): Fixed service time added to every response, in seconds.
+        api (StubApi, optional): State to serve, a fresh one by default.
+        capacity (int): Requests served at once; more are answered with 429 and
+            `Retry-After` like a throttling gateway. 0 serves all.
+    """
+
+    daemon_threads = True
+    # the async tests open hundreds of connections at once
+    request_queue_size = 1024
+
+    def __init__(
+        self,
+        host=STUB_HOST,
+        port=STUB_PORT,
+        delay=STUB_DELAY,
+        api=None,
+        capacity=STUB_CAPACITY,
+    ):
+        self.api = api or StubApi()
+        self.delay = delay
+        self.capacity = capacity
+        self.throttled = 0
+        self._in_flight = 0
+        self._lock = threading.Lock()
+        self._thread = None
+        self._saved_env = None
+        super().__init__((host, port), _Handler)
+
+    def admit(self) -> bool:
+        """Counts a request in, False if `capacity` requests are being served."""
+        with self._lock:
+            if self.capacity and self._in_flight >= self.capacity:
+                self.throttled += 1
+                return False
+            self._in_flight += 1
+            return True
+
+    def leave(self):
+        with self._lock:
+            self._in_flight -= 1
+
+    @property
+    def url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "StubServer":
+        """Serves on a daemon thread."""
+        self._thread = threading.Thread(
+            target=self.serve_forever, name="fcle-stub-server", daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def install(self):
+        """Routes plain-HTTP requests of this process (and its children) to the stub."""
+        self._saved_env = {name: os.environ.get(name) for name in PROXY_ENV}
+        os.environ["HTTP_PROXY"] = os.environ["http_proxy"] = self.url
+        os.environ["NO_PROXY"] = os.environ["no_proxy"] = ""
+
+    def stop(self):
+        if self._saved_env is not None:
+            for name, value in self._saved_env.items():
+                if value is None:
+                    os.environ.pop(name, None)
+                else:
+                    os.environ[name] = value
+            self._saved_env = None
+        if self._thread is not None:
+            self.shutdown()
+            self._thread.join()
+            self._thread = None
+        self.server_close()
+
+
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--host", default=STUB_HOST)
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--delay", type=float, default=STUB_DELAY)
+    parser.add_argument("--capacity", type=int, default=STUB_CAPACITY)
+    args = parser.parse_args(argv)
+    server = StubServer(args.host, args.port, args.delay, capacity=args.capacity)
+    print(f"stub API on {server.url}{urlsplit(BASE_URL).path} (Ctrl+C to stop)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,392 @@
+"""
+Bulk sweeper for the test accounts in the ledger and everything they own.
+
+The suite registers thousands of `LABEL` users a day on staging and never
+deletes them. The sweeper takes the accounts from the ledger (utils/ledger.py)
+and, for every one, logs in, deletes its dependent records through the API and
+then the account itself:
+
+    favorite teachers, user languages, teacher documents, teacher educations,
+    teaching experiences, learning materials  ->  DELETE Users
+
+Accounts are swept in parallel (`--workers`) and every request of the sweep
+passes one shared rate limiter (`--rps`), so it does not load staging more
+than intended. Progress goes to stderr. The outcome of every account is
+appended to a state file next to the ledger. A sweep that was interrupted
+resumes where it stopped: accounts already deleted or gone are skipped, failed
+ones are tried again. `--prune` rewrites the ledger without the swept accounts.
+Swept accounts are also dropped from the token store (utils/token_store.py).
+
+Run it from tests/fcle:
+
+    python -m utils.sweeper                           # ledger from settings
+    python -m utils.sweeper --ledger run.jsonl --workers 16 --rps 50
+    python -m utils.sweeper --local-api --seed 200    # against the local stand-in
+
+With `--local-api` the ledger and the state file are temporary unless
+`--ledger` names another file; the staging ledger is never read or written.
+"""
+
+import json
+import sys
+import tempfile
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from http import HTTPStatus
+from pathlib import Path
+
+from settings import ENDPOINTS, LABEL, SWEEP_RPS, SWEEP_WORKERS, TIMEOUT, USER_TIMEZONE
+from utils.ledger import ledger_path, read_ledger
+from utils.token_store import TokenStore, store_path
+
+# (ENDPOINTS key, list query) of the records an account can own, deleted in
+# this order before the account
+DEPENDENTS = (
+    ("fav-teachers", None),
+    ("user-languages", None),
+    ("teacher_documents", None),
+    ("teacher_educations", None),
+    ("Teaching_Experiences", None),
+    ("learning_materials", "byUserId"),
+)
+
+# login answers for accounts that no longer exist
+GONE_STATUSES = (HTTPStatus.GONE, HTTPStatus.NOT_FOUND)
+
+# DELETE answers for a record deleted in the meantime
+DELETED_STATUSES = (HTTPStatus.NOT_FOUND, HTTPStatus.UNPROCESSABLE_ENTITY)
+
+MATERIALS_PAGE = 100
+
+
+class RateLimiter:
+    """
+    Spaces calls of `acquire` at least 1 / `rps` seconds apart, across threads.
+
+    Args:
+        rps (float): Calls per second; 0 or less disables the limit.
+    """
+
+    def __init__(self, rps):
+        self.interval = 1 / rps if rps > 0 else 0.0
+        self._next = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        if not self.interval:
+            return
+        with self._lock:
+            now = time.monotonic()
+            due = max(self._next, now)
+            self._next = due + self.interval
+        if due > now:
+            time.sleep(due - now)
+
+
+class SweepError(Exception):
+    """An account could not be swept, the sweep goes on with the next one."""
+
+
+class Sweeper:
+    """
+    Deletes ledger accounts and their dependent records through the API.
+
+    Args:
+        transport (utils.transport.HttpTransport): Sends the requests.
+        workers (int): Accounts swept in parallel.
+        rps (float): Rate limit of all requests together.
+        state_path (Path, optional): Outcomes of finished accounts, appended;
+            accounts recorded there as deleted or gone are skipped.
+    """
+
+    def __init__(
+        self, transport, workers=SWEEP_WORKERS, rps=SWEEP_RPS, state_path=None
+    ):
+        self.transport = transport
+        self.workers = max(1, workers)
+        self.limiter = RateLimiter(rps)
+        self.state_path = state_path
+        self.outcomes = Counter()
+        self.errors = []
+        self.requests = 0
+        self._lock = threading.Lock()
+
+    def done(self) -> set:
+        """Emails the state file records as deleted or gone."""
+        if self.state_path is None or not self.state_path.exists():
+            return set()
+        done = set()
+        with open(self.state_path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                if entry.get("outcome") in ("deleted", "gone"):
+                    done.add(entry["email"])
+        return done
+
+    def _request(self, method, endpoint, **kwargs):
+        self.limiter.acquire()
+        with self._lock:
+            self.requests += 1
+        return self.transport.request(method, endpoint, timeout=TIMEOUT, **kwargs)
+
+    def _ids(self, endpoint, headers, params=None) -> list:
+        r = self._request("GET", endpoint, headers=headers, params=params)
+        if r.status_code != HTTPStatus.OK:
+            return []  # e.g. teacher records of an account that is no teacher
+        items = r.json()
+        return [item["id"] for item in items if isinstance(item, dict) and "id" in item]
+
+    def _delete_all(self, key, query, headers, user_id):
+        endpoint = ENDPOINTS[key]
+        params = None
+        if query is not None:
+            params = {query: user_id, "pageSize": MATERIALS_PAGE, "pageNumber": 1}
+        while True:
+            ids = self._ids(endpoint, headers, params)
+            for id_ in ids:
+                r = self._request("DELETE", f"{endpoint}/{id_}", headers=headers)
+                if r.status_code >= 300 and r.status_code not in DELETED_STATUSES:
+                    raise SweepError(f"DELETE {endpoint}/{id_}: {r.status_code}")
+            # a paged list shrinks while it is deleted, read page 1 again
+            if params is None or len(ids) < MATERIALS_PAGE:
+                return
+
+    def sweep_account(self, account) -> str:
+        """Sweeps one ledger entry, returns "deleted" or "gone"."""
+        email = account["email"]
+        r = self._request(
+            "POST",
+            ENDPOINTS["login"],
+            json={
+                "email": email,
+                "password": account["password"],
+                "timezone": USER_TIMEZONE,
+            },
+        )
+        if r.status_code in GONE_STATUSES:
+            return "gone"
+        if r.status_code != HTTPStatus.OK:
+            raise SweepError(f"login: {r.status_code}")
+        headers = {"Authorization": f"Bearer {r.json()['token']}"}
+
+        r = self._request("GET", ENDPOINTS["get-profile"], headers=headers)
+        if r.status_code != HTTPStatus.OK:
+            raise SweepError(f"get-profile: {r.status_code}")
+        user_id = r.json().get("id")
+
+        for key, query in DEPENDENTS:
+            self._delete_all(key, query, headers, user_id)
+
+        r = self._request(
+            "DELETE", ENDPOINTS["users"], json={"email": email}, headers=headers
+        )
+        if r.status_code >= 300:
+            raise SweepError(f"DELETE {ENDPOINTS['users']}: {r.status_code}")
+        return "deleted"
+
+    def _sweep(self, account):
+        try:
+            outcome = self.sweep_account(account)
+            error = None
+        except Exception as e:  # one broken account must not stop the sweep
+            outcome, error = "failed", f"{account['email']}: {e}"
+        with self._lock:
+            self.outcomes[outcome] += 1
+            if error is not None:
+                self.errors.append(error)
+            if self.state_path is not None:
+                with open(self.state_path, "a", encoding="utf-8") as f:
+                    f.write(
+                        json.dumps({"email": account["email"], "outcome": outcome})
+                        + "\n"
+                    )
+
+    def run(self, accounts, progress=sys.stderr) -> Counter:
+        """
+        Sweeps `accounts` (ledger entries), skipping those done in earlier runs.
+
+        Returns:
+            Counter: Accounts per outcome: deleted, gone, failed, skipped.
+        """
+        done = self.done()
+        todo = [account for account in accounts if account["email"] not in done]
+        self.outcomes["skipped"] = len(accounts) - len(todo)
+        started = time.monotonic()
+        stop = threading.Event()
+
+        def _report():
+            while not stop.wait(1.0):
+                self._progress(progress, len(todo), started)
+
+        reporter = threading.Thread(target=_report, daemon=True)
+        reporter.start()
+        try:
+            with ThreadPoolExecutor(max_workers=self.workers) as executor:
+                for _ in executor.map(self._sweep, todo):
+                    pass
+        finally:
+            stop.set()
+            reporter.join()
+            self._progress(progress, len(todo), started, end="\n")
+        return self.outcomes
+
+    def _progress(self, stream, total, started, end=""):
+        if stream is None:
+            return
+        with self._lock:
+            outcomes = dict(self.outcomes)
+            requests = self.requests
+        swept = sum(outcomes.get(k, 0) for k in ("deleted", "gone", "failed"))
+        elapsed = time.monotonic() - started
+        stream.write(
+            f"\rswept {swept}/{total}: {outcomes.get('deleted', 0)} deleted, "
+            f"{outcomes.get('gone', 0)} gone, {outcomes.get('failed', 0)} failed; "
+            f"{requests} requests, {swept / elapsed if elapsed else 0:.1f} accounts/s"
+            + end
+        )
+        stream.flush()
+
+
+def prune_ledger(path, state_path):
+    """Rewrites the ledger without the accounts the state file marks as swept."""
+    done = Sweeper(None, state_path=state_path).done()
+    with open(path, encoding="utf-8") as f:
+        kept = [line for line in f if _email(line) not in done]
+    tmp = path.with_name(path.name + ".tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        f.writelines(kept)
+    tmp.replace(path)
+    state_path.unlink(missing_ok=True)
+    return len(kept)
+
+
+def _email(line):
+    try:
+        return json.loads(line).get("email")
+    except json.JSONDecodeError:
+        return None
+
+
+def _seed(count, ledger):
+    """Registers `count` labelled accounts with dependent records on the stand-in."""
+    from utils.ledger import configure_ledger
+    from utils.transport import get_transport
+    from utils.user_pool import register_user
+
+    transport = get_transport()
+
+    def _post(payload, endpoint, headers=None):
+        return transport.request("POST", endpoint, json=payload, headers=headers)
+
+    configure_ledger(ledger)
+    try:
+        for _ in range(count):
+            user = register_user(_post)
+            _post({"teacherId": 1000155}, ENDPOINTS["fav-teachers"], user.headers)
+            _post(
+                {"languageId": 1, "isTarget": True, "level": "A1"},
+                ENDPOINTS["user-languages"],
+                user.headers,
+            )
+    finally:
+        configure_ledger(None)
+
+
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument(
+        "--ledger", default=None, help="ledger file, ACCOUNT_LEDGER by default"
+    )
+    parser.add_argument(
+        "--label", default=LABEL, help="email prefix of the accounts to sweep"
+    )
+    parser.add_argument("--workers", type=int, default=SWEEP_WORKERS)
+    parser.add_argument(
+        "--rps", type=float, default=SWEEP_RPS, help="0 disables the limit"
+    )
+    parser.add_argument(
+        "--state", default=None, help="progress file, <ledger>.swept by default"
+    )
+    parser.add_argument(
+        "--prune", action="store_true", help="drop swept accounts from the ledger"
+    )
+    parser.add_argument(
+        "--tokens",
+        default=None,
+        help="token store to drop swept accounts from, TOKEN_STORE by default",
+    )
+    parser.add_argument(
+        "--local-api", action="store_true", help="sweep the in-process stand-in"
+    )
+    parser.add_argument(
+        "--seed",
+        type=int,
+        default=0,
+        help="with --local-api: first register N accounts",
+    )
+    args = parser.parse_args(argv)
+
+    if args.seed and not args.local_api:
+        parser.error("--seed only registers accounts on the stand-in, add --local-api")
+    scratch = None
+    if args.local_api and not args.ledger:
+        # the stand-in's accounts are not the staging ones: its 410 must not
+        # mark a real account gone, nor --seed append to the real ledger
+        scratch = tempfile.TemporaryDirectory(prefix="fcle-sweep-")
+        ledger = Path(scratch.name) / "ledger.jsonl"
+    else:
+        ledger = Path(args.ledger) if args.ledger else ledger_path()
+    state = Path(args.state) if args.state else ledger.with_name(ledger.name + ".swept")
+    if args.local_api:
+        default = ledger_path()
+        for path in (ledger, state):
+            if path.resolve() in (
+                default.resolve(),
+                default.with_name(default.name + ".swept").resolve(),
+            ):
+                parser.error(f"--local-api does not touch the staging ledger {path}")
+
+    server = None
+    if args.local_api:
+        from utils.stub_server import StubServer
+
+        server = StubServer().start()
+        server.install()
+    try:
+        if args.seed:
+            _seed(args.seed, ledger)
+        if not ledger.exists():
+            sys.exit(f"no ledger at {ledger}")
+
+        from utils.transport import get_transport
+
+        accounts = read_ledger(ledger, args.label)
+        sweeper = Sweeper(get_transport(), args.workers, args.rps, state)
+        outcomes = sweeper.run(accounts)
+        for error in sweeper.errors[:10]:
+            print(f"  {error}", file=sys.stderr)
+        tokens = Path(args.tokens) if args.tokens else store_path()
+        if not args.local_api and tokens.exists():
+            # the next session must not claim a deleted pool user
+            TokenStore(tokens).forget(sweeper.done())
+        if args.prune:
+            kept = prune_ledger(ledger, state)
+            print(f"ledger pruned, {kept} accounts left", file=sys.stderr)
+        if outcomes["failed"]:
+            sys.exit(1)
+    finally:
+        if server is not None:
+            server.stop()
+        if scratch is not None:
+            scratch.cleanup()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,205 @@
+"""
+Tokens of the suite's accounts, kept on disk across runs.
+
+Every session used to start by registering its pooled users (signup →
+set-password → login) and by logging in the fixed accounts again. The token
+store keeps the accounts and their JWTs in a JSON file, keyed by the API they
+belong to (BASE_URL) and email:
+
+    {"version": 1, "environments": {"http://example.com/api/": {
+        "labelfordb...@gmail.com": {"password": "...", "nickname": "...",
+                                    "token": "eyJ...", "exp": 1760003600,
+                                    "pooled": true, "holder": null}}}}
+
+- Pooled users that were still clean at the end of a session are put back;
+  the next session (or `--workers` process) claims them instead of
+  registering new ones. A claim records the claiming process id, so two
+  processes never lease the same user; claims of dead processes are released.
+- A token is used while its `exp` claim (read from the JWT payload, the
+  signature is not checked) is more than TOKEN_REFRESH_MARGIN seconds away,
+  otherwise the account logs in again: one round-trip instead of three. A
+  token without a readable `exp` is always renewed.
+- `cached_token` does the same for fixed accounts that only log in.
+
+The file is rewritten under an exclusive lock (fcntl, so POSIX only; without
+it parallel workers may claim the same user) and replaced atomically. The
+store is off with `--local-api` and cassettes: the stand-in's accounts die
+with the run and cassettes replay the signups. `python -m utils.sweeper`
+forgets the accounts it deleted.
+"""
+
+import base64
+import contextlib
+import json
+import os
+import threading
+import time
+from pathlib import Path
+
+from settings import BASE_URL, TOKEN_REFRESH_MARGIN, TOKEN_STORE
+from utils.import_audit import root_dir
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+VERSION = 1
+
+_store = None
+
+
+def store_path(path=TOKEN_STORE) -> Path:
+    """`path`, relative paths taken from the directory with pytest.ini."""
+    path = Path(path)
+    return path if path.is_absolute() else root_dir() / path
+
+
+def jwt_expiry(token):
+    """`exp` claim of a JWT in epoch seconds, None if it cannot be read."""
+    try:
+        payload = token.split(".")[1]
+        claims = json.loads(
+            base64.urlsafe_b64decode(payload + "=" * (-len(payload) % 4))
+        )
+        return float(claims["exp"])
+    except (AttributeError, IndexError, KeyError, TypeError, ValueError):
+        return None
+
+
+def fresh(token, margin=TOKEN_REFRESH_MARGIN) -> bool:
+    """Whether `token` stays valid for more than `margin` seconds."""
+    exp = jwt_expiry(token)
+    return exp is not None and exp - time.time() > margin
+
+
+def _alive(pid) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except OSError:
+        return True  # exists, owned by someone else
+    return True
+
+
+class TokenStore:
+    """
+    Accounts and tokens of one environment in a shared JSON file.
+
+    Args:
+        path (Path): JSON file, created on the first write.
+        environment (str): Key of the API the accounts belong to.
+    """
+
+    def __init__(self, path, environment=BASE_URL):
+        self.path = Path(path)
+        self.environment = environment
+        self._lock = threading.Lock()
+
+    @contextlib.contextmanager
+    def _accounts(self):
+        """The environment's {email: entry}, written back when the block ends."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self._lock, open(
+            self.path.with_name(self.path.name + ".lock"), "w"
+        ) as lock:
+            if fcntl is not None:
+                fcntl.flock(lock, fcntl.LOCK_EX)
+            try:
+                data = json.loads(self.path.read_text(encoding="utf-8"))
+                if data.get("version") != VERSION:
+                    raise ValueError(data.get("version"))
+            except (OSError, ValueError, AttributeError):
+                data = {"version": VERSION, "environments": {}}
+            accounts = data["environments"].setdefault(self.environment, {})
+            yield accounts
+            if not accounts:
+                del data["environments"][self.environment]
+            tmp = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+            tmp.write_text(json.dumps(data, indent=1, sort_keys=True), encoding="utf-8")
+            tmp.replace(self.path)
+
+    def claim(self, n) -> list:
+        """
+        Takes up to `n` pooled accounts no live process holds.
+
+        Returns:
+            list[dict]: {"email", "password", "nickname", "token"} per account.
+        """
+        pid = os.getpid()
+        claimed = []
+        with self._accounts() as accounts:
+            for email, entry in accounts.items():
+                if len(claimed) >= n:
+                    break
+                holder = entry.get("holder")
+                if not entry.get("pooled") or (holder is not None and _alive(holder)):
+                    continue
+                entry["holder"] = pid
+                claimed.append(
+                    {
+                        "email": email,
+                        "password": entry["password"],
+                        "nickname": entry.get("nickname", ""),
+                        "token": entry["token"],
+                    }
+                )
+        return claimed
+
+    def put(self, email, password, token, nickname=None, pooled=False):
+        """Stores an account with its current token, unclaimed."""
+        with self._accounts() as accounts:
+            accounts[email] = {
+                "password": password,
+                "nickname": nickname,
+                "token": token,
+                "exp": jwt_expiry(token),
+                "pooled": pooled,
+                "holder": None,
+            }
+
+    def get(self, email):
+        """Stored token of `email`, None if there is none."""
+        with self._accounts() as accounts:
+            entry = accounts.get(email)
+        return entry and entry["token"]
+
+    def forget(self, emails):
+        """Drops accounts, e.g. deleted or quarantined ones."""
+        emails = set(emails)
+        if not emails:
+            return
+        with self._accounts() as accounts:
+            for email in emails & set(accounts):
+                del accounts[email]
+
+
+def configure_token_store(path):
+    """Keeps tokens in the store at `path` from now on, None turns the store off."""
+    global _store
+    _store = None if path is None else TokenStore(path)
+
+
+def get_token_store():
+    """The configured TokenStore, None if the store is off."""
+    return _store
+
+
+def cached_token(email, password, login) -> str:
+    """
+    Token of a fixed account, logging in only when the stored one is about to expire.
+
+    Args:
+        email (str): Account email, the key in the store.
+        password (str): Stored with the token.
+        login (callable): `login()` returning a new token.
+    """
+    store = _store
+    token = store.get(email) if store is not None else None
+    if token is not None and fresh(token):
+        return token
+    token = login()
+    if store is not None:
+        store.put(email, password, token)
+    return token
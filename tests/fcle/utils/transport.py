@@ -0,0 +1,401 @@
+"""
+Shared HTTP transport for the request fixtures.
+
+Every fixture in conftest.py and every helper in utils/http_utils.py sends its
+requests through a single `HttpTransport`. It owns one `requests.Session` with a
+keep-alive connection pool per host, so a TCP/TLS handshake is paid once per
+connection instead of once per request.
+
+Retries:
+    Connection errors are retried for every method (nothing reached the server).
+    Read errors and RETRY_STATUSES are retried only for idempotent methods, so a
+    POST that created an entity is never silently sent twice.
+
+Timing:
+    The pools use `TimedHTTPConnection`/`TimedHTTPSConnection`, which note DNS,
+    connect and time-to-first-byte of the running request; `request()` reports
+    them with the total time and body sizes to utils/latency.py.
+
+Concurrency:
+    With an `AdaptiveLimiter` every request first takes a permit of its endpoint
+    group, and the limiter adapts the group's limit to 429/503 and latency
+    (see utils/concurrency.py).
+
+Cassettes:
+    With a record cassette the adapter also writes every exchange to it; with a
+    replay cassette the session uses `ReplayAdapter` and never opens a socket
+    (see utils/cassette.py). Replayed requests are still timed.
+"""
+
+import socket
+import time
+from http import HTTPStatus, cookiejar
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.exceptions import (
+    ConnectTimeoutError,
+    NameResolutionError,
+    NewConnectionError,
+)
+from urllib3.util.connection import allowed_gai_family
+from urllib3.util.retry import Retry
+
+from settings import (
+    BACKOFF_FACTOR,
+    BASE_URL,
+    MAX_RETRIES,
+    POOL_CONNECTIONS,
+    POOL_MAXSIZE,
+    RETRY_STATUSES,
+    TIMEOUT,
+)
+from utils.cassette import ReplayAdapter
+from utils.concurrency import retry_after_seconds
+from utils.latency import (
+    body_size,
+    current_timing,
+    endpoint_key,
+    get_recorder,
+    start_timing,
+    stop_timing,
+)
+
+
+class _TimedConnectionMixin:
+    """Notes DNS, connect and time-to-first-byte into the current RequestTiming."""
+
+    def _new_conn(self):
+        timing = current_timing()
+        if timing is None:
+            return super()._new_conn()
+
+        host = self._dns_host
+        started = time.perf_counter()
+        try:
+            addresses = socket.getaddrinfo(
+                host, self.port, allowed_gai_family(), socket.SOCK_STREAM
+            )
+        except socket.gaierror as e:
+            raise NameResolutionError(self.host, self, e) from e
+        resolved = time.perf_counter()
+        timing.add_dns(resolved - started)
+
+        # connect to the resolved addresses in order, like urllib3's create_connection
+        error = None
+        try:
+            for *_, address in addresses:
+                self._dns_host = address[0]
+                try:
+                    sock = super()._new_conn()
+                    break
+                except (ConnectTimeoutError, NewConnectionError) as e:
+                    error = e
+            else:
+                raise error
+        finally:
+            self._dns_host = host
+            timing.add_connect(time.perf_counter() - resolved)
+        return sock
+
+    def request(self, *args, **kwargs):
+        timing = current_timing()
+        if timing is not None:
+            timing.sent = time.perf_counter()
+        return super().request(*args, **kwargs)
+
+    def getresponse(self):
+        response = super().getresponse()
+        timing = current_timing()
+        if timing is not None:
+            timing.headers = time.perf_counter()
+        return response
+
+
+class TimedHTTPConnection(_TimedConnectionMixin, HTTPConnection):
+    pass
+
+
+class TimedHTTPSConnection(_TimedConnectionMixin, HTTPSConnection):
+    pass
+
+
+class TimedHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = TimedHTTPConnection
+
+
+class TimedHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = TimedHTTPSConnection
+
+
+class TimedHTTPAdapter(HTTPAdapter):
+    """HTTPAdapter whose pools open timed connections."""
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            "http": TimedHTTPConnectionPool,
+            "https": TimedHTTPSConnectionPool,
+        }
+
+    def proxy_manager_for(self, proxy, **proxy_kwargs):
+        # urllib3 leaves Nagle on for proxy connections, so a request body sent
+        # after the headers waits for the proxy's delayed ACK (~40 ms a request)
+        proxy_kwargs.setdefault("socket_options", HTTPConnection.default_socket_options)
+        manager = super().proxy_manager_for(proxy, **proxy_kwargs)
+        manager.pool_classes_by_scheme = self.poolmanager.pool_classes_by_scheme
+        return manager
+
+
+class RecordingHTTPAdapter(TimedHTTPAdapter):
+    """TimedHTTPAdapter that writes every final response to a record cassette."""
+
+    def __init__(self, cassette, **kwargs):
+        self.cassette = cassette
+        super().__init__(**kwargs)
+
+    def send(self, request, **kwargs):
+        response = super().send(request, **kwargs)
+        self.cassette.record(
+            request.method,
+            request.url,
+            request.body,
+            request.headers,
+            response.status_code,
+            response.reason,
+            response.headers,
+            response.content,
+        )
+        return response
+
+
+class HttpTransport:
+    """
+    Connection-pooled HTTP client shared by the whole test session.
+
+    Attributes:
+        base_url (str): Prefix for relative endpoints.
+        pool_connections (int): Number of per-host pools kept alive.
+        pool_maxsize (int): Maximum keep-alive connections per host.
+        max_retries (int): Retry budget for connection/read/status errors.
+        backoff_factor (float): Exponential backoff factor between retries.
+        timeout (int | float): Default timeout for every request.
+        cassette (utils.cassette.Cassette | None): Cassette to record to or replay from.
+        limiter (utils.concurrency.AdaptiveLimiter | None): Concurrency limit of
+            the requests; None sends them all at once.
+    """
+
+    def __init__(
+        self,
+        base_url=BASE_URL,
+        pool_connections=POOL_CONNECTIONS,
+        pool_maxsize=POOL_MAXSIZE,
+        max_retries=MAX_RETRIES,
+        backoff_factor=BACKOFF_FACTOR,
+        timeout=TIMEOUT,
+        cassette=None,
+        limiter=None,
+    ):
+        self.base_url = base_url
+        self.pool_connections = pool_connections
+        self.pool_maxsize = pool_maxsize
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self.timeout = timeout
+        self.cassette = cassette
+        self.limiter = limiter
+        self._session = None
+
+    @property
+    def session(self):
+        """Lazily built `requests.Session` with the pooled, retrying adapter."""
+        if self._session is None:
+            self._session = self._build_session()
+        return self._session
+
+    def _build_session(self):
+        retry = Retry(
+            total=self.max_retries,
+            backoff_factor=self.backoff_factor,
+            status_forcelist=RETRY_STATUSES,
+            allowed_methods=Retry.DEFAULT_ALLOWED_METHODS,
+            respect_retry_after_header=True,
+            raise_on_status=False,
+        )
+        pool_options = dict(
+            pool_connections=self.pool_connections,
+            pool_maxsize=self.pool_maxsize,
+            max_retries=retry,
+        )
+        if self.cassette is None:
+            adapter = TimedHTTPAdapter(**pool_options)
+        elif self.cassette.mode == "replay":
+            adapter = ReplayAdapter(self.cassette)
+        else:
+            adapter = RecordingHTTPAdapter(self.cassette, **pool_options)
+
+        session = requests.Session()
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        # module-level requests.* never kept cookies between calls, keep it that way
+        session.cookies.set_policy(cookiejar.DefaultCookiePolicy(allowed_domains=[]))
+        return session
+
+    def build_url(self, endpoint: str) -> str:
+        """Returns the full URL (if endpoint is relative)."""
+        if not isinstance(endpoint, str):
+            raise TypeError(
+                f"endpoint must be a str path or URL, got {type(endpoint).__name__}"
+            )
+        if endpoint.startswith("http"):
+            return endpoint
+        return f"{self.base_url.rstrip('/')}/{endpoint.lstrip('/')}"
+
+    def request(self, method: str, endpoint: str, **kwargs) -> requests.Response:
+        """
+        Sends a request over the pooled session.
+
+        With a limiter, the request waits for a permit of its endpoint group
+        first, and a throttled 429 is sent again after its `Retry-After`.
+
+        Args:
+            method (str): HTTP method.
+            endpoint (str): Relative endpoint (see settings.ENDPOINTS) or absolute URL.
+            **kwargs: Passed to `requests.Session.request` (json, data, files, params,
+                headers, timeout, ...). `timeout` defaults to the transport timeout.
+
+        Returns:
+            requests.Response: The response object.
+        """
+        kwargs.setdefault("timeout", self.timeout)
+        url = self.build_url(endpoint)
+        key = endpoint_key(url, self.base_url)
+        attempt = 0
+        while True:
+            response = self._send(method, url, key, kwargs)
+            retry_after = retry_after_seconds(response.headers.get("Retry-After"))
+            if (
+                response.status_code != HTTPStatus.TOO_MANY_REQUESTS
+                or retry_after is None
+                or attempt >= self.max_retries
+                or not resendable(kwargs)
+            ):
+                return response
+            response.close()
+            attempt += 1
+            if self.limiter is None:
+                time.sleep(retry_after)  # the limiter holds the group back itself
+
+    def _send(self, method, url, key, kwargs):
+        permit = self.limiter.acquire(key) if self.limiter is not None else None
+        timing = start_timing()
+        started = time.perf_counter()
+        status = "error"
+        response = None
+        try:
+            response = self.session.request(method, url, **kwargs)
+            status = response.status_code
+            return response
+        finally:
+            total = time.perf_counter() - started
+            stop_timing()
+            if permit is not None:
+                self.limiter.release(
+                    permit,
+                    response.status_code if response is not None else None,
+                    retry_after_seconds(
+                        response.headers.get("Retry-After")
+                        if response is not None
+                        else None
+                    ),
+                )
+            get_recorder().record(
+                key,
+                method.upper(),
+                status,
+                total,
+                ttfb=timing.ttfb,
+                connect=timing.connect,
+                dns=timing.dns,
+                request_bytes=(
+                    body_size(response.request.body) if response is not None else 0
+                ),
+                response_bytes=_response_size(response, kwargs.get("stream")),
+            )
+
+    def connection_stats(self) -> dict:
+        """
+        Returns per-host request/connection counters of the live pools.
+
+        Returns:
+            dict: {"scheme://host:port": {"requests": int, "connections": int, "reused": int}}
+        """
+        stats = {}
+        if self._session is None:
+            return stats
+
+        for adapter in {id(a): a for a in self._session.adapters.values()}.values():
+            if not hasattr(adapter, "poolmanager"):  # replayed, no connections
+                continue
+            pools = adapter.poolmanager.pools
+            for key in list(pools.keys()):
+                pool = pools.get(key)
+                if pool is None:
+                    continue
+                host = f"{pool.scheme}://{pool.host}:{pool.port}"
+                entry = stats.setdefault(host, {"requests": 0, "connections": 0})
+                entry["requests"] += pool.num_requests
+                entry["connections"] += pool.num_connections
+
+        for entry in stats.values():
+            entry["reused"] = max(entry["requests"] - entry["connections"], 0)
+        return stats
+
+    def close(self):
+        if self._session is not None:
+            self._session.close()
+            self._session = None
+
+
+def resendable(kwargs) -> bool:
+    """Whether the body of a request can be sent again, i.e. is not a stream."""
+    if kwargs.get("files"):
+        return False
+    data = kwargs.get("data")
+    return data is None or isinstance(data, (bytes, str, dict, list, tuple))
+
+
+def _response_size(response, stream) -> int:
+    if response is None:
+        return 0
+    if stream:  # do not consume a streamed body just to measure it
+        return int(response.headers.get("Content-Length") or 0)
+    return len(response.content)
+
+
+_transport = None
+
+
+def configure_transport(**options) -> HttpTransport:
+    """Replaces the shared transport with one built from `options`."""
+    global _transport
+    close_transport()
+    _transport = HttpTransport(**options)
+    return _transport
+
+
+def get_transport() -> HttpTransport:
+    """Returns the shared transport, creating it with default settings if needed."""
+    global _transport
+    if _transport is None:
+        _transport = HttpTransport()
+    return _transport
+
+
+def close_transport():
+    global _transport
+    if _transport is not None:
+        _transport.close()
+        _transport = None
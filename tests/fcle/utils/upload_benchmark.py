@@ -0,0 +1,231 @@
+"""
+Upload throughput benchmark for the newteacher document endpoints.
+
+Benchmark tests (marker `benchmark`, run only with `pytest --benchmark`) call
+`UploadBenchmark.run()` for one point of the sweep: endpoint x file type x
+file size x concurrency. A point sends `concurrency * UPLOAD_BENCH_ROUNDS`
+streamed uploads of a synthetic file (utils/multipart.py) from `concurrency`
+threads and records:
+
+    MB/s        payload bytes of the accepted (2xx) uploads / wall time of the
+                point; a rejection such as 413 may come before the body is read,
+                so it does not count, the number of rejected uploads is
+                reported next to it
+    latency     p50/p95/max per upload, from the histograms of utils/histogram.py
+    statuses    count per HTTP status, 2xx counts as accepted
+
+Rejection threshold:
+    Per endpoint and file type, the largest size that was accepted and the
+    smallest size that was rejected (any non-2xx status or a transport error).
+    When the smallest rejected size is above the largest accepted one the
+    server enforces a clean limit between the two.
+
+The summary is printed at the end of the session and written as JSON with
+`--benchmark-report PATH`.
+"""
+
+import json
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+
+import requests
+
+from settings import UPLOAD_BENCH_ROUNDS
+from utils.histogram import LatencyHistogram
+from utils.multipart import KB, MB, MultipartEncoder, synthetic_file
+
+
+def format_size(size) -> str:
+    if size >= MB:
+        return f"{size / MB:g} MB"
+    if size >= KB:
+        return f"{size / KB:g} KB"
+    return f"{size} B"
+
+
+@dataclass
+class UploadPoint:
+    """Result of one point of the sweep."""
+
+    endpoint: str
+    file_type: str
+    size: int
+    concurrency: int
+    wall: float = 0.0
+    statuses: Counter = field(default_factory=Counter)
+    latency: LatencyHistogram = field(default_factory=LatencyHistogram)
+
+    @property
+    def requests(self) -> int:
+        return sum(self.statuses.values())
+
+    @property
+    def accepted(self) -> int:
+        return sum(
+            n for status, n in self.statuses.items() if str(status).startswith("2")
+        )
+
+    @property
+    def rejections(self) -> int:
+        """Uploads answered with a non-2xx status or dropped."""
+        return self.requests - self.accepted
+
+    @property
+    def rejected(self) -> bool:
+        return self.rejections > 0
+
+    @property
+    def throughput(self) -> float:
+        """MB/s of payload over the accepted uploads."""
+        return self.accepted * self.size / MB / self.wall if self.wall else 0.0
+
+    def to_dict(self) -> dict:
+        return {
+            "endpoint": self.endpoint,
+            "file_type": self.file_type,
+            "size": self.size,
+            "concurrency": self.concurrency,
+            "requests": self.requests,
+            "accepted": self.accepted,
+            "rejected": self.rejections,
+            "statuses": {str(k): v for k, v in sorted(self.statuses.items(), key=str)},
+            "wall_s": round(self.wall, 3),
+            "mb_per_s": round(self.throughput, 3),
+            "p50_ms": round(self.latency.percentile(50) / 1000, 1),
+            "p95_ms": round(self.latency.percentile(95) / 1000, 1),
+            "max_ms": round(self.latency.percentile(100) / 1000, 1),
+        }
+
+
+class UploadBenchmark:
+    """pytest plugin: runs sweep points for the benchmark tests and reports them."""
+
+    def __init__(self, report_path=None, max_size=None, rounds=UPLOAD_BENCH_ROUNDS):
+        self.report_path = report_path
+        self.max_size = max_size
+        self.rounds = rounds
+        self.points = []
+        self._lock = threading.Lock()
+
+    def run(self, transport, endpoint, data, headers, file_type, size, concurrency):
+        """
+        Sends one point of the sweep.
+
+        The uploads go straight through the transport rather than the
+        `upload_stream` fixture, which turns a dropped connection into
+        `pytest.fail` and would abort the whole point.
+
+        Args:
+            transport (HttpTransport): The `http_transport` fixture.
+            endpoint (str): Upload endpoint.
+            data (dict): Form fields (title, description, referenceid).
+            headers (dict): Authorization headers of a teacher.
+            file_type (str): "pdf", "png" or "jpg".
+            size (int): File size in bytes.
+            concurrency (int): Uploads in flight at the same time.
+
+        Returns:
+            UploadPoint: The measured point, also kept for the summary.
+        """
+        point = UploadPoint(endpoint, file_type, size, concurrency)
+        name = f"bench.{file_type}"
+
+        def _one(_):
+            encoder = MultipartEncoder(
+                data, {"file": (name, synthetic_file(size, file_type))}
+            )
+            started = time.perf_counter()
+            try:
+                response = transport.request(
+                    "POST",
+                    endpoint,
+                    data=encoder,
+                    headers={**headers, "Content-Type": encoder.content_type},
+                )
+                status = response.status_code
+            except requests.RequestException:  # a dropped upload is a data point
+                status = "error"
+            elapsed = time.perf_counter() - started
+            with self._lock:
+                point.statuses[status] += 1
+                point.latency.record(int(elapsed * 1_000_000))
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            list(pool.map(_one, range(concurrency * self.rounds)))
+        point.wall = time.perf_counter() - started
+
+        with self._lock:
+            self.points.append(point)
+        return point
+
+    def thresholds(self) -> dict:
+        """{(endpoint, file_type): (largest accepted size, smallest rejected size)}"""
+        limits = {}
+        for point in self.points:
+            accepted, rejected = limits.get(
+                (point.endpoint, point.file_type), (None, None)
+            )
+            if point.accepted:
+                accepted = max(accepted or 0, point.size)
+            if point.rejected:
+                rejected = point.size if rejected is None else min(rejected, point.size)
+            limits[(point.endpoint, point.file_type)] = (accepted, rejected)
+        return limits
+
+    def pytest_sessionfinish(self, session):
+        if not self.report_path:
+            return
+        with open(self.report_path, "w", encoding="utf-8") as f:
+            json.dump(
+                {
+                    "points": [point.to_dict() for point in self.points],
+                    "thresholds": [
+                        {
+                            "endpoint": endpoint,
+                            "file_type": file_type,
+                            "largest_accepted": accepted,
+                            "smallest_rejected": rejected,
+                        }
+                        for (endpoint, file_type), (accepted, rejected) in sorted(
+                            self.thresholds().items()
+                        )
+                    ],
+                },
+                f,
+                indent=2,
+            )
+
+    def pytest_terminal_summary(self, terminalreporter):
+        if not self.points:
+            return
+        terminalreporter.section("upload benchmark")
+        terminalreporter.write_line(
+            f"{'endpoint':<40}{'type':>5}{'size':>10}{'conc':>6}{'ok':>7}"
+            f"{'MB/s':>9}{'rej':>5}{'p50 ms':>9}{'p95 ms':>9}  statuses"
+        )
+        for point in sorted(
+            self.points, key=lambda p: (p.endpoint, p.file_type, p.size, p.concurrency)
+        ):
+            row = point.to_dict()
+            terminalreporter.write_line(
+                f"{point.endpoint:<40}{point.file_type:>5}{format_size(point.size):>10}"
+                f"{point.concurrency:>6}{point.accepted:>3}/{point.requests:<3}"
+                f"{row['mb_per_s']:>9.2f}{point.rejections:>5}"
+                f"{row['p50_ms']:>9.1f}{row['p95_ms']:>9.1f}"
+                f"  {row['statuses']}"
+            )
+        terminalreporter.write_line("rejection thresholds:")
+        for (endpoint, file_type), (accepted, rejected) in sorted(
+            self.thresholds().items()
+        ):
+            terminalreporter.write_line(
+                f"  {endpoint} {file_type}: largest accepted "
+                f"{format_size(accepted) if accepted else '-'}, smallest rejected "
+                f"{format_size(rejected) if rejected else '-'}"
+            )
+        if self.report_path:
+            terminalreporter.write_line(f"benchmark report: {self.report_path}")
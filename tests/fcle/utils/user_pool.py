@@ -0,0 +1,269 @@
+"""
+Session-wide pool of pre-registered, logged-in users.
+
+Registering a user costs three round-trips (signup → set-password → login).
+Instead of paying them in every test, `UserPool` registers a batch of users
+once, in parallel, and leases them to tests through the `auth_headers` fixture.
+
+Users returned by a test that mutated them (marker `mutates_user`) or that
+failed are quarantined: they are never handed out again and the pool registers
+a replacement on demand.
+
+With a token store (utils/token_store.py) the pool first claims the clean
+users earlier sessions left there and only registers the rest; `close()` puts
+its clean users back. While the session runs, a background thread logs users
+in again shortly before their token expires, so long runs never hand out an
+expired token.
+"""
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from http import HTTPStatus
+
+from settings import (
+    ENDPOINTS,
+    TOKEN_REFRESH_INTERVAL,
+    TOKEN_REFRESH_MARGIN,
+    USER_POOL_WORKERS,
+    USER_TIMEZONE,
+)
+from utils.identities import get_identity_generator
+from utils.ledger import record_account
+from utils.token_store import fresh, jwt_expiry
+
+
+@dataclass
+class PooledUser:
+    """Registered user with a valid JWT."""
+
+    email: str
+    password: str
+    nickname: str
+    token: str
+
+    @property
+    def headers(self) -> dict:
+        return {"Authorization": f"Bearer {self.token}"}
+
+
+def register_user(post, identity=None) -> PooledUser:
+    """
+    Runs the signup → set-password → login flow for a new generated user.
+
+    Args:
+        post (callable): `post(payload, endpoint)` returning a response,
+            e.g. the `post_request` fixture.
+        identity (utils.identities.Identity, optional): Email, password and
+            nickname to register; the next unique identity of this process
+            by default.
+
+    Returns:
+        PooledUser: The registered user with its login token.
+
+    Raises:
+        AssertionError: If any step returns an unexpected status code.
+    """
+    if identity is None:
+        identity = get_identity_generator().identity()
+    email, pwd, nick = identity.email, identity.password, identity.nickname
+    # signup
+    r1 = post({"email": email, "lang": "en"}, ENDPOINTS["signup"])
+    assert r1.status_code == HTTPStatus.OK, f"Signup failed: {r1.status_code} {r1.text}"
+    token_signup = r1.json()["token"]
+
+    # set-password
+    r2 = post(
+        {
+            "token": token_signup,
+            "newPassword": pwd,
+            "nickname": nick,
+            "timezone": USER_TIMEZONE,
+        },
+        ENDPOINTS["set_password"],
+    )
+    assert (
+        r2.status_code == HTTPStatus.OK
+    ), f"Set password failed: {r2.status_code} {r2.text}"
+
+    # login
+    r3 = post(
+        {"email": email, "password": pwd, "timezone": USER_TIMEZONE},
+        ENDPOINTS["login"],
+    )
+    assert r3.status_code == HTTPStatus.OK, f"Login failed: {r3.status_code} {r3.text}"
+    record_account(email, pwd)
+
+    return PooledUser(email, pwd, nick, r3.json()["token"])
+
+
+def login_user(post, user) -> bool:
+    """
+    Logs a registered user in again and replaces its token.
+
+    Returns:
+        bool: False if the login was refused, e.g. the account was deleted.
+    """
+    r = post(
+        {"email": user.email, "password": user.password, "timezone": USER_TIMEZONE},
+        ENDPOINTS["login"],
+    )
+    if r.status_code != HTTPStatus.OK:
+        return False
+    user.token = r.json()["token"]
+    return True
+
+
+class UserPool:
+    """
+    Thread-safe lease/release pool of registered users.
+
+    Args:
+        size (int): Number of users registered by `fill()`.
+        post (callable): `post(payload, endpoint)` used to register users.
+        workers (int): Parallel registrations while filling the pool.
+        store (utils.token_store.TokenStore, optional): Users kept across runs.
+        refresh_interval (float): Seconds between background expiry checks,
+            0 disables them.
+    """
+
+    def __init__(
+        self,
+        size,
+        post,
+        workers=USER_POOL_WORKERS,
+        store=None,
+        refresh_interval=TOKEN_REFRESH_INTERVAL,
+    ):
+        self.size = size
+        self.post = post
+        self.workers = max(1, min(workers, size))
+        self.store = store
+        self.refresh_interval = refresh_interval
+        self.reused = 0
+        self.refreshed = 0
+        self._idle = []
+        self._leased = {}
+        self._quarantined = []
+        self._filled = False
+        self._lock = threading.Lock()
+        self._fill_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._refresher = None
+
+    def _register(self, identity=None) -> PooledUser:
+        return register_user(self.post, identity)
+
+    def _reuse(self, user):
+        """`user` with a token that lasts, None if it can no longer log in."""
+        if fresh(user.token):
+            return user
+        return user if login_user(self.post, user) else None
+
+    def _stored(self) -> list:
+        """Users claimed from the store, logged in again where needed."""
+        claimed = [PooledUser(**account) for account in self.store.claim(self.size)]
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            results = list(executor.map(self._reuse, claimed))
+        users = [user for user in results if user is not None]
+        self.store.forget(u.email for u, r in zip(claimed, results) if r is None)
+        return users
+
+    def fill(self):
+        """Registers `size` users in parallel. Raises if none could be created."""
+        users = self._stored() if self.store is not None else []
+        self.reused = len(users)
+        identities = get_identity_generator().batch(self.size - len(users))
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            futures = [
+                executor.submit(self._register, identity) for identity in identities
+            ]
+
+        errors = []
+        for future in futures:
+            try:
+                users.append(future.result())
+            except Exception as e:  # a failed signup must not kill the others
+                errors.append(e)
+
+        if not users and errors:
+            raise errors[0]
+
+        with self._lock:
+            self._idle.extend(users)
+            self._filled = True
+        if self.refresh_interval > 0:
+            self._refresher = threading.Thread(
+                target=self._refresh, name="fcle-token-refresh", daemon=True
+            )
+            self._refresher.start()
+
+    def _refresh(self):
+        # renews tokens with a readable `exp` before it passes, idle and leased alike
+        while not self._stop.wait(self.refresh_interval):
+            with self._lock:
+                users = self._idle + list(self._leased.values())
+            for user in users:
+                if jwt_expiry(user.token) is None or fresh(user.token):
+                    continue
+                try:
+                    if login_user(self.post, user):
+                        self.refreshed += 1
+                except Exception:  # the lease path logs in if this one failed
+                    pass
+
+    def lease(self) -> PooledUser:
+        """Returns an idle user, registering a new one if the pool is drained."""
+        with self._fill_lock:
+            if not self._filled:
+                self.fill()
+
+        with self._lock:
+            user = self._idle.pop() if self._idle else None
+        if user is None:
+            user = self._register()
+        elif jwt_expiry(user.token) and not fresh(user.token, TOKEN_REFRESH_MARGIN / 2):
+            login_user(self.post, user)  # the refresh thread fell behind
+
+        with self._lock:
+            self._leased[user.email] = user
+        return user
+
+    def release(self, user: PooledUser):
+        """Returns a clean user to the pool."""
+        with self._lock:
+            self._leased.pop(user.email, None)
+            self._idle.append(user)
+
+    def quarantine(self, user: PooledUser):
+        """Retires a user whose server-side state can no longer be trusted."""
+        with self._lock:
+            self._leased.pop(user.email, None)
+            self._quarantined.append(user)
+
+    def close(self):
+        """Stops the refresh thread and hands the clean users back to the store."""
+        self._stop.set()
+        if self._refresher is not None:
+            self._refresher.join()
+        if self.store is None:
+            return
+        with self._lock:
+            idle, retired = list(self._idle), self._quarantined + list(
+                self._leased.values()
+            )
+        for user in idle:
+            self.store.put(
+                user.email, user.password, user.token, user.nickname, pooled=True
+            )
+        self.store.forget(user.email for user in retired)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "idle": len(self._idle),
+                "leased": len(self._leased),
+                "quarantined": len(self._quarantined),
+                "reused": self.reused,
+                "refreshed": self.refreshed,
+            }